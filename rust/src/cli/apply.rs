@@ -5,9 +5,12 @@ use std::io::{stdin, stdout, Read, Write};
 use std::process::{Command, Stdio};
 use std::str::FromStr;
 
-use nmstate::{NetworkPolicy, NetworkState};
+use nmstate::{NetworkState, NmstateTimings};
 
-use crate::error::CliError;
+use crate::{
+    error::CliError,
+    state::{read_content, state_or_policy_from_content},
+};
 
 const DEFAULT_TIMEOUT: u32 = 60;
 
@@ -60,35 +63,8 @@ where
     } else {
         DEFAULT_TIMEOUT
     };
-    let mut content = String::new();
-    // Replace non-breaking space '\u{A0}'  to normal space
-    reader.read_to_string(&mut content)?;
-    let content = content.replace('\u{A0}', " ");
-
-    let mut net_state: NetworkState = match serde_yaml::from_str(&content) {
-        Ok(s) => s,
-        Err(state_error) => {
-            // Try NetworkPolicy
-            let net_policy: NetworkPolicy = match serde_yaml::from_str(&content)
-            {
-                Ok(p) => p,
-                Err(policy_error) => {
-                    let e = if content.contains("desiredState")
-                        || content.contains("desired")
-                    {
-                        policy_error
-                    } else {
-                        state_error
-                    };
-                    return Err(CliError::from(format!(
-                        "Provide file is not valid NetworkState or \
-                        NetworkPolicy: {e}"
-                    )));
-                }
-            };
-            NetworkState::try_from(net_policy)?
-        }
-    };
+    let content = read_content(reader)?;
+    let mut net_state = state_or_policy_from_content(&content)?;
 
     net_state.set_kernel_only(kernel_only);
     net_state.set_verify_change(!no_verify);
@@ -97,6 +73,9 @@ where
     net_state.set_memory_only(
         matches.try_contains_id("MEMORY_ONLY").unwrap_or_default(),
     );
+    if let Ok(Some(netns)) = matches.try_get_one::<String>("NETNS") {
+        net_state.set_netns(netns);
+    }
     let rt = tokio::runtime::Builder::new_current_thread()
         .enable_io()
         .enable_time()
@@ -104,11 +83,20 @@ where
         .map_err(|e| {
             CliError::from(format!("tokio::runtime::Builder failed with {e}"))
         })?;
-    let mut diff_state = rt.block_on(apply_state_async(net_state))?;
+    let mut diff_state =
+        if matches.try_contains_id("TIMINGS").unwrap_or_default() {
+            let mut timings = NmstateTimings::new();
+            let result =
+                rt.block_on(timings.collect(apply_state_async(net_state)));
+            crate::query::print_timings(&timings)?;
+            result?
+        } else {
+            rt.block_on(apply_state_async(net_state))?
+        };
     if !matches.try_contains_id("SHOW_SECRETS").unwrap_or_default() {
         diff_state.hide_secrets();
     }
-    let sorted_net_state = crate::query::sort_netstate(diff_state)?;
+    let sorted_net_state = crate::query::sort_netstate(&diff_state);
     Ok(serde_yaml::to_string(&sorted_net_state)?)
 }
 
@@ -173,7 +161,7 @@ pub(crate) fn state_edit(
     if !matches.try_contains_id("SHOW_SECRETS").unwrap_or_default() {
         diff_state.hide_secrets();
     }
-    let sorted_net_state = crate::query::sort_netstate(diff_state)?;
+    let sorted_net_state = crate::query::sort_netstate(&diff_state);
     Ok(serde_yaml::to_string(&sorted_net_state)?)
 }
 
@@ -269,6 +257,9 @@ async fn apply_state_async(
     let mut cur_state = NetworkState::new();
     cur_state.set_kernel_only(net_state.kernel_only());
     cur_state.set_running_config_only(true);
+    if let Some(netns) = net_state.netns() {
+        cur_state.set_netns(netns);
+    }
     cur_state.retrieve_async().await?;
 
     let mut ctrlc_stream = tokio::signal::unix::signal(
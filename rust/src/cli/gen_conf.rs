@@ -1,10 +1,94 @@
 // SPDX-License-Identifier: Apache-2.0
 
+use std::io::Write;
+use std::os::unix::fs::{OpenOptionsExt, PermissionsExt};
+use std::path::Path;
+
 use crate::{error::CliError, state::state_from_file};
 
-pub(crate) fn gen_conf(file_path: &str) -> Result<String, CliError> {
+pub(crate) fn gen_conf(matches: &clap::ArgMatches) -> Result<String, CliError> {
+    let file_path = matches.value_of("STATE_FILE").unwrap_or("-");
     let net_state = state_from_file(file_path)?;
     let confs = net_state.gen_conf()?;
+    if let Some(output_dir) = matches.value_of("OUTPUT_DIR") {
+        return write_confs_to_dir(&confs, Path::new(output_dir));
+    }
     let escaped_string = serde_yaml::to_string(&confs)?;
     Ok(escaped_string.replace("\\n", "\n\n"))
 }
+
+// Store each config file into `<output_dir>/<backend>/<file_name>`.
+// Files holding identical content are not rewritten, so repeated runs against
+// the same folder only touch the configurations which actually changed.
+fn write_confs_to_dir(
+    confs: &std::collections::HashMap<String, Vec<(String, String)>>,
+    output_dir: &Path,
+) -> Result<String, CliError> {
+    let mut written = 0usize;
+    let mut unchanged = 0usize;
+    for (backend, files) in confs {
+        validate_conf_path_name(backend)?;
+        let backend_dir = output_dir.join(backend);
+        std::fs::create_dir_all(&backend_dir).map_err(|e| {
+            CliError::from(format!(
+                "Failed to create folder {}: {e}",
+                backend_dir.display()
+            ))
+        })?;
+        for (file_name, content) in files {
+            validate_conf_path_name(file_name)?;
+            let file_path = backend_dir.join(file_name);
+            if let Ok(exist_content) = std::fs::read(&file_path) {
+                if exist_content == content.as_bytes() {
+                    set_conf_file_mode(&file_path)?;
+                    unchanged += 1;
+                    continue;
+                }
+            }
+            let mut fd = std::fs::OpenOptions::new()
+                .write(true)
+                .create(true)
+                .truncate(true)
+                .mode(0o600)
+                .open(&file_path)
+                .map_err(|e| {
+                    CliError::from(format!(
+                        "Failed to open {}: {e}",
+                        file_path.display()
+                    ))
+                })?;
+            fd.write_all(content.as_bytes())?;
+            // The mode of open() only applies to newly created file
+            set_conf_file_mode(&file_path)?;
+            written += 1;
+        }
+    }
+    Ok(format!(
+        "Stored configurations to {}: {written} written, {unchanged} \
+        unchanged",
+        output_dir.display()
+    ))
+}
+
+// Backend and file names are used as single path component, reject anything
+// which could escape the output folder.
+fn validate_conf_path_name(name: &str) -> Result<(), CliError> {
+    if name.is_empty() || name == "." || name == ".." || name.contains('/') {
+        Err(CliError::from(format!(
+            "Refusing to store config file with invalid name {name}"
+        )))
+    } else {
+        Ok(())
+    }
+}
+
+// NetworkManager ignores keyfiles readable by others
+fn set_conf_file_mode(file_path: &Path) -> Result<(), CliError> {
+    std::fs::set_permissions(file_path, std::fs::Permissions::from_mode(0o600))
+        .map_err(|e| {
+            CliError::from(format!(
+                "Failed to set permission of {}: {e}",
+                file_path.display()
+            ))
+        })
+}
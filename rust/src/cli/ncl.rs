@@ -135,6 +135,56 @@ fn main() {
                         .takes_value(false)
                         .help("Show secrets(hide by default)"),
                 )
+                .arg(
+                    clap::Arg::new("NO_LLDP_NEIGHBORS")
+                        .long("no-lldp-neighbors")
+                        .takes_value(false)
+                        .help("Do not query LLDP neighbors"),
+                )
+                .arg(
+                    clap::Arg::new("NETNS")
+                        .long("netns")
+                        .takes_value(true)
+                        .requires("KERNEL")
+                        .help(
+                            "Show kernel network state of specified network \
+                            namespace(PID, path or name)",
+                        ),
+                )
+                .arg(
+                    clap::Arg::new("WATCH")
+                        .long("watch")
+                        .takes_value(false)
+                        .conflicts_with_all(&["IFNAME", "NETNS"])
+                        .help(
+                            "Show network state, then keep showing network \
+                            state changes until interrupted",
+                        ),
+                )
+                .arg(
+                    clap::Arg::new("FINGERPRINT")
+                        .long("fingerprint")
+                        .takes_value(true)
+                        .min_values(0)
+                        .max_values(1)
+                        .value_name("DESIRED_STATE_FILE")
+                        .conflicts_with("WATCH")
+                        .help(
+                            "Show SHA-256 fingerprint of network state instead \
+                            of full state. When desired state file defined, \
+                            only properties mentioned in it are included",
+                        ),
+                )
+                .arg(
+                    clap::Arg::new("TIMINGS")
+                        .long("timings")
+                        .takes_value(false)
+                        .conflicts_with("WATCH")
+                        .help(
+                            "Print the duration of each retrieve phase to \
+                            stderr",
+                        ),
+                )
         )
         .subcommand(
             clap::Command::new(SUB_CMD_APPLY)
@@ -193,6 +243,26 @@ fn main() {
                         .takes_value(false)
                         .help("Do not make the state persistent"),
                 )
+                .arg(
+                    clap::Arg::new("NETNS")
+                        .long("netns")
+                        .takes_value(true)
+                        .requires("KERNEL")
+                        .conflicts_with("NO_COMMIT")
+                        .help(
+                            "Apply network state to kernel of specified \
+                            network namespace(PID, path or name)",
+                        ),
+                )
+                .arg(
+                    clap::Arg::new("TIMINGS")
+                        .long("timings")
+                        .takes_value(false)
+                        .help(
+                            "Print the duration of each apply phase to stderr \
+                            even when apply failed",
+                        ),
+                )
         )
         .subcommand(
             clap::Command::new(SUB_CMD_GEN_CONF)
@@ -202,6 +272,17 @@ fn main() {
                         .required(true)
                         .index(1)
                         .help("Network state file"),
+                )
+                .arg(
+                    clap::Arg::new("OUTPUT_DIR")
+                        .short('o')
+                        .long("output-dir")
+                        .takes_value(true)
+                        .help(
+                            "Store generated configurations into specified \
+                            folder instead of printing them, unchanged \
+                            files are not rewritten",
+                        ),
                 ),
         )
         .subcommand(
@@ -360,10 +441,13 @@ fn main() {
                 .about("Generate statistic of specified desire states")
                 .arg(
                     clap::Arg::new("STATE_FILE")
-                        .required(true)
+                        .required(false)
                         .multiple_occurrences(true)
                         .index(1)
-                        .help("Network state file (repeatable)"),
+                        .help(
+                            "Network state file (repeatable), read from \
+                            stdin if not defined",
+                        ),
                 )
                 .arg(
                     clap::Arg::new("CURRENT_STATE")
@@ -378,6 +462,18 @@ fn main() {
                         .takes_value(false)
                         .help("Show statistic in json format"),
                 )
+                .arg(
+                    clap::Arg::new("BATCH")
+                        .long("batch")
+                        .takes_value(false)
+                        .help(
+                            "Generate statistic for each state file \
+                            individually in parallel, print them as JSON \
+                            lines followed by a summary of feature and \
+                            topology usage. Folders are searched \
+                            recursively for YAML and JSON files",
+                        ),
+                )
         )
         .subcommand(
             clap::Command::new(SUB_CMD_VERSION)
@@ -457,9 +553,7 @@ fn main() {
     log::info!("Nmstate version: {}", clap::crate_version!());
 
     if let Some(matches) = matches.subcommand_matches(SUB_CMD_GEN_CONF) {
-        if let Some(file_path) = matches.value_of("STATE_FILE") {
-            print_result_and_exit(gen_conf(file_path));
-        }
+        print_result_and_exit(gen_conf(matches));
     } else if let Some(matches) = matches.subcommand_matches(SUB_CMD_SHOW) {
         print_result_and_exit(show(matches));
     } else if let Some(matches) = matches.subcommand_matches(SUB_CMD_APPLY) {
@@ -538,7 +632,9 @@ fn main() {
 }
 
 #[cfg(not(feature = "gen_conf"))]
-fn gen_conf(_file_path: &str) -> Result<String, crate::error::CliError> {
+fn gen_conf(
+    _matches: &clap::ArgMatches,
+) -> Result<String, crate::error::CliError> {
     Err("The gc sub-command require `gen_conf` feature been \
         enabled during compiling"
         .into())
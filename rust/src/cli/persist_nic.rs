@@ -12,8 +12,9 @@
 //!  - Iterate over all active NICs
 //!  - Pin every Ethernet interface to its MAC address (prefer permanent MAC
 //!    address) using link files and the [`ifname=`] kernel argument.
-//!  - After booting to new environment, use `udevadm test-builtin net_id` to
-//!    check whether pined interface name is different from systemd UDEV
+//!  - After booting to new environment, use the `ID_NET_NAME_*` properties
+//!    stored in udev database (or `udevadm test-builtin net_id` if not found)
+//!    to check whether pined interface name is different from systemd UDEV
 //!    Generated one. If still the same, remove the `.link` file.
 //!
 //! [`.link`]: https://www.freedesktop.org/software/systemd/man/systemd.link.html
@@ -22,8 +23,6 @@ use std::collections::HashMap;
 use std::io::Read;
 use std::path::{Path, PathBuf};
 
-use nmstate::{Interface, InterfaceType, NetworkState};
-
 use crate::error::CliError;
 
 /// Comment added into our generated link files
@@ -41,6 +40,8 @@ const UDEVADM_CMD_OPT: [&str; 2] = ["test-builtin", "net_id"];
 const ID_NET_NAME_ONBOARD: &str = "ID_NET_NAME_ONBOARD";
 const ID_NET_NAME_SLOT: &str = "ID_NET_NAME_SLOT";
 const ID_NET_NAME_PATH: &str = "ID_NET_NAME_PATH";
+/// The udev database holding properties of each device
+const UDEV_DATA_FOLDER: &str = "/run/udev/data";
 
 /// The action to take
 pub(crate) enum PersistAction {
@@ -50,12 +51,82 @@ pub(crate) enum PersistAction {
     CleanUp,
 }
 
-fn gather_state() -> Result<NetworkState, CliError> {
-    let mut state = NetworkState::new();
-    state.set_kernel_only(true);
-    state.set_running_config_only(true);
-    state.retrieve()?;
-    Ok(state)
+/// Ethernet interface information required for persisting its name
+struct EthernetNic {
+    name: String,
+    driver: Option<String>,
+    mac_address: Option<String>,
+    /// Also hold the MAC address stored in bond port
+    /// (`IFLA_BOND_PORT_PERM_HWADDR`) when interface has no permanent MAC
+    /// address.
+    permanent_mac_address: Option<String>,
+    is_bond_port: bool,
+}
+
+/// Retrieve link information of ethernet interfaces only in single netlink
+/// dump, without querying IP addresses, routes, ethtool or NetworkManager.
+fn gather_ethernet_nics() -> Result<Vec<EthernetNic>, CliError> {
+    let mut filter = nispor::NetStateFilter::minimum();
+    filter.iface = Some(nispor::NetStateIfaceFilter::minimum());
+    let np_state =
+        nispor::NetState::retrieve_with_filter(&filter).map_err(|e| {
+            CliError::from(format!(
+                "Failed to retrieve kernel network state: {}: {}",
+                e.kind, e.msg
+            ))
+        })?;
+
+    let mut ret: Vec<EthernetNic> = np_state
+        .ifaces
+        .values()
+        .filter(|i| i.iface_type == nispor::IfaceType::Ethernet)
+        .map(|np_iface| {
+            let is_bond_port = np_iface
+                .controller
+                .as_ref()
+                .and_then(|c| np_state.ifaces.get(c))
+                .map(|c| c.iface_type == nispor::IfaceType::Bond)
+                .unwrap_or_default();
+            let permanent_mac_address =
+                non_empty_mac(&np_iface.permanent_mac_address).or_else(|| {
+                    np_iface
+                        .bond_subordinate
+                        .as_ref()
+                        .and_then(|b| non_empty_mac(&b.perm_hwaddr))
+                });
+            EthernetNic {
+                name: np_iface.name.to_string(),
+                driver: np_iface
+                    .driver
+                    .clone()
+                    .filter(|d| !d.is_empty())
+                    .or_else(|| get_driver_from_sysfs(&np_iface.name)),
+                mac_address: non_empty_mac(&np_iface.mac_address),
+                permanent_mac_address,
+                is_bond_port,
+            }
+        })
+        .collect();
+    ret.sort_unstable_by(|a, b| a.name.cmp(&b.name));
+    Ok(ret)
+}
+
+fn non_empty_mac(mac: &str) -> Option<String> {
+    if mac.is_empty() {
+        None
+    } else {
+        Some(mac.to_uppercase())
+    }
+}
+
+fn get_driver_from_sysfs(iface_name: &str) -> Option<String> {
+    std::fs::read_link(format!("/sys/class/net/{iface_name}/device/driver"))
+        .ok()
+        .and_then(|p| {
+            p.file_name()
+                .and_then(|n| n.to_str())
+                .map(ToOwned::to_owned)
+        })
 }
 
 pub(crate) fn entrypoint(
@@ -99,40 +170,32 @@ fn run_persist_immediately(
         log::info!("Host uses initrd networking");
     }
 
-    let state = gather_state()?;
+    let nics = gather_ethernet_nics()?;
     let mut changed = false;
-    for iface in state
-        .interfaces
-        .iter()
-        .filter(|i| i.iface_type() == InterfaceType::Ethernet)
-    {
+    for nic in nics.iter() {
         // The MAC address of bond port might has been altered when attaching
-        // to bond, we need special handling here
-        let mac = if iface.base_iface().controller_type
-            == Some(InterfaceType::Bond)
-        {
-            get_bond_port_mac(iface)
+        // to bond, only use permanent MAC or the one stored in bond port.
+        let mac = if nic.is_bond_port {
+            nic.permanent_mac_address.as_deref()
         } else {
             // Prefer permanent(often stored in firmware) MAC address
-            iface
-                .base_iface()
-                .permanent_mac_address
-                .clone()
-                .or_else(|| iface.base_iface().mac_address.clone())
+            nic.permanent_mac_address
+                .as_deref()
+                .or(nic.mac_address.as_deref())
         };
         let mac = match mac {
             Some(m) => m,
             None => {
                 log::info!(
                     "Skipping interface {} due to missing reliable MAC address",
-                    iface.name()
+                    nic.name
                 );
 
                 continue;
             }
         };
 
-        let file_path = gen_link_file_path(root, iface.name());
+        let file_path = gen_link_file_path(root, &nic.name);
         if file_path.exists() {
             log::info!(
                 "Network link file {} already exists",
@@ -140,24 +203,16 @@ fn run_persist_immediately(
             );
             continue;
         }
-        let iface_name = iface.name();
-        let karg = format_ifname_karg(iface_name, &mac);
-        let driver = iface.base_iface().driver.as_deref().and_then(|d| {
-            if d.is_empty() {
-                None
-            } else {
-                Some(d)
-            }
-        });
+        let iface_name = nic.name.as_str();
+        let karg = format_ifname_karg(iface_name, mac);
+        let driver = nic.driver.as_deref();
         log::info!(
             "Will persist the interface {iface_name} \
             driver {} with MAC {mac}",
             driver.unwrap_or("unknown")
         );
         if !dry_run {
-            persist_iface_name_via_systemd_link(
-                root, &mac, iface_name, driver,
-            )?;
+            persist_iface_name_via_systemd_link(root, mac, iface_name, driver)?;
         }
         if with_kargs {
             log::info!("Kernel argument added: {karg}");
@@ -252,17 +307,14 @@ pub(crate) fn clean_up(
         return Ok("".to_string());
     }
 
-    let state = gather_state()?;
-    let macs: HashMap<&str, &str> = state
-        .interfaces
+    let nics = gather_ethernet_nics()?;
+    let macs: HashMap<&str, &str> = nics
         .iter()
-        .filter(|i| i.iface_type() == InterfaceType::Ethernet)
-        .filter_map(|i| {
-            i.base_iface()
-                .permanent_mac_address
+        .filter_map(|nic| {
+            nic.permanent_mac_address
                 .as_deref()
-                .or_else(|| i.base_iface().mac_address.as_deref())
-                .map(|m| (i.name(), m))
+                .or(nic.mac_address.as_deref())
+                .map(|m| (nic.name.as_str(), m))
         })
         .collect();
 
@@ -272,39 +324,53 @@ pub(crate) fn clean_up(
         log::info!("Host uses initrd networking");
     }
 
-    for (iface_name, file_path) in pinned_ifaces {
-        if !is_nmstate_generated_systemd_link_file(&file_path) {
-            log::info!(
-                "File {} is not generated by nmstate, ignoring",
-                file_path.display()
-            );
-            continue;
-        }
-        let systemd_iface_name =
-            match get_systemd_preferred_iface_name(root, &iface_name) {
-                Ok(i) => i,
-                Err(e) => {
-                    log::error!(
-                        "Failed to retrieve systemd preferred \
-                        iface name for {iface_name}: {e}"
-                    );
-                    continue;
-                }
-            };
+    let pinned_ifaces: Vec<(String, PathBuf)> = pinned_ifaces
+        .into_iter()
+        .filter(|(_, file_path)| {
+            if is_nmstate_generated_systemd_link_file(file_path) {
+                true
+            } else {
+                log::info!(
+                    "File {} is not generated by nmstate, ignoring",
+                    file_path.display()
+                );
+                false
+            }
+        })
+        .collect();
+    let iface_names: Vec<&str> =
+        pinned_ifaces.iter().map(|(n, _)| n.as_str()).collect();
+    let systemd_iface_names =
+        get_systemd_preferred_iface_names(root, iface_names.as_slice());
+
+    for ((iface_name, file_path), systemd_iface_name) in
+        pinned_ifaces.iter().zip(systemd_iface_names)
+    {
+        let iface_name = iface_name.as_str();
+        let systemd_iface_name = match systemd_iface_name {
+            Ok(i) => i,
+            Err(e) => {
+                log::error!(
+                    "Failed to retrieve systemd preferred \
+                    iface name for {iface_name}: {e}"
+                );
+                continue;
+            }
+        };
         if systemd_iface_name == iface_name {
             log::info!("Interface name {iface_name} is unchanged");
-            let mac = match macs.get(iface_name.as_str()) {
+            let mac = match macs.get(iface_name) {
                 Some(mac) => mac,
                 None => {
                     log::error!("Interface {iface_name} has no MAC address");
                     continue;
                 }
             };
-            let karg = format_ifname_karg(&iface_name, mac);
+            let karg = format_ifname_karg(iface_name, mac);
             log::info!("Will remove generated file {}", file_path.display());
 
             if !dry_run {
-                std::fs::remove_file(&file_path)?;
+                std::fs::remove_file(file_path)?;
                 log::info!(
                     "Removed systemd network link file {}",
                     file_path.display()
@@ -338,12 +404,110 @@ fn format_ifname_karg(ifname: &str, mac: &str) -> String {
     format!("ifname={ifname}:{mac}")
 }
 
+// Resolve systemd preferred interface names in the same order of
+// `iface_names`.
+// When running against live root, the `ID_NET_NAME_*` properties are read
+// from udev database without spawning any process. Interfaces not found in
+// udev database (or all of them when using other root) fallback to
+// `udevadm test-builtin net_id` executed concurrently.
+fn get_systemd_preferred_iface_names(
+    root: &str,
+    iface_names: &[&str],
+) -> Vec<Result<String, CliError>> {
+    let mut ret: Vec<Option<Result<String, CliError>>> = iface_names
+        .iter()
+        .map(|iface_name| {
+            if root == "/" {
+                get_udev_db_preferred_iface_name(iface_name).map(Ok)
+            } else {
+                None
+            }
+        })
+        .collect();
+
+    let pending: Vec<usize> = ret
+        .iter()
+        .enumerate()
+        .filter_map(|(i, r)| if r.is_none() { Some(i) } else { None })
+        .collect();
+    let concurrency = std::thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(1);
+    for chunk in pending.chunks(concurrency) {
+        std::thread::scope(|s| {
+            let handles: Vec<_> = chunk
+                .iter()
+                .map(|i| {
+                    let iface_name = iface_names[*i];
+                    (
+                        *i,
+                        s.spawn(move || {
+                            get_systemd_preferred_iface_name(root, iface_name)
+                        }),
+                    )
+                })
+                .collect();
+            for (i, handle) in handles {
+                ret[i] = Some(handle.join().unwrap_or_else(|_| {
+                    Err(CliError::from("Thread running udevadm panicked"))
+                }));
+            }
+        });
+    }
+
+    ret.into_iter()
+        .map(|r| {
+            r.unwrap_or_else(|| {
+                Err(CliError::from("BUG: udev lookup result missing"))
+            })
+        })
+        .collect()
+}
+
+// The udev database file is named as `n<ifindex>` for network interfaces,
+// and holds properties in the format of `E:KEY=VALUE`.
+fn get_udev_db_preferred_iface_name(iface_name: &str) -> Option<String> {
+    let ifindex =
+        std::fs::read_to_string(format!("/sys/class/net/{iface_name}/ifindex"))
+            .ok()?;
+    let content = std::fs::read_to_string(
+        Path::new(UDEV_DATA_FOLDER).join(format!("n{}", ifindex.trim())),
+    )
+    .ok()?;
+    let name = select_systemd_preferred_name(
+        content
+            .lines()
+            .filter_map(|l| l.strip_prefix("E:"))
+            .filter_map(|l| l.split_once('=')),
+    );
+    if let Some(name) = name.as_ref() {
+        log::debug!(
+            "Found systemd preferred name {name} of interface \
+            {iface_name} in udev database"
+        );
+    }
+    name
+}
+
 // With `NamePolicy=keep kernel database onboard slot path` in systemd configure
 // in RHEL 8 and 9. Assuming `keep, kernel and database` all return NULL,
 // systemd will use interface name in the order of:
 //  * `ID_NET_NAME_ONBOARD`
 //  * `ID_NET_NAME_SLOT`
 //  * `ID_NET_NAME_PATH`
+fn select_systemd_preferred_name<'a>(
+    props: impl Iterator<Item = (&'a str, &'a str)> + Clone,
+) -> Option<String> {
+    for key in [ID_NET_NAME_ONBOARD, ID_NET_NAME_SLOT, ID_NET_NAME_PATH] {
+        for (k, v) in props.clone() {
+            if k == key {
+                return Some(v.to_string());
+            }
+        }
+    }
+    None
+}
+
 pub(crate) fn get_systemd_preferred_iface_name(
     root: &str,
     iface_name: &str,
@@ -370,21 +534,10 @@ pub(crate) fn get_systemd_preferred_iface_name(
         CliError::from(format!("Failed to parse udevadm reply to UTF-8: {e}"))
     })?;
 
-    let lines = output.lines().filter_map(|l| l.split_once('='));
-    for (k, v) in lines.clone() {
-        if k == ID_NET_NAME_ONBOARD {
-            return Ok(v.to_string());
-        }
-    }
-    for (k, v) in lines.clone() {
-        if k == ID_NET_NAME_SLOT {
-            return Ok(v.to_string());
-        }
-    }
-    for (k, v) in lines.clone() {
-        if k == ID_NET_NAME_PATH {
-            return Ok(v.to_string());
-        }
+    if let Some(name) = select_systemd_preferred_name(
+        output.lines().filter_map(|l| l.split_once('=')),
+    ) {
+        return Ok(name);
     }
 
     Err(format!(
@@ -465,48 +618,3 @@ fn has_any_kargs(kargs: &[&str]) -> bool {
         .map(|c| c.split(' ').any(|x| kargs.contains(&x)))
         .unwrap_or_default()
 }
-
-// Preference order on MAC address of bond port:
-// 1. Permanent MAC address
-// 2. MAC address stored in `IFLA_BOND_PORT_PERM_HWADDR`
-fn get_bond_port_mac(iface: &Interface) -> Option<String> {
-    if let Some(mac) = iface.base_iface().permanent_mac_address.as_deref() {
-        return Some(mac.to_string());
-    }
-
-    let mut filter = nispor::NetStateFilter::minimum();
-    let mut iface_filter = nispor::NetStateIfaceFilter::minimum();
-    iface_filter.iface_name = Some(iface.name().to_string());
-    filter.iface = Some(iface_filter);
-    match nispor::NetState::retrieve_with_filter(&filter) {
-        Ok(np_state) => {
-            if let Some(mac) = np_state
-                .ifaces
-                .get(iface.name())
-                .and_then(|i| i.bond_subordinate.as_ref())
-                .and_then(|b| {
-                    if b.perm_hwaddr.is_empty() {
-                        None
-                    } else {
-                        Some(b.perm_hwaddr.clone())
-                    }
-                })
-            {
-                log::info!(
-                    "Using MAC address stored in bond port: {mac} \
-                    for interface {}",
-                    iface.name()
-                );
-                return Some(mac);
-            }
-        }
-        Err(e) => {
-            log::error!(
-                "Failed to retrieve netlink state for bond port {}: {e}",
-                iface.name()
-            );
-        }
-    }
-
-    None
-}
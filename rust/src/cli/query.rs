@@ -1,34 +1,36 @@
 // SPDX-License-Identifier: Apache-2.0
 
+use std::io::Write;
+
 use nmstate::{
-    DnsState, HostNameState, NetworkState, OvnConfiguration, OvsDbGlobalConfig,
-    RouteRules, Routes,
+    DnsState, HostNameState, Interface, NetworkState, NetworkStateMonitor,
+    NmstateTimings, OvnConfiguration, OvsDbGlobalConfig, RouteRules, Routes,
 };
 use serde::Serialize;
-use serde_yaml::Value;
 
-use crate::error::CliError;
+use crate::{error::CliError, state::value_from_file};
 
+// Borrowing view of NetworkState with interfaces sorted by name. The `name`
+// and `type` of each interface are serialized first by `BaseInterface`
+// itself, so no intermediate YAML tree is required.
 #[derive(Clone, Debug, PartialEq, Eq, Serialize)]
-pub(crate) struct SortedNetworkState {
+pub(crate) struct SortedNetworkState<'a> {
     #[serde(skip_serializing_if = "Option::is_none")]
-    hostname: Option<HostNameState>,
+    hostname: Option<&'a HostNameState>,
     #[serde(rename = "dns-resolver", skip_serializing_if = "Option::is_none")]
-    dns: Option<DnsState>,
-    #[serde(rename = "route-rules", default)]
-    rules: RouteRules,
-    routes: Routes,
-    interfaces: Vec<Value>,
+    dns: Option<&'a DnsState>,
+    #[serde(rename = "route-rules")]
+    rules: &'a RouteRules,
+    routes: &'a Routes,
+    interfaces: Vec<&'a Interface>,
     #[serde(rename = "ovs-db", skip_serializing_if = "Option::is_none")]
-    ovsdb: Option<OvsDbGlobalConfig>,
+    ovsdb: Option<&'a OvsDbGlobalConfig>,
     #[serde(rename = "ovn")]
-    ovn: OvnConfiguration,
-    #[serde(skip_serializing_if = "String::is_empty", default)]
-    description: String,
+    ovn: &'a OvnConfiguration,
+    #[serde(skip_serializing_if = "str::is_empty")]
+    description: &'a str,
 }
 
-const IFACE_TOP_PRIORTIES: [&str; 2] = ["name", "type"];
-
 // Ordering the outputs
 pub(crate) fn show(matches: &clap::ArgMatches) -> Result<String, CliError> {
     let mut net_state = NetworkState::new();
@@ -39,77 +41,111 @@ pub(crate) fn show(matches: &clap::ArgMatches) -> Result<String, CliError> {
         net_state.set_running_config_only(true);
     }
     net_state.set_include_secrets(matches.is_present("SHOW_SECRETS"));
-    net_state.retrieve()?;
-    Ok(if let Some(ifname) = matches.value_of("IFNAME") {
+    if matches.is_present("NO_LLDP_NEIGHBORS") {
+        net_state.set_include_lldp_neighbors(false);
+    }
+    if let Some(netns) = matches.value_of("NETNS") {
+        net_state.set_netns(netns);
+    }
+    if matches.is_present("WATCH") {
+        return watch(&net_state, matches.is_present("JSON"));
+    }
+    if matches.is_present("TIMINGS") {
+        let mut timings = NmstateTimings::new();
+        let result = net_state.retrieve_with_timings(&mut timings);
+        print_timings(&timings)?;
+        result?;
+    } else {
+        net_state.retrieve()?;
+    }
+    if matches.is_present("FINGERPRINT") {
+        let desired = match matches.value_of("FINGERPRINT") {
+            Some(file_path) => Some(value_from_file(file_path)?),
+            None => None,
+        };
+        return Ok(if let Some(ifname) = matches.value_of("IFNAME") {
+            filter_net_state_with_iface(&net_state, ifname)
+                .fingerprint(desired.as_ref())?
+        } else {
+            net_state.fingerprint(desired.as_ref())?
+        });
+    }
+    if let Some(ifname) = matches.value_of("IFNAME") {
         let mut new_net_state = filter_net_state_with_iface(&net_state, ifname);
         new_net_state.set_kernel_only(matches.is_present("KERNEL"));
-        if matches.is_present("JSON") {
-            serde_json::to_string_pretty(&new_net_state)?
+        write_state(&new_net_state, matches.is_present("JSON"))
+    } else {
+        write_state(&sort_netstate(&net_state), matches.is_present("JSON"))
+    }
+}
+
+// Serialize straight into stdout instead of holding another copy of the
+// state in a String. The trailing new line is printed by
+// `print_result_and_exit()` for the returned empty string.
+fn write_state<T>(state: &T, use_json: bool) -> Result<String, CliError>
+where
+    T: Serialize,
+{
+    let mut stdout = std::io::BufWriter::new(std::io::stdout().lock());
+    if use_json {
+        serde_json::to_writer_pretty(&mut stdout, state)?;
+    } else {
+        serde_yaml::to_writer(&mut stdout, state)?;
+    }
+    stdout.flush()?;
+    Ok(String::new())
+}
+
+// The stdout is reserved for the network state, hence print timings to
+// stderr.
+pub(crate) fn print_timings(timings: &NmstateTimings) -> Result<(), CliError> {
+    eprint!("{}", serde_yaml::to_string(timings)?);
+    Ok(())
+}
+
+// Print current network state, then print each list of changes as a new
+// YAML document(or JSON line) until interrupted or failed.
+fn watch(template: &NetworkState, use_json: bool) -> Result<String, CliError> {
+    let mut monitor = NetworkStateMonitor::new(template)?;
+    let mut stdout = std::io::stdout();
+    let cur_state = sort_netstate(monitor.current());
+    if use_json {
+        serde_json::to_writer(&mut stdout, &cur_state)?;
+        writeln!(stdout)?;
+    } else {
+        serde_yaml::to_writer(&mut stdout, &cur_state)?;
+    }
+    stdout.flush()?;
+    loop {
+        let changes = monitor.next_changes(None)?;
+        if changes.is_empty() {
+            continue;
+        }
+        if use_json {
+            writeln!(stdout, "{}", serde_json::to_string(&changes)?)?;
         } else {
-            serde_yaml::to_string(&new_net_state)?
+            write!(stdout, "---\n{}", serde_yaml::to_string(&changes)?)?;
         }
-    } else if matches.is_present("JSON") {
-        serde_json::to_string_pretty(&sort_netstate(net_state)?)?
-    } else {
-        serde_yaml::to_string(&sort_netstate(net_state)?)?
-    })
+        stdout.flush()?;
+    }
 }
 
 pub(crate) fn sort_netstate(
-    net_state: NetworkState,
-) -> Result<SortedNetworkState, CliError> {
+    net_state: &NetworkState,
+) -> SortedNetworkState<'_> {
     let mut ifaces = net_state.interfaces.to_vec();
     ifaces.sort_by(|a, b| a.name().cmp(b.name()));
 
-    if let Value::Sequence(ifaces) = serde_yaml::to_value(&ifaces)? {
-        let mut new_ifaces = Vec::new();
-        for iface_v in ifaces {
-            if let Value::Mapping(iface) = iface_v {
-                let mut new_iface = serde_yaml::Mapping::new();
-                for top_property in &IFACE_TOP_PRIORTIES {
-                    if let Some(v) =
-                        iface.get(Value::String(top_property.to_string()))
-                    {
-                        new_iface.insert(
-                            Value::String(top_property.to_string()),
-                            v.clone(),
-                        );
-                    }
-                }
-                for (k, v) in iface.iter() {
-                    if let Value::String(ref name) = k {
-                        if IFACE_TOP_PRIORTIES.contains(&name.as_str()) {
-                            continue;
-                        }
-                    }
-                    new_iface.insert(k.clone(), v.clone());
-                }
-
-                new_ifaces.push(Value::Mapping(new_iface));
-            }
-        }
-        return Ok(SortedNetworkState {
-            hostname: net_state.hostname,
-            interfaces: new_ifaces,
-            routes: net_state.routes,
-            rules: net_state.rules,
-            dns: net_state.dns,
-            ovsdb: net_state.ovsdb,
-            ovn: net_state.ovn,
-            description: net_state.description,
-        });
+    SortedNetworkState {
+        hostname: net_state.hostname.as_ref(),
+        interfaces: ifaces,
+        routes: &net_state.routes,
+        rules: &net_state.rules,
+        dns: net_state.dns.as_ref(),
+        ovsdb: net_state.ovsdb.as_ref(),
+        ovn: &net_state.ovn,
+        description: &net_state.description,
     }
-
-    Ok(SortedNetworkState {
-        hostname: net_state.hostname,
-        interfaces: Vec::new(),
-        routes: net_state.routes,
-        rules: net_state.rules,
-        dns: net_state.dns,
-        ovsdb: net_state.ovsdb,
-        ovn: net_state.ovn,
-        description: net_state.description,
-    })
 }
 
 fn filter_net_state_with_iface(
@@ -1,21 +1,140 @@
 // SPDX-License-Identifier: Apache-2.0
 
-use nmstate::NetworkState;
+use std::collections::HashMap;
 use std::io::Read;
 
+use nmstate::{from_json_or_yaml_str, NetworkPolicy, NetworkState};
+use serde::de::{
+    DeserializeOwned, Deserializer, IgnoredAny, MapAccess, Visitor,
+};
+
 use crate::error::CliError;
 
+// Top level keys only found in NetworkPolicy
+const POLICY_TOP_KEYS: [&str; 3] = ["capture", "desired", "desiredState"];
+
 pub(crate) fn state_from_file(
     file_path: &str,
 ) -> Result<NetworkState, CliError> {
+    deserialize_file(file_path)
+}
+
+// Raw document without default values of NetworkState filled
+pub(crate) fn value_from_file(
+    file_path: &str,
+) -> Result<serde_json::Value, CliError> {
+    deserialize_file(file_path)
+}
+
+fn deserialize_file<T>(file_path: &str) -> Result<T, CliError>
+where
+    T: DeserializeOwned,
+{
+    let content = if file_path == "-" {
+        read_content(&mut std::io::stdin())?
+    } else {
+        read_content(&mut std::fs::File::open(file_path)?)?
+    };
+    Ok(from_json_or_yaml_str(&content)?)
+}
+
+pub(crate) fn read_content<R>(reader: &mut R) -> Result<String, CliError>
+where
+    R: Read,
+{
     let mut content = String::new();
-    if file_path == "-" {
-        std::io::stdin().read_to_string(&mut content)?;
+    reader.read_to_string(&mut content)?;
+    // Replace non-breaking space '\u{A0}'  to normal space, only copy the
+    // content when found.
+    if content.contains('\u{A0}') {
+        content = content.replace('\u{A0}', " ");
+    }
+    Ok(content)
+}
+
+// Parse the content as NetworkState or NetworkPolicy in single pass by
+// checking the top level keys first.
+pub(crate) fn state_or_policy_from_content(
+    content: &str,
+) -> Result<NetworkState, CliError> {
+    let result = if is_network_policy(content) {
+        from_json_or_yaml_str::<NetworkPolicy>(content)
+            .and_then(NetworkState::try_from)
     } else {
-        std::fs::File::open(file_path)?.read_to_string(&mut content)?;
+        from_json_or_yaml_str::<NetworkState>(content)
     };
-    // Replace non-breaking space '\u{A0}'  to normal space
-    let content = content.replace('\u{A0}', " ");
+    result.map_err(|e| {
+        CliError::from(format!(
+            "Provide file is not valid NetworkState or NetworkPolicy: {}",
+            e.msg()
+        ))
+    })
+}
+
+fn is_json(content: &str) -> bool {
+    content.trim_start().starts_with('{')
+}
+
+fn is_network_policy(content: &str) -> bool {
+    if is_json(content) {
+        let mut found = false;
+        // Error is expected when stopped before the end of top level map.
+        let result = serde_json::Deserializer::from_str(content)
+            .deserialize_map(PolicyKeyVisitor(&mut found));
+        match result {
+            // YAML flow mapping like `{capture: {}, desired: {}}`
+            Err(e) if !found && e.is_syntax() => {
+                is_yaml_flow_network_policy(content)
+            }
+            _ => found,
+        }
+    } else {
+        // Top level keys of YAML block mapping have no indentation, block
+        // scalars and nested keys are always indented.
+        content.lines().any(|line| {
+            if line.starts_with(char::is_whitespace) {
+                return false;
+            }
+            match line.split_once(':') {
+                Some((key, _)) => POLICY_TOP_KEYS
+                    .contains(&key.trim_end().trim_matches(['"', '\''])),
+                None => false,
+            }
+        })
+    }
+}
+
+fn is_yaml_flow_network_policy(content: &str) -> bool {
+    serde_yaml::from_str::<HashMap<String, IgnoredAny>>(content)
+        .map(|keys| keys.keys().any(|k| POLICY_TOP_KEYS.contains(&k.as_str())))
+        .unwrap_or_default()
+}
+
+// Stop at the first top level key only found in NetworkPolicy, values of
+// other keys are skipped without being stored.
+struct PolicyKeyVisitor<'a>(&'a mut bool);
+
+impl<'de> Visitor<'de> for PolicyKeyVisitor<'_> {
+    type Value = ();
+
+    fn expecting(
+        &self,
+        formatter: &mut std::fmt::Formatter,
+    ) -> std::fmt::Result {
+        formatter.write_str("a map")
+    }
 
-    Ok(NetworkState::new_from_yaml(&content)?)
+    fn visit_map<A>(self, mut map: A) -> Result<(), A::Error>
+    where
+        A: MapAccess<'de>,
+    {
+        while let Some(key) = map.next_key::<String>()? {
+            if POLICY_TOP_KEYS.contains(&key.as_str()) {
+                *self.0 = true;
+                return Ok(());
+            }
+            map.next_value::<IgnoredAny>()?;
+        }
+        Ok(())
+    }
 }
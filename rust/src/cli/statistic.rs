@@ -1,14 +1,25 @@
 // SPDX-License-Identifier: Apache-2.0
 
-use std::io::Read;
+use std::collections::BTreeMap;
+use std::io::Write;
+use std::path::{Path, PathBuf};
+use std::sync::Mutex;
 
-use nmstate::NetworkState;
+use nmstate::{NetworkState, NmstateFeature, NmstateStatistic};
+use serde::Serialize;
 
-use crate::error::CliError;
+use crate::{error::CliError, state::state_from_file};
+
+// Number of state files allowed to be in flight(processing or waiting to be
+// printed) per worker.
+const BATCH_WINDOW_SIZE_PER_WORKER: usize = 4;
 
 pub(crate) fn statistic(
     matches: &clap::ArgMatches,
 ) -> Result<String, crate::error::CliError> {
+    if matches.is_present("BATCH") {
+        return statistic_batch(matches);
+    }
     let mut desired_state = NetworkState::default();
     if let Some(file_paths) = matches.values_of("STATE_FILE") {
         let file_paths: Vec<&str> = file_paths.collect();
@@ -18,15 +29,7 @@ pub(crate) fn statistic(
     } else {
         desired_state = state_from_file("-")?;
     }
-    let current_state =
-        if let Some(cur_state_file) = matches.value_of("CURRENT_STATE") {
-            state_from_file(cur_state_file)?
-        } else {
-            let mut net_state = NetworkState::new();
-            net_state.set_running_config_only(true);
-            net_state.retrieve()?;
-            net_state
-        };
+    let current_state = current_state(matches)?;
 
     let statistic = desired_state.statistic(&current_state)?;
 
@@ -37,15 +40,177 @@ pub(crate) fn statistic(
     })
 }
 
-fn state_from_file(file_path: &str) -> Result<NetworkState, CliError> {
-    let mut content = String::new();
-    if file_path == "-" {
-        std::io::stdin().read_to_string(&mut content)?;
+fn current_state(matches: &clap::ArgMatches) -> Result<NetworkState, CliError> {
+    if let Some(cur_state_file) = matches.value_of("CURRENT_STATE") {
+        state_from_file(cur_state_file)
     } else {
-        std::fs::File::open(file_path)?.read_to_string(&mut content)?;
-    };
-    // Replace non-breaking space '\u{A0}'  to normal space
-    let content = content.replace('\u{A0}', " ");
+        let mut net_state = NetworkState::new();
+        net_state.set_running_config_only(true);
+        net_state.retrieve()?;
+        Ok(net_state)
+    }
+}
+
+#[derive(Debug, Serialize)]
+#[serde(rename_all = "kebab-case")]
+enum BatchStatisticResult {
+    Statistic(NmstateStatistic),
+    Error(String),
+}
+
+#[derive(Debug, Serialize)]
+struct BatchStatisticLine<'a> {
+    file: &'a str,
+    #[serde(flatten)]
+    result: &'a BatchStatisticResult,
+}
 
-    Ok(NetworkState::new_from_yaml(&content)?)
+#[derive(Debug, Default, Serialize)]
+struct BatchStatisticSummary {
+    total: usize,
+    failed: usize,
+    features: BTreeMap<NmstateFeature, usize>,
+    topology: BTreeMap<String, usize>,
+}
+
+impl BatchStatisticSummary {
+    fn add(&mut self, result: &BatchStatisticResult) {
+        self.total += 1;
+        match result {
+            BatchStatisticResult::Statistic(stat) => {
+                for feature in &stat.features {
+                    *self.features.entry(*feature).or_default() += 1;
+                }
+                for topo in &stat.topology {
+                    *self.topology.entry(topo.to_string()).or_default() += 1;
+                }
+            }
+            BatchStatisticResult::Error(_) => {
+                self.failed += 1;
+            }
+        }
+    }
+}
+
+// Generate statistic for each state file individually using all CPUs.
+// Each result is printed as a JSON line in the order of input files once
+// generated. A file is only handed to workers once it is within a fixed
+// window after the next file to print, so a slow file cannot make finished
+// results pile up. The feature and topology usage counts of all the states
+// are returned as final JSON line.
+fn statistic_batch(matches: &clap::ArgMatches) -> Result<String, CliError> {
+    let mut files: Vec<String> = Vec::new();
+    if let Some(file_paths) = matches.values_of("STATE_FILE") {
+        for file_path in file_paths {
+            collect_state_files(Path::new(file_path), &mut files)?;
+        }
+    } else {
+        files.push("-".to_string());
+    }
+    let current = current_state(matches)?;
+
+    let worker_count = std::thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(1)
+        .min(files.len())
+        .max(1);
+    let window = worker_count * BATCH_WINDOW_SIZE_PER_WORKER;
+    let (job_sender, job_receiver) = std::sync::mpsc::channel::<usize>();
+    let job_receiver = Mutex::new(job_receiver);
+    let (sender, receiver) =
+        std::sync::mpsc::sync_channel::<(usize, BatchStatisticResult)>(window);
+    let mut summary = BatchStatisticSummary::default();
+
+    std::thread::scope(|scope| -> Result<(), CliError> {
+        // Moved into this closure, so workers are notified to quit on
+        // failure of printing before the scope waits for them.
+        let job_sender = job_sender;
+        let receiver = receiver;
+        for _ in 0..worker_count {
+            let sender = sender.clone();
+            let job_receiver = &job_receiver;
+            let files = &files;
+            let current = &current;
+            scope.spawn(move || loop {
+                let index = match job_receiver
+                    .lock()
+                    .ok()
+                    .and_then(|jobs| jobs.recv().ok())
+                {
+                    Some(i) => i,
+                    None => break,
+                };
+                let file = files[index].as_str();
+                let result = match state_from_file(file).and_then(|state| {
+                    state.statistic(current).map_err(CliError::from)
+                }) {
+                    Ok(stat) => BatchStatisticResult::Statistic(stat),
+                    Err(e) => BatchStatisticResult::Error(e.error_msg),
+                };
+                if sender.send((index, result)).is_err() {
+                    break;
+                }
+            });
+        }
+        drop(sender);
+        for index in 0..window.min(files.len()) {
+            job_sender.send(index).ok();
+        }
+
+        let mut stdout = std::io::BufWriter::new(std::io::stdout().lock());
+        // Results finished ahead of the ones before them, at most `window`
+        let mut pending: BTreeMap<usize, BatchStatisticResult> =
+            BTreeMap::new();
+        let mut next_output = 0;
+        while next_output < files.len() {
+            let (index, result) = receiver.recv().map_err(|_| {
+                CliError::from("Batch statistic worker quit unexpectedly")
+            })?;
+            pending.insert(index, result);
+            while let Some(result) = pending.remove(&next_output) {
+                summary.add(&result);
+                let line = BatchStatisticLine {
+                    file: files[next_output].as_str(),
+                    result: &result,
+                };
+                writeln!(stdout, "{}", serde_json::to_string(&line)?)?;
+                if next_output + window < files.len() {
+                    job_sender.send(next_output + window).ok();
+                }
+                next_output += 1;
+            }
+        }
+        stdout.flush()?;
+        Ok(())
+    })?;
+
+    Ok(serde_json::to_string(&serde_json::json!({
+        "summary": summary
+    }))?)
+}
+
+// Folders are searched recursively for YAML or JSON files.
+fn collect_state_files(
+    path: &Path,
+    files: &mut Vec<String>,
+) -> Result<(), CliError> {
+    if !path.is_dir() {
+        files.push(path.display().to_string());
+        return Ok(());
+    }
+    let mut entries: Vec<PathBuf> = std::fs::read_dir(path)?
+        .filter_map(|entry| entry.ok().map(|e| e.path()))
+        .collect();
+    entries.sort_unstable();
+    for entry in entries {
+        if entry.is_dir() {
+            collect_state_files(&entry, files)?;
+        } else if matches!(
+            entry.extension().and_then(|e| e.to_str()),
+            Some("yml" | "yaml" | "json")
+        ) {
+            files.push(entry.display().to_string());
+        }
+    }
+    Ok(())
 }
@@ -4,6 +4,7 @@ use std::ffi::CString;
 use std::time::SystemTime;
 
 use libc::{c_char, c_int};
+use nmstate::{NetworkState, NmstateTimings};
 
 use crate::{
     init_logger,
@@ -24,6 +25,50 @@ pub extern "C" fn nmstate_net_state_apply(
     log: *mut *mut c_char,
     err_kind: *mut *mut c_char,
     err_msg: *mut *mut c_char,
+) -> c_int {
+    net_state_apply(
+        flags,
+        state,
+        rollback_timeout,
+        std::ptr::null_mut(),
+        log,
+        err_kind,
+        err_msg,
+    )
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_apply_with_timings(
+    flags: u32,
+    state: *const c_char,
+    rollback_timeout: u32,
+    timings: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!timings.is_null());
+    net_state_apply(
+        flags,
+        state,
+        rollback_timeout,
+        timings,
+        log,
+        err_kind,
+        err_msg,
+    )
+}
+
+// The `timings` is ignored when it is null pointer.
+fn net_state_apply(
+    flags: u32,
+    state: *const c_char,
+    rollback_timeout: u32,
+    timings: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
 ) -> c_int {
     assert!(!log.is_null());
     assert!(!err_kind.is_null());
@@ -33,12 +78,22 @@ pub extern "C" fn nmstate_net_state_apply(
         *log = std::ptr::null_mut();
         *err_kind = std::ptr::null_mut();
         *err_msg = std::ptr::null_mut();
+        if !timings.is_null() {
+            *timings = std::ptr::null_mut();
+        }
     }
 
     if state.is_null() {
         return NMSTATE_PASS;
     }
 
+    let mut net_state = match c_str_to_net_state(state, err_kind, err_msg) {
+        Ok(s) => s,
+        Err(rc) => {
+            return rc;
+        }
+    };
+
     let logger = match init_logger() {
         Ok(l) => l,
         Err(e) => {
@@ -52,13 +107,37 @@ pub extern "C" fn nmstate_net_state_apply(
     };
     let now = SystemTime::now();
 
-    let mut net_state = match c_str_to_net_state(state, err_kind, err_msg) {
-        Ok(s) => s,
-        Err(rc) => {
-            return rc;
-        }
+    set_apply_flags(&mut net_state, flags, rollback_timeout);
+
+    let result = if timings.is_null() {
+        net_state.apply()
+    } else {
+        let mut apply_timings = NmstateTimings::new();
+        let result = net_state.apply_with_timings(&mut apply_timings);
+        store_timings(&apply_timings, timings);
+        result
     };
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    if let Err(e) = result {
+        unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind =
+                CString::new(format!("{}", &e.kind())).unwrap().into_raw();
+        }
+        NMSTATE_FAIL
+    } else {
+        NMSTATE_PASS
+    }
+}
 
+pub(crate) fn set_apply_flags(
+    net_state: &mut NetworkState,
+    flags: u32,
+    rollback_timeout: u32,
+) {
     if (flags & NMSTATE_FLAG_KERNEL_ONLY) > 0 {
         net_state.set_kernel_only(true);
     }
@@ -76,20 +155,20 @@ pub extern "C" fn nmstate_net_state_apply(
     }
 
     net_state.set_timeout(rollback_timeout);
+}
 
-    let result = net_state.apply();
-    unsafe {
-        *log = CString::new(logger.drain(now)).unwrap().into_raw();
-    }
-
-    if let Err(e) = result {
-        unsafe {
-            *err_msg = CString::new(e.msg()).unwrap().into_raw();
-            *err_kind =
-                CString::new(format!("{}", &e.kind())).unwrap().into_raw();
+// Timings are stored regardless the result of apply or retrieve, failure on
+// serializing timings is only logged.
+pub(crate) fn store_timings(
+    net_timings: &NmstateTimings,
+    timings: *mut *mut c_char,
+) {
+    match serde_json::to_string(net_timings) {
+        Ok(s) => unsafe {
+            *timings = CString::new(s).unwrap().into_raw();
+        },
+        Err(e) => {
+            log::error!("Failed to convert timings to JSON: {e}");
         }
-        NMSTATE_FAIL
-    } else {
-        NMSTATE_PASS
     }
 }
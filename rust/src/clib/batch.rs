@@ -0,0 +1,66 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::ffi::CStr;
+
+use libc::c_char;
+use nmstate::{ErrorKind, NmstateError};
+use serde::Serialize;
+
+// Error of single item in batch operation, the batch itself still succeeded.
+#[derive(Debug, Serialize)]
+pub(crate) struct BatchError {
+    kind: String,
+    msg: String,
+}
+
+impl From<NmstateError> for BatchError {
+    fn from(e: NmstateError) -> Self {
+        Self {
+            kind: e.kind().to_string(),
+            msg: e.msg().to_string(),
+        }
+    }
+}
+
+// Parse C string holding a JSON or YAML array.
+pub(crate) fn c_str_to_yaml_values(
+    input: *const c_char,
+) -> Result<Vec<serde_yaml::Value>, NmstateError> {
+    let input_str = unsafe { CStr::from_ptr(input) }.to_str().map_err(|e| {
+        NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!("Error on converting C char to rust str: {e}"),
+        )
+    })?;
+    // YAML is superset of JSON, hence serde_yaml can handle both.
+    serde_yaml::from_str(input_str).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!("Expecting a list of network states: {e}"),
+        )
+    })
+}
+
+pub(crate) fn serialize_batch<T>(
+    entries: &T,
+    use_json: bool,
+) -> Result<String, NmstateError>
+where
+    T: Serialize + ?Sized,
+{
+    if use_json {
+        serde_json::to_string(entries).map_err(|e| {
+            NmstateError::new(
+                ErrorKind::Bug,
+                format!("Failed to convert batch result to JSON: {e}"),
+            )
+        })
+    } else {
+        serde_yaml::to_string(entries).map_err(|e| {
+            NmstateError::new(
+                ErrorKind::Bug,
+                format!("Failed to convert batch result to YAML: {e}"),
+            )
+        })
+    }
+}
@@ -0,0 +1,204 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::ffi::CString;
+use std::time::{Duration, SystemTime};
+
+use libc::{c_char, c_int, c_void};
+use nmstate::{NetworkStateCache, NmstateError};
+
+use crate::{
+    apply::set_apply_flags,
+    batch::serialize_batch,
+    init_logger,
+    query::{net_state_from_flags, NMSTATE_FLAG_YAML_OUTPUT},
+    state::c_str_to_net_state,
+    NMSTATE_FAIL, NMSTATE_PASS,
+};
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_cache_new(
+    max_age_ms: u32,
+    cache: *mut *mut c_void,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!cache.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *cache = std::ptr::null_mut();
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let result = NetworkStateCache::new().map(|mut c| {
+        c.set_max_age(Duration::from_millis(max_age_ms.into()));
+        c
+    });
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    match result {
+        Ok(c) => unsafe {
+            *cache = Box::into_raw(Box::new(c)) as *mut c_void;
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_cache_retrieve(
+    cache: *mut c_void,
+    flags: u32,
+    state: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!cache.is_null());
+    assert!(!state.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *state = std::ptr::null_mut();
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let cache = unsafe { &mut *(cache as *mut NetworkStateCache) };
+    let result: Result<String, NmstateError> =
+        cache.retrieve(&net_state_from_flags(flags)).and_then(|s| {
+            serialize_batch(&s, (flags & NMSTATE_FLAG_YAML_OUTPUT) == 0)
+        });
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    match result {
+        Ok(s) => unsafe {
+            *state = CString::new(s).unwrap().into_raw();
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_cache_apply(
+    cache: *mut c_void,
+    flags: u32,
+    state: *const c_char,
+    rollback_timeout: u32,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!cache.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    if state.is_null() {
+        return NMSTATE_PASS;
+    }
+
+    let mut net_state = match c_str_to_net_state(state, err_kind, err_msg) {
+        Ok(s) => s,
+        Err(rc) => {
+            return rc;
+        }
+    };
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    set_apply_flags(&mut net_state, flags, rollback_timeout);
+
+    let cache = unsafe { &mut *(cache as *mut NetworkStateCache) };
+    let result = cache.apply(&net_state);
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    if let Err(e) = result {
+        unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+        }
+        NMSTATE_FAIL
+    } else {
+        NMSTATE_PASS
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_cache_free(cache: *mut c_void) {
+    unsafe {
+        if !cache.is_null() {
+            drop(Box::from_raw(cache as *mut NetworkStateCache));
+        }
+    }
+}
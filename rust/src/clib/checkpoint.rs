@@ -25,19 +25,6 @@ pub extern "C" fn nmstate_checkpoint_commit(
         *err_msg = std::ptr::null_mut();
     }
 
-    let logger = match init_logger() {
-        Ok(l) => l,
-        Err(e) => {
-            unsafe {
-                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
-                    .unwrap()
-                    .into_raw();
-            }
-            return NMSTATE_FAIL;
-        }
-    };
-    let now = SystemTime::now();
-
     let mut checkpoint_str = "";
     if !checkpoint.is_null() {
         let checkpoint_cstr = unsafe { CStr::from_ptr(checkpoint) };
@@ -62,6 +49,19 @@ pub extern "C" fn nmstate_checkpoint_commit(
         }
     }
 
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
     let result = nmstate::NetworkState::checkpoint_commit(checkpoint_str);
     unsafe {
         *log = CString::new(logger.drain(now)).unwrap().into_raw();
@@ -97,19 +97,6 @@ pub extern "C" fn nmstate_checkpoint_rollback(
         *err_msg = std::ptr::null_mut();
     }
 
-    let logger = match init_logger() {
-        Ok(l) => l,
-        Err(e) => {
-            unsafe {
-                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
-                    .unwrap()
-                    .into_raw();
-            }
-            return NMSTATE_FAIL;
-        }
-    };
-    let now = SystemTime::now();
-
     let mut checkpoint_str = "";
     if !checkpoint.is_null() {
         let checkpoint_cstr = unsafe { CStr::from_ptr(checkpoint) };
@@ -134,6 +121,19 @@ pub extern "C" fn nmstate_checkpoint_rollback(
         }
     }
 
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
     // TODO: save log to the output pointer
     let result = nmstate::NetworkState::checkpoint_rollback(checkpoint_str);
     unsafe {
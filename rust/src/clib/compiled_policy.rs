@@ -0,0 +1,211 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::ffi::{CStr, CString};
+use std::time::SystemTime;
+
+use libc::{c_char, c_int, c_void};
+use nmstate::{
+    CompiledPolicy, ErrorKind, NetworkPolicy, NetworkState, NmstateError,
+};
+use serde::Serialize;
+
+use crate::{
+    batch::{c_str_to_yaml_values, serialize_batch, BatchError},
+    init_logger,
+    state::is_state_in_json,
+    NMSTATE_FAIL, NMSTATE_PASS,
+};
+
+#[derive(Debug, Serialize)]
+#[serde(rename_all = "kebab-case")]
+enum PolicyBatchEntry {
+    State(NetworkState),
+    Error(BatchError),
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_compiled_policy_new(
+    policy: *const c_char,
+    compiled_policy: *mut *mut c_void,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!policy.is_null());
+    assert!(!compiled_policy.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *compiled_policy = std::ptr::null_mut();
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let result = c_str_to_compiled_policy(policy);
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    match result {
+        Ok(p) => unsafe {
+            *compiled_policy = Box::into_raw(Box::new(p)) as *mut c_void;
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_compiled_policy_execute(
+    compiled_policy: *const c_void,
+    current_states: *const c_char,
+    states: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!compiled_policy.is_null());
+    assert!(!current_states.is_null());
+    assert!(!states.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *states = std::ptr::null_mut();
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let compiled_policy =
+        unsafe { &*(compiled_policy as *const CompiledPolicy) };
+    let result = c_str_to_yaml_values(current_states)
+        .map(|values| execute_policy(compiled_policy, values))
+        .and_then(|entries| {
+            serialize_batch(&entries, is_state_in_json(current_states))
+        });
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    match result {
+        Ok(s) => unsafe {
+            *states = CString::new(s).unwrap().into_raw();
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_compiled_policy_free(compiled_policy: *mut c_void) {
+    unsafe {
+        if !compiled_policy.is_null() {
+            drop(Box::from_raw(compiled_policy as *mut CompiledPolicy));
+        }
+    }
+}
+
+fn c_str_to_compiled_policy(
+    policy: *const c_char,
+) -> Result<CompiledPolicy, NmstateError> {
+    let policy_str =
+        unsafe { CStr::from_ptr(policy) }.to_str().map_err(|e| {
+            NmstateError::new(
+                ErrorKind::InvalidArgument,
+                format!("Error on converting C char to rust str: {e}"),
+            )
+        })?;
+    let policy: NetworkPolicy =
+        serde_yaml::from_str(policy_str).map_err(|e| {
+            NmstateError::new(ErrorKind::InvalidArgument, e.to_string())
+        })?;
+    CompiledPolicy::new(&policy)
+}
+
+// Invalid current state in the list is reported as error entry in place
+// instead of failing the whole batch.
+fn execute_policy(
+    compiled_policy: &CompiledPolicy,
+    values: Vec<serde_yaml::Value>,
+) -> Vec<PolicyBatchEntry> {
+    let mut entries: Vec<Option<PolicyBatchEntry>> =
+        Vec::with_capacity(values.len());
+    let mut currents = Vec::with_capacity(values.len());
+    for value in values {
+        match serde_yaml::from_value::<NetworkState>(value) {
+            Ok(current) => {
+                entries.push(None);
+                currents.push(current);
+            }
+            Err(e) => {
+                entries.push(Some(PolicyBatchEntry::Error(
+                    NmstateError::new(
+                        ErrorKind::InvalidArgument,
+                        format!("Invalid network state: {e}"),
+                    )
+                    .into(),
+                )));
+            }
+        }
+    }
+
+    let mut results = compiled_policy.execute_many(&currents).into_iter();
+    entries
+        .into_iter()
+        .map(|entry| {
+            entry.unwrap_or_else(|| match results.next() {
+                Some(Ok(state)) => PolicyBatchEntry::State(state),
+                Some(Err(e)) => PolicyBatchEntry::Error(e.into()),
+                None => PolicyBatchEntry::Error(
+                    NmstateError::new(
+                        ErrorKind::Bug,
+                        "Got less results than network states".to_string(),
+                    )
+                    .into(),
+                ),
+            })
+        })
+        .collect()
+}
@@ -1,11 +1,15 @@
 // SPDX-License-Identifier: Apache-2.0
 
+use std::collections::HashMap;
 use std::ffi::CString;
 use std::time::SystemTime;
 
 use libc::{c_char, c_int};
+use nmstate::{ErrorKind, NetworkState, NmstateError};
+use serde::Serialize;
 
 use crate::{
+    batch::{c_str_to_yaml_values, serialize_batch, BatchError},
     init_logger,
     state::{c_str_to_net_state, is_state_in_json},
     NMSTATE_FAIL, NMSTATE_PASS,
@@ -37,6 +41,13 @@ pub extern "C" fn nmstate_generate_configurations(
         return NMSTATE_PASS;
     }
 
+    let net_state = match c_str_to_net_state(state, err_kind, err_msg) {
+        Ok(n) => n,
+        Err(rc) => {
+            return rc;
+        }
+    };
+
     let logger = match init_logger() {
         Ok(l) => l,
         Err(e) => {
@@ -50,13 +61,6 @@ pub extern "C" fn nmstate_generate_configurations(
     };
     let now = SystemTime::now();
 
-    let net_state = match c_str_to_net_state(state, err_kind, err_msg) {
-        Ok(n) => n,
-        Err(rc) => {
-            return rc;
-        }
-    };
-
     let input_is_json = is_state_in_json(state);
     let result = net_state.gen_conf();
     unsafe {
@@ -104,3 +108,114 @@ pub extern "C" fn nmstate_generate_configurations(
         }
     }
 }
+
+#[derive(Debug, Serialize)]
+#[serde(rename_all = "kebab-case")]
+enum GenConfBatchEntry {
+    Configs(HashMap<String, Vec<(String, String)>>),
+    Error(BatchError),
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_generate_configurations_many(
+    states: *const c_char,
+    configs: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!states.is_null());
+    assert!(!configs.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *log = std::ptr::null_mut();
+        *configs = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let result = c_str_to_gen_conf_entries(states);
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    let serialize = result.and_then(|entries| {
+        serialize_batch(&entries, is_state_in_json(states))
+    });
+
+    match serialize {
+        Ok(cfgs) => unsafe {
+            *configs = CString::new(cfgs).unwrap().into_raw();
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+// Invalid network state in the list is reported as error entry in place
+// instead of failing the whole batch.
+fn c_str_to_gen_conf_entries(
+    states: *const c_char,
+) -> Result<Vec<GenConfBatchEntry>, NmstateError> {
+    let values = c_str_to_yaml_values(states)?;
+
+    let mut entries: Vec<Option<GenConfBatchEntry>> =
+        Vec::with_capacity(values.len());
+    let mut net_states = Vec::with_capacity(values.len());
+    for value in values {
+        match serde_yaml::from_value::<NetworkState>(value) {
+            Ok(net_state) => {
+                entries.push(None);
+                net_states.push(net_state);
+            }
+            Err(e) => {
+                entries.push(Some(GenConfBatchEntry::Error(
+                    NmstateError::new(
+                        ErrorKind::InvalidArgument,
+                        format!("Invalid network state: {e}"),
+                    )
+                    .into(),
+                )));
+            }
+        }
+    }
+
+    let mut results = NetworkState::gen_conf_many(&net_states).into_iter();
+    Ok(entries
+        .into_iter()
+        .map(|entry| {
+            entry.unwrap_or_else(|| match results.next() {
+                Some(Ok(confs)) => GenConfBatchEntry::Configs(confs),
+                Some(Err(e)) => GenConfBatchEntry::Error(e.into()),
+                None => GenConfBatchEntry::Error(
+                    NmstateError::new(
+                        ErrorKind::Bug,
+                        "Got less results than network states".to_string(),
+                    )
+                    .into(),
+                ),
+            })
+        })
+        .collect())
+}
@@ -2,8 +2,14 @@
 
 #[cfg(feature = "query_apply")]
 mod apply;
+#[cfg(any(feature = "gen_conf", feature = "query_apply"))]
+mod batch;
+#[cfg(feature = "query_apply")]
+mod cache;
 #[cfg(feature = "query_apply")]
 mod checkpoint;
+#[cfg(feature = "query_apply")]
+mod compiled_policy;
 mod format;
 #[cfg(feature = "gen_conf")]
 mod gen_conf;
@@ -11,6 +17,8 @@ mod gen_conf;
 mod gen_diff;
 mod logger;
 #[cfg(feature = "query_apply")]
+mod monitor;
+#[cfg(feature = "query_apply")]
 mod policy;
 #[cfg(feature = "query_apply")]
 mod query;
@@ -25,17 +33,40 @@ use once_cell::sync::OnceCell;
 use crate::logger::MemoryLogger;
 
 #[cfg(feature = "query_apply")]
-pub use crate::apply::nmstate_net_state_apply;
+pub use crate::apply::{
+    nmstate_net_state_apply, nmstate_net_state_apply_with_timings,
+};
+#[cfg(feature = "query_apply")]
+pub use crate::cache::{
+    nmstate_net_state_cache_apply, nmstate_net_state_cache_free,
+    nmstate_net_state_cache_new, nmstate_net_state_cache_retrieve,
+};
 #[cfg(feature = "query_apply")]
 pub use crate::checkpoint::{
     nmstate_checkpoint_commit, nmstate_checkpoint_rollback,
 };
+#[cfg(feature = "query_apply")]
+pub use crate::compiled_policy::{
+    nmstate_compiled_policy_execute, nmstate_compiled_policy_free,
+    nmstate_compiled_policy_new,
+};
 #[cfg(feature = "gen_conf")]
-pub use crate::gen_conf::nmstate_generate_configurations;
+pub use crate::gen_conf::{
+    nmstate_generate_configurations, nmstate_generate_configurations_many,
+};
+#[cfg(feature = "query_apply")]
+pub use crate::monitor::{
+    nmstate_net_state_monitor_free, nmstate_net_state_monitor_new,
+    nmstate_net_state_monitor_next, nmstate_net_state_watch,
+};
 #[cfg(feature = "query_apply")]
 pub use crate::policy::nmstate_net_state_from_policy;
 #[cfg(feature = "query_apply")]
-pub use crate::query::nmstate_net_state_retrieve;
+pub use crate::query::{
+    nmstate_net_state_fingerprint, nmstate_net_state_retrieve,
+    nmstate_net_state_retrieve_netns_many,
+    nmstate_net_state_retrieve_with_timings,
+};
 
 pub(crate) const NMSTATE_PASS: c_int = 0;
 pub(crate) const NMSTATE_FAIL: c_int = 1;
@@ -54,6 +85,16 @@ pub extern "C" fn nmstate_cstring_free(cstring: *mut c_char) {
     }
 }
 
+// The buffered logs are cleared once all the consumers drained, sustained
+// growth between calls indicates some code path missed the drain.
+#[no_mangle]
+pub extern "C" fn nmstate_log_buffered_count() -> u64 {
+    INSTANCE
+        .get()
+        .map(|l| l.buffered_count() as u64)
+        .unwrap_or_default()
+}
+
 pub(crate) fn init_logger() -> Result<&'static MemoryLogger, NmstateError> {
     match INSTANCE.get() {
         Some(l) => {
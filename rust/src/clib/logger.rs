@@ -110,6 +110,11 @@ impl MemoryLogger {
         self.consumer_count.fetch_add(1, Ordering::SeqCst);
     }
 
+    /// Number of log entries held in buffer.
+    pub(crate) fn buffered_count(&self) -> usize {
+        self.logs.lock().expect("inner lock poisoned").len()
+    }
+
     /// Drain the whole buffered log, only return logs since specified time.
     /// Note that this locks the logger, causing logging to block.
     pub(crate) fn drain(&self, since: SystemTime) -> String {
@@ -0,0 +1,256 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::ffi::CString;
+use std::time::{Duration, SystemTime};
+
+use libc::{c_char, c_int, c_void};
+use nmstate::{
+    NetworkState, NetworkStateChange, NetworkStateMonitor, NmstateError,
+};
+
+use crate::{
+    batch::serialize_batch,
+    init_logger,
+    query::{
+        NMSTATE_FLAG_INCLUDE_SECRETS, NMSTATE_FLAG_KERNEL_ONLY,
+        NMSTATE_FLAG_RUNNING_CONFIG_ONLY, NMSTATE_FLAG_YAML_OUTPUT,
+    },
+    NMSTATE_FAIL, NMSTATE_PASS,
+};
+
+pub type NmstateWatchCallback = extern "C" fn(
+    changes: *const c_char,
+    log: *const c_char,
+    user_data: *mut c_void,
+) -> c_int;
+
+struct ClibMonitor {
+    monitor: NetworkStateMonitor,
+    use_json: bool,
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_monitor_new(
+    flags: u32,
+    monitor: *mut *mut c_void,
+    state: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!monitor.is_null());
+    assert!(!state.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *monitor = std::ptr::null_mut();
+        *state = std::ptr::null_mut();
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let result = new_monitor(flags).and_then(|m| {
+        let state_str = serialize_batch(m.monitor.current(), m.use_json)?;
+        Ok((m, state_str))
+    });
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    match result {
+        Ok((m, state_str)) => unsafe {
+            *monitor = Box::into_raw(Box::new(m)) as *mut c_void;
+            *state = CString::new(state_str).unwrap().into_raw();
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_monitor_next(
+    monitor: *mut c_void,
+    timeout_ms: i32,
+    changes: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!monitor.is_null());
+    assert!(!changes.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *changes = std::ptr::null_mut();
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let monitor = unsafe { &mut *(monitor as *mut ClibMonitor) };
+    let result = next_changes(monitor, timeout_ms);
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    match result {
+        Ok(s) => unsafe {
+            *changes = CString::new(s).unwrap().into_raw();
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_monitor_free(monitor: *mut c_void) {
+    unsafe {
+        if !monitor.is_null() {
+            drop(Box::from_raw(monitor as *mut ClibMonitor));
+        }
+    }
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_watch(
+    flags: u32,
+    callback: NmstateWatchCallback,
+    user_data: *mut c_void,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *log = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let mut monitor: Option<ClibMonitor> = None;
+    loop {
+        let logger = match init_logger() {
+            Ok(l) => l,
+            Err(e) => {
+                unsafe {
+                    *err_msg =
+                        CString::new(format!("Failed to setup logger: {e}"))
+                            .unwrap()
+                            .into_raw();
+                }
+                return NMSTATE_FAIL;
+            }
+        };
+        let now = SystemTime::now();
+
+        // The first callback holds the full state, follow up ones hold the
+        // list of changes.
+        let result = match monitor.as_mut() {
+            Some(m) => next_changes(m, -1),
+            None => new_monitor(flags).and_then(|m| {
+                let state_str =
+                    serialize_batch(m.monitor.current(), m.use_json)?;
+                monitor = Some(m);
+                Ok(state_str)
+            }),
+        };
+        let log_str = logger.drain(now);
+
+        match result {
+            Ok(s) if s.is_empty() => continue,
+            Ok(s) => {
+                let c_changes = CString::new(s).unwrap();
+                let c_log = CString::new(log_str).unwrap();
+                if callback(c_changes.as_ptr(), c_log.as_ptr(), user_data) != 0
+                {
+                    return NMSTATE_PASS;
+                }
+            }
+            Err(e) => unsafe {
+                *log = CString::new(log_str).unwrap().into_raw();
+                *err_msg = CString::new(e.msg()).unwrap().into_raw();
+                *err_kind =
+                    CString::new(e.kind().to_string()).unwrap().into_raw();
+                return NMSTATE_FAIL;
+            },
+        }
+    }
+}
+
+fn new_monitor(flags: u32) -> Result<ClibMonitor, NmstateError> {
+    let mut net_state = NetworkState::new();
+    if (flags & NMSTATE_FLAG_KERNEL_ONLY) > 0 {
+        net_state.set_kernel_only(true);
+    }
+    if (flags & NMSTATE_FLAG_INCLUDE_SECRETS) > 0 {
+        net_state.set_include_secrets(true);
+    }
+    if (flags & NMSTATE_FLAG_RUNNING_CONFIG_ONLY) > 0 {
+        net_state.set_running_config_only(true);
+    }
+    Ok(ClibMonitor {
+        monitor: NetworkStateMonitor::new(&net_state)?,
+        use_json: (flags & NMSTATE_FLAG_YAML_OUTPUT) == 0,
+    })
+}
+
+// Return empty string on timeout
+fn next_changes(
+    monitor: &mut ClibMonitor,
+    timeout_ms: i32,
+) -> Result<String, NmstateError> {
+    let timeout = u64::try_from(timeout_ms).ok().map(Duration::from_millis);
+    let changes: Vec<NetworkStateChange> =
+        monitor.monitor.next_changes(timeout)?;
+    if changes.is_empty() {
+        Ok(String::new())
+    } else {
+        serialize_batch(&changes, monitor.use_json)
+    }
+}
@@ -1,11 +1,20 @@
 // SPDX-License-Identifier: Apache-2.0
 
-use std::ffi::CString;
+use std::collections::BTreeMap;
+use std::ffi::{CStr, CString};
 use std::time::SystemTime;
 
 use libc::{c_char, c_int};
+use nmstate::{ErrorKind, NetworkState, NmstateError, NmstateTimings};
+use serde::Serialize;
 
-use crate::{init_logger, NMSTATE_FAIL, NMSTATE_PASS};
+use crate::{
+    apply::store_timings,
+    batch::{serialize_batch, BatchError},
+    init_logger,
+    state::c_str_to_json_value,
+    NMSTATE_FAIL, NMSTATE_PASS,
+};
 
 pub(crate) const NMSTATE_FLAG_KERNEL_ONLY: u32 = 1 << 1;
 pub(crate) const NMSTATE_FLAG_NO_VERIFY: u32 = 1 << 2;
@@ -15,6 +24,7 @@ pub(crate) const NMSTATE_FLAG_NO_COMMIT: u32 = 1 << 5;
 pub(crate) const NMSTATE_FLAG_MEMORY_ONLY: u32 = 1 << 6;
 pub(crate) const NMSTATE_FLAG_RUNNING_CONFIG_ONLY: u32 = 1 << 7;
 pub(crate) const NMSTATE_FLAG_YAML_OUTPUT: u32 = 1 << 8;
+pub(crate) const NMSTATE_FLAG_NO_LLDP_NEIGHBORS: u32 = 1 << 9;
 
 #[allow(clippy::not_unsafe_ptr_arg_deref)]
 #[no_mangle]
@@ -24,6 +34,39 @@ pub extern "C" fn nmstate_net_state_retrieve(
     log: *mut *mut c_char,
     err_kind: *mut *mut c_char,
     err_msg: *mut *mut c_char,
+) -> c_int {
+    net_state_retrieve(
+        flags,
+        state,
+        std::ptr::null_mut(),
+        log,
+        err_kind,
+        err_msg,
+    )
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_retrieve_with_timings(
+    flags: u32,
+    state: *mut *mut c_char,
+    timings: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!timings.is_null());
+    net_state_retrieve(flags, state, timings, log, err_kind, err_msg)
+}
+
+// The `timings` is ignored when it is null pointer.
+fn net_state_retrieve(
+    flags: u32,
+    state: *mut *mut c_char,
+    timings: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
 ) -> c_int {
     assert!(!state.is_null());
     assert!(!log.is_null());
@@ -35,6 +78,9 @@ pub extern "C" fn nmstate_net_state_retrieve(
         *state = std::ptr::null_mut();
         *err_kind = std::ptr::null_mut();
         *err_msg = std::ptr::null_mut();
+        if !timings.is_null() {
+            *timings = std::ptr::null_mut();
+        }
     }
 
     let logger = match init_logger() {
@@ -50,24 +96,15 @@ pub extern "C" fn nmstate_net_state_retrieve(
     };
     let now = SystemTime::now();
 
-    let mut net_state = nmstate::NetworkState::new();
-    if (flags & NMSTATE_FLAG_KERNEL_ONLY) > 0 {
-        net_state.set_kernel_only(true);
-    }
-
-    if (flags & NMSTATE_FLAG_INCLUDE_STATUS_DATA) > 0 {
-        net_state.set_include_status_data(true);
-    }
-
-    if (flags & NMSTATE_FLAG_INCLUDE_SECRETS) > 0 {
-        net_state.set_include_secrets(true);
-    }
-
-    if (flags & NMSTATE_FLAG_RUNNING_CONFIG_ONLY) > 0 {
-        net_state.set_running_config_only(true);
-    }
-
-    let result = net_state.retrieve();
+    let mut net_state = net_state_from_flags(flags);
+    let result = if timings.is_null() {
+        net_state.retrieve()
+    } else {
+        let mut retrieve_timings = NmstateTimings::new();
+        let result = net_state.retrieve_with_timings(&mut retrieve_timings);
+        store_timings(&retrieve_timings, timings);
+        result
+    };
     unsafe {
         *log = CString::new(logger.drain(now)).unwrap().into_raw();
     }
@@ -114,3 +151,189 @@ pub extern "C" fn nmstate_net_state_retrieve(
         }
     }
 }
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_fingerprint(
+    flags: u32,
+    desired_state: *const c_char,
+    fingerprint: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!fingerprint.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *log = std::ptr::null_mut();
+        *fingerprint = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let desired = if desired_state.is_null() {
+        None
+    } else {
+        match c_str_to_json_value(desired_state, err_kind, err_msg) {
+            Ok(s) => Some(s),
+            Err(rc) => {
+                return rc;
+            }
+        }
+    };
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let mut net_state = net_state_from_flags(flags);
+    let result = net_state
+        .retrieve()
+        .and_then(|s| s.fingerprint(desired.as_ref()));
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    match result {
+        Ok(s) => unsafe {
+            *fingerprint = CString::new(s).unwrap().into_raw();
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+pub(crate) fn net_state_from_flags(flags: u32) -> NetworkState {
+    let mut net_state = NetworkState::new();
+    if (flags & NMSTATE_FLAG_KERNEL_ONLY) > 0 {
+        net_state.set_kernel_only(true);
+    }
+
+    if (flags & NMSTATE_FLAG_INCLUDE_STATUS_DATA) > 0 {
+        net_state.set_include_status_data(true);
+    }
+
+    if (flags & NMSTATE_FLAG_INCLUDE_SECRETS) > 0 {
+        net_state.set_include_secrets(true);
+    }
+
+    if (flags & NMSTATE_FLAG_RUNNING_CONFIG_ONLY) > 0 {
+        net_state.set_running_config_only(true);
+    }
+
+    if (flags & NMSTATE_FLAG_NO_LLDP_NEIGHBORS) > 0 {
+        net_state.set_include_lldp_neighbors(false);
+    }
+    net_state
+}
+
+#[derive(Debug, Serialize)]
+#[serde(rename_all = "kebab-case")]
+enum NetnsBatchEntry {
+    State(NetworkState),
+    Error(BatchError),
+}
+
+#[allow(clippy::not_unsafe_ptr_arg_deref)]
+#[no_mangle]
+pub extern "C" fn nmstate_net_state_retrieve_netns_many(
+    flags: u32,
+    netns_list: *const c_char,
+    states: *mut *mut c_char,
+    log: *mut *mut c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> c_int {
+    assert!(!netns_list.is_null());
+    assert!(!states.is_null());
+    assert!(!log.is_null());
+    assert!(!err_kind.is_null());
+    assert!(!err_msg.is_null());
+
+    unsafe {
+        *log = std::ptr::null_mut();
+        *states = std::ptr::null_mut();
+        *err_kind = std::ptr::null_mut();
+        *err_msg = std::ptr::null_mut();
+    }
+
+    let logger = match init_logger() {
+        Ok(l) => l,
+        Err(e) => {
+            unsafe {
+                *err_msg = CString::new(format!("Failed to setup logger: {e}"))
+                    .unwrap()
+                    .into_raw();
+            }
+            return NMSTATE_FAIL;
+        }
+    };
+    let now = SystemTime::now();
+
+    let result = c_str_to_netns_list(netns_list).map(|netns_list| {
+        net_state_from_flags(flags)
+            .retrieve_netns_many(&netns_list)
+            .into_iter()
+            .map(|(netns, result)| {
+                let entry = match result {
+                    Ok(s) => NetnsBatchEntry::State(s),
+                    Err(e) => NetnsBatchEntry::Error(e.into()),
+                };
+                (netns, entry)
+            })
+            .collect::<BTreeMap<String, NetnsBatchEntry>>()
+    });
+    unsafe {
+        *log = CString::new(logger.drain(now)).unwrap().into_raw();
+    }
+
+    let serialize = result.and_then(|entries| {
+        serialize_batch(&entries, (flags & NMSTATE_FLAG_YAML_OUTPUT) == 0)
+    });
+
+    match serialize {
+        Ok(s) => unsafe {
+            *states = CString::new(s).unwrap().into_raw();
+            NMSTATE_PASS
+        },
+        Err(e) => unsafe {
+            *err_msg = CString::new(e.msg()).unwrap().into_raw();
+            *err_kind = CString::new(e.kind().to_string()).unwrap().into_raw();
+            NMSTATE_FAIL
+        },
+    }
+}
+
+fn c_str_to_netns_list(
+    input: *const c_char,
+) -> Result<Vec<String>, NmstateError> {
+    let input_str = unsafe { CStr::from_ptr(input) }.to_str().map_err(|e| {
+        NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!("Error on converting C char to rust str: {e}"),
+        )
+    })?;
+    // YAML is superset of JSON, hence serde_yaml can handle both.
+    serde_yaml::from_str(input_str).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!("Expecting a list of network namespaces: {e}"),
+        )
+    })
+}
@@ -3,7 +3,8 @@
 use std::ffi::{CStr, CString};
 
 use libc::{c_char, c_int};
-use nmstate::{ErrorKind, NetworkState};
+use nmstate::{from_json_or_yaml_str, ErrorKind, NetworkState};
+use serde::de::{DeserializeOwned, IgnoredAny};
 
 use crate::NMSTATE_FAIL;
 
@@ -12,6 +13,27 @@ pub(crate) fn c_str_to_net_state(
     err_kind: *mut *mut c_char,
     err_msg: *mut *mut c_char,
 ) -> Result<NetworkState, c_int> {
+    c_str_deserialize(state, "NetworkState", err_kind, err_msg)
+}
+
+// Raw document without default values of NetworkState filled
+pub(crate) fn c_str_to_json_value(
+    state: *const c_char,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> Result<serde_json::Value, c_int> {
+    c_str_deserialize(state, "JSON value", err_kind, err_msg)
+}
+
+fn c_str_deserialize<T>(
+    state: *const c_char,
+    type_name: &str,
+    err_kind: *mut *mut c_char,
+    err_msg: *mut *mut c_char,
+) -> Result<T, c_int>
+where
+    T: DeserializeOwned,
+{
     let net_state_cstr = unsafe { CStr::from_ptr(state) };
     let net_state_str = net_state_cstr.to_str().map_err(|e| unsafe {
         *err_msg = CString::new(format!(
@@ -24,9 +46,9 @@ pub(crate) fn c_str_to_net_state(
             .into_raw();
         NMSTATE_FAIL
     })?;
-    NetworkState::new_from_yaml(net_state_str).map_err(|e| unsafe {
+    from_json_or_yaml_str(net_state_str).map_err(|e| unsafe {
         *err_msg = CString::new(format!(
-            "Error on converting string to rust NetworkState: {e}"
+            "Error on converting string to rust {type_name}: {e}"
         ))
         .unwrap()
         .into_raw();
@@ -38,7 +60,8 @@ pub(crate) fn c_str_to_net_state(
 pub(crate) fn is_state_in_json(state: *const c_char) -> bool {
     let net_state_cstr = unsafe { CStr::from_ptr(state) };
     if let Ok(net_state_str) = net_state_cstr.to_str() {
-        serde_json::from_str::<serde_json::Value>(net_state_str).is_ok()
+        // Validate without building the JSON tree
+        serde_json::from_str::<IgnoredAny>(net_state_str).is_ok()
     } else {
         false
     }
@@ -309,3 +309,31 @@ impl std::convert::TryFrom<serde_json::Value> for NumberAsString {
         }
     }
 }
+
+/// Deserialize JSON or YAML string with error mapped to [NmstateError].
+/// JSON is a subset of YAML, but [serde_json] is much faster than
+/// [serde_yaml] on large machine generated states. Fallback to YAML when the
+/// content is not valid JSON syntax, for example YAML flow mapping.
+pub fn from_json_or_yaml_str<T>(content: &str) -> Result<T, NmstateError>
+where
+    T: de::DeserializeOwned,
+{
+    if content.trim_start().starts_with('{') {
+        match serde_json::from_str(content) {
+            Ok(v) => return Ok(v),
+            Err(e) if e.is_data() => {
+                return Err(NmstateError::new(
+                    ErrorKind::InvalidArgument,
+                    format!("Invalid JSON string: {e}"),
+                ));
+            }
+            Err(_) => (),
+        }
+    }
+    serde_yaml::from_str(content).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!("Invalid YAML string: {e}"),
+        )
+    })
+}
@@ -0,0 +1,167 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use serde_json::{Map, Value};
+use sha2::{Digest, Sha256};
+
+use crate::{ErrorKind, NetworkState, NmstateError};
+
+// Changing every second for dynamic IP addresses, not considered as drift.
+const VOLATILE_KEYS: [&str; 2] = ["valid-life-time", "preferred-life-time"];
+
+// Lists whose order is decided by the kernel or backends instead of user.
+const UNORDERED_LISTS: [&str; 3] =
+    [".routes.config", ".routes.running", ".route-rules.config"];
+
+impl NetworkState {
+    /// Generate SHA-256 digest(in hex string) of canonical form of this
+    /// [NetworkState]. Two network states holding the same properties always
+    /// have the same fingerprint regardless of the order of interfaces,
+    /// routes and route rules.
+    ///
+    /// When `desired` is defined, only properties mentioned in `desired` are
+    /// included, so the fingerprint of current network state could be
+    /// compared with the previous one to detect drift from desired state
+    /// without transferring the full network state.
+    /// The `desired` should be the raw document provided by user instead of
+    /// serialized [NetworkState], otherwise the default values would be
+    /// included also.
+    /// Interfaces are matched by name and type(if defined in `desired` and
+    /// not `unknown`).
+    pub fn fingerprint(
+        &self,
+        desired: Option<&Value>,
+    ) -> Result<String, NmstateError> {
+        let mut value = to_json_value(self)?;
+        if let Some(desired) = desired {
+            value = filter_by_desired(&value, desired);
+        }
+        let value = canonicalize(value, "");
+        let data = serde_json::to_vec(&value).map_err(|e| {
+            NmstateError::new(
+                ErrorKind::Bug,
+                format!("Failed to serialize canonical network state: {e}"),
+            )
+        })?;
+        Ok(Sha256::digest(data)
+            .iter()
+            .map(|b| format!("{b:02x}"))
+            .collect())
+    }
+}
+
+fn to_json_value(net_state: &NetworkState) -> Result<Value, NmstateError> {
+    serde_json::to_value(net_state).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::Bug,
+            format!("Failed to serialize network state {net_state:?}: {e}"),
+        )
+    })
+}
+
+// Only keep properties mentioned in desired. The lists except
+// interfaces are kept as whole.
+fn filter_by_desired(current: &Value, desired: &Value) -> Value {
+    let (cur_obj, des_obj) = match (current.as_object(), desired.as_object()) {
+        (Some(c), Some(d)) => (c, d),
+        _ => return current.clone(),
+    };
+    let mut ret = Map::new();
+    for (key, des_value) in des_obj {
+        let cur_value = cur_obj.get(key).unwrap_or(&Value::Null);
+        let value = if key == "interfaces" {
+            filter_ifaces_by_desired(cur_value, des_value)
+        } else {
+            filter_by_desired(cur_value, des_value)
+        };
+        ret.insert(key.to_string(), value);
+    }
+    Value::Object(ret)
+}
+
+fn filter_ifaces_by_desired(current: &Value, desired: &Value) -> Value {
+    let (cur_ifaces, des_ifaces) =
+        match (current.as_array(), desired.as_array()) {
+            (Some(c), Some(d)) => (c, d),
+            _ => return current.clone(),
+        };
+    Value::Array(
+        des_ifaces
+            .iter()
+            .map(|des_iface| {
+                let name = des_iface.get("name");
+                // Missing or `unknown` type matches any type
+                let iface_type = des_iface
+                    .get("type")
+                    .filter(|t| t.as_str() != Some("unknown"));
+                cur_ifaces
+                    .iter()
+                    .find(|cur_iface| {
+                        cur_iface.get("name") == name
+                            && (iface_type.is_none()
+                                || cur_iface.get("type") == iface_type)
+                    })
+                    .map(|cur_iface| filter_by_desired(cur_iface, des_iface))
+                    .unwrap_or(Value::Null)
+            })
+            .collect(),
+    )
+}
+
+// Sort object keys, interfaces, routes and route rules, remove volatile
+// properties. The `path` is like `.routes.config` for identifying the lists
+// to sort.
+fn canonicalize(value: Value, path: &str) -> Value {
+    match value {
+        Value::Object(obj) => {
+            let mut items: Vec<(String, Value)> = obj
+                .into_iter()
+                .filter(|(k, _)| !VOLATILE_KEYS.contains(&k.as_str()))
+                .collect();
+            items.sort_unstable_by(|(a, _), (b, _)| a.cmp(b));
+            let mut ret = Map::new();
+            for (key, value) in items {
+                let value = canonicalize(value, &format!("{path}.{key}"));
+                ret.insert(key, value);
+            }
+            Value::Object(ret)
+        }
+        Value::Array(items) => {
+            let item_path = format!("{path}[]");
+            let items = items
+                .into_iter()
+                .map(|v| canonicalize(v, item_path.as_str()));
+            if path == ".interfaces" {
+                sort_list(items, iface_sort_key)
+            } else if UNORDERED_LISTS.contains(&path) {
+                sort_list(items, Value::to_string)
+            } else {
+                Value::Array(items.collect())
+            }
+        }
+        v => v,
+    }
+}
+
+fn iface_sort_key(iface: &Value) -> String {
+    format!(
+        "{}\0{}",
+        iface
+            .get("name")
+            .and_then(|n| n.as_str())
+            .unwrap_or_default(),
+        iface
+            .get("type")
+            .and_then(|t| t.as_str())
+            .unwrap_or_default()
+    )
+}
+
+fn sort_list(
+    items: impl Iterator<Item = Value>,
+    sort_key: fn(&Value) -> String,
+) -> Value {
+    let mut items: Vec<(String, Value)> =
+        items.map(|v| (sort_key(&v), v)).collect();
+    items.sort_by(|(a, _), (b, _)| a.cmp(b));
+    Value::Array(items.into_iter().map(|(_, v)| v).collect())
+}
@@ -3,9 +3,15 @@
 use std::collections::HashMap;
 
 use crate::{
-    nm::nm_gen_conf, Interface, MergedNetworkState, NetworkState, NmstateError,
+    nm::nm_gen_conf, worker_pool::worker_pool_map, Interface,
+    MergedNetworkState, NetworkState, NmstateError,
 };
 
+/// Result of [NetworkState::gen_conf()]: backend name as key and
+/// `Vec<(config_file_name, config_content>)>` as value.
+pub type GenConfResult =
+    Result<HashMap<String, Vec<(String, String)>>, NmstateError>;
+
 impl NetworkState {
     /// Generate offline network configurations.
     /// Currently only support generate NetworkManager key file out of
@@ -35,6 +41,16 @@ impl NetworkState {
         ret.insert("NetworkManager".to_string(), nm_gen_conf(&merged_state)?);
         Ok(ret)
     }
+
+    /// Generate offline network configurations for each of specified
+    /// [NetworkState] using a pool of worker threads.
+    ///
+    /// The output holds the result of [NetworkState::gen_conf()] for each
+    /// state in the same order of input, failure of one state does not
+    /// prevent others from being generated.
+    pub fn gen_conf_many(states: &[NetworkState]) -> Vec<GenConfResult> {
+        worker_pool_map(states, NetworkState::gen_conf)
+    }
 }
 
 #[cfg(test)]
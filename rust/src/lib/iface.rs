@@ -444,6 +444,33 @@ impl Interface {
         self.base_iface().iface_type.clone()
     }
 
+    // Clone the interface as specified interface type.
+    // Interface of unknown type is converted from its stored JSON
+    // properties, others are cloned as it is.
+    pub(crate) fn clone_as_type(
+        &self,
+        iface_type: &InterfaceType,
+    ) -> Result<Self, NmstateError> {
+        if let Self::Unknown(iface) = self {
+            let mut value = match serde_json::to_value(&iface.base)? {
+                serde_json::Value::Object(v) => v,
+                _ => serde_json::Map::new(),
+            };
+            if let Some(other) = iface.other.as_object() {
+                for (k, v) in other.iter() {
+                    value.insert(k.to_string(), v.clone());
+                }
+            }
+            value.insert(
+                "type".to_string(),
+                serde_json::Value::String(iface_type.to_string()),
+            );
+            Ok(Self::deserialize(serde_json::Value::Object(value))?)
+        } else {
+            Ok(self.clone())
+        }
+    }
+
     pub(crate) fn clone_name_type_only(&self) -> Self {
         match self {
             Self::LinuxBridge(iface) => {
@@ -19,15 +19,16 @@ pub struct BaseInterface {
     /// Interface name, when applying with `InterfaceIdentifier::MacAddress`,
     /// if `profile_name` not defined, this will be used as profile name.
     pub name: String,
+    // Keep `type` next to `name` in serialized output
+    #[serde(rename = "type", default = "default_iface_type")]
+    /// Interface type. Serialize and deserialize to/from `type`
+    pub iface_type: InterfaceType,
     #[serde(skip_serializing_if = "Option::is_none")]
     pub profile_name: Option<String>,
     #[serde(skip_serializing_if = "crate::serializer::is_option_string_empty")]
     /// Interface description stored in network backend. Not available for
     /// kernel only mode.
     pub description: Option<String>,
-    #[serde(rename = "type", default = "default_iface_type")]
-    /// Interface type. Serialize and deserialize to/from `type`
-    pub iface_type: InterfaceType,
     #[serde(skip_serializing_if = "crate::serializer::is_option_string_empty")]
     /// The driver of the specified network device.
     pub driver: Option<String>,
@@ -11,11 +11,10 @@ use crate::{
     InterfaceState, InterfaceType, MergedInterface, NmstateError,
 };
 
-// The max loop count for Interfaces.set_ifaces_up_priority()
-// This allows interface with 4 nested levels in any order.
-// To support more nested level, user could place top controller at the
-// beginning of desire state
-const INTERFACES_SET_PRIORITY_MAX_RETRY: u32 = 4;
+use super::{
+    inter_ifaces_graph::MergedInterfacesGraph,
+    inter_ifaces_index::InterfacesIndex,
+};
 
 const COPY_MAC_ALLOWED_IFACE_TYPES: [InterfaceType; 3] = [
     InterfaceType::Bond,
@@ -25,17 +24,16 @@ const COPY_MAC_ALLOWED_IFACE_TYPES: [InterfaceType; 3] = [
 
 /// Represent a list of [Interface].
 ///
-/// With special [serde::Deserializer] and [serde::Serializer].  When applying
-/// complex nested interface(e.g. bridge over bond over vlan of eth1), the
-/// supported maximum nest level is 4 like previous example.  For 5+ nested
-/// level, you need to place controller interface before its ports.
+/// With special [serde::Deserializer] and [serde::Serializer].  Complex
+/// nested interfaces(e.g. bridge over bond over vlan of eth1) can be placed
+/// in any order, nmstate will activate controller or parent interface
+/// before its ports or children.
 #[derive(Clone, Debug, Default, PartialEq, Eq)]
 #[non_exhaustive]
 pub struct Interfaces {
     pub(crate) kernel_ifaces: HashMap<String, Interface>,
     pub(crate) user_ifaces: HashMap<(String, InterfaceType), Interface>,
-    // The insert_order is allowing user to provided ordered interface
-    // to support 5+ nested dependency.
+    // The order of interfaces in desired state
     pub(crate) insert_order: Vec<(String, InterfaceType)>,
 }
 
@@ -283,7 +281,7 @@ impl Interfaces {
 
     pub(crate) fn resolve_unknown_ifaces(
         &mut self,
-        cur_ifaces: &Self,
+        cur_index: &InterfacesIndex,
     ) -> Result<(), NmstateError> {
         let mut resolved_ifaces: Vec<Interface> = Vec::new();
         for (iface_name, iface) in self.kernel_ifaces.iter() {
@@ -291,33 +289,16 @@ impl Interfaces {
             {
                 continue;
             }
+            let cur_ifaces = cur_index.get_by_name(iface_name);
             if iface.is_absent() {
-                for cur_iface in cur_ifaces.to_vec() {
-                    if cur_iface.name() == iface_name {
-                        let mut new_iface = cur_iface.clone_name_type_only();
-                        new_iface.base_iface_mut().state =
-                            InterfaceState::Absent;
-                        resolved_ifaces.push(new_iface);
-                    }
+                for cur_iface in cur_ifaces {
+                    let mut new_iface = cur_iface.clone_name_type_only();
+                    new_iface.base_iface_mut().state = InterfaceState::Absent;
+                    resolved_ifaces.push(new_iface);
                 }
             } else {
-                let mut founds = Vec::new();
-                for cur_iface in cur_ifaces.to_vec() {
-                    if cur_iface.name() == iface_name {
-                        let mut new_iface_value = serde_json::to_value(iface)?;
-                        if let Some(obj) = new_iface_value.as_object_mut() {
-                            obj.insert(
-                                "type".to_string(),
-                                serde_json::Value::String(
-                                    cur_iface.iface_type().to_string(),
-                                ),
-                            );
-                        }
-                        founds.push(new_iface_value);
-                    }
-                }
-                match founds.len() {
-                    0 => {
+                match cur_ifaces {
+                    [] => {
                         let e = NmstateError::new(
                             ErrorKind::InvalidArgument,
                             format!(
@@ -328,9 +309,10 @@ impl Interfaces {
                         log::error!("{}", e);
                         return Err(e);
                     }
-                    1 => {
-                        let new_iface = Interface::deserialize(&founds[0])?;
-                        resolved_ifaces.push(new_iface);
+                    [cur_iface] => {
+                        resolved_ifaces.push(
+                            iface.clone_as_type(&cur_iface.iface_type())?,
+                        );
                     }
                     _ => {
                         let e = NmstateError::new(
@@ -338,7 +320,11 @@ impl Interfaces {
                             format!(
                                 "Found 2+ interface matching desired unknown \
                             type interface {}: {:?}",
-                                iface_name, &founds
+                                iface_name,
+                                cur_ifaces
+                                    .iter()
+                                    .map(|i| i.iface_type().to_string())
+                                    .collect::<Vec<String>>()
                             ),
                         );
                         log::error!("{}", e);
@@ -360,7 +346,7 @@ impl Interfaces {
     //  * Store interface.name to interface.profile_name.
     fn resolve_mac_identifider_in_desired(
         &mut self,
-        current: &Self,
+        cur_index: &InterfacesIndex,
     ) -> Result<(), NmstateError> {
         let mut changed_ifaces: Vec<Interface> = Vec::new();
         for iface in self.iter().filter(|i| {
@@ -368,7 +354,7 @@ impl Interfaces {
                 && i.base_iface().profile_name.is_none()
         }) {
             let mac_address = match iface.base_iface().mac_address.as_deref() {
-                Some(m) => m.to_ascii_uppercase(),
+                Some(m) => m,
                 None => {
                     return Err(NmstateError::new(
                         ErrorKind::InvalidArgument,
@@ -381,69 +367,26 @@ impl Interfaces {
                     ));
                 }
             };
-            let mut has_match = false;
             // If `permanent_mac_address` got no matches, fallback to
             // `mac_address`
-            for use_permanent_addr in [true, false] {
-                for cur_iface in current.kernel_ifaces.values() {
-                    if iface.iface_type() != InterfaceType::Unknown
-                        && iface.iface_type() != cur_iface.iface_type()
-                    {
-                        continue;
-                    }
-                    let cur_mac_addr = if use_permanent_addr {
-                        cur_iface
-                            .base_iface()
-                            .permanent_mac_address
-                            .as_deref()
-                            .map(|m| m.to_ascii_uppercase())
-                    } else {
-                        cur_iface
-                            .base_iface()
-                            .mac_address
-                            .as_deref()
-                            .map(|m| m.to_ascii_uppercase())
-                    };
-                    if cur_mac_addr.as_deref() == Some(&mac_address) {
-                        let mut new_iface = if iface.iface_type()
-                            == InterfaceType::Unknown
-                        {
-                            let mut new_iface_value =
-                                serde_json::to_value(iface)?;
-                            if let Some(obj) = new_iface_value.as_object_mut() {
-                                obj.insert(
-                                    "type".to_string(),
-                                    serde_json::Value::String(
-                                        cur_iface.iface_type().to_string(),
-                                    ),
-                                );
-                            }
-                            Interface::deserialize(new_iface_value)?
-                        } else {
-                            iface.clone()
-                        };
-                        new_iface.base_iface_mut().profile_name =
-                            Some(iface.base_iface().name.clone());
-                        new_iface.base_iface_mut().name =
-                            cur_iface.name().to_string();
-                        changed_ifaces.push(new_iface);
-                        has_match = true;
-                        break;
-                    }
-                }
-                if has_match {
-                    break;
-                }
-            }
-
-            if !has_match {
+            if let Some(cur_iface) =
+                cur_index.get_by_mac(mac_address, &iface.iface_type())
+            {
+                let mut new_iface =
+                    iface.clone_as_type(&cur_iface.iface_type())?;
+                new_iface.base_iface_mut().profile_name =
+                    Some(iface.base_iface().name.clone());
+                new_iface.base_iface_mut().name = cur_iface.name().to_string();
+                changed_ifaces.push(new_iface);
+            } else {
                 return Err(NmstateError::new(
                     ErrorKind::InvalidArgument,
                     format!(
                         "Desired interface {} has `identifier: mac-address` \
-                    with MAC address {mac_address}, but no interface is \
+                    with MAC address {}, but no interface is \
                     holding that MAC address",
-                        iface.name()
+                        iface.name(),
+                        mac_address.to_ascii_uppercase()
                     ),
                 ));
             }
@@ -475,21 +418,7 @@ impl Interfaces {
             {
                 if let Some(des_iface) = self.kernel_ifaces.get(profile_name) {
                     let mut new_iface =
-                        if des_iface.iface_type() == InterfaceType::Unknown {
-                            let mut new_iface_value =
-                                serde_json::to_value(des_iface)?;
-                            if let Some(obj) = new_iface_value.as_object_mut() {
-                                obj.insert(
-                                    "type".to_string(),
-                                    serde_json::Value::String(
-                                        cur_iface.iface_type().to_string(),
-                                    ),
-                                );
-                            }
-                            Interface::deserialize(new_iface_value)?
-                        } else {
-                            des_iface.clone()
-                        };
+                        des_iface.clone_as_type(&cur_iface.iface_type())?;
 
                     new_iface.base_iface_mut().identifier =
                         Some(InterfaceIdentifier::MacAddress);
@@ -663,8 +592,9 @@ impl MergedInterfaces {
         } else {
             desired.resolve_sriov_reference(&current)?;
             desired.resolve_mac_identifider_in_current(&current)?;
-            desired.resolve_unknown_ifaces(&current)?;
-            desired.resolve_mac_identifider_in_desired(&current)?;
+            let cur_index = InterfacesIndex::new(&current);
+            desired.resolve_unknown_ifaces(&cur_index)?;
+            desired.resolve_mac_identifider_in_desired(&cur_index)?;
         }
 
         desired.auto_managed_controller_ports(&current);
@@ -782,10 +712,11 @@ impl MergedInterfaces {
         self.validate_controller_and_port_list_confliction()?;
         self.handle_changed_ports()?;
         self.resolve_port_iface_controller_type()?;
-        self._set_up_priority()?;
-        self.check_overbook_ports()?;
+        // Also checks overbooked ports
+        let graph = MergedInterfacesGraph::new(self)?;
+        self.set_up_priority(&graph)?;
         self.check_infiniband_as_ports()?;
-        self.mark_orphan_interface_as_absent()?;
+        self.mark_orphan_interface_as_absent(&graph)?;
         self.process_veth_peer_changes()?;
         self.validate_dispatch_script_has_no_checkpoint()?;
         for iface in self
@@ -799,24 +730,22 @@ impl MergedInterfaces {
         Ok(())
     }
 
-    fn _set_up_priority(&mut self) -> Result<(), NmstateError> {
-        for _ in 0..INTERFACES_SET_PRIORITY_MAX_RETRY {
-            if self.set_ifaces_up_priority() {
-                return Ok(());
+    fn set_up_priority(
+        &mut self,
+        graph: &MergedInterfacesGraph,
+    ) -> Result<(), NmstateError> {
+        let priorities = graph.kernel_up_priorities()?;
+        log::debug!("Kernel interface up priorities {:?}", priorities);
+        for (iface_name, priority) in priorities {
+            if let Some(iface) = self
+                .kernel_ifaces
+                .get_mut(iface_name)
+                .and_then(|i| i.for_apply.as_mut())
+            {
+                iface.base_iface_mut().up_priority = priority;
             }
         }
-        log::error!(
-            "Failed to set up priority: please order the interfaces in desire \
-            state to place controller before its ports"
-        );
-        Err(NmstateError::new(
-            ErrorKind::InvalidArgument,
-            "Failed to set up priority: nmstate only support nested interface \
-            up to 4 levels. To support more nest level, \
-            please order the interfaces in desire \
-            state to place controller before its ports"
-                .to_string(),
-        ))
+        Ok(())
     }
 
     fn apply_copy_mac_from(&mut self) -> Result<(), NmstateError> {
@@ -893,8 +822,13 @@ impl MergedInterfaces {
 
     // Unlike orphan check in `apply_ctrller_change()`, this function is for
     // orphan interface without controller.
-    fn mark_orphan_interface_as_absent(&mut self) -> Result<(), NmstateError> {
-        let gone_ifaces: Vec<String> = self
+    // Mark interfaces as absent when their parent is removed, including
+    // children of those orphans.
+    fn mark_orphan_interface_as_absent(
+        &mut self,
+        graph: &MergedInterfacesGraph,
+    ) -> Result<(), NmstateError> {
+        let mut gone_ifaces: Vec<usize> = self
             .kernel_ifaces
             .values()
             .filter(|i| {
@@ -906,34 +840,45 @@ impl MergedInterfaces {
                     && i.merged.is_absent()
                     && i.merged.iface_type() != InterfaceType::Ethernet
             })
-            .map(|i| i.merged.name().to_string())
+            .filter_map(|i| graph.kernel_node(i.merged.name()))
             .collect();
 
-        // OvsInterface is already checked by `apply_ctrller_change()`.
-        for iface in self.kernel_ifaces.values_mut().filter(|i| {
-            i.merged.is_up()
-                && i.merged.iface_type() != InterfaceType::OvsInterface
-        }) {
-            if let Some(parent) = iface.merged.parent() {
-                if gone_ifaces.contains(&parent.to_string()) {
-                    if iface.is_desired() && iface.merged.is_up() {
-                        return Err(NmstateError::new(
-                            ErrorKind::InvalidArgument,
-                            format!(
-                                "Interface {} cannot be in up state \
-                                as its parent {parent} has been marked \
-                                as absent",
-                                iface.merged.name(),
-                            ),
-                        ));
-                    }
-                    log::info!(
-                        "Marking interface {} as absent as its \
-                        parent {} is so",
-                        iface.merged.name(),
-                        parent
-                    );
-                    iface.mark_as_absent();
+        while let Some(parent_index) = gone_ifaces.pop() {
+            let parent = graph.name(parent_index);
+            for child_index in graph.children(parent_index) {
+                let iface = match self
+                    .kernel_ifaces
+                    .get_mut(graph.name(*child_index))
+                {
+                    Some(i) => i,
+                    None => continue,
+                };
+                // OvsInterface is already checked by `apply_ctrller_change()`.
+                if !iface.merged.is_up()
+                    || iface.merged.iface_type() == InterfaceType::OvsInterface
+                {
+                    continue;
+                }
+                if iface.is_desired() {
+                    return Err(NmstateError::new(
+                        ErrorKind::InvalidArgument,
+                        format!(
+                            "Interface {} cannot be in up state \
+                            as its parent {parent} has been marked \
+                            as absent",
+                            iface.merged.name(),
+                        ),
+                    ));
+                }
+                log::info!(
+                    "Marking interface {} as absent as its \
+                    parent {} is so",
+                    iface.merged.name(),
+                    parent
+                );
+                iface.mark_as_absent();
+                if iface.merged.iface_type() != InterfaceType::Ethernet {
+                    gone_ifaces.push(*child_index);
                 }
             }
         }
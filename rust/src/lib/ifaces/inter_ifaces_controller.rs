@@ -7,7 +7,7 @@ use crate::{
     MergedInterface, MergedInterfaces, NmstateError, OvsInterface,
 };
 
-fn is_port_overbook(
+pub(crate) fn is_port_overbook(
     port_to_ctrl: &mut HashMap<String, String>,
     port: &str,
     ctrl: &str,
@@ -324,147 +324,6 @@ impl MergedInterfaces {
         Ok(())
     }
 
-    // Return True if we have all up_priority fixed.
-    pub(crate) fn set_ifaces_up_priority(&mut self) -> bool {
-        // Return true when all interface has correct priority.
-        let mut ret = true;
-        let mut pending_changes: HashMap<String, u32> = HashMap::new();
-        // Use the push order to allow user providing help on dependency order
-
-        for (iface_name, iface_type) in &self.insert_order {
-            let iface = match self.get_iface(iface_name, iface_type.clone()) {
-                Some(i) => {
-                    if let Some(i) = i.for_apply.as_ref() {
-                        i
-                    } else {
-                        continue;
-                    }
-                }
-                None => continue,
-            };
-            if !iface.is_up() {
-                continue;
-            }
-
-            if iface.base_iface().is_up_priority_valid() {
-                continue;
-            }
-
-            if let Some(ref ctrl_name) = iface.base_iface().controller {
-                if ctrl_name.is_empty() {
-                    continue;
-                }
-                let ctrl_iface = self
-                    .get_iface(
-                        ctrl_name,
-                        iface
-                            .base_iface()
-                            .controller_type
-                            .clone()
-                            .unwrap_or_default(),
-                    )
-                    .and_then(|i| i.for_apply.as_ref());
-                if let Some(ctrl_iface) = ctrl_iface {
-                    if let Some(ctrl_pri) = pending_changes.remove(ctrl_name) {
-                        pending_changes.insert(ctrl_name.to_string(), ctrl_pri);
-                        pending_changes
-                            .insert(iface_name.to_string(), ctrl_pri + 1);
-                    } else if ctrl_iface.base_iface().is_up_priority_valid() {
-                        pending_changes.insert(
-                            iface_name.to_string(),
-                            ctrl_iface.base_iface().up_priority + 1,
-                        );
-                    } else {
-                        // Its controller does not have valid up priority yet.
-                        log::debug!(
-                            "Controller {ctrl_name} of {iface_name} is has no \
-                            up priority"
-                        );
-                        ret = false;
-                    }
-                } else {
-                    // Interface has no controller defined in desire
-                    continue;
-                }
-            } else {
-                continue;
-            }
-        }
-
-        // If not remaining unknown up_priority, we set up the parent/child
-        // up_priority
-        if ret {
-            for (iface_name, iface_type) in &self.insert_order {
-                let iface = match self.get_iface(iface_name, iface_type.clone())
-                {
-                    Some(i) => {
-                        if let Some(i) = i.for_apply.as_ref() {
-                            i
-                        } else {
-                            continue;
-                        }
-                    }
-                    None => continue,
-                };
-                if !iface.is_up() {
-                    continue;
-                }
-                if let Some(parent) = iface.parent() {
-                    let parent_priority = pending_changes.get(parent).cloned();
-                    if let Some(parent_priority) = parent_priority {
-                        pending_changes.insert(
-                            iface_name.to_string(),
-                            parent_priority + 1,
-                        );
-                    } else if let Some(parent_iface) = self
-                        .kernel_ifaces
-                        .get(parent)
-                        .and_then(|i| i.for_apply.as_ref())
-                    {
-                        if parent_iface.base_iface().is_up_priority_valid() {
-                            pending_changes.insert(
-                                iface_name.to_string(),
-                                parent_iface.base_iface().up_priority + 1,
-                            );
-                        }
-                    }
-                }
-            }
-        }
-
-        log::debug!("Pending kernel up priority changes {:?}", pending_changes);
-        for (iface_name, priority) in pending_changes.iter() {
-            if let Some(iface) = self
-                .kernel_ifaces
-                .get_mut(iface_name)
-                .and_then(|i| i.for_apply.as_mut())
-            {
-                iface.base_iface_mut().up_priority = *priority;
-            }
-        }
-
-        ret
-    }
-
-    pub(crate) fn check_overbook_ports(&self) -> Result<(), NmstateError> {
-        let mut port_to_ctrl: HashMap<String, String> = HashMap::new();
-        for iface in self.iter().filter(|i| {
-            i.merged.is_controller() && i.merged.is_up() && i.is_desired()
-        }) {
-            let ports = if let Some(p) = iface.merged.ports() {
-                p
-            } else {
-                continue;
-            };
-
-            for port in ports {
-                is_port_overbook(&mut port_to_ctrl, port, iface.merged.name())?;
-            }
-        }
-
-        Ok(())
-    }
-
     // Infiniband over IP can only be port of active_backup bond as it is a
     // layer 3 interface like tun.
     pub(crate) fn check_infiniband_as_ports(&self) -> Result<(), NmstateError> {
@@ -0,0 +1,250 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::collections::{HashMap, VecDeque};
+
+use crate::{
+    ErrorKind, Interface, InterfaceType, MergedInterface, MergedInterfaces,
+    NmstateError,
+};
+
+use super::inter_ifaces_controller::is_port_overbook;
+
+// Dependency graph among merged interfaces. Built once after controller and
+// port changes are resolved, so planning is linear to the number of
+// interfaces plus dependencies regardless of nest level or the order of
+// interfaces in desired state.
+//
+// Holds:
+//  * Up dependencies of interfaces to apply: the controller (from
+//    `controller` property) and the parent (e.g. VLAN base interface) should
+//    be activated before the interface itself.
+//  * Children of each kernel interface via `parent()` of merged interfaces.
+//  * Port to controller mapping from port list of desired controllers,
+//    overbooked ports are rejected when building the graph.
+#[derive(Debug, Default)]
+pub(crate) struct MergedInterfacesGraph {
+    nodes: Vec<GraphNode>,
+    kernel_nodes: HashMap<String, usize>,
+    user_nodes: HashMap<(String, InterfaceType), usize>,
+    // First user space interface of specified name, used when controller
+    // type is unknown.
+    user_nodes_by_name: HashMap<String, usize>,
+    // Interfaces required to wait the specified one to be activated first
+    dependents: Vec<Vec<usize>>,
+    // Number of interfaces required to be activated before specified one
+    dep_counts: Vec<usize>,
+    children: Vec<Vec<usize>>,
+}
+
+#[derive(Debug, Clone, PartialEq, Eq)]
+enum GraphNode {
+    Kernel(String),
+    User(String, InterfaceType),
+}
+
+impl GraphNode {
+    fn name(&self) -> &str {
+        match self {
+            Self::Kernel(name) | Self::User(name, _) => name.as_str(),
+        }
+    }
+}
+
+impl MergedInterfacesGraph {
+    pub(crate) fn new(ifaces: &MergedInterfaces) -> Result<Self, NmstateError> {
+        let mut ret = Self::default();
+        let mut merged_ifaces: Vec<&MergedInterface> = Vec::new();
+        for (name, iface) in ifaces.kernel_ifaces.iter() {
+            ret.kernel_nodes.insert(name.to_string(), ret.nodes.len());
+            ret.nodes.push(GraphNode::Kernel(name.to_string()));
+            merged_ifaces.push(iface);
+        }
+        for ((name, iface_type), iface) in ifaces.user_ifaces.iter() {
+            ret.user_nodes.insert(
+                (name.to_string(), iface_type.clone()),
+                ret.nodes.len(),
+            );
+            ret.user_nodes_by_name
+                .entry(name.to_string())
+                .or_insert(ret.nodes.len());
+            ret.nodes
+                .push(GraphNode::User(name.to_string(), iface_type.clone()));
+            merged_ifaces.push(iface);
+        }
+        ret.dependents = vec![Vec::new(); ret.nodes.len()];
+        ret.dep_counts = vec![0; ret.nodes.len()];
+        ret.children = vec![Vec::new(); ret.nodes.len()];
+
+        let mut port_to_ctrl: HashMap<String, String> = HashMap::new();
+        for (index, iface) in merged_ifaces.iter().enumerate() {
+            if iface.merged.is_controller()
+                && iface.merged.is_up()
+                && iface.is_desired()
+            {
+                for port in iface.merged.ports().unwrap_or_default() {
+                    is_port_overbook(
+                        &mut port_to_ctrl,
+                        port,
+                        iface.merged.name(),
+                    )?;
+                }
+            }
+
+            if let GraphNode::Kernel(_) = ret.nodes[index] {
+                if let Some(parent) = ret.kernel_parent_node(&iface.merged) {
+                    ret.children[parent].push(index);
+                }
+            }
+
+            let apply_iface = match iface.for_apply.as_ref() {
+                Some(i) if i.is_up() => i,
+                _ => continue,
+            };
+            let mut deps: Vec<usize> = Vec::new();
+            if let Some(ctrl_name) = apply_iface
+                .base_iface()
+                .controller
+                .as_deref()
+                .filter(|c| !c.is_empty())
+            {
+                if let Some(ctrl) = ret.find_node(
+                    ctrl_name,
+                    &apply_iface
+                        .base_iface()
+                        .controller_type
+                        .clone()
+                        .unwrap_or_default(),
+                ) {
+                    deps.push(ctrl);
+                }
+            }
+            if let Some(parent) = ret.kernel_parent_node(apply_iface) {
+                deps.push(parent);
+            }
+            for dep in deps {
+                // Only wait on interfaces we are going to apply
+                if merged_ifaces[dep].for_apply.is_some() {
+                    ret.dependents[dep].push(index);
+                    ret.dep_counts[index] += 1;
+                }
+            }
+        }
+        Ok(ret)
+    }
+
+    // Same search logic as `MergedInterfaces::get_iface()`
+    fn find_node(
+        &self,
+        name: &str,
+        iface_type: &InterfaceType,
+    ) -> Option<usize> {
+        if iface_type == &InterfaceType::Unknown {
+            self.kernel_nodes
+                .get(name)
+                .or_else(|| self.user_nodes_by_name.get(name))
+                .copied()
+        } else if iface_type.is_userspace() {
+            self.user_nodes
+                .get(&(name.to_string(), iface_type.clone()))
+                .copied()
+        } else {
+            self.kernel_nodes.get(name).copied()
+        }
+    }
+
+    // The `parent()` of OVS internal interface is its controller, the
+    // user space OVS bridge, which commonly shares the same name with the
+    // OVS internal interface. Hence skip parent which is the controller
+    // or the interface itself to avoid self dependency.
+    fn kernel_parent_node(&self, iface: &Interface) -> Option<usize> {
+        let parent = iface.parent()?;
+        if parent == iface.name()
+            || iface.base_iface().controller.as_deref() == Some(parent)
+        {
+            None
+        } else {
+            self.kernel_node(parent)
+        }
+    }
+
+    pub(crate) fn kernel_node(&self, name: &str) -> Option<usize> {
+        self.kernel_nodes.get(name).copied()
+    }
+
+    pub(crate) fn name(&self, index: usize) -> &str {
+        self.nodes[index].name()
+    }
+
+    // Kernel interfaces using specified interface as parent
+    pub(crate) fn children(&self, index: usize) -> &[usize] {
+        self.children[index].as_slice()
+    }
+
+    // Topological sort on up dependencies. The up priority of each
+    // interface is the length of longest dependency chain before it, so
+    // top controller or interface with no dependency get 0, while its ports
+    // or children get 1, and so on.
+    // Return HashMap of kernel interface name to its up priority.
+    pub(crate) fn kernel_up_priorities(
+        &self,
+    ) -> Result<HashMap<&str, u32>, NmstateError> {
+        let mut dep_counts = self.dep_counts.clone();
+        let mut priorities: Vec<u32> = vec![0; self.nodes.len()];
+        let mut pending: VecDeque<usize> = dep_counts
+            .iter()
+            .enumerate()
+            .filter_map(|(i, c)| if *c == 0 { Some(i) } else { None })
+            .collect();
+        let mut sorted_count = 0usize;
+        while let Some(index) = pending.pop_front() {
+            sorted_count += 1;
+            for dependent in self.dependents[index].iter() {
+                priorities[*dependent] =
+                    priorities[*dependent].max(priorities[index] + 1);
+                dep_counts[*dependent] -= 1;
+                if dep_counts[*dependent] == 0 {
+                    pending.push_back(*dependent);
+                }
+            }
+        }
+
+        if sorted_count != self.nodes.len() {
+            let mut names: Vec<&str> = dep_counts
+                .iter()
+                .enumerate()
+                .filter_map(|(i, c)| {
+                    if *c > 0 {
+                        Some(self.nodes[i].name())
+                    } else {
+                        None
+                    }
+                })
+                .collect();
+            names.sort_unstable();
+            names.dedup();
+            let e = NmstateError::new(
+                ErrorKind::InvalidArgument,
+                format!(
+                    "Failed to set up priority: circular dependency found \
+                    via controller or parent property among interfaces: {}",
+                    names.join(", ")
+                ),
+            );
+            log::error!("{}", e);
+            return Err(e);
+        }
+
+        Ok(self
+            .nodes
+            .iter()
+            .zip(priorities)
+            .filter_map(|(node, priority)| {
+                if let GraphNode::Kernel(name) = node {
+                    Some((name.as_str(), priority))
+                } else {
+                    None
+                }
+            })
+            .collect())
+    }
+}
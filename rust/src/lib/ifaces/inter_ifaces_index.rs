@@ -0,0 +1,105 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::collections::HashMap;
+
+use crate::{Interface, InterfaceType, Interfaces};
+
+// Lookup tables of current interfaces built once per merge, used for
+// resolving desired interfaces with unknown type or MAC address based
+// identifier without scanning all current interfaces for each of them.
+pub(crate) struct InterfacesIndex<'a> {
+    // Both kernel and user space interfaces
+    by_name: HashMap<&'a str, Vec<&'a Interface>>,
+    // Kernel interfaces only
+    by_permanent_mac: HashMap<MacKey, Vec<&'a Interface>>,
+    // Kernel interfaces only
+    by_mac: HashMap<MacKey, Vec<&'a Interface>>,
+}
+
+impl<'a> InterfacesIndex<'a> {
+    pub(crate) fn new(ifaces: &'a Interfaces) -> Self {
+        let mut ret = Self {
+            by_name: HashMap::new(),
+            by_permanent_mac: HashMap::new(),
+            by_mac: HashMap::new(),
+        };
+        for iface in ifaces.to_vec() {
+            ret.by_name.entry(iface.name()).or_default().push(iface);
+        }
+        for iface in ifaces.kernel_ifaces.values() {
+            if let Some(mac) =
+                iface.base_iface().permanent_mac_address.as_deref()
+            {
+                ret.by_permanent_mac
+                    .entry(MacKey::new(mac))
+                    .or_default()
+                    .push(iface);
+            }
+            if let Some(mac) = iface.base_iface().mac_address.as_deref() {
+                ret.by_mac.entry(MacKey::new(mac)).or_default().push(iface);
+            }
+        }
+        ret
+    }
+
+    pub(crate) fn get_by_name(&self, iface_name: &str) -> &[&'a Interface] {
+        self.by_name
+            .get(iface_name)
+            .map(Vec::as_slice)
+            .unwrap_or_default()
+    }
+
+    // Search kernel interface holding specified MAC address. Prefer
+    // permanent MAC address, fallback to current MAC address.
+    // The `InterfaceType::Unknown` matches all interface types.
+    pub(crate) fn get_by_mac(
+        &self,
+        mac: &str,
+        iface_type: &InterfaceType,
+    ) -> Option<&'a Interface> {
+        let mac = MacKey::new(mac);
+        for index in [&self.by_permanent_mac, &self.by_mac] {
+            if let Some(iface) = index.get(&mac).and_then(|ifaces| {
+                ifaces.iter().find(|i| {
+                    iface_type == &InterfaceType::Unknown
+                        || iface_type == &i.iface_type()
+                })
+            }) {
+                return Some(iface);
+            }
+        }
+        None
+    }
+}
+
+// MAC address in the format of `XX:XX:XX:XX:XX:XX` (up to 8 octets, case
+// insensitive) is stored as integer along with its octet count, others
+// (e.g. 20 octets InfiniBand address) are stored as upper case string.
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+enum MacKey {
+    Int(usize, u64),
+    Str(String),
+}
+
+impl MacKey {
+    fn new(mac: &str) -> Self {
+        let mut value = 0u64;
+        let mut count = 0usize;
+        for octet in mac.split(':') {
+            if count >= 8
+                || octet.len() != 2
+                || !octet.chars().all(|c| c.is_ascii_hexdigit())
+            {
+                return Self::Str(mac.to_ascii_uppercase());
+            }
+            match u8::from_str_radix(octet, 16) {
+                Ok(o) => {
+                    value = (value << 8) | o as u64;
+                    count += 1;
+                }
+                Err(_) => return Self::Str(mac.to_ascii_uppercase()),
+            }
+        }
+        Self::Int(count, value)
+    }
+}
@@ -17,6 +17,8 @@ mod xfrm;
 // The pub(crate) is only for unit test
 mod infiniband;
 pub(crate) mod inter_ifaces_controller;
+mod inter_ifaces_graph;
+mod inter_ifaces_index;
 mod linux_bridge;
 mod mac_vlan;
 mod mac_vtap;
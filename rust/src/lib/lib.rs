@@ -87,6 +87,7 @@ mod deserializer;
 mod dispatch;
 mod dns;
 mod error;
+mod fingerprint;
 #[cfg(feature = "gen_conf")]
 mod gen_conf;
 mod hostname;
@@ -118,11 +119,16 @@ mod state;
 #[cfg(feature = "query_apply")]
 mod statistic;
 mod unit_tests;
+#[cfg(any(feature = "gen_conf", feature = "query_apply"))]
+mod worker_pool;
 
+pub use crate::deserializer::from_json_or_yaml_str;
 pub use crate::dispatch::DispatchConfig;
 pub(crate) use crate::dns::MergedDnsState;
 pub use crate::dns::{DnsClientState, DnsState};
 pub use crate::error::{ErrorKind, NmstateError};
+#[cfg(feature = "gen_conf")]
+pub use crate::gen_conf::GenConfResult;
 pub use crate::hostname::HostNameState;
 pub(crate) use crate::hostname::MergedHostNameState;
 pub use crate::ieee8021x::Ieee8021XConfig;
@@ -177,7 +183,14 @@ pub(crate) use crate::ovs::MergedOvsDbGlobalConfig;
 pub use crate::ovs::{OvsDbGlobalConfig, OvsDbIfaceConfig};
 #[cfg(feature = "query_apply")]
 pub use crate::policy::{
-    NetworkCaptureRules, NetworkPolicy, NetworkStateTemplate,
+    CompiledPolicy, NetworkCaptureRules, NetworkPolicy, NetworkStateTemplate,
+};
+#[cfg(feature = "query_apply")]
+pub(crate) use crate::query_apply::{timings_count, timings_phase};
+#[cfg(feature = "query_apply")]
+pub use crate::query_apply::{
+    NetworkStateCache, NetworkStateChange, NetworkStateMonitor,
+    NmstatePhaseTiming, NmstateTimings,
 };
 pub(crate) use crate::route::MergedRoutes;
 pub use crate::route::{RouteEntry, RouteState, RouteType, Routes};
@@ -124,6 +124,10 @@ pub struct NetworkState {
     pub(crate) running_config_only: bool,
     #[serde(skip)]
     pub(crate) memory_only: bool,
+    #[serde(skip)]
+    pub(crate) no_lldp_neighbors: bool,
+    #[serde(skip)]
+    pub(crate) netns: Option<String>,
 }
 
 impl NetworkState {
@@ -205,6 +209,16 @@ impl NetworkState {
         self
     }
 
+    /// Whether to query LLDP neighbors of interfaces with LLDP enabled in
+    /// [NetworkState::retrieve()]. When set to false, interfaces with LLDP
+    /// enabled are shown with empty neighbor list.
+    /// Ignored when [NetworkState::set_running_config_only()] set to true.
+    /// Default is true.
+    pub fn set_include_lldp_neighbors(&mut self, value: bool) -> &mut Self {
+        self.no_lldp_neighbors = !value;
+        self
+    }
+
     /// When set to true, the network state be applied and only stored in memory
     /// which will be purged after system reboot.
     pub fn set_memory_only(&mut self, value: bool) -> &mut Self {
@@ -212,6 +226,23 @@ impl NetworkState {
         self
     }
 
+    /// Retrieve from or apply to specified network namespace instead of the
+    /// one of current process. The network namespace could be the PID of
+    /// process, absolute path to network namespace file(e.g.
+    /// `/proc/<pid>/ns/net`) or name of network namespace created by
+    /// `ip netns add`.
+    /// Only supported when [NetworkState::set_kernel_only()] set to true.
+    /// Hostname, DNS and OVS database are not retrieved, applying them or
+    /// applying without commit is not supported.
+    pub fn set_netns(&mut self, netns: &str) -> &mut Self {
+        self.netns = Some(netns.to_string());
+        self
+    }
+
+    pub fn netns(&self) -> Option<&str> {
+        self.netns.as_deref()
+    }
+
     /// Create empty [NetworkState]
     pub fn new() -> Self {
         Default::default()
@@ -9,8 +9,8 @@ use crate::{
         veth::nms_veth_conf_to_np,
         vlan::nms_vlan_conf_to_np,
     },
-    ErrorKind, Interface, InterfaceType, MergedInterface, MergedInterfaces,
-    MergedNetworkState, NmstateError,
+    ErrorKind, Interface, InterfaceIpAddr, InterfaceType, MergedInterface,
+    MergedInterfaces, MergedNetworkState, NmstateError,
 };
 
 pub(crate) async fn nispor_apply(
@@ -40,22 +40,38 @@ pub(crate) async fn nispor_apply(
         i.merged.iface_type() != InterfaceType::Unknown && !i.merged.is_absent()
     }) {
         if let Some(iface) = merged_iface.for_apply.as_ref() {
-            np_ifaces.push(nmstate_iface_to_np(iface)?);
+            if let Some(np_iface) =
+                nmstate_iface_to_np_delta(iface, merged_iface.current.as_ref())?
+            {
+                np_ifaces.push(np_iface);
+            }
         }
     }
 
-    let mut net_conf = nispor::NetConf::default();
-    net_conf.ifaces = Some(np_ifaces);
-
-    if merged_state.routes.is_changed() {
-        net_conf.routes = Some(gen_nispor_route_confs(&merged_state.routes)?);
-    }
+    let np_routes = if merged_state.routes.is_changed() {
+        gen_nispor_route_confs(&merged_state.routes, &merged_state.interfaces)?
+    } else {
+        Vec::new()
+    };
 
-    if let Err(e) = net_conf.apply_async().await {
-        return Err(NmstateError::new(
-            ErrorKind::PluginFailure,
-            format!("Unknown error from nipsor plugin: {}, {}", e.kind, e.msg),
-        ));
+    // All interface and route changes are sent in single nispor request
+    if !np_ifaces.is_empty() || !np_routes.is_empty() {
+        let mut net_conf = nispor::NetConf::default();
+        if !np_ifaces.is_empty() {
+            net_conf.ifaces = Some(np_ifaces);
+        }
+        if !np_routes.is_empty() {
+            net_conf.routes = Some(np_routes);
+        }
+        if let Err(e) = net_conf.apply_async().await {
+            return Err(NmstateError::new(
+                ErrorKind::PluginFailure,
+                format!(
+                    "Unknown error from nipsor plugin: {}, {}",
+                    e.kind, e.msg
+                ),
+            ));
+        }
     }
 
     if let Some(running_hostname) = merged_state
@@ -129,6 +145,116 @@ fn nmstate_iface_to_np(
     Ok(np_iface)
 }
 
+// Only include properties different from current interface, so unchanged
+// IP addresses, MAC address, controller, veth and VLAN configurations are not
+// sent to kernel again.
+// Return None if existing interface is up and has nothing to change.
+pub(crate) fn nmstate_iface_to_np_delta(
+    nms_iface: &Interface,
+    cur_iface: Option<&Interface>,
+) -> Result<Option<nispor::IfaceConf>, NmstateError> {
+    let mut np_iface = nmstate_iface_to_np(nms_iface)?;
+    let cur_iface = match cur_iface {
+        Some(c) if matches!(np_iface.state, nispor::IfaceState::Up) => c,
+        _ => return Ok(Some(np_iface)),
+    };
+    let base_iface = nms_iface.base_iface();
+    let cur_base_iface = cur_iface.base_iface();
+
+    if np_iface.ipv4.is_some()
+        && sorted_ip_addrs(
+            base_iface
+                .ipv4
+                .as_ref()
+                .and_then(|i| i.addresses.as_deref()),
+        ) == sorted_ip_addrs(
+            cur_base_iface
+                .ipv4
+                .as_ref()
+                .and_then(|i| i.addresses.as_deref()),
+        )
+    {
+        np_iface.ipv4 = None;
+    }
+    if np_iface.ipv6.is_some()
+        && sorted_ip_addrs(
+            base_iface
+                .ipv6
+                .as_ref()
+                .and_then(|i| i.addresses.as_deref()),
+        ) == sorted_ip_addrs(
+            cur_base_iface
+                .ipv6
+                .as_ref()
+                .and_then(|i| i.addresses.as_deref()),
+        )
+    {
+        np_iface.ipv6 = None;
+    }
+
+    if let (Some(mac), Some(cur_mac)) = (
+        np_iface.mac_address.as_deref(),
+        cur_base_iface.mac_address.as_deref(),
+    ) {
+        if mac.eq_ignore_ascii_case(cur_mac) {
+            np_iface.mac_address = None;
+        }
+    }
+
+    // Empty string means detaching from controller
+    if np_iface.controller.as_deref().filter(|c| !c.is_empty())
+        == cur_base_iface
+            .controller
+            .as_deref()
+            .filter(|c| !c.is_empty())
+    {
+        np_iface.controller = None;
+    }
+
+    match (nms_iface, cur_iface) {
+        (Interface::Ethernet(iface), Interface::Ethernet(cur_iface))
+            if iface.veth == cur_iface.veth =>
+        {
+            np_iface.veth = None;
+        }
+        (Interface::Vlan(iface), Interface::Vlan(cur_iface))
+            if iface.vlan == cur_iface.vlan =>
+        {
+            np_iface.vlan = None;
+        }
+        _ => (),
+    }
+
+    if cur_iface.is_up()
+        && np_iface.ipv4.is_none()
+        && np_iface.ipv6.is_none()
+        && np_iface.mac_address.is_none()
+        && np_iface.controller.is_none()
+        && np_iface.veth.is_none()
+        && np_iface.vlan.is_none()
+    {
+        log::debug!(
+            "Interface {} has no kernel change to apply",
+            nms_iface.name()
+        );
+        Ok(None)
+    } else {
+        Ok(Some(np_iface))
+    }
+}
+
+fn sorted_ip_addrs(
+    addrs: Option<&[InterfaceIpAddr]>,
+) -> Vec<(std::net::IpAddr, u8)> {
+    let mut ret: Vec<(std::net::IpAddr, u8)> = addrs
+        .unwrap_or_default()
+        .iter()
+        .map(|a| (a.ip, a.prefix_length))
+        .collect();
+    ret.sort_unstable();
+    ret
+}
+
 async fn delete_ifaces(
     merged_ifaces: &MergedInterfaces,
 ) -> Result<(), NmstateError> {
@@ -159,6 +285,10 @@ async fn delete_ifaces(
         }
     }
 
+    if np_ifaces.is_empty() {
+        return Ok(());
+    }
+
     let mut net_conf = nispor::NetConf::default();
     net_conf.ifaces = Some(np_ifaces);
 
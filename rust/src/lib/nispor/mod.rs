@@ -1,6 +1,6 @@
 // SPDX-License-Identifier: Apache-2.0
 
-mod apply;
+pub(crate) mod apply;
 mod base_iface;
 mod bond;
 mod dns;
@@ -16,6 +16,7 @@ mod linux_bridge;
 mod linux_bridge_port_vlan;
 mod mac_vlan;
 mod macsec;
+mod monitor;
 mod mptcp;
 mod route;
 mod route_rule;
@@ -27,4 +28,5 @@ mod vxlan;
 
 pub(crate) use apply::nispor_apply;
 pub(crate) use hostname::set_running_hostname;
+pub(crate) use monitor::NetlinkMonitor;
 pub(crate) use show::nispor_retrieve;
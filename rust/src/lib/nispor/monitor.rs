@@ -0,0 +1,103 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::os::unix::io::{AsRawFd, FromRawFd, OwnedFd, RawFd};
+
+use nix::sys::socket::{
+    bind, recv, socket, AddressFamily, MsgFlags, NetlinkAddr, SockFlag,
+    SockProtocol, SockType,
+};
+
+use crate::{ErrorKind, NmstateError};
+
+// Legacy rtnetlink multicast group bit masks from linux/rtnetlink.h
+const RTMGRP_LINK: u32 = 1;
+const RTMGRP_IPV4_IFADDR: u32 = 0x10;
+const RTMGRP_IPV4_ROUTE: u32 = 0x40;
+const RTMGRP_IPV4_RULE: u32 = 0x80;
+const RTMGRP_IPV6_IFADDR: u32 = 0x100;
+const RTMGRP_IPV6_ROUTE: u32 = 0x400;
+// RTNLGRP_IPV6_RULE is 19, has no legacy RTMGRP_ define
+const RTMGRP_IPV6_RULE: u32 = 1 << (19 - 1);
+
+const NETLINK_BUFFER_SIZE: usize = 65536;
+
+// Subscriber of rtnetlink notifications on links, addresses, routes and
+// route rules. The content of notification is not parsed, it is only used
+// to indicate the kernel network state has changed.
+#[derive(Debug)]
+pub(crate) struct NetlinkMonitor {
+    fd: OwnedFd,
+    buffer: Vec<u8>,
+}
+
+impl NetlinkMonitor {
+    pub(crate) fn new() -> Result<Self, NmstateError> {
+        let fd = socket(
+            AddressFamily::Netlink,
+            SockType::Raw,
+            SockFlag::SOCK_CLOEXEC | SockFlag::SOCK_NONBLOCK,
+            SockProtocol::NetlinkRoute,
+        )
+        .map_err(|e| {
+            NmstateError::new(
+                ErrorKind::Bug,
+                format!("Failed to create netlink socket: {e}"),
+            )
+        })?;
+        let fd = unsafe { OwnedFd::from_raw_fd(fd) };
+        let groups = RTMGRP_LINK
+            | RTMGRP_IPV4_IFADDR
+            | RTMGRP_IPV4_ROUTE
+            | RTMGRP_IPV4_RULE
+            | RTMGRP_IPV6_IFADDR
+            | RTMGRP_IPV6_ROUTE
+            | RTMGRP_IPV6_RULE;
+        bind(fd.as_raw_fd(), &NetlinkAddr::new(0, groups)).map_err(|e| {
+            NmstateError::new(
+                ErrorKind::PermissionError,
+                format!("Failed to subscribe rtnetlink notifications: {e}"),
+            )
+        })?;
+        Ok(Self {
+            fd,
+            buffer: vec![0u8; NETLINK_BUFFER_SIZE],
+        })
+    }
+
+    // Read all pending notifications, return true if any.
+    // Overflow of socket receive buffer means notifications were dropped by
+    // kernel, which is also treated as change.
+    pub(crate) fn drain(&mut self) -> Result<bool, NmstateError> {
+        let mut changed = false;
+        loop {
+            match recv(
+                self.fd.as_raw_fd(),
+                self.buffer.as_mut_slice(),
+                MsgFlags::MSG_DONTWAIT,
+            ) {
+                Ok(0) => return Ok(changed),
+                Ok(_) => changed = true,
+                Err(nix::errno::Errno::EAGAIN) => return Ok(changed),
+                Err(nix::errno::Errno::EINTR) => continue,
+                Err(nix::errno::Errno::ENOBUFS) => {
+                    log::debug!("Some rtnetlink notifications were dropped");
+                    changed = true;
+                }
+                Err(e) => {
+                    return Err(NmstateError::new(
+                        ErrorKind::Bug,
+                        format!(
+                            "Failed to receive rtnetlink notifications: {e}"
+                        ),
+                    ));
+                }
+            }
+        }
+    }
+}
+
+impl AsRawFd for NetlinkMonitor {
+    fn as_raw_fd(&self) -> RawFd {
+        self.fd.as_raw_fd()
+    }
+}
@@ -3,7 +3,8 @@
 use log::warn;
 
 use crate::{
-    ErrorKind, MergedRoutes, NmstateError, RouteEntry, RouteType, Routes,
+    ErrorKind, MergedInterfaces, MergedRoutes, NmstateError, RouteEntry,
+    RouteType, Routes,
 };
 
 const SUPPORTED_ROUTE_SCOPE: [nispor::RouteScope; 2] =
@@ -289,11 +290,27 @@ fn nmstate_to_nispor_route_conf(
     Ok(ret)
 }
 
+// Only changed routes are included. Routes to be removed from deleted
+// interfaces are skipped as kernel already removed them along with the
+// interface.
 pub(crate) fn gen_nispor_route_confs(
     merged_routes: &MergedRoutes,
+    merged_ifaces: &MergedInterfaces,
 ) -> Result<Vec<nispor::RouteConf>, NmstateError> {
     let mut ret = Vec::new();
     for nmstate_rt in merged_routes.changed_routes.as_slice() {
+        if nmstate_rt.is_absent()
+            && nmstate_rt
+                .next_hop_iface
+                .as_deref()
+                .and_then(|iface_name| {
+                    merged_ifaces.kernel_ifaces.get(iface_name)
+                })
+                .map(|iface| iface.merged.is_absent())
+                .unwrap_or_default()
+        {
+            continue;
+        }
         ret.push(nmstate_to_nispor_route_conf(nmstate_rt)?)
     }
     Ok(ret)
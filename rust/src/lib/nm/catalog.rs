@@ -0,0 +1,319 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::collections::{HashMap, HashSet};
+
+use super::nm_dbus::{NmActiveConnection, NmConnection, NmIfaceType};
+
+// Index of existing NetworkManager connections built once per apply, so
+// looking up profile of each changed interface does not need to scan all the
+// saved profiles. The indexes store position in the original list, hence
+// lookups could preserve the order of NetworkManager reply.
+#[derive(Debug, Default)]
+pub(crate) struct NmConnectionCatalog<'a> {
+    nm_conns: &'a [NmConnection],
+    by_uuid: HashMap<&'a str, usize>,
+    // Keyed by interface name or connection ID for VPN without interface
+    // name. Please check `profile_key()`.
+    by_name_type: HashMap<(&'a str, NmIfaceType), Vec<usize>>,
+    by_id: HashMap<&'a str, Vec<usize>>,
+    activated_uuids: HashSet<&'a str>,
+}
+
+impl<'a> NmConnectionCatalog<'a> {
+    pub(crate) fn new(
+        nm_conns: &'a [NmConnection],
+        nm_acs: &'a [NmActiveConnection],
+    ) -> Self {
+        let mut ret = Self {
+            nm_conns,
+            activated_uuids: nm_acs
+                .iter()
+                .map(|nm_ac| nm_ac.uuid.as_str())
+                .collect(),
+            ..Default::default()
+        };
+        for (index, nm_conn) in nm_conns.iter().enumerate() {
+            if let Some(uuid) = nm_conn.uuid() {
+                ret.by_uuid.entry(uuid).or_insert(index);
+            }
+            if let Some(key) = profile_key(nm_conn) {
+                ret.by_name_type.entry(key).or_default().push(index);
+            }
+            if let Some(id) = nm_conn.id() {
+                ret.by_id.entry(id).or_default().push(index);
+            }
+        }
+        ret
+    }
+
+    pub(crate) fn get(&self, uuid: &str) -> Option<&'a NmConnection> {
+        self.by_uuid.get(uuid).map(|i| &self.nm_conns[*i])
+    }
+
+    pub(crate) fn is_activated(&self, uuid: &str) -> bool {
+        self.activated_uuids.contains(uuid)
+    }
+
+    #[cfg(feature = "query_apply")]
+    pub(crate) fn get_activated(&self, uuid: &str) -> Option<&'a NmConnection> {
+        if self.is_activated(uuid) {
+            self.get(uuid)
+        } else {
+            None
+        }
+    }
+
+    // Connections using specified interface name(or connection ID for VPN
+    // without interface name) and exact NM interface type.
+    #[cfg(feature = "query_apply")]
+    pub(crate) fn get_by_name_type(
+        &self,
+        name: &str,
+        nm_iface_type: &NmIfaceType,
+    ) -> Vec<&'a NmConnection> {
+        self.indexes_of(name, &[nm_iface_type.clone()])
+            .into_iter()
+            .map(|i| &self.nm_conns[i])
+            .collect()
+    }
+
+    // Connections with specified connection ID regardless of type.
+    pub(crate) fn get_by_id(&self, id: &str) -> Vec<&'a NmConnection> {
+        self.by_id
+            .get(id)
+            .map(|indexes| indexes.iter().map(|i| &self.nm_conns[*i]).collect())
+            .unwrap_or_default()
+    }
+
+    // Found existing profile, prefer the activated one, otherwise the last
+    // one found. Ethernet profile could also be veth.
+    pub(crate) fn get_exist_profile(
+        &self,
+        iface_name: &str,
+        nm_iface_type: &NmIfaceType,
+    ) -> Option<&'a NmConnection> {
+        let indexes = self.exist_profile_indexes(iface_name, nm_iface_type);
+        indexes
+            .iter()
+            .find(|i| {
+                self.nm_conns[**i].uuid().map(|u| self.is_activated(u))
+                    == Some(true)
+            })
+            .or_else(|| indexes.last())
+            .map(|i| &self.nm_conns[*i])
+    }
+
+    // Same as `get_exist_profile()` but ignore activation state.
+    #[cfg(feature = "query_apply")]
+    pub(crate) fn get_last_exist_profile(
+        &self,
+        iface_name: &str,
+        nm_iface_type: &NmIfaceType,
+    ) -> Option<&'a NmConnection> {
+        self.exist_profile_indexes(iface_name, nm_iface_type)
+            .last()
+            .map(|i| &self.nm_conns[*i])
+    }
+
+    // The first profile with specified connection ID and NM interface type.
+    pub(crate) fn get_by_profile_name(
+        &self,
+        profile_name: &str,
+        nm_iface_type: &NmIfaceType,
+    ) -> Option<&'a NmConnection> {
+        self.get_by_id(profile_name)
+            .into_iter()
+            .find(|c| c.iface_type() == Some(nm_iface_type))
+    }
+
+    // The first profile for veth peer, could be ethernet or veth.
+    pub(crate) fn get_veth_peer_profile(
+        &self,
+        peer_name: &str,
+    ) -> Option<&'a NmConnection> {
+        self.indexes_of(peer_name, &[NmIfaceType::Ethernet, NmIfaceType::Veth])
+            .first()
+            .map(|i| &self.nm_conns[*i])
+    }
+
+    fn exist_profile_indexes(
+        &self,
+        iface_name: &str,
+        nm_iface_type: &NmIfaceType,
+    ) -> Vec<usize> {
+        match nm_iface_type {
+            // For VPN, the we use connection id
+            NmIfaceType::Vpn => {
+                self.by_id.get(iface_name).cloned().unwrap_or_default()
+            }
+            NmIfaceType::Ethernet => self.indexes_of(
+                iface_name,
+                &[NmIfaceType::Ethernet, NmIfaceType::Veth],
+            ),
+            _ => self.indexes_of(iface_name, &[nm_iface_type.clone()]),
+        }
+    }
+
+    // Sorted indexes of connections matching name and any of the types.
+    fn indexes_of(
+        &self,
+        name: &str,
+        nm_iface_types: &[NmIfaceType],
+    ) -> Vec<usize> {
+        let mut ret: Vec<usize> = Vec::new();
+        for nm_iface_type in nm_iface_types {
+            if let Some(indexes) =
+                self.by_name_type.get(&(name, nm_iface_type.clone()))
+            {
+                ret.extend(indexes);
+            }
+        }
+        if nm_iface_types.len() > 1 {
+            ret.sort_unstable();
+        }
+        ret
+    }
+}
+
+// Interface name and NM interface type for identifying profiles of the same
+// interface. VPN connection might not have interface name, use connection ID
+// instead.
+pub(crate) fn profile_key(
+    nm_conn: &NmConnection,
+) -> Option<(&str, NmIfaceType)> {
+    let nm_iface_type = nm_conn.iface_type()?;
+    if let Some(name) = nm_conn.iface_name() {
+        Some((name, nm_iface_type.clone()))
+    } else if nm_iface_type == &NmIfaceType::Vpn {
+        nm_conn.id().map(|id| (id, NmIfaceType::Vpn))
+    } else {
+        None
+    }
+}
+
+#[cfg(all(test, feature = "query_apply"))]
+mod tests {
+    use super::super::nm_dbus::{
+        NmActiveConnection, NmConnection, NmIfaceType, NmSettingConnection,
+    };
+    use super::NmConnectionCatalog;
+
+    fn new_nm_conn(
+        uuid: &str,
+        id: &str,
+        iface_name: Option<&str>,
+        iface_type: NmIfaceType,
+    ) -> NmConnection {
+        let mut nm_conn_set = NmSettingConnection::default();
+        nm_conn_set.uuid = Some(uuid.to_string());
+        nm_conn_set.id = Some(id.to_string());
+        nm_conn_set.iface_name = iface_name.map(|n| n.to_string());
+        nm_conn_set.iface_type = Some(iface_type);
+        NmConnection {
+            connection: Some(nm_conn_set),
+            ..Default::default()
+        }
+    }
+
+    fn new_nm_ac(uuid: &str) -> NmActiveConnection {
+        NmActiveConnection {
+            uuid: uuid.to_string(),
+            ..Default::default()
+        }
+    }
+
+    #[test]
+    fn test_catalog_prefer_activated_profile() {
+        let nm_conns = vec![
+            new_nm_conn("uuid1", "eth1", Some("eth1"), NmIfaceType::Ethernet),
+            new_nm_conn("uuid2", "eth1-2", Some("eth1"), NmIfaceType::Ethernet),
+            new_nm_conn("uuid3", "eth1-3", Some("eth1"), NmIfaceType::Ethernet),
+        ];
+        let catalog = NmConnectionCatalog::new(&nm_conns, &[]);
+        assert_eq!(
+            catalog
+                .get_exist_profile("eth1", &NmIfaceType::Ethernet)
+                .and_then(|c| c.uuid()),
+            Some("uuid3")
+        );
+
+        let nm_acs = vec![new_nm_ac("uuid1")];
+        let catalog = NmConnectionCatalog::new(&nm_conns, &nm_acs);
+        assert_eq!(
+            catalog
+                .get_exist_profile("eth1", &NmIfaceType::Ethernet)
+                .and_then(|c| c.uuid()),
+            Some("uuid1")
+        );
+        assert_eq!(
+            catalog
+                .get_last_exist_profile("eth1", &NmIfaceType::Ethernet)
+                .and_then(|c| c.uuid()),
+            Some("uuid3")
+        );
+        assert!(catalog.get_activated("uuid1").is_some());
+        assert!(catalog.get_activated("uuid2").is_none());
+    }
+
+    #[test]
+    fn test_catalog_ethernet_include_veth_in_order() {
+        let nm_conns = vec![
+            new_nm_conn("uuid1", "veth1", Some("veth1"), NmIfaceType::Veth),
+            new_nm_conn(
+                "uuid2",
+                "veth1-eth",
+                Some("veth1"),
+                NmIfaceType::Ethernet,
+            ),
+            new_nm_conn("uuid3", "veth1-2", Some("veth1"), NmIfaceType::Veth),
+        ];
+        let catalog = NmConnectionCatalog::new(&nm_conns, &[]);
+        assert_eq!(
+            catalog
+                .get_exist_profile("veth1", &NmIfaceType::Ethernet)
+                .and_then(|c| c.uuid()),
+            Some("uuid3")
+        );
+        assert_eq!(
+            catalog
+                .get_exist_profile("veth1", &NmIfaceType::Veth)
+                .and_then(|c| c.uuid()),
+            Some("uuid3")
+        );
+        assert_eq!(
+            catalog
+                .get_veth_peer_profile("veth1")
+                .and_then(|c| c.uuid()),
+            Some("uuid1")
+        );
+        assert_eq!(
+            catalog
+                .get_by_name_type("veth1", &NmIfaceType::Ethernet)
+                .len(),
+            1
+        );
+    }
+
+    #[test]
+    fn test_catalog_vpn_by_id() {
+        let nm_conns =
+            vec![new_nm_conn("uuid1", "hosta_vpn", None, NmIfaceType::Vpn)];
+        let catalog = NmConnectionCatalog::new(&nm_conns, &[]);
+        assert_eq!(
+            catalog
+                .get_exist_profile("hosta_vpn", &NmIfaceType::Vpn)
+                .and_then(|c| c.uuid()),
+            Some("uuid1")
+        );
+        assert_eq!(
+            catalog
+                .get_by_name_type("hosta_vpn", &NmIfaceType::Vpn)
+                .len(),
+            1
+        );
+        assert!(catalog.get("uuid1").is_some());
+        assert!(catalog
+            .get_by_profile_name("hosta_vpn", &NmIfaceType::Ethernet)
+            .is_none());
+    }
+}
@@ -3,12 +3,17 @@
 use crate::{ErrorKind, MergedNetworkState, NmstateError};
 
 use super::{
+    catalog::NmConnectionCatalog,
     dns::{store_dns_config_to_iface, store_dns_search_or_option_to_iface},
+    nm_dbus::NmConnection,
     profile::perpare_nm_conns,
     route::store_route_config,
     route_rule::store_route_rule_config,
 };
 
+// Below this count, spawning threads costs more than rendering the keyfiles.
+const GEN_CONF_PARALLEL_MIN_CONNS: usize = 64;
+
 pub(crate) fn nm_gen_conf(
     merged_state: &MergedNetworkState,
 ) -> Result<Vec<(String, String)>, NmstateError> {
@@ -36,12 +41,53 @@ pub(crate) fn nm_gen_conf(
 
     let nm_conns = perpare_nm_conns(
         &merged_state,
-        &Vec::new(),
-        &Vec::new(),
+        &NmConnectionCatalog::default(),
         true, // gen_conf mode
     )?
     .to_store;
 
+    if nm_conns.len() < GEN_CONF_PARALLEL_MIN_CONNS {
+        return nm_conns_to_keyfiles(&nm_conns);
+    }
+
+    // Rendering keyfiles does not depend on each other, split the connections
+    // into chunks and render them on all available CPUs while preserving the
+    // output order.
+    let thread_count = std::thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(1);
+    let chunk_size = (nm_conns.len() + thread_count - 1) / thread_count;
+    let results: Vec<Result<Vec<(String, String)>, NmstateError>> =
+        std::thread::scope(|s| {
+            let handles: Vec<_> = nm_conns
+                .chunks(chunk_size)
+                .map(|chunk| s.spawn(move || nm_conns_to_keyfiles(chunk)))
+                .collect();
+            handles
+                .into_iter()
+                .map(|h| {
+                    h.join().unwrap_or_else(|_| {
+                        Err(NmstateError::new(
+                            ErrorKind::Bug,
+                            "Thread generating NetworkManager keyfiles \
+                            panicked"
+                                .to_string(),
+                        ))
+                    })
+                })
+                .collect()
+        });
+
+    let mut ret = Vec::new();
+    for result in results {
+        ret.extend(result?);
+    }
+    Ok(ret)
+}
+
+fn nm_conns_to_keyfiles(
+    nm_conns: &[NmConnection],
+) -> Result<Vec<(String, String)>, NmstateError> {
     let mut ret = Vec::new();
     for nm_conn in nm_conns {
         match nm_conn.to_keyfile() {
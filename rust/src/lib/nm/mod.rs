@@ -2,6 +2,7 @@
 
 #[cfg(feature = "query_apply")]
 mod active_connection;
+mod catalog;
 #[cfg(feature = "query_apply")]
 mod checkpoint;
 #[cfg(feature = "query_apply")]
@@ -11,6 +12,8 @@ pub(crate) mod dns;
 mod error;
 #[cfg(feature = "gen_conf")]
 mod gen_conf;
+#[cfg(feature = "query_apply")]
+mod monitor;
 #[allow(unused_imports)]
 mod nm_dbus;
 mod profile;
@@ -30,6 +33,8 @@ pub(crate) use checkpoint::{
 #[cfg(feature = "gen_conf")]
 pub(crate) use gen_conf::nm_gen_conf;
 #[cfg(feature = "query_apply")]
+pub(crate) use monitor::NmMonitor;
+#[cfg(feature = "query_apply")]
 pub(crate) use query_apply::nm_apply;
 #[cfg(feature = "query_apply")]
 pub(crate) use show::nm_retrieve;
@@ -0,0 +1,80 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::os::unix::io::{AsRawFd, RawFd};
+
+use nix::poll::{poll, PollFd, PollFlags};
+
+use crate::{ErrorKind, NmstateError};
+
+const NM_DBUS_SERVICE: &str = "org.freedesktop.NetworkManager";
+const DBUS_SERVICE: &str = "org.freedesktop.DBus";
+const DBUS_PATH: &str = "/org/freedesktop/DBus";
+// Stop draining after this many messages, so a flood of signals cannot
+// starve other notification sources.
+const MAX_DRAIN_MESSAGES: usize = 1024;
+
+// Subscriber of D-Bus signals emitted by NetworkManager. The content of
+// signal is not parsed, it is only used to indicate NetworkManager state
+// (devices, active connections, profiles, DNS) has changed.
+pub(crate) struct NmMonitor {
+    connection: zbus::Connection,
+}
+
+impl NmMonitor {
+    pub(crate) fn new() -> Result<Self, NmstateError> {
+        let connection =
+            zbus::Connection::new_system().map_err(parse_dbus_error)?;
+        let rule = format!("type='signal',sender='{NM_DBUS_SERVICE}'");
+        connection
+            .call_method(
+                Some(DBUS_SERVICE),
+                DBUS_PATH,
+                Some(DBUS_SERVICE),
+                "AddMatch",
+                &(rule.as_str()),
+            )
+            .map_err(parse_dbus_error)?;
+        Ok(Self { connection })
+    }
+
+    // Only invoked when the socket is readable. Keep receiving while the
+    // socket is still readable, so a burst of signals is consumed by single
+    // poll of caller. Return true if any signal received.
+    pub(crate) fn drain(&mut self) -> Result<bool, NmstateError> {
+        let mut changed = false;
+        for _ in 0..MAX_DRAIN_MESSAGES {
+            let msg = self
+                .connection
+                .receive_message()
+                .map_err(parse_dbus_error)?;
+            changed |= msg
+                .header()
+                .ok()
+                .and_then(|h| h.message_type().ok())
+                .map(|t| t == zbus::MessageType::Signal)
+                .unwrap_or_default();
+            if !self.is_readable() {
+                break;
+            }
+        }
+        Ok(changed)
+    }
+
+    fn is_readable(&self) -> bool {
+        let mut fds = [PollFd::new(self.as_raw_fd(), PollFlags::POLLIN)];
+        matches!(poll(&mut fds, 0), Ok(n) if n > 0)
+    }
+}
+
+impl AsRawFd for NmMonitor {
+    fn as_raw_fd(&self) -> RawFd {
+        self.connection.as_raw_fd()
+    }
+}
+
+fn parse_dbus_error(e: zbus::Error) -> NmstateError {
+    NmstateError::new(
+        ErrorKind::DependencyError,
+        format!("Failed to monitor NetworkManager D-Bus signals: {e}"),
+    )
+}
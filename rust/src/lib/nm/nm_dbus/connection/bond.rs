@@ -6,7 +6,9 @@ use std::convert::TryFrom;
 use serde::Deserialize;
 use zvariant::Value;
 
-use super::super::{connection::DbusDictionary, NmError, ToDbusValue};
+use super::super::{
+    connection::DbusDictionary, convert::str_map_ref, NmError, ToDbusValue,
+};
 
 #[derive(Debug, Clone, PartialEq, Default, Deserialize)]
 #[serde(try_from = "DbusDictionary")]
@@ -34,7 +36,7 @@ impl TryFrom<DbusDictionary> for NmSettingBond {
 impl ToDbusValue for NmSettingBond {
     fn to_value(&self) -> Result<HashMap<&str, Value>, NmError> {
         let mut ret = HashMap::new();
-        ret.insert("options", Value::from(self.options.clone()));
+        ret.insert("options", Value::from(str_map_ref(&self.options)));
         ret.extend(
             self._other
                 .iter()
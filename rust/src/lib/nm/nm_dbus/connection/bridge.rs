@@ -22,9 +22,7 @@ use serde::Deserialize;
 
 use super::super::{
     connection::DbusDictionary,
-    convert::{
-        mac_str_to_u8_array, own_value_to_bytes_array, u8_array_to_mac_string,
-    },
+    convert::{mac_str_to_u8_array, own_value_to_mac_string},
     NmError, NmVlanProtocol, ToDbusValue,
 };
 
@@ -74,9 +72,8 @@ impl TryFrom<DbusDictionary> for NmSettingBridge {
             group_address: _from_map!(
                 v,
                 "group-address",
-                own_value_to_bytes_array
-            )?
-            .map(u8_array_to_mac_string),
+                own_value_to_mac_string
+            )?,
             group_forward_mask: _from_map!(
                 v,
                 "group-forward-mask",
@@ -35,10 +35,10 @@ impl ToDbusValue for NmSettingHsr {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError> {
         let mut ret = HashMap::new();
         if let Some(v) = &self.port1 {
-            ret.insert("port1", zvariant::Value::new(v.clone()));
+            ret.insert("port1", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = &self.port2 {
-            ret.insert("port2", zvariant::Value::new(v.clone()));
+            ret.insert("port2", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = &self.multicast_spec {
             if *v > 0 {
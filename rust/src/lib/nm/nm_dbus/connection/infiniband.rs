@@ -35,7 +35,7 @@ impl ToDbusValue for NmSettingInfiniBand {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError> {
         let mut ret = HashMap::new();
         if let Some(v) = &self.parent {
-            ret.insert("parent", zvariant::Value::new(v.clone()));
+            ret.insert("parent", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = &self.mode {
             ret.insert("transport-mode", zvariant::Value::new(v));
@@ -35,7 +35,7 @@ impl ToDbusValue for NmSettingIpVlan {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError> {
         let mut ret = HashMap::new();
         if let Some(v) = &self.parent {
-            ret.insert("parent", zvariant::Value::new(v.clone()));
+            ret.insert("parent", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = self.mode {
             ret.insert("mode", zvariant::Value::new(v));
@@ -45,7 +45,7 @@ impl ToDbusValue for NmSettingMacSec {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError> {
         let mut ret = HashMap::new();
         if let Some(v) = &self.parent {
-            ret.insert("parent", zvariant::Value::new(v.clone()));
+            ret.insert("parent", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = &self.mode {
             ret.insert("mode", zvariant::Value::new(*v));
@@ -54,10 +54,10 @@ impl ToDbusValue for NmSettingMacSec {
             ret.insert("encrypt", zvariant::Value::new(*v));
         }
         if let Some(v) = &self.mka_cak {
-            ret.insert("mka-cak", zvariant::Value::new(v.clone()));
+            ret.insert("mka-cak", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = &self.mka_ckn {
-            ret.insert("mka-ckn", zvariant::Value::new(v.clone()));
+            ret.insert("mka-ckn", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = &self.port {
             if *v > 0 {
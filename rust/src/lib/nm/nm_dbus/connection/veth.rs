@@ -29,7 +29,7 @@ impl ToDbusValue for NmSettingVeth {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError> {
         let mut ret = HashMap::new();
         if let Some(v) = &self.peer {
-            ret.insert("peer", zvariant::Value::new(v.clone()));
+            ret.insert("peer", zvariant::Value::new(v.as_str()));
         }
         ret.extend(self._other.iter().map(|(key, value)| {
             (key.as_str(), zvariant::Value::from(value.clone()))
@@ -82,7 +82,7 @@ impl ToDbusValue for NmSettingVlan {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError> {
         let mut ret = HashMap::new();
         if let Some(v) = &self.parent {
-            ret.insert("parent", zvariant::Value::new(v.clone()));
+            ret.insert("parent", zvariant::Value::new(v.as_str()));
         }
         if let Some(id) = self.id {
             ret.insert("id", zvariant::Value::new(id));
@@ -5,7 +5,9 @@ use std::convert::TryFrom;
 
 use serde::Deserialize;
 
-use super::super::{connection::DbusDictionary, NmError, ToDbusValue};
+use super::super::{
+    connection::DbusDictionary, convert::str_map_ref, NmError, ToDbusValue,
+};
 
 #[derive(Debug, Clone, PartialEq, Default, Deserialize)]
 #[serde(try_from = "DbusDictionary")]
@@ -48,16 +50,16 @@ impl ToDbusValue for NmSettingVpn {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError> {
         let mut ret = HashMap::new();
         if let Some(v) = &self.data {
-            ret.insert("data", zvariant::Value::new(v.clone()));
+            ret.insert("data", zvariant::Value::new(str_map_ref(v)));
         }
         if let Some(v) = self.service_type.as_ref() {
-            ret.insert("service-type", zvariant::Value::new(v.clone()));
+            ret.insert("service-type", zvariant::Value::new(v.as_str()));
         }
         if let Some(v) = self.persistent.as_ref() {
             ret.insert("persistent", zvariant::Value::new(*v));
         }
         if let Some(v) = self.secrets.as_ref() {
-            ret.insert("secrets", zvariant::Value::new(v.clone()));
+            ret.insert("secrets", zvariant::Value::new(str_map_ref(v)));
         }
         if let Some(v) = self.timeout.as_ref() {
             ret.insert("timeout", zvariant::Value::new(*v));
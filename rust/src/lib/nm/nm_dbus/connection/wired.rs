@@ -6,10 +6,8 @@ use std::convert::TryFrom;
 use serde::Deserialize;
 
 use super::super::{
-    connection::DbusDictionary,
-    convert::mac_str_to_u8_array,
-    convert::{own_value_to_bytes_array, u8_array_to_mac_string},
-    NmError, ToDbusValue,
+    connection::DbusDictionary, convert::mac_str_to_u8_array,
+    convert::own_value_to_mac_string, NmError, ToDbusValue,
 };
 
 #[derive(Debug, Clone, PartialEq, Default, Deserialize)]
@@ -33,15 +31,9 @@ impl TryFrom<DbusDictionary> for NmSettingWired {
             cloned_mac_address: _from_map!(
                 v,
                 "cloned-mac-address",
-                own_value_to_bytes_array
-            )?
-            .map(u8_array_to_mac_string),
-            mac_address: _from_map!(
-                v,
-                "mac-address",
-                own_value_to_bytes_array
-            )?
-            .map(u8_array_to_mac_string),
+                own_value_to_mac_string
+            )?,
+            mac_address: _from_map!(v, "mac-address", own_value_to_mac_string)?,
             mtu: _from_map!(v, "mtu", u32::try_from)?,
             accept_all_mac_addresses: _from_map!(
                 v,
@@ -21,28 +21,33 @@ use log::error;
 
 use super::NmError;
 
-pub(crate) fn own_value_to_bytes_array(
+const HEX_CHARS: &[u8; 16] = b"0123456789ABCDEF";
+
+// Format the D-Bus byte array into MAC address string directly without
+// storing the bytes into intermediate Vec.
+pub(crate) fn own_value_to_mac_string(
     value: zvariant::OwnedValue,
-) -> Result<Vec<u8>, NmError> {
-    Ok(zvariant::Array::try_from(value)?
-        .iter()
-        .filter_map(|val| {
-            if let zvariant::Value::U8(i) = val {
-                return Some(i);
-            }
-            None
-        })
-        .copied()
-        .collect())
+) -> Result<String, NmError> {
+    let array = zvariant::Array::try_from(value)?;
+    Ok(u8_iter_to_mac_string(array.iter().filter_map(|val| {
+        if let zvariant::Value::U8(i) = val {
+            return Some(*i);
+        }
+        None
+    })))
 }
 
-pub(crate) fn u8_array_to_mac_string(data: Vec<u8>) -> String {
-    // TODO replace collect().join(":") with intersperse(":").collect() once it
-    // is stabilized
-    data.iter()
-        .map(|byte| format!("{byte:02X}"))
-        .collect::<Vec<_>>()
-        .join(":")
+pub(crate) fn u8_iter_to_mac_string(data: impl Iterator<Item = u8>) -> String {
+    // Ethernet MAC address is 6 bytes, each takes 3 chars except the last one
+    let mut ret = String::with_capacity(17);
+    for byte in data {
+        if !ret.is_empty() {
+            ret.push(':');
+        }
+        ret.push(HEX_CHARS[(byte >> 4) as usize] as char);
+        ret.push(HEX_CHARS[(byte & 0xf) as usize] as char);
+    }
+    ret
 }
 
 pub(crate) fn mac_str_to_u8_array(mac: &str) -> Vec<u8> {
@@ -62,6 +67,32 @@ pub(crate) fn mac_str_to_u8_array(mac: &str) -> Vec<u8> {
     }
 }
 
+// Borrow the string dictionary for encoding as D-Bus `a{ss}` without cloning.
+pub(crate) fn str_map_ref(
+    map: &HashMap<String, String>,
+) -> HashMap<&str, &str> {
+    map.iter().map(|(k, v)| (k.as_str(), v.as_str())).collect()
+}
+
 pub(crate) trait ToDbusValue {
     fn to_value(&self) -> Result<HashMap<&str, zvariant::Value>, NmError>;
 }
+
+#[cfg(test)]
+mod tests {
+    use super::{mac_str_to_u8_array, u8_iter_to_mac_string};
+
+    #[test]
+    fn test_mac_string_u8_array_round_trip() {
+        let mac = "00:1A:2B:3C:4D:FF";
+        let bytes = mac_str_to_u8_array(mac);
+        assert_eq!(bytes, vec![0x00, 0x1a, 0x2b, 0x3c, 0x4d, 0xff]);
+        assert_eq!(u8_iter_to_mac_string(bytes.into_iter()), mac);
+    }
+
+    #[test]
+    fn test_mac_string_from_empty_or_invalid() {
+        assert_eq!(u8_iter_to_mac_string(std::iter::empty()), "");
+        assert!(mac_str_to_u8_array("00:1A:ZZ").is_empty());
+    }
+}
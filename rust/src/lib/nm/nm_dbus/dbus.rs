@@ -30,14 +30,6 @@ pub(crate) const NM_DBUS_INTERFACE_DEV: &str =
 
 const NM_DBUS_INTERFACE_DEVICE: &str = "org.freedesktop.NetworkManager.Device";
 
-const NM_SETTINGS_CREATE2_FLAGS_TO_DISK: u32 = 1;
-const NM_SETTINGS_CREATE2_FLAGS_IN_MEMORY: u32 = 2;
-const NM_SETTINGS_CREATE2_FLAGS_BLOCK_AUTOCONNECT: u32 = 32;
-
-const NM_SETTINGS_UPDATE2_FLAGS_TO_DISK: u32 = 1;
-const NM_SETTINGS_UPDATE2_FLAGS_IN_MEMORY: u32 = 2;
-const NM_SETTINGS_UPDATE2_FLAGS_BLOCK_AUTOCONNECT: u32 = 32;
-
 pub(crate) struct NmDbus<'a> {
     pub(crate) connection: zbus::Connection,
     proxy: NetworkManagerProxy<'a>,
@@ -191,78 +183,6 @@ impl NmDbus<'_> {
             .collect())
     }
 
-    pub(crate) fn connection_deactivate(
-        &self,
-        nm_ac: &str,
-    ) -> Result<(), NmError> {
-        Ok(self.proxy.deactivate_connection(&str_to_obj_path(nm_ac)?)?)
-    }
-
-    pub(crate) fn connection_add(
-        &self,
-        nm_conn: &NmConnection,
-        memory_only: bool,
-    ) -> Result<(), NmError> {
-        let value = nm_conn.to_value()?;
-        let flags = NM_SETTINGS_CREATE2_FLAGS_BLOCK_AUTOCONNECT
-            + if memory_only {
-                NM_SETTINGS_CREATE2_FLAGS_IN_MEMORY
-            } else {
-                NM_SETTINGS_CREATE2_FLAGS_TO_DISK
-            };
-        self.setting_proxy
-            .add_connection2(value, flags, HashMap::new())?;
-        Ok(())
-    }
-
-    pub(crate) fn connection_delete(
-        &self,
-        con_obj_path: &str,
-    ) -> Result<(), NmError> {
-        debug!("connection_delete: {}", con_obj_path);
-        let proxy = zbus::Proxy::new(
-            &self.connection,
-            NM_DBUS_INTERFACE_ROOT,
-            con_obj_path,
-            NM_DBUS_INTERFACE_SETTING,
-        )?;
-        Ok(proxy.call::<(), ()>("Delete", &())?)
-    }
-
-    pub(crate) fn connection_update(
-        &self,
-        con_obj_path: &str,
-        nm_conn: &NmConnection,
-        memory_only: bool,
-    ) -> Result<(), NmError> {
-        let value = nm_conn.to_value()?;
-        let proxy = zbus::Proxy::new(
-            &self.connection,
-            NM_DBUS_INTERFACE_ROOT,
-            con_obj_path,
-            NM_DBUS_INTERFACE_SETTING,
-        )?;
-        let flags = NM_SETTINGS_UPDATE2_FLAGS_BLOCK_AUTOCONNECT
-            + if memory_only {
-                NM_SETTINGS_UPDATE2_FLAGS_IN_MEMORY
-            } else {
-                NM_SETTINGS_UPDATE2_FLAGS_TO_DISK
-            };
-        proxy.call::<(
-                NmConnectionDbusValue,
-                u32,
-                HashMap<&str, zvariant::Value>,
-            ), HashMap<String, zvariant::OwnedValue>>(
-                "Update2",
-                &(
-                    value,
-                    flags,
-                    HashMap::new()
-                ),
-            )?;
-        Ok(())
-    }
-
     pub(crate) fn nm_dev_obj_paths_get(&self) -> Result<Vec<String>, NmError> {
         Ok(self
             .proxy
@@ -1,6 +1,8 @@
 // SPDX-License-Identifier: Apache-2.0
 
+use std::collections::HashMap;
 use std::convert::TryFrom;
+use std::sync::atomic::{AtomicUsize, Ordering};
 use std::time::{Duration, Instant};
 
 use log::debug;
@@ -15,12 +17,18 @@ use super::{
     dns::{NmDnsEntry, NmGlobalDnsConfig},
     error::{ErrorKind, NmError},
     lldp::NmLldpNeighbor,
-    query_apply::device::{
-        nm_dev_delete, nm_dev_from_obj_path, nm_dev_get_llpd,
+    query_apply::{
+        connection::{nm_ac_deactivate, nm_conn_add_or_update, nm_conn_delete},
+        device::{nm_dev_delete, nm_dev_from_obj_path, nm_dev_get_llpd},
     },
     NmIfaceType,
 };
 
+// Maximum number of D-Bus calls in flight
+const NM_DBUS_CALL_WINDOW: usize = 16;
+// Number of D-Bus calls between checkpoint timeout extending
+const NM_DBUS_CALL_CHUNK_SIZE: usize = 128;
+
 pub struct NmApi<'a> {
     pub(crate) dbus: NmDbus<'a>,
     checkpoint: Option<String>,
@@ -116,15 +124,26 @@ impl NmApi<'_> {
         self.dbus.connection_activate(&nm_conn)
     }
 
-    pub fn connection_deactivate(&mut self, uuid: &str) -> Result<(), NmError> {
-        debug!("connection_deactivate: {}", uuid);
+    // Deactivate multiple connections concurrently. Connections not
+    // activated are ignored. The output follows the order of `uuids`.
+    pub fn connections_deactivate(
+        &mut self,
+        uuids: &[&str],
+    ) -> Result<Vec<Result<(), NmError>>, NmError> {
+        debug!("connections_deactivate: {:?}", uuids);
         self.extend_timeout_if_required()?;
-        if let Ok(nm_ac) = get_nm_ac_obj_path_by_uuid(&self.dbus, uuid) {
-            if !nm_ac.is_empty() {
-                self.dbus.connection_deactivate(&nm_ac)?;
-            }
-        }
-        Ok(())
+        let nm_ac_obj_paths = get_nm_ac_obj_paths_by_uuid(&self.dbus)?;
+        let nm_ac_obj_paths: Vec<Option<&str>> = uuids
+            .iter()
+            .map(|uuid| nm_ac_obj_paths.get(*uuid).map(|p| p.as_str()))
+            .collect();
+        self.concurrent_calls(
+            nm_ac_obj_paths.as_slice(),
+            |dbus_conn, nm_ac_obj_path| match nm_ac_obj_path {
+                Some(p) => nm_ac_deactivate(dbus_conn, p),
+                None => Ok(()),
+            },
+        )
     }
 
     pub fn connections_get(&mut self) -> Result<Vec<NmConnection>, NmError> {
@@ -186,34 +205,36 @@ impl NmApi<'_> {
         Ok(nm_conns)
     }
 
-    pub fn connection_add(
+    // Create or update(when `NmConnection.obj_path` is not empty) multiple
+    // connections concurrently. The output follows the order of `nm_conns`.
+    pub fn connections_add(
         &mut self,
-        nm_conn: &NmConnection,
+        nm_conns: &[NmConnection],
         memory_only: bool,
-    ) -> Result<(), NmError> {
-        debug!("connection_add: {:?}", nm_conn);
-        self.extend_timeout_if_required()?;
-        if !nm_conn.obj_path.is_empty() {
-            self.dbus.connection_update(
-                nm_conn.obj_path.as_str(),
-                nm_conn,
-                memory_only,
-            )
-        } else {
-            self.dbus.connection_add(nm_conn, memory_only)
-        }
+    ) -> Result<Vec<Result<(), NmError>>, NmError> {
+        debug!("connections_add: {:?}", nm_conns);
+        self.concurrent_calls(nm_conns, |dbus_conn, nm_conn| {
+            nm_conn_add_or_update(dbus_conn, nm_conn, memory_only)
+        })
     }
 
-    pub fn connection_delete(&mut self, uuid: &str) -> Result<(), NmError> {
-        debug!("connection_delete: {}", uuid);
-        self.extend_timeout_if_required()?;
-        if let Ok(con_obj_path) = self.dbus.get_conn_obj_path_by_uuid(uuid) {
-            debug!("Found nm_connection {} for UUID {}", con_obj_path, uuid);
-            if !con_obj_path.is_empty() {
-                self.dbus.connection_delete(&con_obj_path)?;
+    // Delete multiple connections concurrently using their object paths.
+    // Connections already gone are ignored. The output follows the order of
+    // `con_obj_paths`.
+    pub fn connections_delete(
+        &mut self,
+        con_obj_paths: &[&str],
+    ) -> Result<Vec<Result<(), NmError>>, NmError> {
+        debug!("connections_delete: {:?}", con_obj_paths);
+        self.concurrent_calls(con_obj_paths, |dbus_conn, con_obj_path| {
+            match nm_conn_delete(dbus_conn, con_obj_path) {
+                Err(e) if e.kind == ErrorKind::NotFound => {
+                    debug!("Connection {} already deleted", con_obj_path);
+                    Ok(())
+                }
+                result => result,
             }
-        }
-        Ok(())
+        })
     }
 
     pub fn connection_reapply(
@@ -307,12 +328,55 @@ impl NmApi<'_> {
         nm_dev_delete(&self.dbus.connection, nm_dev_obj_path)
     }
 
-    pub fn device_lldp_neighbor_get(
+    // Query LLDP neighbors of multiple devices concurrently using the same
+    // D-Bus connection. The output follows the order of `nm_dev_obj_paths`.
+    pub fn devices_lldp_neighbor_get(
         &mut self,
-        nm_dev_obj_path: &str,
-    ) -> Result<Vec<NmLldpNeighbor>, NmError> {
+        nm_dev_obj_paths: &[&str],
+    ) -> Result<Vec<Vec<NmLldpNeighbor>>, NmError> {
         self.extend_timeout_if_required()?;
-        nm_dev_get_llpd(&self.dbus.connection, nm_dev_obj_path)
+        let dbus_conn = &self.dbus.connection;
+        let thread_count = std::thread::available_parallelism()
+            .map(|n| n.get())
+            .unwrap_or(1)
+            .min(nm_dev_obj_paths.len());
+        if thread_count <= 1 {
+            return nm_dev_obj_paths
+                .iter()
+                .map(|obj_path| nm_dev_get_llpd(dbus_conn, obj_path))
+                .collect();
+        }
+        let chunk_size =
+            (nm_dev_obj_paths.len() + thread_count - 1) / thread_count;
+        std::thread::scope(|s| {
+            let handles: Vec<_> = nm_dev_obj_paths
+                .chunks(chunk_size)
+                .map(|obj_paths| {
+                    s.spawn(move || {
+                        obj_paths
+                            .iter()
+                            .map(|obj_path| {
+                                nm_dev_get_llpd(dbus_conn, obj_path)
+                            })
+                            .collect::<Result<Vec<_>, NmError>>()
+                    })
+                })
+                .collect();
+            let mut ret = Vec::new();
+            for handle in handles {
+                match handle.join() {
+                    Ok(neighbors) => ret.extend(neighbors?),
+                    Err(_) => {
+                        return Err(NmError::new(
+                            ErrorKind::Bug,
+                            "Thread querying LLDP neighbors panicked"
+                                .to_string(),
+                        ));
+                    }
+                }
+            }
+            Ok(ret)
+        })
     }
 
     // If any device is with NewActivation or IpConfig state,
@@ -410,6 +474,70 @@ impl NmApi<'_> {
         self.dbus.set_global_dns_configuration(config.to_value()?)
     }
 
+    // Invoke `call` on each item using a bounded window of concurrent D-Bus
+    // calls sharing the same D-Bus connection. Items are processed in chunks,
+    // so checkpoint timeout could be extended between chunks. Errors are
+    // collected per item, the output follows the order of `items`.
+    fn concurrent_calls<T, F>(
+        &mut self,
+        items: &[T],
+        call: F,
+    ) -> Result<Vec<Result<(), NmError>>, NmError>
+    where
+        T: Sync,
+        F: Fn(&zbus::Connection, &T) -> Result<(), NmError> + Sync,
+    {
+        let mut ret = Vec::with_capacity(items.len());
+        for chunk in items.chunks(NM_DBUS_CALL_CHUNK_SIZE) {
+            self.extend_timeout_if_required()?;
+            let dbus_conn = &self.dbus.connection;
+            let window = NM_DBUS_CALL_WINDOW.min(chunk.len());
+            if window <= 1 {
+                ret.extend(chunk.iter().map(|item| call(dbus_conn, item)));
+                continue;
+            }
+            let next_index = AtomicUsize::new(0);
+            let mut results: Vec<(usize, Result<(), NmError>)> =
+                std::thread::scope(|s| {
+                    let handles: Vec<_> = (0..window)
+                        .map(|_| {
+                            s.spawn(|| {
+                                let mut results = Vec::new();
+                                loop {
+                                    let index = next_index
+                                        .fetch_add(1, Ordering::Relaxed);
+                                    match chunk.get(index) {
+                                        Some(item) => results.push((
+                                            index,
+                                            call(dbus_conn, item),
+                                        )),
+                                        None => return results,
+                                    }
+                                }
+                            })
+                        })
+                        .collect();
+                    let mut results = Vec::with_capacity(chunk.len());
+                    for handle in handles {
+                        match handle.join() {
+                            Ok(r) => results.extend(r),
+                            Err(_) => {
+                                return Err(NmError::new(
+                                    ErrorKind::Bug,
+                                    "Thread invoking D-Bus call panicked"
+                                        .to_string(),
+                                ));
+                            }
+                        }
+                    }
+                    Ok(results)
+                })?;
+            results.sort_unstable_by_key(|(index, _)| *index);
+            ret.extend(results.into_iter().map(|(_, result)| result));
+        }
+        Ok(ret)
+    }
+
     // We have to search all NmDevice because OVS port might hold identical
     // interface name as OVS system interface.
     fn get_disk_obj_path(
@@ -435,16 +563,19 @@ impl NmApi<'_> {
     }
 }
 
-fn get_nm_ac_obj_path_by_uuid(
+// Index object path of active connections by UUID
+fn get_nm_ac_obj_paths_by_uuid(
     dbus: &NmDbus,
-    uuid: &str,
-) -> Result<String, NmError> {
-    let nm_ac_obj_paths = dbus.active_connections()?;
-
-    for nm_ac_obj_path in nm_ac_obj_paths {
-        if nm_ac_obj_path_uuid_get(&dbus.connection, &nm_ac_obj_path)? == uuid {
-            return Ok(nm_ac_obj_path);
+) -> Result<HashMap<String, String>, NmError> {
+    let mut ret = HashMap::new();
+    for nm_ac_obj_path in dbus.active_connections()? {
+        // Race: Active connection might just been deleted, hence we ignore
+        // error here
+        if let Ok(uuid) =
+            nm_ac_obj_path_uuid_get(&dbus.connection, &nm_ac_obj_path)
+        {
+            ret.insert(uuid, nm_ac_obj_path);
         }
     }
-    Ok("".into())
+    Ok(ret)
 }
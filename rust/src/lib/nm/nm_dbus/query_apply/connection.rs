@@ -0,0 +1,130 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::collections::HashMap;
+use std::convert::TryFrom;
+
+use super::super::{
+    connection::NmConnectionDbusValue,
+    dbus::{NM_DBUS_INTERFACE_ROOT, NM_DBUS_INTERFACE_SETTING},
+    ErrorKind, NmConnection, NmError,
+};
+
+const NM_DBUS_PATH_ROOT: &str = "/org/freedesktop/NetworkManager";
+const NM_DBUS_PATH_SETTINGS: &str = "/org/freedesktop/NetworkManager/Settings";
+const NM_DBUS_INTERFACE_SETTINGS: &str =
+    "org.freedesktop.NetworkManager.Settings";
+
+const DBUS_ERR_UNKNOWN_OBJECT: &str =
+    "org.freedesktop.DBus.Error.UnknownObject";
+const DBUS_ERR_UNKNOWN_METHOD: &str =
+    "org.freedesktop.DBus.Error.UnknownMethod";
+
+const NM_SETTINGS_CREATE2_FLAGS_TO_DISK: u32 = 1;
+const NM_SETTINGS_CREATE2_FLAGS_IN_MEMORY: u32 = 2;
+const NM_SETTINGS_CREATE2_FLAGS_BLOCK_AUTOCONNECT: u32 = 32;
+
+const NM_SETTINGS_UPDATE2_FLAGS_TO_DISK: u32 = 1;
+const NM_SETTINGS_UPDATE2_FLAGS_IN_MEMORY: u32 = 2;
+const NM_SETTINGS_UPDATE2_FLAGS_BLOCK_AUTOCONNECT: u32 = 32;
+
+// Update the connection if it has object path, otherwise create new one.
+pub(crate) fn nm_conn_add_or_update(
+    dbus_conn: &zbus::Connection,
+    nm_conn: &NmConnection,
+    memory_only: bool,
+) -> Result<(), NmError> {
+    let value = nm_conn.to_value()?;
+    if nm_conn.obj_path.is_empty() {
+        let proxy = zbus::Proxy::new(
+            dbus_conn,
+            NM_DBUS_INTERFACE_ROOT,
+            NM_DBUS_PATH_SETTINGS,
+            NM_DBUS_INTERFACE_SETTINGS,
+        )?;
+        let flags = NM_SETTINGS_CREATE2_FLAGS_BLOCK_AUTOCONNECT
+            + if memory_only {
+                NM_SETTINGS_CREATE2_FLAGS_IN_MEMORY
+            } else {
+                NM_SETTINGS_CREATE2_FLAGS_TO_DISK
+            };
+        proxy.call::<(
+            NmConnectionDbusValue,
+            u32,
+            HashMap<&str, zvariant::Value>,
+        ), (
+            zvariant::OwnedObjectPath,
+            HashMap<String, zvariant::OwnedValue>,
+        )>("AddConnection2", &(value, flags, HashMap::new()))?;
+    } else {
+        let proxy = zbus::Proxy::new(
+            dbus_conn,
+            NM_DBUS_INTERFACE_ROOT,
+            nm_conn.obj_path.as_str(),
+            NM_DBUS_INTERFACE_SETTING,
+        )?;
+        let flags = NM_SETTINGS_UPDATE2_FLAGS_BLOCK_AUTOCONNECT
+            + if memory_only {
+                NM_SETTINGS_UPDATE2_FLAGS_IN_MEMORY
+            } else {
+                NM_SETTINGS_UPDATE2_FLAGS_TO_DISK
+            };
+        proxy.call::<(
+            NmConnectionDbusValue,
+            u32,
+            HashMap<&str, zvariant::Value>,
+        ), HashMap<String, zvariant::OwnedValue>>(
+            "Update2",
+            &(value, flags, HashMap::new()),
+        )?;
+    }
+    Ok(())
+}
+
+// Return error with `ErrorKind::NotFound` if connection is already gone.
+pub(crate) fn nm_conn_delete(
+    dbus_conn: &zbus::Connection,
+    con_obj_path: &str,
+) -> Result<(), NmError> {
+    let proxy = zbus::Proxy::new(
+        dbus_conn,
+        NM_DBUS_INTERFACE_ROOT,
+        con_obj_path,
+        NM_DBUS_INTERFACE_SETTING,
+    )?;
+    match proxy.call::<(), ()>("Delete", &()) {
+        Ok(()) => Ok(()),
+        Err(zbus::Error::MethodError(ref error_type, ..))
+            if error_type == DBUS_ERR_UNKNOWN_OBJECT
+                || error_type == DBUS_ERR_UNKNOWN_METHOD =>
+        {
+            Err(NmError::new(
+                ErrorKind::NotFound,
+                format!("Connection {con_obj_path} not found"),
+            ))
+        }
+        Err(e) => Err(e.into()),
+    }
+}
+
+pub(crate) fn nm_ac_deactivate(
+    dbus_conn: &zbus::Connection,
+    nm_ac_obj_path: &str,
+) -> Result<(), NmError> {
+    let proxy = zbus::Proxy::new(
+        dbus_conn,
+        NM_DBUS_INTERFACE_ROOT,
+        NM_DBUS_PATH_ROOT,
+        NM_DBUS_INTERFACE_ROOT,
+    )?;
+    let nm_ac_obj_path = zvariant::ObjectPath::try_from(nm_ac_obj_path)
+        .map_err(|e| {
+            NmError::new(
+                ErrorKind::InvalidArgument,
+                format!("Invalid object path: {e}"),
+            )
+        })?;
+    Ok(proxy.call::<zvariant::ObjectPath, ()>(
+        "DeactivateConnection",
+        &nm_ac_obj_path,
+    )?)
+}
@@ -1,3 +1,4 @@
 // SPDX-License-Identifier: Apache-2.0
 
+pub(crate) mod connection;
 pub(crate) mod device;
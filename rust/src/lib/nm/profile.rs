@@ -1,6 +1,7 @@
 // SPDX-License-Identifier: Apache-2.0
 
-use super::nm_dbus::{NmActiveConnection, NmConnection};
+use super::catalog::NmConnectionCatalog;
+use super::nm_dbus::NmConnection;
 use super::settings::{
     fix_ip_dhcp_timeout, get_exist_profile, iface_to_nm_connections,
 };
@@ -19,16 +20,12 @@ pub(crate) struct PerparedNmConnections {
 
 pub(crate) fn perpare_nm_conns(
     merged_state: &MergedNetworkState,
-    exist_nm_conns: &[NmConnection],
-    nm_acs: &[NmActiveConnection],
+    catalog: &NmConnectionCatalog,
     gen_conf_mode: bool,
 ) -> Result<PerparedNmConnections, NmstateError> {
     let mut nm_conns_to_update: Vec<NmConnection> = Vec::new();
     let mut nm_conns_to_activate: Vec<NmConnection> = Vec::new();
 
-    let nm_ac_uuids: Vec<&str> =
-        nm_acs.iter().map(|nm_ac| &nm_ac.uuid as &str).collect();
-
     let mut ifaces: Vec<&MergedInterface> = merged_state
         .interfaces
         .iter()
@@ -52,10 +49,9 @@ pub(crate) fn perpare_nm_conns(
         .filter(|iface| iface.merged.is_down())
         .filter_map(|iface| {
             get_exist_profile(
-                exist_nm_conns,
+                catalog,
                 &iface.merged.base_iface().name,
                 &iface.merged.base_iface().iface_type,
-                &nm_ac_uuids,
             )
         })
         .cloned()
@@ -73,8 +69,7 @@ pub(crate) fn perpare_nm_conns(
         for mut nm_conn in iface_to_nm_connections(
             merged_iface,
             merged_state,
-            exist_nm_conns,
-            &nm_ac_uuids,
+            catalog,
             gen_conf_mode,
         )? {
             if iface.is_up()
@@ -82,7 +77,7 @@ pub(crate) fn perpare_nm_conns(
                     merged_iface,
                     &merged_state.interfaces,
                     &nm_conn,
-                    exist_nm_conns,
+                    catalog,
                 )
             {
                 nm_conns_to_activate.push(nm_conn.clone());
@@ -121,7 +116,7 @@ fn can_skip_activation(
     merged_iface: &MergedInterface,
     merged_ifaces: &MergedInterfaces,
     nm_conn: &NmConnection,
-    exist_nm_conns: &[NmConnection],
+    catalog: &NmConnectionCatalog,
 ) -> bool {
     // if the controller is desired to be down or absent, activating the
     // connection on the port will risk making the controller activate again,
@@ -152,7 +147,7 @@ fn can_skip_activation(
     // Reapply of connection never reactivate its subordinates, hence we do not
     // skip activation when modifying the connection.
     if let Some(uuid) = nm_conn.uuid() {
-        if exist_nm_conns.iter().any(|c| c.uuid() == Some(uuid)) {
+        if catalog.get(uuid).is_some() {
             return false;
         }
     }
@@ -3,6 +3,7 @@
 use std::collections::HashSet;
 
 use super::super::{
+    catalog::NmConnectionCatalog,
     device::create_index_for_nm_devs,
     dns::{store_dns_config_to_iface, store_dns_search_or_option_to_iface},
     error::nm_error_to_nmstate,
@@ -19,7 +20,7 @@ use super::super::{
         is_ipvlan_changed, is_mptcp_flags_changed, is_route_removed,
         is_veth_peer_changed, is_vlan_changed, is_vrf_table_id_changed,
         is_vxlan_changed,
-        profile::is_uuid,
+        profile::{delete_profiles, is_uuid},
         save_nm_profiles,
         vpn::get_match_ipsec_nm_conn,
     },
@@ -29,8 +30,8 @@ use super::super::{
 };
 
 use crate::{
-    InterfaceIdentifier, InterfaceType, MergedInterfaces, MergedNetworkState,
-    NmstateError,
+    timings_phase, InterfaceIdentifier, InterfaceType, MergedInterfaces,
+    MergedNetworkState, NmstateError,
 };
 
 // There is plan to simply the `add_net_state`, `chg_net_state`, `del_net_state`
@@ -49,6 +50,7 @@ pub(crate) async fn nm_apply(
     nm_api.set_checkpoint_auto_refresh(true);
 
     if !merged_state.memory_only {
+        let _phase = timings_phase("nm-apply.delete-ifaces");
         delete_ifaces(&mut nm_api, merged_state)?;
     }
 
@@ -68,12 +70,15 @@ pub(crate) async fn nm_apply(
         }
     }
 
+    let retrieve_phase = timings_phase("nm-apply.retrieve");
     let exist_nm_conns =
         nm_api.connections_get().map_err(nm_error_to_nmstate)?;
     let nm_acs = nm_api
         .active_connections_get()
         .map_err(nm_error_to_nmstate)?;
     let nm_devs = nm_api.devices_get().map_err(nm_error_to_nmstate)?;
+    drop(retrieve_phase);
+    let nm_conn_catalog = NmConnectionCatalog::new(&exist_nm_conns, &nm_acs);
 
     let mut merged_state = merged_state.clone();
 
@@ -127,61 +132,61 @@ pub(crate) async fn nm_apply(
             )?;
         }
     }
+    let prepare_phase = timings_phase("nm-apply.prepare-profiles");
     let PerparedNmConnections {
         to_store: nm_conns_to_store,
         to_activate: nm_conns_to_activate,
         to_deactivate: nm_conns_to_deactivate,
-    } = perpare_nm_conns(
-        &merged_state,
-        exist_nm_conns.as_slice(),
-        nm_acs.as_slice(),
-        false,
-    )?;
-
-    let nm_ac_uuids: Vec<&str> =
-        nm_acs.iter().map(|nm_ac| &nm_ac.uuid as &str).collect();
-    let activated_nm_conns: Vec<&NmConnection> = exist_nm_conns
-        .iter()
-        .filter(|c| {
-            if let Some(uuid) = c.uuid() {
-                nm_ac_uuids.contains(&uuid)
-            } else {
-                false
-            }
-        })
-        .collect();
+    } = perpare_nm_conns(&merged_state, &nm_conn_catalog, false)?;
+
     let nm_conns_to_deactivate_first = gen_nm_conn_need_to_deactivate_first(
         &merged_state.interfaces,
         nm_conns_to_activate.as_slice(),
-        activated_nm_conns.as_slice(),
+        &nm_conn_catalog,
     );
-    deactivate_nm_profiles(
-        &mut nm_api,
-        nm_conns_to_deactivate_first.as_slice(),
-    )?;
-
-    save_nm_profiles(
-        &mut nm_api,
-        nm_conns_to_store.as_slice(),
-        merged_state.memory_only,
-    )?;
+    drop(prepare_phase);
+
+    {
+        let _phase = timings_phase("nm-apply.deactivate-profiles");
+        deactivate_nm_profiles(
+            &mut nm_api,
+            nm_conns_to_deactivate_first.as_slice(),
+        )?;
+    }
+
+    {
+        let _phase = timings_phase("nm-apply.save-profiles");
+        save_nm_profiles(
+            &mut nm_api,
+            nm_conns_to_store.as_slice(),
+            merged_state.memory_only,
+        )?;
+    }
     if !merged_state.memory_only {
+        let _phase = timings_phase("nm-apply.delete-profiles");
         delete_exist_profiles(
             &mut nm_api,
-            &exist_nm_conns,
+            &nm_conn_catalog,
             &nm_conns_to_store,
         )?;
         delete_orphan_ovs_ports(
             &mut nm_api,
             &merged_state.interfaces,
-            &exist_nm_conns,
+            &nm_conn_catalog,
             &nm_conns_to_activate,
         )?;
     }
 
-    activate_nm_profiles(&mut nm_api, nm_conns_to_activate.as_slice()).await?;
+    {
+        let _phase = timings_phase("nm-apply.activate-profiles");
+        activate_nm_profiles(&mut nm_api, nm_conns_to_activate.as_slice())
+            .await?;
+    }
 
-    deactivate_nm_profiles(&mut nm_api, nm_conns_to_deactivate.as_slice())?;
+    {
+        let _phase = timings_phase("nm-apply.deactivate-profiles");
+        deactivate_nm_profiles(&mut nm_api, nm_conns_to_deactivate.as_slice())?;
+    }
 
     apply_dispatch_script(&merged_state.interfaces)?;
 
@@ -316,11 +321,12 @@ fn delete_ifaces(
         }
     }
 
-    for uuid in &uuids_to_delete {
-        nm_api
-            .connection_delete(uuid)
-            .map_err(nm_error_to_nmstate)?;
-    }
+    let all_nm_conns_catalog = NmConnectionCatalog::new(&all_nm_conns, &[]);
+    let nm_conns_to_delete: Vec<&NmConnection> = uuids_to_delete
+        .iter()
+        .filter_map(|uuid| all_nm_conns_catalog.get(uuid))
+        .collect();
+    delete_profiles(nm_api, &nm_conns_to_delete)?;
 
     delete_orphan_ports(nm_api, &uuids_to_delete)?;
     delete_remain_virtual_interface_as_desired(nm_api, merged_state)?;
@@ -371,7 +377,7 @@ fn delete_orphan_ports(
     nm_api: &mut NmApi,
     uuids_deleted: &HashSet<&str>,
 ) -> Result<(), NmstateError> {
-    let mut uuids_to_delete = Vec::new();
+    let mut nm_conns_to_delete: Vec<&NmConnection> = Vec::new();
     let all_nm_conns = nm_api.connections_get().map_err(nm_error_to_nmstate)?;
     for nm_conn in &all_nm_conns {
         if nm_conn.iface_type() != Some(&NmIfaceType::OvsPort) {
@@ -386,17 +392,12 @@ fn delete_orphan_ports(
                         nm_conn.iface_type().cloned().unwrap_or_default(),
                         uuid
                     );
-                    uuids_to_delete.push(uuid);
+                    nm_conns_to_delete.push(nm_conn);
                 }
             }
         }
     }
-    for uuid in &uuids_to_delete {
-        nm_api
-            .connection_delete(uuid)
-            .map_err(nm_error_to_nmstate)?;
-    }
-    Ok(())
+    delete_profiles(nm_api, &nm_conns_to_delete)
 }
 
 // * NM has problem on remove routes, we need to deactivate it first
@@ -412,7 +413,7 @@ fn delete_orphan_ports(
 fn gen_nm_conn_need_to_deactivate_first(
     merged_iface: &MergedInterfaces,
     nm_conns_to_activate: &[NmConnection],
-    activated_nm_conns: &[&NmConnection],
+    catalog: &NmConnectionCatalog,
 ) -> Vec<NmConnection> {
     let mut ret: Vec<NmConnection> = Vec::new();
 
@@ -423,15 +424,7 @@ fn gen_nm_conn_need_to_deactivate_first(
 
     for nm_conn in nm_conns_to_activate {
         if let Some(uuid) = nm_conn.uuid() {
-            if let Some(activated_nm_con) =
-                activated_nm_conns.iter().find(|c| {
-                    if let Some(cur_uuid) = c.uuid() {
-                        cur_uuid == uuid
-                    } else {
-                        false
-                    }
-                })
-            {
+            if let Some(activated_nm_con) = catalog.get_activated(uuid) {
                 if is_route_removed(nm_conn, activated_nm_con)
                     || is_vrf_table_id_changed(nm_conn, activated_nm_con)
                     || is_vlan_changed(nm_conn, activated_nm_con)
@@ -449,7 +442,7 @@ fn gen_nm_conn_need_to_deactivate_first(
                     )
                     || is_ipvlan_changed(nm_conn, activated_nm_con)
                 {
-                    ret.push((*activated_nm_con).clone());
+                    ret.push(activated_nm_con.clone());
                 }
             }
         }
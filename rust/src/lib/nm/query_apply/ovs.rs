@@ -1,9 +1,12 @@
 // SPDX-License-Identifier: Apache-2.0
 
+use std::collections::HashSet;
+
 use super::super::nm_dbus::{NmApi, NmConnection, NmDevice, NmIfaceType};
 use super::super::{
+    catalog::NmConnectionCatalog,
     query_apply::profile::{delete_profiles, is_uuid},
-    settings::get_exist_profile,
+    settings::iface_type_to_nm,
     show::nm_conn_to_base_iface,
 };
 
@@ -17,10 +20,14 @@ use crate::{
 pub(crate) fn delete_orphan_ovs_ports(
     nm_api: &mut NmApi,
     merged_ifaces: &MergedInterfaces,
-    exist_nm_conns: &[NmConnection],
+    catalog: &NmConnectionCatalog,
     nm_conns_to_activate: &[NmConnection],
 ) -> Result<(), NmstateError> {
-    let mut orphan_ovs_port_uuids: Vec<&str> = Vec::new();
+    let mut orphan_ovs_ports: Vec<&NmConnection> = Vec::new();
+    let uuids_to_activate: HashSet<&str> = nm_conns_to_activate
+        .iter()
+        .filter_map(|c| c.uuid())
+        .collect();
     for iface in merged_ifaces
         .kernel_ifaces
         .values()
@@ -33,12 +40,14 @@ pub(crate) fn delete_orphan_ovs_ports(
             != Some(&InterfaceType::OvsBridge)
             && iface_was_ovs_sys_iface(iface)
         {
-            if let Some(exist_profile) = get_exist_profile(
-                exist_nm_conns,
-                iface.merged.name(),
+            if let Some(exist_profile) = iface_type_to_nm(
                 &iface.merged.iface_type(),
-                &Vec::new(),
-            ) {
+            )
+            .ok()
+            .and_then(|nm_iface_type| {
+                catalog
+                    .get_last_exist_profile(iface.merged.name(), &nm_iface_type)
+            }) {
                 if exist_profile
                     .connection
                     .as_ref()
@@ -50,27 +59,25 @@ pub(crate) fn delete_orphan_ovs_ports(
                         .as_ref()
                         .and_then(|c| c.controller.as_ref())
                     {
-                        let ovs_port_uuid = if is_uuid(ovs_port_name) {
-                            ovs_port_name
-                        } else if let Some(uuid) = get_exist_profile(
-                            exist_nm_conns,
-                            ovs_port_name,
-                            &InterfaceType::Other("ovs-port".to_string()),
-                            &[],
-                        )
-                        .and_then(|c| c.uuid())
-                        {
-                            uuid
+                        let ovs_port = if is_uuid(ovs_port_name) {
+                            catalog.get(ovs_port_name)
                         } else {
-                            continue;
+                            catalog.get_last_exist_profile(
+                                ovs_port_name,
+                                &NmIfaceType::OvsPort,
+                            )
+                        };
+                        let (ovs_port, ovs_port_uuid) = match ovs_port
+                            .and_then(|c| c.uuid().map(|u| (c, u)))
+                        {
+                            Some(p) => p,
+                            None => continue,
                         };
                         // The OVS bond might still have ports even
                         // specified interface detached, this OVS bond will
                         // be included in `nm_conns_to_activate()`, we just
                         // do not remove connection pending for activation.
-                        if nm_conns_to_activate.iter().any(|nm_conn| {
-                            nm_conn.uuid() == Some(ovs_port_uuid)
-                        }) {
+                        if uuids_to_activate.contains(ovs_port_uuid) {
                             continue;
                         }
 
@@ -81,13 +88,13 @@ pub(crate) fn delete_orphan_ovs_ports(
                             iface.merged.name(),
                             iface.merged.iface_type()
                         );
-                        orphan_ovs_port_uuids.push(ovs_port_uuid)
+                        orphan_ovs_ports.push(ovs_port)
                     }
                 }
             }
         }
     }
-    delete_profiles(nm_api, orphan_ovs_port_uuids.as_slice())
+    delete_profiles(nm_api, orphan_ovs_ports.as_slice())
 }
 
 fn iface_was_ovs_sys_iface(iface: &MergedInterface) -> bool {
@@ -1,88 +1,58 @@
 // SPDX-License-Identifier: Apache-2.0
 
-use std::collections::{hash_map::Entry, HashMap};
+use std::collections::{hash_map::Entry, HashMap, HashSet};
 
+use super::super::catalog::{profile_key, NmConnectionCatalog};
 use super::super::error::nm_error_to_nmstate;
 use super::super::nm_dbus::{
-    self, NmApi, NmConnection, NmIfaceType, NmSettingsConnectionFlag,
+    self, NmApi, NmConnection, NmError, NmIfaceType, NmSettingsConnectionFlag,
 };
 
-use crate::{ErrorKind, NmstateError};
+use crate::{timings_count, ErrorKind, NmstateError};
 
 const ACTIVATION_RETRY_COUNT: usize = 6;
 const ACTIVATION_RETRY_INTERVAL: u64 = 1;
 
 pub(crate) fn delete_exist_profiles(
     nm_api: &mut NmApi,
-    exist_nm_conns: &[NmConnection],
+    catalog: &NmConnectionCatalog,
     nm_conns: &[NmConnection],
 ) -> Result<(), NmstateError> {
-    let mut excluded_uuids: Vec<&str> = Vec::new();
-    let mut changed_iface_name_types: Vec<(&str, NmIfaceType)> = Vec::new();
-    let mut uuids_to_delete = Vec::new();
-    for nm_conn in nm_conns {
-        if let Some(uuid) = nm_conn.uuid() {
-            excluded_uuids.push(uuid);
-        }
-        if let Some(name) = nm_conn.iface_name() {
-            if let Some(nm_iface_type) = nm_conn.iface_type() {
-                changed_iface_name_types.push((name, nm_iface_type.clone()));
-            }
-        } else if nm_conn.iface_type() == Some(&NmIfaceType::Vpn) {
-            if let Some(name) = nm_conn.id() {
-                // For VPN, the we use connection id
-                changed_iface_name_types.push((name, NmIfaceType::Vpn));
-            }
-        }
-    }
-    for exist_nm_conn in exist_nm_conns {
-        let uuid = if let Some(u) = exist_nm_conn.uuid() {
-            u
-        } else {
+    let excluded_uuids: HashSet<&str> =
+        nm_conns.iter().filter_map(|c| c.uuid()).collect();
+    let mut nm_conns_to_delete: Vec<&NmConnection> = Vec::new();
+    let mut checked_keys: HashSet<(&str, NmIfaceType)> = HashSet::new();
+    for (name, nm_iface_type) in nm_conns.iter().filter_map(profile_key) {
+        if !checked_keys.insert((name, nm_iface_type.clone())) {
             continue;
-        };
-        let iface_name = if let Some(i) = exist_nm_conn.iface_name() {
-            i
-        } else if exist_nm_conn.iface_type() == Some(&NmIfaceType::Vpn) {
-            if let Some(i) = exist_nm_conn.id() {
-                i
+        }
+        for exist_nm_conn in catalog.get_by_name_type(name, &nm_iface_type) {
+            let uuid = if let Some(u) = exist_nm_conn.uuid() {
+                u
             } else {
                 continue;
+            };
+            // Volatile nm_conn will be automatically removed once
+            // deactivated. Hence no need to deactivate.
+            if exist_nm_conn
+                .flags
+                .contains(&NmSettingsConnectionFlag::Volatile)
+                || excluded_uuids.contains(uuid)
+            {
+                continue;
             }
-        } else {
-            continue;
-        };
-        let nm_iface_type = if let Some(t) = exist_nm_conn.iface_type() {
-            t
-        } else {
-            continue;
-        };
-        // Volatile nm_conn will be automatically removed once deactivated.
-        // Hence no need to deactivate.
-        if exist_nm_conn
-            .flags
-            .contains(&NmSettingsConnectionFlag::Volatile)
-        {
-            continue;
-        }
-        if !excluded_uuids.contains(&uuid)
-            && changed_iface_name_types
-                .contains(&(iface_name, nm_iface_type.clone()))
-        {
-            if let Some(uuid) = exist_nm_conn.uuid() {
-                uuids_to_delete.push(uuid);
-                log::info!(
-                    "Deleting existing connection \
+            nm_conns_to_delete.push(exist_nm_conn);
+            log::info!(
+                "Deleting existing connection \
                 UUID {}, id {:?} type {:?} name {:?}",
-                    uuid,
-                    exist_nm_conn.id(),
-                    exist_nm_conn.iface_type(),
-                    exist_nm_conn.iface_name(),
-                );
-            }
+                uuid,
+                exist_nm_conn.id(),
+                exist_nm_conn.iface_type(),
+                exist_nm_conn.iface_name(),
+            );
         }
     }
-    delete_profiles(nm_api, &uuids_to_delete)
+    delete_profiles(nm_api, &nm_conns_to_delete)
 }
 
 pub(crate) fn save_nm_profiles(
@@ -108,11 +78,12 @@ pub(crate) fn save_nm_profiles(
                 nm_conn.iface_name(),
             );
         }
-        nm_api
-            .connection_add(nm_conn, memory_only)
-            .map_err(nm_error_to_nmstate)?;
     }
-    Ok(())
+    timings_count("nm-profiles-saved", nm_conns.len() as u64);
+    let results = nm_api
+        .connections_add(nm_conns, memory_only)
+        .map_err(nm_error_to_nmstate)?;
+    first_error("save", nm_conns.iter().zip(results), |_| false)
 }
 
 pub(crate) async fn activate_nm_profiles(
@@ -123,7 +94,8 @@ pub(crate) async fn activate_nm_profiles(
     let nm_acs = nm_api
         .active_connections_get()
         .map_err(nm_error_to_nmstate)?;
-    let nm_ac_uuids: Vec<&str> =
+    // Activation state changed since the catalog was built
+    let nm_ac_uuids: HashSet<&str> =
         nm_acs.iter().map(|nm_ac| &nm_ac.uuid as &str).collect();
 
     for i in 1..ACTIVATION_RETRY_COUNT + 1 {
@@ -131,7 +103,7 @@ pub(crate) async fn activate_nm_profiles(
             let remain_nm_conns = _activate_nm_profiles(
                 nm_api,
                 nm_conns.as_slice(),
-                nm_ac_uuids.as_slice(),
+                &nm_ac_uuids,
             )?;
             if remain_nm_conns.is_empty() {
                 break;
@@ -163,7 +135,7 @@ pub(crate) async fn activate_nm_profiles(
 fn _activate_nm_profiles(
     nm_api: &mut NmApi,
     nm_conns: &[NmConnection],
-    nm_ac_uuids: &[&str],
+    nm_ac_uuids: &HashSet<&str>,
 ) -> Result<Vec<(NmConnection, NmstateError)>, NmstateError> {
     // Contain a list of `(iface_name, nm_iface_type)`.
     let mut new_controllers: Vec<(&str, NmIfaceType)> = Vec::new();
@@ -173,7 +145,7 @@ fn _activate_nm_profiles(
         .filter(|c| c.iface_type().map(|t| t.is_controller()) == Some(true))
     {
         if let Some(uuid) = nm_conn.uuid() {
-            if nm_ac_uuids.contains(&uuid) {
+            if nm_ac_uuids.contains(uuid) {
                 if let Err(e) = reapply_or_activate(nm_api, nm_conn) {
                     if e.kind().can_retry() {
                         failed_nm_conns.push((nm_conn.clone(), e));
@@ -186,6 +158,7 @@ fn _activate_nm_profiles(
                     nm_conn.iface_name().unwrap_or(""),
                     nm_conn.iface_type().cloned().unwrap_or_default(),
                 ));
+                timings_count("nm-profiles-activated", 1);
                 if let Err(e) = nm_api
                     .connection_activate(uuid)
                     .map_err(nm_error_to_nmstate)
@@ -204,7 +177,7 @@ fn _activate_nm_profiles(
         .filter(|c| c.iface_type().map(|t| t.is_controller()) != Some(true))
     {
         if let Some(uuid) = nm_conn.uuid() {
-            if nm_ac_uuids.contains(&uuid) {
+            if nm_ac_uuids.contains(uuid) {
                 log::info!(
                     "Reapplying connection {}: {}/{}",
                     uuid,
@@ -249,6 +222,7 @@ fn _activate_nm_profiles(
                     nm_conn.iface_name().unwrap_or(""),
                     nm_conn.iface_type().cloned().unwrap_or_default()
                 );
+                timings_count("nm-profiles-activated", 1);
                 if let Err(e) = nm_api
                     .connection_activate(uuid)
                     .map_err(nm_error_to_nmstate)
@@ -269,6 +243,8 @@ pub(crate) fn deactivate_nm_profiles(
     nm_api: &mut NmApi,
     nm_conns: &[NmConnection],
 ) -> Result<(), NmstateError> {
+    let mut uuids: Vec<&str> = Vec::new();
+    let mut uuid_nm_conns: Vec<&NmConnection> = Vec::new();
     for nm_conn in nm_conns {
         if let Some(uuid) = nm_conn.uuid() {
             log::info!(
@@ -277,18 +253,20 @@ pub(crate) fn deactivate_nm_profiles(
                 nm_conn.iface_name().unwrap_or(""),
                 nm_conn.iface_type().cloned().unwrap_or_default()
             );
-            if let Err(e) = nm_api.connection_deactivate(uuid) {
-                if e.kind
-                    != nm_dbus::ErrorKind::Manager(
-                        nm_dbus::NmManagerError::ConnectionNotActive,
-                    )
-                {
-                    return Err(nm_error_to_nmstate(e));
-                }
-            }
+            uuids.push(uuid);
+            uuid_nm_conns.push(nm_conn);
         }
     }
-    Ok(())
+    timings_count("nm-profiles-deactivated", uuids.len() as u64);
+    let results = nm_api
+        .connections_deactivate(&uuids)
+        .map_err(nm_error_to_nmstate)?;
+    first_error("deactivate", uuid_nm_conns.into_iter().zip(results), |e| {
+        e.kind
+            == nm_dbus::ErrorKind::Manager(
+                nm_dbus::NmManagerError::ConnectionNotActive,
+            )
+    })
 }
 
 pub(crate) fn create_index_for_nm_conns_by_name_type(
@@ -333,16 +311,53 @@ pub(crate) fn create_index_for_nm_conns_by_name_type(
     ret
 }
 
+// Using object path of connections retrieved before, no need to look up them
+// again by UUID.
 pub(crate) fn delete_profiles(
     nm_api: &mut NmApi,
-    uuids: &[&str],
+    nm_conns: &[&NmConnection],
 ) -> Result<(), NmstateError> {
-    for uuid in uuids {
-        nm_api
-            .connection_delete(uuid)
-            .map_err(nm_error_to_nmstate)?;
+    let nm_conns: Vec<&NmConnection> = nm_conns
+        .iter()
+        .filter(|c| !c.obj_path.is_empty())
+        .copied()
+        .collect();
+    let con_obj_paths: Vec<&str> =
+        nm_conns.iter().map(|c| c.obj_path.as_str()).collect();
+    timings_count("nm-profiles-deleted", con_obj_paths.len() as u64);
+    let results = nm_api
+        .connections_delete(&con_obj_paths)
+        .map_err(nm_error_to_nmstate)?;
+    first_error("delete", nm_conns.into_iter().zip(results), |_| false)
+}
+
+// The D-Bus calls are issued concurrently, hence all of them are done before
+// checking errors. Log every failure not ignored and return the first one.
+fn first_error<'a>(
+    action: &str,
+    results: impl Iterator<Item = (&'a NmConnection, Result<(), NmError>)>,
+    ignore: impl Fn(&NmError) -> bool,
+) -> Result<(), NmstateError> {
+    let mut ret = Ok(());
+    for (nm_conn, result) in results {
+        if let Err(e) = result {
+            if ignore(&e) {
+                continue;
+            }
+            log::error!(
+                "Failed to {} connection {}: {}/{}: {}",
+                action,
+                nm_conn.uuid().unwrap_or(""),
+                nm_conn.iface_name().unwrap_or(""),
+                nm_conn.iface_type().cloned().unwrap_or_default(),
+                e
+            );
+            if ret.is_ok() {
+                ret = Err(nm_error_to_nmstate(e));
+            }
+        }
     }
-    Ok(())
+    ret
 }
 
 fn reapply_or_activate(
@@ -367,6 +382,7 @@ fn reapply_or_activate(
         nm_conn.iface_name().unwrap_or(""),
         nm_conn.iface_type().cloned().unwrap_or_default()
     );
+    timings_count("nm-profiles-reapplied", 1);
     if let Err(e) = nm_api.connection_reapply(nm_conn) {
         log::info!(
             "Reapply operation failed on {} {} {uuid}, \
@@ -375,6 +391,7 @@ fn reapply_or_activate(
             nm_conn.iface_name().unwrap_or(""),
             e
         );
+        timings_count("nm-profiles-activated", 1);
         nm_api
             .connection_activate(uuid)
             .map_err(nm_error_to_nmstate)?;
@@ -1,5 +1,6 @@
 // SPDX-License-Identifier: Apache-2.0
 
+use super::super::catalog::NmConnectionCatalog;
 use super::super::nm_dbus::{
     NmConnection, NmIfaceType, NmSettingConnection, NmSettingMacVlan,
     NmSettingVeth, NmSettingVrf, NmSettingVxlan, NmSettingsConnectionFlag,
@@ -37,8 +38,7 @@ use crate::{
 pub(crate) fn iface_to_nm_connections(
     merged_iface: &MergedInterface,
     merged_state: &MergedNetworkState,
-    exist_nm_conns: &[NmConnection],
-    nm_ac_uuids: &[&str],
+    catalog: &NmConnectionCatalog,
     gen_conf_mode: bool,
 ) -> Result<Vec<NmConnection>, NmstateError> {
     let mut ret: Vec<NmConnection> = Vec::new();
@@ -53,7 +53,7 @@ pub(crate) fn iface_to_nm_connections(
         == Some(InterfaceIdentifier::MacAddress)
     {
         get_exist_profile_by_profile_name(
-            exist_nm_conns,
+            catalog,
             iface
                 .base_iface()
                 .profile_name
@@ -63,10 +63,9 @@ pub(crate) fn iface_to_nm_connections(
         )
     } else {
         get_exist_profile(
-            exist_nm_conns,
+            catalog,
             &iface.base_iface().name,
             &iface.base_iface().iface_type,
-            nm_ac_uuids,
         )
     };
 
@@ -82,8 +81,7 @@ pub(crate) fn iface_to_nm_connections(
                     return persisten_iface_cur_conf(
                         cur_iface,
                         merged_state,
-                        exist_nm_conns,
-                        nm_ac_uuids,
+                        catalog,
                         gen_conf_mode,
                     );
                 }
@@ -96,8 +94,7 @@ pub(crate) fn iface_to_nm_connections(
                     return persisten_iface_cur_conf(
                         cur_iface,
                         merged_state,
-                        exist_nm_conns,
-                        nm_ac_uuids,
+                        catalog,
                         gen_conf_mode,
                     );
                 }
@@ -145,10 +142,9 @@ pub(crate) fn iface_to_nm_connections(
             // For OVS Bridge, we should create its OVS port also
             for ovs_port_conf in ovs_br_iface.port_confs() {
                 let exist_nm_ovs_port_conn = get_exist_profile(
-                    exist_nm_conns,
+                    catalog,
                     &ovs_port_conf.name,
                     &InterfaceType::Other("ovs-port".to_string()),
-                    nm_ac_uuids,
                 );
                 ret.push(create_ovs_port_nm_conn(
                     &ovs_br_iface.base.name,
@@ -199,7 +195,7 @@ pub(crate) fn iface_to_nm_connections(
                     ret.push(create_veth_peer_profile_if_not_found(
                         veth_conf.peer.as_str(),
                         eth_iface.base.name.as_str(),
-                        exist_nm_conns,
+                        catalog,
                         stable_uuid,
                     )?);
                 }
@@ -296,10 +292,9 @@ pub(crate) fn iface_to_nm_connections(
                             })
                     {
                         let exist_nm_ovs_port_conn = get_exist_profile(
-                            exist_nm_conns,
+                            catalog,
                             &ovs_port_name,
                             &InterfaceType::Other("ovs-port".to_string()),
-                            nm_ac_uuids,
                         );
                         ret.push(create_ovs_port_nm_conn(
                             ctrl,
@@ -474,70 +469,27 @@ fn uuid_from_name_and_type(
 
 // Found existing profile, prefer the activated one
 pub(crate) fn get_exist_profile<'a>(
-    exist_nm_conns: &'a [NmConnection],
+    catalog: &NmConnectionCatalog<'a>,
     iface_name: &str,
     iface_type: &InterfaceType,
-    nm_ac_uuids: &[&str],
 ) -> Option<&'a NmConnection> {
-    let mut found_nm_conns: Vec<&NmConnection> = Vec::new();
-    let nm_iface_type = if let Ok(t) = iface_type_to_nm(iface_type) {
-        t
-    } else {
-        return None;
-    };
-    for exist_nm_conn in exist_nm_conns {
-        if nm_iface_type == NmIfaceType::Vpn {
-            if exist_nm_conn.id() == Some(iface_name) {
-                if let Some(uuid) = exist_nm_conn.uuid() {
-                    // Prefer activated connection
-                    if nm_ac_uuids.contains(&uuid) {
-                        return Some(exist_nm_conn);
-                    }
-                }
-                found_nm_conns.push(exist_nm_conn);
-            }
-        } else if exist_nm_conn.iface_name() == Some(iface_name)
-            && (exist_nm_conn.iface_type() == Some(&nm_iface_type)
-                || (nm_iface_type == NmIfaceType::Ethernet
-                    && exist_nm_conn.iface_type() == Some(&NmIfaceType::Veth)))
-        {
-            if let Some(uuid) = exist_nm_conn.uuid() {
-                // Prefer activated connection
-                if nm_ac_uuids.contains(&uuid) {
-                    return Some(exist_nm_conn);
-                }
-            }
-            found_nm_conns.push(exist_nm_conn);
-        }
-    }
-    found_nm_conns.pop()
+    let nm_iface_type = iface_type_to_nm(iface_type).ok()?;
+    catalog.get_exist_profile(iface_name, &nm_iface_type)
 }
 
 fn get_exist_profile_by_profile_name<'a>(
-    exist_nm_conns: &'a [NmConnection],
+    catalog: &NmConnectionCatalog<'a>,
     profile_name: &str,
     iface_type: &InterfaceType,
 ) -> Option<&'a NmConnection> {
-    for exist_nm_conn in exist_nm_conns {
-        let nm_iface_type = if let Ok(t) = iface_type_to_nm(iface_type) {
-            t
-        } else {
-            continue;
-        };
-        if exist_nm_conn.id() == Some(profile_name)
-            && exist_nm_conn.iface_type() == Some(&nm_iface_type)
-        {
-            return Some(exist_nm_conn);
-        }
-    }
-    None
+    let nm_iface_type = iface_type_to_nm(iface_type).ok()?;
+    catalog.get_by_profile_name(profile_name, &nm_iface_type)
 }
 
 fn persisten_iface_cur_conf(
     cur_iface: &Interface,
     merged_state: &MergedNetworkState,
-    exist_nm_conns: &[NmConnection],
-    nm_ac_uuids: &[&str],
+    catalog: &NmConnectionCatalog,
     gen_conf_mode: bool,
 ) -> Result<Vec<NmConnection>, NmstateError> {
     let mut iface = cur_iface.clone();
@@ -549,13 +501,7 @@ fn persisten_iface_cur_conf(
     }
     let merged_iface = MergedInterface::new(Some(iface), None)?;
 
-    iface_to_nm_connections(
-        &merged_iface,
-        merged_state,
-        exist_nm_conns,
-        nm_ac_uuids,
-        gen_conf_mode,
-    )
+    iface_to_nm_connections(&merged_iface, merged_state, catalog, gen_conf_mode)
 }
 
 fn preserve_current_ip(iface: &mut Interface, cur_iface: Option<&Interface>) {
@@ -31,9 +31,14 @@ use crate::{
     VrfInterface, VxlanInterface,
 };
 
+// LLDP neighbors are only queried when `include_lldp_neighbors` is true and
+// `running_config_only` is false, otherwise interfaces with LLDP enabled are
+// reported with empty neighbor list.
 pub(crate) fn nm_retrieve(
     running_config_only: bool,
+    include_lldp_neighbors: bool,
 ) -> Result<NetworkState, NmstateError> {
+    let query_lldp = include_lldp_neighbors && !running_config_only;
     let mut net_state = NetworkState::new();
     let mut nm_api = NmApi::new().map_err(nm_error_to_nmstate)?;
     let nm_conns = nm_api
@@ -58,6 +63,8 @@ pub(crate) fn nm_retrieve(
     }
     let nm_acs_name_type_index =
         create_index_for_nm_acs_by_name_type(nm_acs.as_slice());
+    // Interface name and NM device object path of LLDP neighbors to query
+    let mut lldp_devs: Vec<(String, &str)> = Vec::new();
 
     // Include disconnected interface as state:down
     // This is used for verify on `state: absent`
@@ -133,19 +140,11 @@ pub(crate) fn nm_retrieve(
                     None
                 };
 
-                let lldp_neighbors = if is_lldp_enabled(nm_conn) {
-                    if running_config_only {
-                        Some(Vec::new())
-                    } else {
-                        Some(
-                            nm_api
-                                .device_lldp_neighbor_get(&nm_dev.obj_path)
-                                .map_err(nm_error_to_nmstate)?,
-                        )
-                    }
-                } else {
-                    None
-                };
+                // The LLDP neighbors are queried after all interfaces
+                // are collected
+                let lldp_enabled = is_lldp_enabled(nm_conn);
+                let lldp_neighbors =
+                    if lldp_enabled { Some(Vec::new()) } else { None };
                 if let Some(iface) =
                     iface_get(nm_dev, nm_conn, nm_saved_conn, lldp_neighbors)
                 {
@@ -154,11 +153,33 @@ pub(crate) fn nm_retrieve(
                         iface.name(),
                         iface.iface_type()
                     );
+                    if query_lldp && lldp_enabled {
+                        lldp_devs.push((
+                            iface.name().to_string(),
+                            nm_dev.obj_path.as_str(),
+                        ));
+                    }
                     net_state.append_interface_data(iface);
                 }
             }
         }
     }
+    if !lldp_devs.is_empty() {
+        let obj_paths: Vec<&str> =
+            lldp_devs.iter().map(|(_, obj_path)| *obj_path).collect();
+        let all_neighbors = nm_api
+            .devices_lldp_neighbor_get(obj_paths.as_slice())
+            .map_err(nm_error_to_nmstate)?;
+        for ((iface_name, _), neighbors) in lldp_devs.iter().zip(all_neighbors)
+        {
+            if let Some(iface) =
+                net_state.interfaces.kernel_ifaces.get_mut(iface_name)
+            {
+                iface.base_iface_mut().lldp = Some(get_lldp(neighbors));
+            }
+        }
+    }
+
     for iface in get_supported_vpn_ifaces(&nm_saved_conn_uuid_index, &nm_acs)? {
         net_state.append_interface_data(iface);
     }
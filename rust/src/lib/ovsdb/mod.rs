@@ -4,9 +4,11 @@ mod apply;
 mod db;
 mod global_conf;
 mod json_rpc;
+mod monitor;
 mod show;
 
 pub(crate) use self::db::DEFAULT_OVS_DB_SOCKET_PATH;
 pub(crate) use apply::ovsdb_apply;
+pub(crate) use monitor::OvsDbMonitor;
 pub(crate) use show::ovsdb_is_running;
 pub(crate) use show::ovsdb_retrieve;
@@ -0,0 +1,123 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::io::{Read, Write};
+use std::os::unix::io::{AsRawFd, RawFd};
+use std::os::unix::net::UnixStream;
+
+use serde_json::{json, Value};
+
+use super::db::DEFAULT_OVS_DB_SOCKET_PATH;
+use crate::{ErrorKind, NmstateError};
+
+const OVS_DB_NAME: &str = "Open_vSwitch";
+const MONITOR_TABLES: [&str; 4] =
+    ["Open_vSwitch", "Bridge", "Port", "Interface"];
+const BUFFER_SIZE: usize = 4096;
+
+// Subscriber of OVS database update notifications via the `monitor` method
+// of OVSDB JSON-RPC (RFC 7047). The content of update is not parsed, it is
+// only used to indicate the OVS configuration has changed.
+#[derive(Debug)]
+pub(crate) struct OvsDbMonitor {
+    socket: UnixStream,
+    buffer: Vec<u8>,
+}
+
+impl OvsDbMonitor {
+    pub(crate) fn new() -> Result<Self, NmstateError> {
+        let mut socket = UnixStream::connect(DEFAULT_OVS_DB_SOCKET_PATH)
+            .map_err(parse_socket_io_error)?;
+        let mut requests = serde_json::Map::new();
+        for table in MONITOR_TABLES {
+            requests.insert(
+                table.to_string(),
+                json!({"select": {"initial": false}}),
+            );
+        }
+        let request = json!({
+            "method": "monitor",
+            "params": [OVS_DB_NAME, Value::Null, requests],
+            "id": 0,
+        });
+        socket
+            .write_all(request.to_string().as_bytes())
+            .map_err(parse_socket_io_error)?;
+        socket
+            .set_nonblocking(true)
+            .map_err(parse_socket_io_error)?;
+        Ok(Self {
+            socket,
+            buffer: Vec::new(),
+        })
+    }
+
+    // Read all pending messages, return true if any update notification
+    // received. Echo requests from server are replied to keep the connection
+    // alive.
+    pub(crate) fn drain(&mut self) -> Result<bool, NmstateError> {
+        let mut buffer = [0u8; BUFFER_SIZE];
+        loop {
+            match self.socket.read(&mut buffer) {
+                Ok(0) => {
+                    return Err(NmstateError::new(
+                        ErrorKind::PluginFailure,
+                        "OVSDB closed the monitor connection".to_string(),
+                    ));
+                }
+                Ok(read) => self.buffer.extend_from_slice(&buffer[..read]),
+                Err(e) if e.kind() == std::io::ErrorKind::WouldBlock => break,
+                Err(e) if e.kind() == std::io::ErrorKind::Interrupted => (),
+                Err(e) => return Err(parse_socket_io_error(e)),
+            }
+        }
+
+        let mut changed = false;
+        let mut replies: Vec<Value> = Vec::new();
+        let mut consumed = 0;
+        let mut stream = serde_json::Deserializer::from_slice(&self.buffer)
+            .into_iter::<Value>();
+        while let Some(msg) = stream.next() {
+            match msg {
+                Ok(msg) => match msg.get("method").and_then(|m| m.as_str()) {
+                    Some("update") => changed = true,
+                    Some("echo") => replies.push(json!({
+                        "result": msg.get("params"),
+                        "error": Value::Null,
+                        "id": msg.get("id"),
+                    })),
+                    _ => (),
+                },
+                // Incomplete message, wait for more data
+                Err(e) if e.is_eof() => break,
+                Err(e) => {
+                    return Err(NmstateError::new(
+                        ErrorKind::PluginFailure,
+                        format!("Invalid message from OVSDB monitor: {e}"),
+                    ));
+                }
+            }
+            consumed = stream.byte_offset();
+        }
+        self.buffer.drain(..consumed);
+
+        for reply in replies {
+            self.socket
+                .write_all(reply.to_string().as_bytes())
+                .map_err(parse_socket_io_error)?;
+        }
+        Ok(changed)
+    }
+}
+
+impl AsRawFd for OvsDbMonitor {
+    fn as_raw_fd(&self) -> RawFd {
+        self.socket.as_raw_fd()
+    }
+}
+
+fn parse_socket_io_error(e: std::io::Error) -> NmstateError {
+    NmstateError::new(
+        ErrorKind::PluginFailure,
+        format!("OVSDB Socket error: {e}"),
+    )
+}
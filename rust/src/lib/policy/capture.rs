@@ -9,9 +9,10 @@ use serde::{
 use crate::{ErrorKind, NetworkState, NmstateError};
 
 use super::{
-    iface::{get_iface_match, update_ifaces},
+    iface::{get_iface_match, get_iface_match_indexed, update_ifaces},
+    index::CurrentStateIndex,
     json::{get_value_from_json, value_retain_only, value_to_string},
-    route::{get_route_match, update_routes},
+    route::{get_route_match, get_route_match_indexed, update_routes},
     route_rule::{get_route_rule_match, update_route_rules},
     token::{parse_str_to_capture_tokens, NetworkCaptureToken},
 };
@@ -71,24 +72,36 @@ impl NetworkCaptureRules {
         &self,
         current: &NetworkState,
     ) -> Result<HashMap<String, NetworkState>, NmstateError> {
-        let mut cmds = self.cmds.clone();
-        sort_captures(&mut cmds)?;
-        let mut ret = HashMap::new();
-        for (var_name, cmd) in cmds.as_slice() {
-            let matched_state = cmd.execute(current, &ret)?;
-            log::debug!(
-                "Found match state for {}: {:?}",
-                var_name,
-                matched_state
-            );
-            ret.insert(var_name.to_string(), matched_state);
-        }
-        Ok(ret)
+        execute_sorted_captures(self.sorted_cmds()?.as_slice(), current)
     }
 
     pub(crate) fn is_empty(&self) -> bool {
         self.cmds.is_empty()
     }
+
+    // Return the capture commands sorted by their dependency
+    pub(crate) fn sorted_cmds(
+        &self,
+    ) -> Result<Vec<(String, NetworkCaptureCommand)>, NmstateError> {
+        let mut cmds = self.cmds.clone();
+        sort_captures(&mut cmds)?;
+        Ok(cmds)
+    }
+}
+
+// The `cmds` should be sorted by NetworkCaptureRules::sorted_cmds()
+pub(crate) fn execute_sorted_captures(
+    cmds: &[(String, NetworkCaptureCommand)],
+    current: &NetworkState,
+) -> Result<HashMap<String, NetworkState>, NmstateError> {
+    let mut ret = HashMap::new();
+    let mut index = CurrentStateIndex::new(current);
+    for (var_name, cmd) in cmds {
+        let matched_state = cmd.execute(&mut index, &ret)?;
+        log::debug!("Found match state for {}: {:?}", var_name, matched_state);
+        ret.insert(var_name.to_string(), matched_state);
+    }
+    Ok(ret)
 }
 
 #[derive(Clone, Debug, Default, PartialEq, Eq)]
@@ -160,12 +173,13 @@ impl Serialize for NetworkCaptureCommand {
 impl NetworkCaptureCommand {
     pub(crate) fn execute(
         &self,
-        current: &NetworkState,
+        index: &mut CurrentStateIndex,
         captures: &HashMap<String, NetworkState>,
     ) -> Result<NetworkState, NmstateError> {
+        let current = index.current();
         let input = if let Some(cap_name) = self.key_capture.as_ref() {
             if let Some(cap) = captures.get(cap_name) {
-                cap.clone()
+                cap
             } else {
                 return Err(NmstateError::new_policy_error(
                     format!("Capture {cap_name} not found"),
@@ -174,7 +188,7 @@ impl NetworkCaptureCommand {
                 ));
             }
         } else {
-            current.clone()
+            current
         };
         if self.action == NetworkCaptureAction::None {
             if let NetworkCaptureToken::Path(keys, _) = &self.key {
@@ -182,7 +196,7 @@ impl NetworkCaptureCommand {
                     return Ok(NetworkState::new());
                 }
                 let mut input_value =
-                    serde_json::to_value(&input).map_err(|e| {
+                    serde_json::to_value(input).map_err(|e| {
                         NmstateError::new(
                             ErrorKind::Bug,
                             format!(
@@ -203,13 +217,13 @@ impl NetworkCaptureCommand {
                 });
             } else {
                 // User just want to store full state to a new name
-                return Ok(input);
+                return Ok(input.clone());
             }
         }
 
-        let value_input = if let Some(cap_name) = self.value_capture.as_ref() {
+        let value = if let Some(cap_name) = self.value_capture.as_ref() {
             if let Some(cap) = captures.get(cap_name) {
-                cap.clone()
+                get_value(&self.value, cap, self.line.as_str())?
             } else {
                 return Err(NmstateError::new_policy_error(
                     format!("Capture {cap_name} not found"),
@@ -217,14 +231,24 @@ impl NetworkCaptureCommand {
                     self.key_capture_pos,
                 ));
             }
+        } else if let NetworkCaptureToken::Path(prop_path, pos) = &self.value {
+            // The JSON of current state is shared among captures
+            get_value_from_state_value(
+                prop_path,
+                *pos,
+                index.state_value()?,
+                self.line.as_str(),
+            )?
         } else {
-            current.clone()
+            get_value(&self.value, current, self.line.as_str())?
         };
-        let matching_value =
-            match get_value(&self.value, &value_input, self.line.as_str())? {
-                serde_json::Value::Null => None,
-                v => Some(value_to_string(&v)),
-            };
+        let matching_value = match value {
+            serde_json::Value::Null => None,
+            v => Some(value_to_string(&v)),
+        };
+        // Only captures searching the current state could use the index,
+        // captures piped from other capture search in their small input.
+        let use_index = self.key_capture.is_none();
         let matching_value_str = matching_value.clone().unwrap_or_default();
 
         let mut ret = NetworkState::new();
@@ -245,17 +269,26 @@ impl NetworkCaptureCommand {
         match keys.first().map(String::as_str) {
             Some("routes") => {
                 ret.routes = match self.action {
+                    NetworkCaptureAction::Equal if use_index => {
+                        get_route_match_indexed(
+                            &keys[1..],
+                            matching_value_str.as_str(),
+                            index,
+                            self.line.as_str(),
+                            key_pos + "routes.".len(),
+                        )?
+                    }
                     NetworkCaptureAction::Equal => get_route_match(
                         &keys[1..],
                         matching_value_str.as_str(),
-                        &input,
+                        input,
                         self.line.as_str(),
                         key_pos + "routes.".len(),
                     )?,
                     NetworkCaptureAction::Replace => update_routes(
                         &keys[1..],
                         matching_value.as_deref(),
-                        &input,
+                        input,
                         self.line.as_str(),
                         key_pos + "routes.".len(),
                     )?,
@@ -267,14 +300,14 @@ impl NetworkCaptureCommand {
                     NetworkCaptureAction::Equal => get_route_rule_match(
                         &keys[1..],
                         matching_value_str.as_str(),
-                        &input,
+                        input,
                         self.line.as_str(),
                         key_pos + "route-rules.".len(),
                     )?,
                     NetworkCaptureAction::Replace => update_route_rules(
                         &keys[1..],
                         matching_value.as_deref(),
-                        &input,
+                        input,
                         self.line.as_str(),
                         key_pos + "route-rules.".len(),
                     )?,
@@ -283,17 +316,26 @@ impl NetworkCaptureCommand {
             }
             Some("interfaces") => {
                 ret.interfaces = match self.action {
+                    NetworkCaptureAction::Equal if use_index => {
+                        get_iface_match_indexed(
+                            &keys[1..],
+                            matching_value_str.as_str(),
+                            index,
+                            self.line.as_str(),
+                            key_pos + "interfaces.".len(),
+                        )?
+                    }
                     NetworkCaptureAction::Equal => get_iface_match(
                         &keys[1..],
                         matching_value_str.as_str(),
-                        &input,
+                        input,
                         self.line.as_str(),
                         key_pos + "interfaces.".len(),
                     )?,
                     NetworkCaptureAction::Replace => update_ifaces(
                         &keys[1..],
                         matching_value.as_deref(),
-                        &input,
+                        input,
                         self.line.as_str(),
                         key_pos + "interfaces.".len(),
                     )?,
@@ -352,40 +394,51 @@ pub(crate) fn get_value(
 ) -> Result<serde_json::Value, NmstateError> {
     match prop_path {
         NetworkCaptureToken::Path(prop_path, pos) => {
-            match serde_json::to_value(state)
-                .map_err(|e| {
+            get_value_from_state_value(
+                prop_path,
+                *pos,
+                &serde_json::to_value(state).map_err(|e| {
                     NmstateError::new(
                         ErrorKind::Bug,
                         format!(
                             "Failed to convert NetworkState {state:?} \
-                            to serde_json value: {e}"
+                        to serde_json value: {e}"
                         ),
                     )
-                })?
-                .as_object()
-            {
-                Some(state_value) => {
-                    get_value_from_json(prop_path, state_value, line, *pos)
-                }
-                None => Err(NmstateError::new(
-                    ErrorKind::Bug,
-                    format!(
-                        "Failed to convert NetworkState {state:?} to serde_json map",
-                    ),
-                )),
-            }
+                })?,
+                line,
+            )
         }
 
         NetworkCaptureToken::Value(v, _) => {
             Ok(serde_json::Value::String(v.clone()))
         }
-        NetworkCaptureToken::Null(_) => {
-            Ok(serde_json::Value::Null)
-        }
+        NetworkCaptureToken::Null(_) => Ok(serde_json::Value::Null),
         _ => todo!(),
     }
 }
 
+// Same as `get_value()` but taking NetworkState already serialized into JSON
+fn get_value_from_state_value(
+    prop_path: &[String],
+    pos: usize,
+    state_value: &serde_json::Value,
+    line: &str,
+) -> Result<serde_json::Value, NmstateError> {
+    match state_value.as_object() {
+        Some(state_value) => {
+            get_value_from_json(prop_path, state_value, line, pos)
+        }
+        None => Err(NmstateError::new(
+            ErrorKind::Bug,
+            format!(
+                "Failed to convert NetworkState {state_value:?} to \
+                serde_json map",
+            ),
+        )),
+    }
+}
+
 fn get_input_capture_source(
     tokens: &[NetworkCaptureToken],
     line: &str,
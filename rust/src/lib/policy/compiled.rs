@@ -0,0 +1,96 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::collections::HashMap;
+
+use crate::{worker_pool::worker_pool_map, NetworkState, NmstateError};
+
+use super::{
+    capture::{execute_sorted_captures, NetworkCaptureCommand},
+    template::{fill_compiled_template, NetworkTemplateReference},
+    NetworkPolicy,
+};
+
+/// The [NetworkPolicy] with capture rules sorted and desired state template
+/// parsed. Creating it once and invoking [CompiledPolicy::execute()] or
+/// [CompiledPolicy::execute_many()] is faster than converting the same
+/// [NetworkPolicy] against each current network state.
+#[derive(Clone, Debug, PartialEq, Eq)]
+#[non_exhaustive]
+pub struct CompiledPolicy {
+    is_empty: bool,
+    cmds: Vec<(String, NetworkCaptureCommand)>,
+    template: serde_json::Value,
+    template_refs: Vec<NetworkTemplateReference>,
+}
+
+impl TryFrom<&NetworkPolicy> for CompiledPolicy {
+    type Error = NmstateError;
+
+    fn try_from(policy: &NetworkPolicy) -> Result<Self, NmstateError> {
+        Self::new(policy)
+    }
+}
+
+impl CompiledPolicy {
+    /// Sort the capture rules and parse the references in desired state
+    /// template. The [NetworkPolicy::current] is ignored.
+    pub fn new(policy: &NetworkPolicy) -> Result<Self, NmstateError> {
+        let cmds = policy.capture.sorted_cmds()?;
+        let (template, template_refs) = policy.desired.compile()?;
+        for template_ref in template_refs.as_slice() {
+            if let Some((cap_name, line, pos)) = template_ref.capture_name() {
+                if !cmds.iter().any(|(name, _)| name == cap_name) {
+                    return Err(NmstateError::new_policy_error(
+                        format!("Failed to find capture {cap_name}"),
+                        line,
+                        pos,
+                    ));
+                }
+            }
+        }
+        Ok(Self {
+            is_empty: policy.is_empty(),
+            cmds,
+            template,
+            template_refs,
+        })
+    }
+
+    /// Generate network state from this policy against specified current
+    /// network state. Identical to converting the [NetworkPolicy] with
+    /// [NetworkPolicy::current] set to `current` into [NetworkState].
+    pub fn execute(
+        &self,
+        current: &NetworkState,
+    ) -> Result<NetworkState, NmstateError> {
+        if self.is_empty {
+            return Ok(NetworkState::new());
+        }
+        if self.cmds.is_empty() {
+            fill_compiled_template(
+                &self.template,
+                self.template_refs.as_slice(),
+                &HashMap::new(),
+            )
+        } else {
+            let capture_results =
+                execute_sorted_captures(self.cmds.as_slice(), current)?;
+            let desired_state = fill_compiled_template(
+                &self.template,
+                self.template_refs.as_slice(),
+                &capture_results,
+            )?;
+            desired_state.gen_diff(current)
+        }
+    }
+
+    /// Invoke [CompiledPolicy::execute()] against each of current network
+    /// states using a pool of worker threads. The output follows the order
+    /// of `currents`.
+    pub fn execute_many(
+        &self,
+        currents: &[NetworkState],
+    ) -> Vec<Result<NetworkState, NmstateError>> {
+        worker_pool_map(currents, |current| self.execute(current))
+    }
+}
@@ -2,7 +2,10 @@
 
 use crate::{Interface, Interfaces, NetworkState, NmstateError};
 
-use super::json::{search_item, update_items};
+use super::{
+    index::{CaptureIndexSection, CurrentStateIndex},
+    json::{item_not_found_error, search_item, update_items},
+};
 
 pub(crate) fn get_iface_match(
     prop_path: &[String],
@@ -26,6 +29,35 @@ pub(crate) fn get_iface_match(
     Ok(ret)
 }
 
+// Same as `get_iface_match()` against current state but using the lookup
+// table of `CurrentStateIndex`.
+pub(crate) fn get_iface_match_indexed(
+    prop_path: &[String],
+    value: &str,
+    index: &mut CurrentStateIndex,
+    line: &str,
+    pos: usize,
+) -> Result<Interfaces, NmstateError> {
+    let matched = index
+        .search(CaptureIndexSection::Interfaces, prop_path, value, line, pos)
+        .to_vec();
+    if matched.is_empty() {
+        return Err(item_not_found_error(
+            "interface",
+            prop_path,
+            value,
+            line,
+            pos,
+        ));
+    }
+    let ifaces = index.ifaces();
+    let mut ret = Interfaces::new();
+    for i in matched {
+        ret.push(ifaces[i].clone());
+    }
+    Ok(ret)
+}
+
 pub(crate) fn update_ifaces(
     prop_path: &[String],
     value: Option<&str>,
@@ -0,0 +1,176 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::collections::HashMap;
+
+use crate::{ErrorKind, Interface, NetworkState, NmstateError, RouteEntry};
+
+use super::json::{get_value_from_json, value_to_string};
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq, Hash)]
+pub(crate) enum CaptureIndexSection {
+    Interfaces,
+    RunningRoutes,
+    ConfigRoutes,
+}
+
+type JsonMap = serde_json::Map<String, serde_json::Value>;
+
+// Lookup tables over the current network state shared by all captures of
+// single policy evaluation.
+//
+// Without this, every `interfaces.<prop> == <value>` or
+// `routes.running.<prop> == <value>` capture serializes every interface or
+// route of the current state into JSON again, which is O(captures × items)
+// serializations. Here, each item is serialized at most once and each
+// distinct property path is turned into a `value -> item indexes` hash
+// table on first use, hence follow-up captures matching the same property
+// (e.g. `name`, `type`, `next-hop-interface`, `destination`, `table-id`)
+// are hash lookups.
+//
+// The values are produced by the same `get_value_from_json()` and
+// `value_to_string()` used by `search_item()`, so the matching result is
+// identical to the generic search, including item order.
+pub(crate) struct CurrentStateIndex<'a> {
+    current: &'a NetworkState,
+    state_value: Option<serde_json::Value>,
+    ifaces: Option<Vec<&'a Interface>>,
+    items: HashMap<CaptureIndexSection, Vec<Option<JsonMap>>>,
+    lookups: HashMap<(CaptureIndexSection, Vec<String>), PropIndex>,
+}
+
+// Property value in string -> indexes of matching items
+type PropIndex = HashMap<String, Vec<usize>>;
+
+impl<'a> CurrentStateIndex<'a> {
+    pub(crate) fn new(current: &'a NetworkState) -> Self {
+        Self {
+            current,
+            state_value: None,
+            ifaces: None,
+            items: HashMap::new(),
+            lookups: HashMap::new(),
+        }
+    }
+
+    pub(crate) fn current(&self) -> &'a NetworkState {
+        self.current
+    }
+
+    // The JSON value of full current state
+    pub(crate) fn state_value(
+        &mut self,
+    ) -> Result<&serde_json::Value, NmstateError> {
+        let value = match self.state_value.take() {
+            Some(v) => v,
+            None => serde_json::to_value(self.current).map_err(|e| {
+                NmstateError::new(
+                    ErrorKind::Bug,
+                    format!(
+                        "Failed to convert NetworkState {:?} \
+                        to serde_json value: {e}",
+                        self.current
+                    ),
+                )
+            })?,
+        };
+        Ok(self.state_value.insert(value))
+    }
+
+    // Interfaces in the same order as `Interfaces::to_vec()`
+    pub(crate) fn ifaces(&mut self) -> &[&'a Interface] {
+        let current = self.current;
+        self.ifaces
+            .get_or_insert_with(|| current.interfaces.to_vec())
+            .as_slice()
+    }
+
+    pub(crate) fn routes(
+        &self,
+        section: CaptureIndexSection,
+    ) -> &'a [RouteEntry] {
+        let routes = match section {
+            CaptureIndexSection::RunningRoutes => {
+                self.current.routes.running.as_deref()
+            }
+            CaptureIndexSection::ConfigRoutes => {
+                self.current.routes.config.as_deref()
+            }
+            CaptureIndexSection::Interfaces => None,
+        };
+        routes.unwrap_or_default()
+    }
+
+    // Return the indexes of items in specified section whose property
+    // `prop_path` equal to `value`.
+    pub(crate) fn search(
+        &mut self,
+        section: CaptureIndexSection,
+        prop_path: &[String],
+        value: &str,
+        line: &str,
+        pos: usize,
+    ) -> &[usize] {
+        let key = (section, prop_path.to_vec());
+        if !self.lookups.contains_key(&key) {
+            let prop_index =
+                self.build_prop_index(section, prop_path, line, pos);
+            self.lookups.insert(key.clone(), prop_index);
+        }
+        self.lookups
+            .get(&key)
+            .and_then(|prop_index| prop_index.get(value))
+            .map(Vec::as_slice)
+            .unwrap_or_default()
+    }
+
+    fn build_prop_index(
+        &mut self,
+        section: CaptureIndexSection,
+        prop_path: &[String],
+        line: &str,
+        pos: usize,
+    ) -> PropIndex {
+        let mut ret: PropIndex = HashMap::new();
+        for (index, item_value) in self.items(section).iter().enumerate() {
+            // Items failed to serialize or holding no such property are
+            // ignored, just like `search_item()`.
+            if let Some(cur_value) = item_value
+                .as_ref()
+                .and_then(|v| get_value_from_json(prop_path, v, line, pos).ok())
+            {
+                ret.entry(value_to_string(&cur_value))
+                    .or_default()
+                    .push(index);
+            }
+        }
+        ret
+    }
+
+    fn items(&mut self, section: CaptureIndexSection) -> &[Option<JsonMap>] {
+        if !self.items.contains_key(&section) {
+            let items: Vec<Option<JsonMap>> = match section {
+                CaptureIndexSection::Interfaces => self
+                    .ifaces()
+                    .iter()
+                    .map(|iface| to_json_map(*iface))
+                    .collect(),
+                CaptureIndexSection::RunningRoutes
+                | CaptureIndexSection::ConfigRoutes => {
+                    self.routes(section).iter().map(to_json_map).collect()
+                }
+            };
+            self.items.insert(section, items);
+        }
+        self.items
+            .get(&section)
+            .map(Vec::as_slice)
+            .unwrap_or_default()
+    }
+}
+
+fn to_json_map<T: serde::Serialize>(item: &T) -> Option<JsonMap> {
+    match serde_json::to_value(item) {
+        Ok(serde_json::Value::Object(v)) => Some(v),
+        _ => None,
+    }
+}
@@ -121,21 +121,31 @@ where
         }
     }
     if ret.is_empty() {
-        Err(NmstateError::new_policy_error(
-            format!(
-                "{} with '{}={}' not found",
-                item_name,
-                prop_path.join(PROPERTY_SPLITTER),
-                value
-            ),
-            line,
-            pos,
-        ))
+        Err(item_not_found_error(item_name, prop_path, value, line, pos))
     } else {
         Ok(ret)
     }
 }
 
+pub(crate) fn item_not_found_error(
+    item_name: &str,
+    prop_path: &[String],
+    value: &str,
+    line: &str,
+    pos: usize,
+) -> NmstateError {
+    NmstateError::new_policy_error(
+        format!(
+            "{} with '{}={}' not found",
+            item_name,
+            prop_path.join(PROPERTY_SPLITTER),
+            value
+        ),
+        line,
+        pos,
+    )
+}
+
 fn get_leaf_array_value(
     item_name: &str,
     prop_path: &[String],
@@ -1,7 +1,9 @@
 // SPDX-License-Identifier: Apache-2.0
 
 pub(crate) mod capture;
+mod compiled;
 mod iface;
+pub(crate) mod index;
 mod json;
 mod net_policy;
 mod route;
@@ -10,5 +12,6 @@ mod template;
 pub(crate) mod token;
 
 pub use self::capture::NetworkCaptureRules;
+pub use self::compiled::CompiledPolicy;
 pub use self::net_policy::NetworkPolicy;
 pub use self::template::NetworkStateTemplate;
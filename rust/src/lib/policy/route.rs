@@ -2,7 +2,10 @@
 
 use crate::{NetworkState, NmstateError, RouteEntry, Routes};
 
-use super::json::{search_item, update_items};
+use super::{
+    index::{CaptureIndexSection, CurrentStateIndex},
+    json::{item_not_found_error, search_item, update_items},
+};
 
 pub(crate) fn get_route_match(
     prop_path: &[String],
@@ -54,6 +57,59 @@ pub(crate) fn get_route_match(
     Ok(ret)
 }
 
+// Same as `get_route_match()` against current state but using the lookup
+// table of `CurrentStateIndex`.
+pub(crate) fn get_route_match_indexed(
+    prop_path: &[String],
+    value: &str,
+    index: &mut CurrentStateIndex,
+    line: &str,
+    pos: usize,
+) -> Result<Routes, NmstateError> {
+    if prop_path.len() != 2 {
+        return Err(NmstateError::new_policy_error(
+            "No route search pattern found".to_string(),
+            line,
+            pos,
+        ));
+    }
+    let section = match prop_path[0].as_str() {
+        "running" => CaptureIndexSection::RunningRoutes,
+        "config" => CaptureIndexSection::ConfigRoutes,
+        _ => {
+            return Err(NmstateError::new_policy_error(
+                "Only support 'running' or 'config' keyword for \
+                route searching"
+                    .to_string(),
+                line,
+                pos,
+            ));
+        }
+    };
+    let matched = index
+        .search(section, &prop_path[1..], value, line, pos)
+        .to_vec();
+    if matched.is_empty() {
+        return Err(item_not_found_error(
+            "route",
+            &prop_path[1..],
+            value,
+            line,
+            pos,
+        ));
+    }
+    let routes = index.routes(section);
+    let matched_routes: Vec<RouteEntry> =
+        matched.into_iter().map(|i| routes[i].clone()).collect();
+    let mut ret = Routes::new();
+    if section == CaptureIndexSection::RunningRoutes {
+        ret.running = Some(matched_routes);
+    } else {
+        ret.config = Some(matched_routes);
+    }
+    Ok(ret)
+}
+
 pub(crate) fn update_routes(
     prop_path: &[String],
     value: Option<&str>,
@@ -49,6 +49,121 @@ impl NetworkStateTemplate {
     }
 }
 
+// Template string holding reference `{{ capture.<name>.<path> }}`, parsed
+// once by NetworkStateTemplate::compile().
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub(crate) struct NetworkTemplateReference {
+    // JSON pointer(RFC 6901) of the string in template
+    pointer: String,
+    line: String,
+    tokens: Vec<NetworkTemplateToken>,
+}
+
+impl NetworkTemplateReference {
+    // Return the capture name and its position in line
+    pub(crate) fn capture_name(&self) -> Option<(&str, &str, usize)> {
+        self.tokens.iter().find_map(|t| {
+            if let NetworkTemplateToken::Path(path, pos) = t {
+                if path.len() >= 2 && path[0] == "capture" {
+                    return Some((
+                        path[1].as_str(),
+                        self.line.as_str(),
+                        pos + "capture.".len(),
+                    ));
+                }
+            }
+            None
+        })
+    }
+}
+
+impl NetworkStateTemplate {
+    // Parse all the references in template, the output could be used by
+    // fill_compiled_template() for many times without parsing again.
+    pub(crate) fn compile(
+        &self,
+    ) -> Result<(serde_json::Value, Vec<NetworkTemplateReference>), NmstateError>
+    {
+        let template = serde_json::Value::from_iter(self.0.clone());
+        let mut refs = Vec::new();
+        collect_template_refs(&template, String::new(), &mut refs)?;
+        Ok((template, refs))
+    }
+}
+
+pub(crate) fn fill_compiled_template(
+    template: &serde_json::Value,
+    refs: &[NetworkTemplateReference],
+    capture_results: &HashMap<String, NetworkState>,
+) -> Result<NetworkState, NmstateError> {
+    let mut desire_state_value = template.clone();
+    for template_ref in refs {
+        if let Some(new_value) = resolve_template_tokens(
+            template_ref.tokens.as_slice(),
+            template_ref.line.as_str(),
+            capture_results,
+        )? {
+            if let Some(v) =
+                desire_state_value.pointer_mut(template_ref.pointer.as_str())
+            {
+                *v = new_value;
+            }
+        }
+    }
+    serde_json::from_value(desire_state_value).map_err(|e| {
+        NmstateError::new(ErrorKind::InvalidArgument, format!("{e}"))
+    })
+}
+
+fn collect_template_refs(
+    value: &serde_json::Value,
+    pointer: String,
+    refs: &mut Vec<NetworkTemplateReference>,
+) -> Result<(), NmstateError> {
+    match value {
+        serde_json::Value::String(value) => {
+            let line = value.as_str().trim();
+            let tokens = parse_str_to_template_tokens(line)?;
+            if tokens
+                .iter()
+                .any(|t| matches!(t, &NetworkTemplateToken::ReferenceStart(_)))
+                && tokens.iter().any(|t| {
+                    matches!(t, &NetworkTemplateToken::ReferenceEnd(_))
+                })
+            {
+                refs.push(NetworkTemplateReference {
+                    pointer,
+                    line: line.to_string(),
+                    tokens,
+                });
+            }
+        }
+        serde_json::Value::Object(map) => {
+            for (k, v) in map.iter() {
+                collect_template_refs(
+                    v,
+                    format!(
+                        "{pointer}/{}",
+                        k.replace('~', "~0").replace('/', "~1")
+                    ),
+                    refs,
+                )?;
+            }
+        }
+        serde_json::Value::Array(items) => {
+            for (index, item) in items.iter().enumerate() {
+                collect_template_refs(
+                    item,
+                    format!("{pointer}/{index}"),
+                    refs,
+                )?;
+            }
+        }
+        _ => (),
+    }
+    Ok(())
+}
+
 fn resolve_capture_data(
     value: &mut serde_json::Value,
     capture_results: &HashMap<String, NetworkState>,
@@ -56,83 +171,11 @@ fn resolve_capture_data(
     if let serde_json::Value::String(value) = value {
         let line = value.as_str().trim();
         let tokens = parse_str_to_template_tokens(line)?;
-
-        if let (Some(token_start_pos), Some(token_end_pos)) = (
-            tokens.as_slice().iter().position(|t| {
-                matches!(t, &NetworkTemplateToken::ReferenceStart(_))
-            }),
-            tokens.as_slice().iter().position(|t| {
-                matches!(t, &NetworkTemplateToken::ReferenceEnd(_))
-            }),
-        ) {
-            let cap_prop_token = &tokens[token_start_pos + 1];
-            if let NetworkTemplateToken::Path(cap_props, pos) = cap_prop_token {
-                let resolved = get_capture_value(
-                    cap_props.as_slice(),
-                    capture_results,
-                    line,
-                    cap_prop_token.pos(),
-                )?;
-                if (!resolved.is_string())
-                    && (token_start_pos != 0
-                        || token_end_pos != tokens.len() - 1)
-                {
-                    return Err(NmstateError::new_policy_error(
-                        "The resolved reference result is object or array, \
-                        hence you cannot add prefix or postfix"
-                            .to_string(),
-                        line,
-                        *pos,
-                    ));
-                }
-                if let serde_json::Value::String(resolved) = resolved {
-                    let mut new_value = String::new();
-                    // Append resolved to original string
-                    if token_start_pos != 0 {
-                        for token in &tokens[..token_start_pos] {
-                            if let NetworkTemplateToken::Value(s, _) = token {
-                                write!(new_value, "{}", s.as_str()).ok();
-                            } else {
-                                return Err(NmstateError::new_policy_error(
-                                    "Only allows string before reference"
-                                        .to_string(),
-                                    line,
-                                    token.pos(),
-                                ));
-                            }
-                        }
-                    }
-                    write!(new_value, "{resolved}").ok();
-                    if token_end_pos < tokens.len() - 1 {
-                        for token in &tokens[token_end_pos + 1..] {
-                            if let NetworkTemplateToken::Value(s, _) = token {
-                                write!(new_value, "{}", s.as_str()).ok();
-                            } else {
-                                return Err(NmstateError::new_policy_error(
-                                    "Only allows string after reference"
-                                        .to_string(),
-                                    line,
-                                    token.pos(),
-                                ));
-                            }
-                        }
-                    }
-                    return Ok(Some(serde_json::Value::String(new_value)));
-                } else {
-                    return Ok(Some(resolved));
-                }
-            } else {
-                return Err(NmstateError::new_policy_error(
-                    "Only allow property path between reference \
-                        start {{ and reference end }}"
-                        .to_string(),
-                    line,
-                    tokens[token_start_pos].pos(),
-                ));
-            }
-        } else {
-            return Ok(None);
-        }
+        return resolve_template_tokens(
+            tokens.as_slice(),
+            line,
+            capture_results,
+        );
     } else if let Some(value) = value.as_object_mut() {
         let mut pending_changes: HashMap<String, serde_json::Value> =
             HashMap::new();
@@ -161,6 +204,88 @@ fn resolve_capture_data(
     Ok(None)
 }
 
+fn resolve_template_tokens(
+    tokens: &[NetworkTemplateToken],
+    line: &str,
+    capture_results: &HashMap<String, NetworkState>,
+) -> Result<Option<serde_json::Value>, NmstateError> {
+    if let (Some(token_start_pos), Some(token_end_pos)) = (
+        tokens.iter().position(|t| {
+            matches!(t, &NetworkTemplateToken::ReferenceStart(_))
+        }),
+        tokens
+            .iter()
+            .position(|t| matches!(t, &NetworkTemplateToken::ReferenceEnd(_))),
+    ) {
+        let cap_prop_token = &tokens[token_start_pos + 1];
+        if let NetworkTemplateToken::Path(cap_props, pos) = cap_prop_token {
+            let resolved = get_capture_value(
+                cap_props.as_slice(),
+                capture_results,
+                line,
+                cap_prop_token.pos(),
+            )?;
+            if (!resolved.is_string())
+                && (token_start_pos != 0 || token_end_pos != tokens.len() - 1)
+            {
+                return Err(NmstateError::new_policy_error(
+                    "The resolved reference result is object or array, \
+                    hence you cannot add prefix or postfix"
+                        .to_string(),
+                    line,
+                    *pos,
+                ));
+            }
+            if let serde_json::Value::String(resolved) = resolved {
+                let mut new_value = String::new();
+                // Append resolved to original string
+                if token_start_pos != 0 {
+                    for token in &tokens[..token_start_pos] {
+                        if let NetworkTemplateToken::Value(s, _) = token {
+                            write!(new_value, "{}", s.as_str()).ok();
+                        } else {
+                            return Err(NmstateError::new_policy_error(
+                                "Only allows string before reference"
+                                    .to_string(),
+                                line,
+                                token.pos(),
+                            ));
+                        }
+                    }
+                }
+                write!(new_value, "{resolved}").ok();
+                if token_end_pos < tokens.len() - 1 {
+                    for token in &tokens[token_end_pos + 1..] {
+                        if let NetworkTemplateToken::Value(s, _) = token {
+                            write!(new_value, "{}", s.as_str()).ok();
+                        } else {
+                            return Err(NmstateError::new_policy_error(
+                                "Only allows string after reference"
+                                    .to_string(),
+                                line,
+                                token.pos(),
+                            ));
+                        }
+                    }
+                }
+                Ok(Some(serde_json::Value::String(new_value)))
+            } else {
+                Ok(Some(resolved))
+            }
+        } else {
+            Err(NmstateError::new_policy_error(
+                "Only allow property path between reference \
+                    start {{ and reference end }}"
+                    .to_string(),
+                line,
+                tokens[token_start_pos].pos(),
+            ))
+        }
+    } else {
+        Ok(None)
+    }
+}
+
 fn get_capture_value(
     prop_path: &[String],
     captures: &HashMap<String, NetworkState>,
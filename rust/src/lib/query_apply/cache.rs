@@ -0,0 +1,266 @@
+// SPDX-License-Identifier: Apache-2.0
+
+// The notifications are not parsed and nispor has no partial retrieve, hence
+// invalidation is done per source: kernel and OVS database changes drop
+// every cached state while NetworkManager changes only drop the states
+// retrieved with NetworkManager.
+
+use std::collections::HashMap;
+use std::time::{Duration, Instant};
+
+use super::{
+    monitor::{NotificationSources, Notified},
+    net_state::new_tokio_runtime,
+};
+use crate::{NetworkState, NmstateError};
+
+const DEFAULT_MAX_AGE_SECONDS: u64 = 30;
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+struct CacheKey {
+    kernel_only: bool,
+    running_config_only: bool,
+}
+
+impl From<&NetworkState> for CacheKey {
+    fn from(net_state: &NetworkState) -> Self {
+        Self {
+            kernel_only: net_state.kernel_only,
+            running_config_only: net_state.running_config_only,
+        }
+    }
+}
+
+#[derive(Debug)]
+struct CacheEntry {
+    // Always include secrets
+    state: NetworkState,
+    include_lldp_neighbors: bool,
+    retrieved_at: Instant,
+}
+
+/// In-process cache of current network state invalidated by rtnetlink
+/// notifications, NetworkManager D-Bus signals and OVS database updates.
+/// Repeated [NetworkStateCache::retrieve()] and the pre-apply retrieve of
+/// [NetworkStateCache::apply()] are served from cache when no change
+/// notified since last retrieve and the cached state is not older than
+/// [NetworkStateCache::set_max_age()].
+/// Network namespace set by [NetworkState::set_netns()] is not cached.
+/// Only available for feature `query_apply`.
+///
+/// ```no_run
+/// use nmstate::{NetworkState, NetworkStateCache};
+///
+/// let mut cache = NetworkStateCache::new().unwrap();
+/// let cur_state = cache.retrieve(&NetworkState::new()).unwrap();
+/// let desired = NetworkState::new_from_yaml("interfaces: []").unwrap();
+/// cache.apply(&desired).unwrap();
+/// ```
+pub struct NetworkStateCache {
+    max_age: Duration,
+    sources: NotificationSources,
+    entries: HashMap<CacheKey, CacheEntry>,
+}
+
+impl NetworkStateCache {
+    /// Subscribe to change notifications with default max age of cached
+    /// state(30 seconds).
+    pub fn new() -> Result<Self, NmstateError> {
+        Ok(Self {
+            max_age: Duration::from_secs(DEFAULT_MAX_AGE_SECONDS),
+            sources: NotificationSources::new()?,
+            entries: HashMap::new(),
+        })
+    }
+
+    /// Cached state older than `max_age` is retrieved again even no change
+    /// notified. This is the bound of staleness when change notification
+    /// is delayed or lost. Setting to zero disables the cache.
+    pub fn set_max_age(&mut self, max_age: Duration) -> &mut Self {
+        self.max_age = max_age;
+        self
+    }
+
+    /// Drop all cached states.
+    pub fn invalidate(&mut self) {
+        self.entries.clear();
+    }
+
+    /// Retrieve network state using the flags of `template` like
+    /// [NetworkState::set_kernel_only()], served from cache when valid.
+    pub fn retrieve(
+        &mut self,
+        template: &NetworkState,
+    ) -> Result<NetworkState, NmstateError> {
+        new_tokio_runtime()?.block_on(self.retrieve_async(template))
+    }
+
+    /// Async version of [NetworkStateCache::retrieve()].
+    pub async fn retrieve_async(
+        &mut self,
+        template: &NetworkState,
+    ) -> Result<NetworkState, NmstateError> {
+        let mut net_state = template.clone();
+        if template.netns.is_some() {
+            net_state.retrieve_async().await?;
+            return Ok(net_state);
+        }
+        let cur_state = self
+            .get_or_retrieve(template, !template.no_lldp_neighbors)
+            .await?;
+        net_state.hostname = cur_state.hostname;
+        net_state.dns = cur_state.dns;
+        net_state.rules = cur_state.rules;
+        net_state.routes = cur_state.routes;
+        net_state.interfaces = cur_state.interfaces;
+        net_state.ovsdb = cur_state.ovsdb;
+        net_state.ovn = cur_state.ovn;
+        if !template.include_secrets {
+            net_state.hide_secrets();
+        }
+        Ok(net_state)
+    }
+
+    /// Apply `desired` network state using cached state as pre-apply state
+    /// when valid. All cached states are dropped afterwards.
+    pub fn apply(
+        &mut self,
+        desired: &NetworkState,
+    ) -> Result<(), NmstateError> {
+        new_tokio_runtime()?.block_on(self.apply_async(desired))
+    }
+
+    /// Async version of [NetworkStateCache::apply()].
+    pub async fn apply_async(
+        &mut self,
+        desired: &NetworkState,
+    ) -> Result<(), NmstateError> {
+        if desired.netns.is_some() {
+            return desired.apply_async().await;
+        }
+        let cur_state =
+            self.retrieve_async(&desired.new_pre_apply_state()).await?;
+        let result = desired.apply_with_current_async(Some(cur_state)).await;
+        // Changes made by apply might not be notified yet
+        self.invalidate();
+        result
+    }
+
+    async fn get_or_retrieve(
+        &mut self,
+        template: &NetworkState,
+        include_lldp_neighbors: bool,
+    ) -> Result<NetworkState, NmstateError> {
+        self.process_notifications()?;
+
+        let key = CacheKey::from(template);
+        if let Some(entry) = self.entries.get(&key) {
+            if (entry.include_lldp_neighbors || !include_lldp_neighbors)
+                && entry.retrieved_at.elapsed() < self.max_age
+            {
+                log::debug!("Using cached network state of {:?}", key);
+                let mut state = entry.state.clone();
+                if !include_lldp_neighbors {
+                    purge_lldp_neighbors(&mut state);
+                }
+                return Ok(state);
+            }
+        }
+
+        // Subscribe before retrieving, so changes in between are not lost.
+        if !key.kernel_only {
+            self.sources.subscribe_nm()?;
+        }
+        let mut state = NetworkState::new();
+        state.set_kernel_only(key.kernel_only);
+        state.set_running_config_only(key.running_config_only);
+        state.set_include_secrets(true);
+        state.set_include_lldp_neighbors(include_lldp_neighbors);
+        state.retrieve_async().await?;
+        self.entries.insert(
+            key,
+            CacheEntry {
+                state: state.clone(),
+                include_lldp_neighbors,
+                retrieved_at: Instant::now(),
+            },
+        );
+        Ok(state)
+    }
+
+    fn process_notifications(&mut self) -> Result<(), NmstateError> {
+        while let Some(notified) = self.sources.wait(Some(Duration::ZERO))? {
+            invalidate_by(&mut self.entries, notified);
+        }
+        Ok(())
+    }
+}
+
+fn invalidate_by(
+    entries: &mut HashMap<CacheKey, CacheEntry>,
+    notified: Notified,
+) {
+    if notified.kernel || notified.ovsdb {
+        entries.clear();
+    } else if notified.nm {
+        entries.retain(|key, _| key.kernel_only);
+    }
+}
+
+fn purge_lldp_neighbors(net_state: &mut NetworkState) {
+    for iface in net_state
+        .interfaces
+        .kernel_ifaces
+        .values_mut()
+        .chain(net_state.interfaces.user_ifaces.values_mut())
+    {
+        if let Some(lldp) = iface.base_iface_mut().lldp.as_mut() {
+            lldp.neighbors.clear();
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use std::collections::HashMap;
+    use std::time::Instant;
+
+    use super::{invalidate_by, CacheEntry, CacheKey, Notified};
+
+    #[test]
+    fn test_cache_invalidate_by_nm_keep_kernel_only() {
+        let mut entries = HashMap::new();
+        for kernel_only in [true, false] {
+            entries.insert(
+                CacheKey {
+                    kernel_only,
+                    running_config_only: false,
+                },
+                CacheEntry {
+                    state: Default::default(),
+                    include_lldp_neighbors: false,
+                    retrieved_at: Instant::now(),
+                },
+            );
+        }
+
+        invalidate_by(
+            &mut entries,
+            Notified {
+                nm: true,
+                ..Default::default()
+            },
+        );
+        assert_eq!(entries.len(), 1);
+        assert!(entries.keys().all(|k| k.kernel_only));
+
+        invalidate_by(
+            &mut entries,
+            Notified {
+                kernel: true,
+                ..Default::default()
+            },
+        );
+        assert!(entries.is_empty());
+    }
+}
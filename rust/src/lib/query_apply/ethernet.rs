@@ -187,6 +187,47 @@ impl NetworkState {
 }
 
 impl MergedInterfaces {
+    // Return the PF name and VF count of SR-IOV PFs changed by this apply
+    // whose VF interfaces will be created by kernel. When
+    // `drivers-autoprobe: false`, kernel does not create network interface
+    // for VFs, hence excluded. VFs are only recreated when VF count
+    // changed, existing VFs might have been moved to other network
+    // namespace, hence PFs with unchanged VF count are excluded also.
+    pub(crate) fn get_sriov_pfs_to_wait(&self) -> Vec<(&str, u32)> {
+        let mut ret = Vec::new();
+        for iface in self.kernel_ifaces.values().filter(|i| {
+            i.is_changed()
+                && i.merged.is_up()
+                && i.merged.iface_type() == InterfaceType::Ethernet
+        }) {
+            if let Interface::Ethernet(eth_iface) = &iface.merged {
+                if let Some(sriov_conf) =
+                    eth_iface.ethernet.as_ref().and_then(|e| e.sr_iov.as_ref())
+                {
+                    if sriov_conf.drivers_autoprobe == Some(false) {
+                        continue;
+                    }
+                    let cur_total_vfs = match iface.current.as_ref() {
+                        Some(Interface::Ethernet(cur_iface)) => cur_iface
+                            .ethernet
+                            .as_ref()
+                            .and_then(|e| e.sr_iov.as_ref())
+                            .and_then(|s| s.total_vfs),
+                        _ => None,
+                    };
+                    if let Some(total_vfs) = sriov_conf
+                        .total_vfs
+                        .filter(|v| *v > 0 && Some(*v) != cur_total_vfs)
+                    {
+                        ret.push((eth_iface.base.name.as_str(), total_vfs));
+                    }
+                }
+            }
+        }
+        ret.sort_unstable();
+        ret
+    }
+
     pub(crate) fn get_sriov_vf_count(&self) -> u32 {
         let mut ret = 0u32;
         for iface in self.kernel_ifaces.values().filter(|i| {
@@ -0,0 +1,239 @@
+// SPDX-License-Identifier: Apache-2.0
+
+// Kernel only mode has no NetworkManager to hold checkpoint for us, hence the
+// state reverting the change is stored into
+// `/run/nmstate/checkpoint/kernel-<id>.json`. The `/run` folder is purged
+// after reboot, so is the kernel network configuration.
+//
+// Without daemon, nobody rollback the checkpoint on timeout. Instead, the
+// expired checkpoints are rolled back by follow up kernel only apply, commit
+// or rollback action.
+
+use std::io::Write;
+use std::os::unix::fs::{DirBuilderExt, OpenOptionsExt};
+use std::path::{Path, PathBuf};
+use std::time::{SystemTime, UNIX_EPOCH};
+
+use serde::{Deserialize, Serialize};
+
+use crate::{
+    nispor::{nispor_apply, set_running_hostname},
+    ErrorKind, MergedNetworkState, NetworkState, NmstateError,
+};
+
+pub(crate) const KERNEL_CHECKPOINT_PREFIX: &str = "kernel-";
+const KERNEL_CHECKPOINT_DIR: &str = "/run/nmstate/checkpoint";
+
+#[derive(Debug, Serialize, Deserialize)]
+struct KernelCheckpoint {
+    // Seconds since UNIX epoch
+    expire: u64,
+    revert: NetworkState,
+}
+
+pub(crate) fn is_kernel_checkpoint(checkpoint: &str) -> bool {
+    checkpoint.starts_with(KERNEL_CHECKPOINT_PREFIX)
+}
+
+fn now_secs() -> u64 {
+    SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .map(|d| d.as_secs())
+        .unwrap_or_default()
+}
+
+fn checkpoint_path(checkpoint: &str) -> Result<PathBuf, NmstateError> {
+    if !is_kernel_checkpoint(checkpoint)
+        || checkpoint.contains('/')
+        || checkpoint.contains('.')
+    {
+        let e = NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!("Invalid kernel checkpoint {checkpoint}"),
+        );
+        log::error!("{}", e);
+        return Err(e);
+    }
+    Ok(Path::new(KERNEL_CHECKPOINT_DIR).join(format!("{checkpoint}.json")))
+}
+
+// Return kernel checkpoints sorted from oldest to newest
+fn kernel_checkpoints_get() -> Vec<String> {
+    let mut ret: Vec<(u128, String)> = Vec::new();
+    if let Ok(entries) = std::fs::read_dir(KERNEL_CHECKPOINT_DIR) {
+        for entry in entries.flatten() {
+            let file_name = entry.file_name();
+            if let Some(checkpoint) = file_name
+                .to_str()
+                .and_then(|n| n.strip_suffix(".json"))
+                .filter(|n| is_kernel_checkpoint(n))
+            {
+                if let Ok(id) =
+                    checkpoint[KERNEL_CHECKPOINT_PREFIX.len()..].parse::<u128>()
+                {
+                    ret.push((id, checkpoint.to_string()));
+                }
+            }
+        }
+    }
+    ret.sort_unstable();
+    ret.into_iter().map(|(_, checkpoint)| checkpoint).collect()
+}
+
+// Return newest kernel checkpoint if any
+pub(crate) fn last_kernel_checkpoint() -> Option<String> {
+    kernel_checkpoints_get().pop()
+}
+
+pub(crate) fn kernel_checkpoint_create(
+    revert: &NetworkState,
+    timeout: u32,
+) -> Result<String, NmstateError> {
+    let id = SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .map(|d| d.as_nanos())
+        .unwrap_or_default();
+    let checkpoint = format!("{KERNEL_CHECKPOINT_PREFIX}{id}");
+    let file_path = checkpoint_path(&checkpoint)?;
+    let content = serde_json::to_string(&KernelCheckpoint {
+        expire: now_secs() + u64::from(timeout),
+        revert: revert.clone(),
+    })?;
+
+    std::fs::DirBuilder::new()
+        .recursive(true)
+        .mode(0o700)
+        .create(KERNEL_CHECKPOINT_DIR)
+        .map_err(|e| {
+            NmstateError::new(
+                ErrorKind::PermissionError,
+                format!("Failed to create folder {KERNEL_CHECKPOINT_DIR}: {e}"),
+            )
+        })?;
+    // The revert state might contain secrets
+    std::fs::OpenOptions::new()
+        .write(true)
+        .create_new(true)
+        .mode(0o600)
+        .open(&file_path)
+        .and_then(|mut fd| fd.write_all(content.as_bytes()))
+        .map_err(|e| {
+            NmstateError::new(
+                ErrorKind::PermissionError,
+                format!(
+                    "Failed to store kernel checkpoint {}: {e}",
+                    file_path.display()
+                ),
+            )
+        })?;
+    Ok(checkpoint)
+}
+
+fn kernel_checkpoint_load(
+    checkpoint: &str,
+) -> Result<KernelCheckpoint, NmstateError> {
+    let file_path = checkpoint_path(checkpoint)?;
+    let content = std::fs::read_to_string(&file_path).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!("Kernel checkpoint {checkpoint} not found: {e}"),
+        )
+    })?;
+    serde_json::from_str(&content).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::Bug,
+            format!(
+                "Invalid content in kernel checkpoint file {}: {e}",
+                file_path.display()
+            ),
+        )
+    })
+}
+
+fn kernel_checkpoint_remove(checkpoint: &str) -> Result<(), NmstateError> {
+    let file_path = checkpoint_path(checkpoint)?;
+    std::fs::remove_file(&file_path).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::PermissionError,
+            format!(
+                "Failed to remove kernel checkpoint file {}: {e}",
+                file_path.display()
+            ),
+        )
+    })
+}
+
+pub(crate) async fn kernel_checkpoint_destroy(
+    checkpoint: &str,
+) -> Result<(), NmstateError> {
+    let cp = kernel_checkpoint_load(checkpoint)?;
+    if cp.expire <= now_secs() {
+        kernel_checkpoint_rollback(checkpoint).await?;
+        let e = NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!(
+                "Kernel checkpoint {checkpoint} has expired, \
+                rolled back instead of commit"
+            ),
+        );
+        log::error!("{}", e);
+        return Err(e);
+    }
+    kernel_checkpoint_remove(checkpoint)
+}
+
+pub(crate) async fn kernel_checkpoint_rollback(
+    checkpoint: &str,
+) -> Result<(), NmstateError> {
+    let cp = kernel_checkpoint_load(checkpoint)?;
+    kernel_apply_revert(&cp.revert).await?;
+    log::info!("Rollbacked to kernel checkpoint {}", checkpoint);
+    kernel_checkpoint_remove(checkpoint)
+}
+
+// Rollback expired kernel checkpoints from newest to oldest, as they
+// should be rolled back already if we had a daemon. Return true if any
+// checkpoint rolled back.
+pub(crate) async fn kernel_checkpoints_rollback_expired(
+) -> Result<bool, NmstateError> {
+    let now = now_secs();
+    let mut rolled_back = false;
+    for checkpoint in kernel_checkpoints_get().iter().rev() {
+        match kernel_checkpoint_load(checkpoint) {
+            Ok(cp) if cp.expire <= now => {
+                log::warn!(
+                    "Kernel checkpoint {checkpoint} expired, rolling back"
+                );
+                kernel_checkpoint_rollback(checkpoint).await?;
+                rolled_back = true;
+            }
+            Ok(_) => (),
+            Err(e) => {
+                log::warn!("Ignoring kernel checkpoint {checkpoint}: {e}");
+            }
+        }
+    }
+    Ok(rolled_back)
+}
+
+// Apply the state generated by `MergedNetworkState::generate_revert()`
+// without verification.
+pub(crate) async fn kernel_apply_revert(
+    revert: &NetworkState,
+) -> Result<(), NmstateError> {
+    let mut cur_net_state = NetworkState::new();
+    cur_net_state.set_kernel_only(true);
+    cur_net_state.set_include_secrets(true);
+    cur_net_state.set_include_lldp_neighbors(false);
+    cur_net_state.retrieve_async().await?;
+
+    let merged_state =
+        MergedNetworkState::new(revert.clone(), cur_net_state, false, false)?;
+    nispor_apply(&merged_state).await?;
+    if let Some(running_hostname) =
+        revert.hostname.as_ref().and_then(|c| c.running.as_ref())
+    {
+        set_running_hostname(running_hostname)?;
+    }
+    Ok(())
+}
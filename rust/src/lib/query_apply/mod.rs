@@ -2,6 +2,7 @@
 
 mod base;
 mod bond;
+mod cache;
 mod dispatch;
 mod dns;
 mod ethernet;
@@ -13,20 +14,28 @@ mod inter_ifaces;
 mod ip;
 mod ipsec;
 mod ipvlan;
+mod kernel_checkpoint;
 mod linux_bridge;
 mod mac_vlan;
 mod mac_vtap;
 mod macsec;
+pub(crate) mod monitor;
 mod mptcp;
 mod net_state;
+pub(crate) mod netns;
 pub(crate) mod ovn;
 mod ovs;
 mod route;
 mod route_rule;
 mod sriov;
+mod timings;
 mod vlan;
 mod vrf;
 mod vxlan;
 
+pub use self::cache::NetworkStateCache;
+pub use self::monitor::{NetworkStateChange, NetworkStateMonitor};
+pub(crate) use self::timings::{timings_count, timings_phase};
+pub use self::timings::{NmstatePhaseTiming, NmstateTimings};
 #[cfg(test)]
 pub(crate) use route::is_route_delayed_by_nm;
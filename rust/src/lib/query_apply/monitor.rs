@@ -0,0 +1,434 @@
+// SPDX-License-Identifier: Apache-2.0
+
+// Instead of parsing the notifications from kernel, NetworkManager and OVS
+// database, the notifications are only used as trigger of refreshing the
+// in-memory state. Notifications arrived within `DEBOUNCE_MILLISECONDS` are
+// merged into single refresh, and refresh only happens when something
+// changed, hence idle system costs nothing. Only the parts(kernel, OVS
+// database, NetworkManager) of notified sources are retrieved again, then
+// composed with the cached parts of others.
+
+use std::collections::{HashMap, HashSet};
+use std::os::unix::io::AsRawFd;
+use std::time::{Duration, Instant};
+
+use nix::poll::{poll, PollFd, PollFlags};
+use serde::Serialize;
+
+use super::net_state::new_tokio_runtime;
+use crate::{
+    nispor::NetlinkMonitor,
+    nm::NmMonitor,
+    ovsdb::{ovsdb_is_running, OvsDbMonitor},
+    DnsState, ErrorKind, HostNameState, Interface, InterfaceType, NetworkState,
+    NmstateError, OvsDbGlobalConfig, RouteEntry, RouteRuleEntry,
+};
+
+const DEBOUNCE_MILLISECONDS: u64 = 100;
+const DEBOUNCE_MAX_MILLISECONDS: u64 = 1000;
+
+/// Incremental change of network state reported by [NetworkStateMonitor].
+#[derive(Debug, Clone, PartialEq, Eq, Serialize)]
+#[serde(rename_all = "kebab-case")]
+#[non_exhaustive]
+pub enum NetworkStateChange {
+    /// New interface
+    InterfaceAdded(Interface),
+    /// Interface with changed properties, holding its new full state.
+    InterfaceChanged(Interface),
+    /// Removed interface, holding its last known state.
+    InterfaceRemoved(Interface),
+    /// New running route
+    RouteAdded(RouteEntry),
+    /// Removed running route
+    RouteRemoved(RouteEntry),
+    /// New route rule
+    RouteRuleAdded(RouteRuleEntry),
+    /// Removed route rule
+    RouteRuleRemoved(RouteRuleEntry),
+    /// New DNS state
+    DnsChanged(DnsState),
+    /// New hostname state
+    HostnameChanged(HostNameState),
+    /// New OVS database global configuration
+    OvsDbChanged(OvsDbGlobalConfig),
+}
+
+/// Keep an in-memory [NetworkState] up to date by subscribing to rtnetlink
+/// notifications of links, addresses, routes and route rules, plus D-Bus
+/// signals of NetworkManager(unless in kernel only mode) and update
+/// notifications of OVS database(when running).
+/// Only available for feature `query_apply`.
+///
+/// ```no_run
+/// use nmstate::{NetworkState, NetworkStateMonitor};
+///
+/// let mut net_state = NetworkState::new();
+/// net_state.set_kernel_only(true);
+/// let mut monitor = NetworkStateMonitor::new(&net_state).unwrap();
+/// loop {
+///     for change in monitor.next_changes(None).unwrap() {
+///         println!("{change:?}");
+///     }
+/// }
+/// ```
+pub struct NetworkStateMonitor {
+    template: NetworkState,
+    current: NetworkState,
+    parts: RetrievedParts,
+    sources: NotificationSources,
+    rt: tokio::runtime::Runtime,
+}
+
+impl NetworkStateMonitor {
+    /// Subscribe to notifications and retrieve the initial state.
+    /// The flags of `template` like [NetworkState::set_kernel_only()] and
+    /// [NetworkState::set_include_secrets()] are used for every retrieve.
+    pub fn new(template: &NetworkState) -> Result<Self, NmstateError> {
+        let mut template = template.clone();
+        // LLDP neighbors are not notified by any of the sources
+        template.set_include_lldp_neighbors(false);
+        if template.netns.is_some() {
+            let e = NmstateError::new(
+                ErrorKind::NotSupportedError,
+                "Monitoring other network namespace is not supported"
+                    .to_string(),
+            );
+            log::error!("{}", e);
+            return Err(e);
+        }
+
+        // Subscribe before retrieving the initial state, so changes in
+        // between are not lost.
+        let mut sources = NotificationSources::new()?;
+        if !template.kernel_only {
+            sources.subscribe_nm()?;
+        }
+        let rt = new_tokio_runtime()?;
+        let parts = rt.block_on(RetrievedParts::new(&template))?;
+        let current = parts.compose(&template);
+        Ok(Self {
+            template,
+            current,
+            parts,
+            sources,
+            rt,
+        })
+    }
+
+    /// The in-memory network state as of the last reported changes.
+    pub fn current(&self) -> &NetworkState {
+        &self.current
+    }
+
+    /// Block until network state changed or `timeout` reached.
+    /// Return empty list on timeout or when interrupted by signal.
+    /// When `timeout` is None, wait forever.
+    pub fn next_changes(
+        &mut self,
+        timeout: Option<Duration>,
+    ) -> Result<Vec<NetworkStateChange>, NmstateError> {
+        let deadline = timeout.map(|t| Instant::now() + t);
+        loop {
+            let wait =
+                deadline.map(|d| d.saturating_duration_since(Instant::now()));
+            let mut notified = match self.sources.wait(wait)? {
+                None => return Ok(Vec::new()),
+                Some(notified) if !notified.any() => continue,
+                Some(notified) => notified,
+            };
+            // Merge notifications of burst changes like applying a state
+            let debounce_deadline = Instant::now()
+                + Duration::from_millis(DEBOUNCE_MAX_MILLISECONDS);
+            while Instant::now() < debounce_deadline {
+                match self
+                    .sources
+                    .wait(Some(Duration::from_millis(DEBOUNCE_MILLISECONDS)))?
+                {
+                    Some(n) => notified.merge(n),
+                    None => break,
+                }
+            }
+            // OVS daemon started after monitor created is not monitored,
+            // its changes are noticed via kernel notifications.
+            if notified.kernel && !self.sources.is_monitoring_ovsdb() {
+                notified.ovsdb = true;
+            }
+
+            self.rt
+                .block_on(self.parts.refresh(&self.template, notified))?;
+            let new_state = self.parts.compose(&self.template);
+            let changes = gen_changes(&self.current, &new_state);
+            self.current = new_state;
+            if !changes.is_empty() {
+                return Ok(changes);
+            }
+        }
+    }
+}
+
+// Sources of the notifications, used to decide which part of network state
+// is changed.
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq)]
+pub(crate) struct Notified {
+    pub(crate) kernel: bool,
+    pub(crate) nm: bool,
+    pub(crate) ovsdb: bool,
+}
+
+impl Notified {
+    pub(crate) fn any(&self) -> bool {
+        self.kernel || self.nm || self.ovsdb
+    }
+
+    pub(crate) fn merge(&mut self, other: Self) {
+        self.kernel |= other.kernel;
+        self.nm |= other.nm;
+        self.ovsdb |= other.ovsdb;
+    }
+}
+
+// Cached state retrieved from each source
+#[derive(Debug)]
+struct RetrievedParts {
+    kernel: NetworkState,
+    ovsdb: Option<NetworkState>,
+    nm: Option<NetworkState>,
+}
+
+impl RetrievedParts {
+    async fn new(template: &NetworkState) -> Result<Self, NmstateError> {
+        Ok(Self {
+            kernel: template.retrieve_kernel_part().await?,
+            ovsdb: template.retrieve_ovsdb_part()?,
+            nm: template.retrieve_nm_part()?,
+        })
+    }
+
+    async fn refresh(
+        &mut self,
+        template: &NetworkState,
+        notified: Notified,
+    ) -> Result<(), NmstateError> {
+        if notified.kernel {
+            self.kernel = template.retrieve_kernel_part().await?;
+        }
+        if notified.ovsdb {
+            self.ovsdb = template.retrieve_ovsdb_part()?;
+        }
+        if notified.nm {
+            self.nm = template.retrieve_nm_part()?;
+        }
+        Ok(())
+    }
+
+    fn compose(&self, template: &NetworkState) -> NetworkState {
+        let mut net_state = template.clone();
+        net_state.compose_retrieved_parts(
+            self.kernel.clone(),
+            self.ovsdb.as_ref(),
+            self.nm.as_ref(),
+        );
+        net_state
+    }
+}
+
+// Subscription to rtnetlink, NetworkManager D-Bus signals(optional) and OVS
+// database(when running).
+pub(crate) struct NotificationSources {
+    netlink: NetlinkMonitor,
+    nm: Option<NmMonitor>,
+    ovsdb: Option<OvsDbMonitor>,
+}
+
+impl NotificationSources {
+    pub(crate) fn new() -> Result<Self, NmstateError> {
+        let netlink = NetlinkMonitor::new()?;
+        let ovsdb = if ovsdb_is_running() {
+            match OvsDbMonitor::new() {
+                Ok(m) => Some(m),
+                Err(e) => {
+                    log::warn!("Failed to monitor OVS DB: {}", e);
+                    None
+                }
+            }
+        } else {
+            None
+        };
+        Ok(Self {
+            netlink,
+            nm: None,
+            ovsdb,
+        })
+    }
+
+    pub(crate) fn is_monitoring_ovsdb(&self) -> bool {
+        self.ovsdb.is_some()
+    }
+
+    pub(crate) fn subscribe_nm(&mut self) -> Result<(), NmstateError> {
+        if self.nm.is_none() {
+            self.nm = Some(NmMonitor::new()?);
+        }
+        Ok(())
+    }
+
+    // Return None on timeout or when interrupted by signal, otherwise the
+    // sources notified changes(could be none for irrelevant messages).
+    pub(crate) fn wait(
+        &mut self,
+        timeout: Option<Duration>,
+    ) -> Result<Option<Notified>, NmstateError> {
+        let mut fds =
+            vec![PollFd::new(self.netlink.as_raw_fd(), PollFlags::POLLIN)];
+        if let Some(nm) = self.nm.as_ref() {
+            fds.push(PollFd::new(nm.as_raw_fd(), PollFlags::POLLIN));
+        }
+        if let Some(ovsdb) = self.ovsdb.as_ref() {
+            fds.push(PollFd::new(ovsdb.as_raw_fd(), PollFlags::POLLIN));
+        }
+        let timeout_ms = match timeout {
+            Some(t) => i32::try_from(t.as_millis()).unwrap_or(i32::MAX),
+            None => -1,
+        };
+        match poll(&mut fds, timeout_ms) {
+            Ok(0) => return Ok(None),
+            Ok(_) => (),
+            Err(nix::errno::Errno::EINTR) => return Ok(None),
+            Err(e) => {
+                return Err(NmstateError::new(
+                    ErrorKind::Bug,
+                    format!("Failed to poll on notifications: {e}"),
+                ));
+            }
+        }
+        let readable: Vec<bool> = fds
+            .iter()
+            .map(|fd| fd.revents().map(|r| !r.is_empty()).unwrap_or_default())
+            .collect();
+
+        let mut notified = Notified::default();
+        if readable[0] {
+            notified.kernel = self.netlink.drain()?;
+        }
+        let mut index = 1;
+        if let Some(nm) = self.nm.as_mut() {
+            if readable[index] {
+                notified.nm = nm.drain()?;
+            }
+            index += 1;
+        }
+        if let Some(ovsdb) = self.ovsdb.as_mut() {
+            if readable[index] {
+                match ovsdb.drain() {
+                    Ok(c) => notified.ovsdb = c,
+                    Err(e) => {
+                        // OVS daemon might be stopped or restarted, the
+                        // interfaces it manages are still notified by
+                        // kernel.
+                        log::warn!("Stop monitoring OVS DB: {}", e);
+                        self.ovsdb = None;
+                        notified.ovsdb = true;
+                    }
+                }
+            }
+        }
+        Ok(Some(notified))
+    }
+}
+
+pub(crate) fn gen_changes(
+    old: &NetworkState,
+    new: &NetworkState,
+) -> Vec<NetworkStateChange> {
+    let mut ret = Vec::new();
+
+    let old_ifaces: HashMap<(&str, InterfaceType), &Interface> = old
+        .interfaces
+        .to_vec()
+        .into_iter()
+        .map(|i| ((i.name(), i.iface_type()), i))
+        .collect();
+    let mut new_iface_keys: HashSet<(&str, InterfaceType)> = HashSet::new();
+    for iface in new.interfaces.to_vec() {
+        let key = (iface.name(), iface.iface_type());
+        match old_ifaces.get(&key) {
+            Some(old_iface) if *old_iface == iface => (),
+            Some(_) => {
+                ret.push(NetworkStateChange::InterfaceChanged(iface.clone()))
+            }
+            None => ret.push(NetworkStateChange::InterfaceAdded(iface.clone())),
+        }
+        new_iface_keys.insert(key);
+    }
+    for old_iface in old.interfaces.to_vec() {
+        if !new_iface_keys.contains(&(old_iface.name(), old_iface.iface_type()))
+        {
+            ret.push(NetworkStateChange::InterfaceRemoved(old_iface.clone()));
+        }
+    }
+
+    let (added, removed) = diff_entries(
+        old.routes.running.as_deref().unwrap_or_default(),
+        new.routes.running.as_deref().unwrap_or_default(),
+    );
+    ret.extend(added.into_iter().map(NetworkStateChange::RouteAdded));
+    ret.extend(removed.into_iter().map(NetworkStateChange::RouteRemoved));
+
+    let (added, removed) = diff_entries(
+        old.rules.config.as_deref().unwrap_or_default(),
+        new.rules.config.as_deref().unwrap_or_default(),
+    );
+    ret.extend(added.into_iter().map(NetworkStateChange::RouteRuleAdded));
+    ret.extend(
+        removed
+            .into_iter()
+            .map(NetworkStateChange::RouteRuleRemoved),
+    );
+
+    if old.dns != new.dns {
+        ret.push(NetworkStateChange::DnsChanged(
+            new.dns.clone().unwrap_or_default(),
+        ));
+    }
+    if old.hostname != new.hostname {
+        ret.push(NetworkStateChange::HostnameChanged(
+            new.hostname.clone().unwrap_or_default(),
+        ));
+    }
+    if old.ovsdb != new.ovsdb {
+        ret.push(NetworkStateChange::OvsDbChanged(
+            new.ovsdb.clone().unwrap_or_default(),
+        ));
+    }
+    ret
+}
+
+// The `PartialEq` of routes and route rules only compare the properties used
+// for sorting, hence compare their serialized form to notice changes like
+// metric.
+fn diff_entries<T>(old: &[T], new: &[T]) -> (Vec<T>, Vec<T>)
+where
+    T: Serialize + Clone,
+{
+    let to_key = |entry: &T| serde_json::to_string(entry).unwrap_or_default();
+    let old_keys: Vec<String> = old.iter().map(to_key).collect();
+    let new_keys: Vec<String> = new.iter().map(to_key).collect();
+    let old_key_set: HashSet<&str> =
+        old_keys.iter().map(String::as_str).collect();
+    let new_key_set: HashSet<&str> =
+        new_keys.iter().map(String::as_str).collect();
+    let added = new
+        .iter()
+        .zip(new_keys.iter())
+        .filter(|(_, k)| !old_key_set.contains(k.as_str()))
+        .map(|(e, _)| e.clone())
+        .collect();
+    let removed = old
+        .iter()
+        .zip(old_keys.iter())
+        .filter(|(_, k)| !new_key_set.contains(k.as_str()))
+        .map(|(e, _)| e.clone())
+        .collect();
+    (added, removed)
+}
@@ -12,15 +12,28 @@ use crate::{
         ovsdb_apply, ovsdb_is_running, ovsdb_retrieve,
         DEFAULT_OVS_DB_SOCKET_PATH,
     },
-    ErrorKind, MergedInterfaces, MergedNetworkState, NetworkState,
-    NmstateError,
+    timings_count, timings_phase, ErrorKind, MergedInterfaces,
+    MergedNetworkState, NetworkState, NmstateError,
+};
+
+use super::{
+    kernel_checkpoint::{
+        is_kernel_checkpoint, kernel_apply_revert, kernel_checkpoint_create,
+        kernel_checkpoint_destroy, kernel_checkpoint_rollback,
+        kernel_checkpoints_rollback_expired, last_kernel_checkpoint,
+    },
+    netns::is_in_netns,
+    sriov::get_sriov_vf_not_ready_reason,
 };
 
 const DEFAULT_ROLLBACK_TIMEOUT: u32 = 60;
 const VERIFY_RETRY_INTERVAL_MILLISECONDS: u64 = 1000;
 const VERIFY_RETRY_COUNT_DEFAULT: usize = 5;
-const VERIFY_RETRY_COUNT_SRIOV_MIN: usize = 30;
-const VERIFY_RETRY_COUNT_SRIOV_MAX: usize = 300;
+// After VF interfaces created, NM still need time to activate them
+const VERIFY_RETRY_COUNT_SRIOV: usize = 30;
+const SRIOV_VF_WAIT_TIMEOUT_SECONDS_MIN: u64 = 30;
+const SRIOV_VF_WAIT_TIMEOUT_SECONDS_MAX: u64 = 300;
+const SRIOV_VF_WAIT_INTERVAL_MILLISECONDS: u64 = 500;
 const VERIFY_RETRY_COUNT_KERNEL_MODE: usize = 5;
 const RETRY_NM_COUNT: usize = 2;
 const RETRY_NM_INTERVAL_MILLISECONDS: u64 = 2000;
@@ -29,17 +42,33 @@ const MAX_SUPPORTED_INTERFACES: usize = 1000;
 
 impl NetworkState {
     /// Rollback a checkpoint.
-    /// Not available for `kernel only` mode.
+    /// The checkpoint created in `kernel only` mode is prefixed with
+    /// `kernel-`. When checkpoint is empty string, the last kernel
+    /// checkpoint is used if any, otherwise the last NetworkManager
+    /// checkpoint.
     /// Only available for feature `query_apply`.
     pub fn checkpoint_rollback(checkpoint: &str) -> Result<(), NmstateError> {
-        nm_checkpoint_rollback(checkpoint)
+        match get_kernel_checkpoint(checkpoint) {
+            Some(cp) => {
+                new_tokio_runtime()?.block_on(kernel_checkpoint_rollback(&cp))
+            }
+            None => nm_checkpoint_rollback(checkpoint),
+        }
     }
 
     /// Commit a checkpoint.
-    /// Not available for `kernel only` mode.
+    /// The checkpoint created in `kernel only` mode is prefixed with
+    /// `kernel-`, the expired one will be rolled back instead.
+    /// When checkpoint is empty string, the last kernel checkpoint is used if
+    /// any, otherwise the last NetworkManager checkpoint.
     /// Only available for feature `query_apply`.
     pub fn checkpoint_commit(checkpoint: &str) -> Result<(), NmstateError> {
-        nm_checkpoint_destroy(checkpoint)
+        match get_kernel_checkpoint(checkpoint) {
+            Some(cp) => {
+                new_tokio_runtime()?.block_on(kernel_checkpoint_destroy(&cp))
+            }
+            None => nm_checkpoint_destroy(checkpoint),
+        }
     }
 
     /// Retrieve the `NetworkState`.
@@ -60,28 +89,88 @@ impl NetworkState {
     /// Retrieve the `NetworkState`.
     /// Only available for feature `query_apply`.
     pub async fn retrieve_async(&mut self) -> Result<&mut Self, NmstateError> {
-        let state =
-            nispor_retrieve(self.running_config_only, self.kernel_only).await?;
-        self.hostname = state.hostname;
-        self.interfaces = state.interfaces;
-        self.routes = state.routes;
-        self.rules = state.rules;
-        self.dns = state.dns;
-        if ovsdb_is_running() {
-            match ovsdb_retrieve() {
-                Ok(mut ovsdb_state) => {
-                    ovsdb_state.isolate_ovn()?;
-                    self.update_state(&ovsdb_state);
-                }
-                Err(e) => {
-                    log::warn!("Failed to retrieve OVS DB state: {}", e);
-                }
+        let _phase = timings_phase("retrieve");
+        if let Some(netns) = self.netns.clone() {
+            self.retrieve_in_netns_async(&netns).await?;
+            Ok(self)
+        } else {
+            self.retrieve_local_async().await
+        }
+    }
+
+    // Retrieve from the network namespace of current thread
+    pub(crate) async fn retrieve_local_async(
+        &mut self,
+    ) -> Result<&mut Self, NmstateError> {
+        let kernel_state = self.retrieve_kernel_part().await?;
+        let ovsdb_state = self.retrieve_ovsdb_part()?;
+        let nm_state = self.retrieve_nm_part()?;
+        self.compose_retrieved_parts(
+            kernel_state,
+            ovsdb_state.as_ref(),
+            nm_state.as_ref(),
+        );
+        Ok(self)
+    }
+
+    // The retrieve is split into kernel, OVS database and NetworkManager
+    // parts, so `NetworkStateMonitor` could refresh only the notified parts
+    // and compose them again by `compose_retrieved_parts()`.
+    pub(crate) async fn retrieve_kernel_part(
+        &self,
+    ) -> Result<NetworkState, NmstateError> {
+        let _phase = timings_phase("retrieve.kernel");
+        nispor_retrieve(self.running_config_only, self.kernel_only).await
+    }
+
+    // Return None when OVS daemon is not running or failed to retrieve
+    pub(crate) fn retrieve_ovsdb_part(
+        &self,
+    ) -> Result<Option<NetworkState>, NmstateError> {
+        if is_in_netns() || !ovsdb_is_running() {
+            return Ok(None);
+        }
+        let _phase = timings_phase("retrieve.ovsdb");
+        match ovsdb_retrieve() {
+            Ok(mut ovsdb_state) => {
+                ovsdb_state.isolate_ovn()?;
+                Ok(Some(ovsdb_state))
+            }
+            Err(e) => {
+                log::warn!("Failed to retrieve OVS DB state: {}", e);
+                Ok(None)
             }
         }
-        if !self.kernel_only {
-            let nm_state = nm_retrieve(self.running_config_only)?;
+    }
+
+    // Return None in kernel only mode
+    pub(crate) fn retrieve_nm_part(
+        &self,
+    ) -> Result<Option<NetworkState>, NmstateError> {
+        if self.kernel_only {
+            return Ok(None);
+        }
+        let _phase = timings_phase("retrieve.nm");
+        nm_retrieve(self.running_config_only, !self.no_lldp_neighbors).map(Some)
+    }
+
+    pub(crate) fn compose_retrieved_parts(
+        &mut self,
+        kernel_state: NetworkState,
+        ovsdb_state: Option<&NetworkState>,
+        nm_state: Option<&NetworkState>,
+    ) {
+        self.hostname = kernel_state.hostname;
+        self.interfaces = kernel_state.interfaces;
+        self.routes = kernel_state.routes;
+        self.rules = kernel_state.rules;
+        self.dns = kernel_state.dns;
+        if let Some(ovsdb_state) = ovsdb_state {
+            self.update_state(ovsdb_state);
+        }
+        if let Some(nm_state) = nm_state {
             // TODO: Priority handling
-            self.update_state(&nm_state);
+            self.update_state(nm_state);
         }
         if !self.include_secrets {
             self.hide_secrets();
@@ -91,8 +180,6 @@ impl NetworkState {
         self.interfaces
             .user_ifaces
             .retain(|_, iface| !iface.is_ignore());
-
-        Ok(self)
     }
 
     /// Apply the `NetworkState`.
@@ -114,6 +201,16 @@ impl NetworkState {
     /// Apply the `NetworkState`.
     /// Only available for feature `query_apply`.
     pub async fn apply_async(&self) -> Result<(), NmstateError> {
+        self.apply_with_current_async(None).await
+    }
+
+    // The `cur_net_state` is pre-apply state retrieved with secrets included
+    // and LLDP neighbors excluded, when None, it will be retrieved.
+    pub(crate) async fn apply_with_current_async(
+        &self,
+        cur_net_state: Option<NetworkState>,
+    ) -> Result<(), NmstateError> {
+        let _phase = timings_phase("apply");
         if self.interfaces.kernel_ifaces.len()
             + self.interfaces.user_ifaces.len()
             >= MAX_SUPPORTED_INTERFACES
@@ -132,31 +229,39 @@ impl NetworkState {
             );
         }
 
-        if !self.kernel_only {
-            self.apply_with_nm_backend().await
+        if let Some(netns) = self.netns.as_deref() {
+            self.apply_in_netns_async(netns).await
+        } else if !self.kernel_only {
+            self.apply_with_nm_backend(cur_net_state).await
         } else {
-            // TODO: Need checkpoint for kernel only mode
-            self.apply_without_nm_backend().await
+            self.apply_without_nm_backend(cur_net_state).await
         }
     }
 
-    async fn apply_with_nm_backend(&self) -> Result<(), NmstateError> {
+    async fn apply_with_nm_backend(
+        &self,
+        cur_net_state: Option<NetworkState>,
+    ) -> Result<(), NmstateError> {
         let mut merged_state = None;
-        let mut cur_net_state = NetworkState::new();
-        cur_net_state.set_kernel_only(self.kernel_only);
-        cur_net_state.set_include_secrets(true);
-        if let Err(e) = cur_net_state.retrieve_async().await {
-            if e.kind().can_retry() {
-                log::info!("Retrying on: {}", e);
-                tokio::time::sleep(std::time::Duration::from_millis(
-                    RETRY_NM_INTERVAL_MILLISECONDS,
-                ))
-                .await;
-                cur_net_state.retrieve_async().await?;
-            } else {
-                return Err(e);
+        let mut cur_net_state = match cur_net_state {
+            Some(s) => s,
+            None => {
+                let mut cur_net_state = self.new_pre_apply_state();
+                if let Err(e) = cur_net_state.retrieve_async().await {
+                    if e.kind().can_retry() {
+                        log::info!("Retrying on: {}", e);
+                        tokio::time::sleep(std::time::Duration::from_millis(
+                            RETRY_NM_INTERVAL_MILLISECONDS,
+                        ))
+                        .await;
+                        cur_net_state.retrieve_async().await?;
+                    } else {
+                        return Err(e);
+                    }
+                }
+                cur_net_state
             }
-        }
+        };
 
         // At this point, the `unknown` interface type is not resolved yet,
         // hence when user want `enable-and-use` single-transaction for SR-IOV,
@@ -170,6 +275,7 @@ impl NetworkState {
 
         if pf_state.is_none() {
             // Do early pre-apply validation before checkpoint.
+            let _phase = timings_phase("merge");
             merged_state = Some(MergedNetworkState::new(
                 self.clone(),
                 cur_net_state.clone(),
@@ -181,11 +287,12 @@ impl NetworkState {
         let timeout = if let Some(t) = self.timeout {
             t
         } else if pf_state.is_some() {
-            VERIFY_RETRY_COUNT_SRIOV_MAX as u32
+            SRIOV_VF_WAIT_TIMEOUT_SECONDS_MAX as u32
         } else {
             DEFAULT_ROLLBACK_TIMEOUT
         };
 
+        let checkpoint_phase = timings_phase("checkpoint-create");
         let checkpoint = match nm_checkpoint_create(timeout) {
             Ok(c) => c,
             Err(e) => {
@@ -202,16 +309,19 @@ impl NetworkState {
             }
         };
 
+        drop(checkpoint_phase);
         log::info!("Created checkpoint {}", &checkpoint);
 
         with_nm_checkpoint(&checkpoint, self.no_commit, || async {
             if let Some(pf_state) = pf_state {
+                let merge_phase = timings_phase("merge");
                 let pf_merged_state = MergedNetworkState::new(
                     pf_state,
                     cur_net_state.clone(),
                     false,
                     self.memory_only,
                 )?;
+                drop(merge_phase);
                 let verify_count =
                     get_proper_verify_retry_count(&pf_merged_state.interfaces);
                 self.apply_with_nm_backend_and_under_checkpoint(
@@ -224,12 +334,14 @@ impl NetworkState {
                 .await?;
                 // Refresh current state
                 cur_net_state.retrieve_async().await?;
+                let merge_phase = timings_phase("merge");
                 merged_state = Some(MergedNetworkState::new(
                     self.clone(),
                     cur_net_state.clone(),
                     false,
                     self.memory_only,
                 )?);
+                drop(merge_phase);
             }
 
             let merged_state = if let Some(merged_state) = merged_state {
@@ -270,9 +382,14 @@ impl NetworkState {
         // NM might have unknown race problem found by verify stage,
         // we try to apply the state again if so.
         with_retry(RETRY_NM_INTERVAL_MILLISECONDS, RETRY_NM_COUNT, || async {
+            timings_count("apply-attempts", 1);
             nm_checkpoint_timeout_extend(checkpoint, timeout)?;
-            nm_apply(merged_state, checkpoint, timeout).await?;
+            {
+                let _phase = timings_phase("nm-apply");
+                nm_apply(merged_state, checkpoint, timeout).await?;
+            }
             if merged_state.ovsdb.is_changed && ovsdb_is_running() {
+                let _phase = timings_phase("ovsdb-apply");
                 ovsdb_apply(merged_state)?;
             }
             if let Some(running_hostname) =
@@ -281,10 +398,21 @@ impl NetworkState {
                 set_running_hostname(running_hostname)?;
             }
             if !self.no_verify {
+                {
+                    let _phase = timings_phase("wait-sriov-vfs");
+                    wait_sriov_vfs(
+                        &merged_state.interfaces,
+                        checkpoint,
+                        timeout,
+                    )
+                    .await?;
+                }
                 with_retry(
                     VERIFY_RETRY_INTERVAL_MILLISECONDS,
                     retry_count,
                     || async {
+                        let _phase = timings_phase("verify");
+                        timings_count("verify-attempts", 1);
                         nm_checkpoint_timeout_extend(checkpoint, timeout)?;
                         let mut new_cur_net_state = cur_net_state.clone();
                         new_cur_net_state.set_include_secrets(true);
@@ -300,20 +428,70 @@ impl NetworkState {
         .await
     }
 
-    async fn apply_without_nm_backend(&self) -> Result<(), NmstateError> {
-        let mut cur_net_state = NetworkState::new();
-        cur_net_state.set_kernel_only(self.kernel_only);
-        cur_net_state.set_include_secrets(true);
-        cur_net_state.retrieve_async().await?;
+    // Without NetworkManager, the checkpoint is emulated by applying the
+    // state generated by `generate_revert()` against pre-apply state.
+    pub(crate) async fn apply_without_nm_backend(
+        &self,
+        cur_net_state: Option<NetworkState>,
+    ) -> Result<(), NmstateError> {
+        // Kernel checkpoints belong to the network namespace of caller
+        let rolled_back =
+            !is_in_netns() && kernel_checkpoints_rollback_expired().await?;
+
+        let cur_net_state = match cur_net_state {
+            // Rollback changed the state, the provided one is outdated
+            Some(s) if !rolled_back => s,
+            _ => {
+                let mut cur_net_state = self.new_pre_apply_state();
+                cur_net_state.retrieve_async().await?;
+                cur_net_state
+            }
+        };
 
+        let merge_phase = timings_phase("merge");
         let merged_state = MergedNetworkState::new(
             self.clone(),
             cur_net_state.clone(),
             false,
             self.memory_only,
         )?;
+        let revert_state = merged_state.generate_revert()?;
+        drop(merge_phase);
+
+        if let Err(e) = self
+            .apply_without_nm_backend_and_verify(&merged_state, &cur_net_state)
+            .await
+        {
+            let _phase = timings_phase("checkpoint-rollback");
+            if let Err(e) = kernel_apply_revert(&revert_state).await {
+                log::warn!("Failed to rollback kernel only change: {}", e);
+            } else {
+                log::info!("Rollbacked kernel only change");
+            }
+            return Err(e);
+        }
 
-        nispor_apply(&merged_state).await?;
+        if self.no_commit {
+            let _phase = timings_phase("checkpoint-create");
+            let checkpoint = kernel_checkpoint_create(
+                &revert_state,
+                self.timeout.unwrap_or(DEFAULT_ROLLBACK_TIMEOUT),
+            )?;
+            log::info!("Created checkpoint {}", &checkpoint);
+        }
+        Ok(())
+    }
+
+    async fn apply_without_nm_backend_and_verify(
+        &self,
+        merged_state: &MergedNetworkState,
+        cur_net_state: &Self,
+    ) -> Result<(), NmstateError> {
+        timings_count("apply-attempts", 1);
+        {
+            let _phase = timings_phase("kernel-apply");
+            nispor_apply(merged_state).await?;
+        }
         if let Some(running_hostname) =
             self.hostname.as_ref().and_then(|c| c.running.as_ref())
         {
@@ -324,6 +502,8 @@ impl NetworkState {
                 VERIFY_RETRY_INTERVAL_MILLISECONDS,
                 VERIFY_RETRY_COUNT_KERNEL_MODE,
                 || async {
+                    let _phase = timings_phase("verify");
+                    timings_count("verify-attempts", 1);
                     let mut new_cur_net_state = cur_net_state.clone();
                     new_cur_net_state.retrieve_async().await?;
                     merged_state.verify(&new_cur_net_state)
@@ -335,6 +515,16 @@ impl NetworkState {
         }
     }
 
+    // Template for retrieving the pre-apply state
+    pub(crate) fn new_pre_apply_state(&self) -> Self {
+        let mut cur_net_state = NetworkState::new();
+        cur_net_state.set_kernel_only(self.kernel_only);
+        cur_net_state.set_include_secrets(true);
+        // LLDP neighbors are never used by merging or verification
+        cur_net_state.set_include_lldp_neighbors(false);
+        cur_net_state
+    }
+
     pub(crate) fn update_state(&mut self, other: &Self) {
         if let Some(other_hostname) = other.hostname.as_ref() {
             if let Some(h) = self.hostname.as_mut() {
@@ -391,6 +581,32 @@ impl NetworkState {
     }
 }
 
+// Resolve the kernel checkpoint to use. Empty string means the last kernel
+// checkpoint if any.
+fn get_kernel_checkpoint(checkpoint: &str) -> Option<String> {
+    if checkpoint.is_empty() {
+        last_kernel_checkpoint()
+    } else if is_kernel_checkpoint(checkpoint) {
+        Some(checkpoint.to_string())
+    } else {
+        None
+    }
+}
+
+pub(crate) fn new_tokio_runtime(
+) -> Result<tokio::runtime::Runtime, NmstateError> {
+    tokio::runtime::Builder::new_current_thread()
+        .enable_io()
+        .enable_time()
+        .build()
+        .map_err(|e| {
+            NmstateError::new(
+                ErrorKind::Bug,
+                format!("tokio::runtime::Builder failed with {e}"),
+            )
+        })
+}
+
 async fn with_nm_checkpoint<T, Fut>(
     checkpoint: &str,
     no_commit: bool,
@@ -404,6 +620,7 @@ where
     match func().await {
         Ok(()) => {
             if !no_commit {
+                let _phase = timings_phase("checkpoint-destroy");
                 nm_checkpoint_destroy(checkpoint)?;
 
                 log::info!("Destroyed checkpoint {}", checkpoint);
@@ -413,6 +630,7 @@ where
             Ok(())
         }
         Err(e) => {
+            let _phase = timings_phase("checkpoint-rollback");
             if let Err(e) = nm_checkpoint_rollback(checkpoint) {
                 log::warn!("nm_checkpoint_rollback() failed: {}", e);
             }
@@ -458,7 +676,10 @@ where
 }
 
 impl MergedNetworkState {
-    fn verify(&self, current: &NetworkState) -> Result<(), NmstateError> {
+    pub(crate) fn verify(
+        &self,
+        current: &NetworkState,
+    ) -> Result<(), NmstateError> {
         self.hostname.verify(current.hostname.as_ref())?;
         self.interfaces.verify(&current.interfaces)?;
         let ignored_kernel_ifaces: Vec<&str> = self
@@ -485,10 +706,71 @@ impl MergedNetworkState {
 }
 
 fn get_proper_verify_retry_count(merged_ifaces: &MergedInterfaces) -> usize {
-    match merged_ifaces.get_sriov_vf_count() {
-        0 => VERIFY_RETRY_COUNT_DEFAULT,
-        v if v >= 64 => VERIFY_RETRY_COUNT_SRIOV_MAX,
-        v if v <= 16 => VERIFY_RETRY_COUNT_SRIOV_MIN,
-        v => v as usize / 64 * VERIFY_RETRY_COUNT_SRIOV_MAX,
+    if merged_ifaces.get_sriov_vf_count() == 0 {
+        VERIFY_RETRY_COUNT_DEFAULT
+    } else {
+        VERIFY_RETRY_COUNT_SRIOV
     }
 }
+
+fn get_sriov_vf_wait_timeout(vf_count: u32) -> std::time::Duration {
+    std::time::Duration::from_secs(
+        (u64::from(vf_count) * SRIOV_VF_WAIT_TIMEOUT_SECONDS_MAX / 64).clamp(
+            SRIOV_VF_WAIT_TIMEOUT_SECONDS_MIN,
+            SRIOV_VF_WAIT_TIMEOUT_SECONDS_MAX,
+        ),
+    )
+}
+
+// Kernel and udev might take minutes to create VF interfaces of SR-IOV PF.
+// Instead of retrieving and verifying the full network state repeatedly,
+// wait on sysfs of changed PFs only, then the normal verification follows.
+// Timeout on waiting is not treated as failure, the verification will
+// report the detailed error.
+async fn wait_sriov_vfs(
+    merged_ifaces: &MergedInterfaces,
+    checkpoint: &str,
+    checkpoint_timeout: u32,
+) -> Result<(), NmstateError> {
+    let mut pfs = merged_ifaces.get_sriov_pfs_to_wait();
+    if pfs.is_empty() {
+        return Ok(());
+    }
+    let vf_count: u32 = pfs.iter().map(|(_, count)| count).sum();
+    let wait_timeout = get_sriov_vf_wait_timeout(vf_count);
+    let started = std::time::Instant::now();
+    log::info!(
+        "Waiting up to {} seconds for {vf_count} SR-IOV VFs of PF {} \
+        to be created",
+        wait_timeout.as_secs(),
+        pfs.iter()
+            .map(|(pf_name, _)| *pf_name)
+            .collect::<Vec<&str>>()
+            .join(", ")
+    );
+    // Checked PFs are removed, so each PF is checked till ready only
+    while let Some((pf_name, total_vfs)) = pfs.last() {
+        let reason = match get_sriov_vf_not_ready_reason(pf_name, *total_vfs) {
+            Some(r) => r,
+            None => {
+                pfs.pop();
+                continue;
+            }
+        };
+        if started.elapsed() >= wait_timeout {
+            log::warn!("Timeout on waiting SR-IOV VFs to be created: {reason}");
+            return Ok(());
+        }
+        log::debug!("Waiting SR-IOV VFs: {reason}");
+        nm_checkpoint_timeout_extend(checkpoint, checkpoint_timeout)?;
+        tokio::time::sleep(std::time::Duration::from_millis(
+            SRIOV_VF_WAIT_INTERVAL_MILLISECONDS,
+        ))
+        .await;
+    }
+    log::info!(
+        "SR-IOV VFs are ready after {} milliseconds",
+        started.elapsed().as_millis()
+    );
+    Ok(())
+}
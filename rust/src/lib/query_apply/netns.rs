@@ -0,0 +1,281 @@
+// SPDX-License-Identifier: Apache-2.0
+
+// Kernel only retrieve and apply against other network namespace.
+//
+// The network namespace is a per-thread attribute, hence each action is done
+// in a dedicated thread which switched into the target network namespace by
+// `setns()`, leaving the network namespace of the caller and other threads
+// untouched. The netlink sockets used by nispor are created in that thread,
+// so they belong to the target network namespace.
+//
+// The thread also unshares its mount namespace to mount the sysfs of target
+// network namespace at /sys, like `ip netns exec` does, so sysfs based
+// properties (e.g. SR-IOV) are read from target network namespace.
+// The UTS namespace and other mount points are still those of the caller.
+// Hence hostname, DNS and OVS database, which are retrieved from files,
+// syscall or UNIX socket of the caller, are not supported.
+
+use std::cell::Cell;
+use std::collections::HashMap;
+use std::future::Future;
+use std::os::unix::io::AsRawFd;
+use std::path::PathBuf;
+
+use nix::mount::{mount, umount2, MntFlags, MsFlags};
+use nix::sched::{setns, unshare, CloneFlags};
+
+use super::net_state::new_tokio_runtime;
+use crate::{
+    worker_pool::worker_pool_map, ErrorKind, NetworkState, NmstateError,
+};
+
+const NETNS_RUN_DIR: &str = "/run/netns";
+
+thread_local! {
+    static IN_NETNS: Cell<bool> = Cell::new(false);
+}
+
+// Whether current thread has been switched to other network namespace by
+// `run_in_netns()`.
+pub(crate) fn is_in_netns() -> bool {
+    IN_NETNS.with(|v| v.get())
+}
+
+// The netns could be:
+//  * PID of process living in that network namespace.
+//  * Absolute path to network namespace file, e.g. `/proc/<pid>/ns/net`.
+//  * Name of network namespace created by `ip netns add`.
+pub(crate) fn netns_path(netns: &str) -> Result<PathBuf, NmstateError> {
+    let path = if !netns.is_empty() && netns.chars().all(|c| c.is_ascii_digit())
+    {
+        PathBuf::from(format!("/proc/{netns}/ns/net"))
+    } else if netns.starts_with('/') {
+        PathBuf::from(netns)
+    } else if !netns.is_empty() && !netns.contains('/') {
+        PathBuf::from(NETNS_RUN_DIR).join(netns)
+    } else {
+        let e = NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!(
+                "Invalid network namespace '{netns}', expecting PID, \
+                absolute path or name of network namespace"
+            ),
+        );
+        log::error!("{}", e);
+        return Err(e);
+    };
+    Ok(path)
+}
+
+// Run `func` in a new thread switched to specified network namespace.
+fn run_in_netns<T, F, Fut>(netns: &str, func: F) -> Result<T, NmstateError>
+where
+    T: Send,
+    F: FnOnce() -> Fut + Send,
+    Fut: Future<Output = Result<T, NmstateError>>,
+{
+    let path = netns_path(netns)?;
+    let fd = std::fs::File::open(&path).map_err(|e| {
+        NmstateError::new(
+            ErrorKind::InvalidArgument,
+            format!(
+                "Failed to open network namespace {netns} at {}: {e}",
+                path.display()
+            ),
+        )
+    })?;
+
+    std::thread::scope(|s| {
+        s.spawn(|| {
+            setns(fd.as_raw_fd(), CloneFlags::CLONE_NEWNET).map_err(|e| {
+                NmstateError::new(
+                    ErrorKind::PermissionError,
+                    format!(
+                        "Failed to switch to network namespace {netns}: {e}"
+                    ),
+                )
+            })?;
+            IN_NETNS.with(|v| v.set(true));
+            mount_netns_sysfs(netns)?;
+            new_tokio_runtime()?.block_on(func())
+        })
+        .join()
+        .unwrap_or_else(|_| {
+            Err(NmstateError::new(
+                ErrorKind::Bug,
+                format!("Thread for network namespace {netns} panicked"),
+            ))
+        })
+    })
+}
+
+// Unshare mount namespace of current thread and mount sysfs of current
+// network namespace at /sys. The mount namespace is freed along with the
+// thread.
+fn mount_netns_sysfs(netns: &str) -> Result<(), NmstateError> {
+    let to_err = |action: &str, e: nix::Error| {
+        let e = NmstateError::new(
+            ErrorKind::PermissionError,
+            format!(
+                "Failed to {action} for sysfs of network namespace {netns}: \
+                {e}"
+            ),
+        );
+        log::error!("{}", e);
+        e
+    };
+    unshare(CloneFlags::CLONE_NEWNS)
+        .map_err(|e| to_err("unshare mount namespace", e))?;
+    // Do not propagate below mounts back to the mount namespace of caller
+    mount::<str, str, str, str>(
+        None,
+        "/",
+        None,
+        MsFlags::MS_SLAVE | MsFlags::MS_REC,
+        None,
+    )
+    .map_err(|e| to_err("make mount points slave", e))?;
+    // The /sys might not be mounted in container, ignore failure
+    umount2("/sys", MntFlags::MNT_DETACH).ok();
+    mount::<str, str, str, str>(
+        Some("sysfs"),
+        "/sys",
+        Some("sysfs"),
+        MsFlags::empty(),
+        None,
+    )
+    .map_err(|e| to_err("mount", e))
+}
+
+// The thread join of `run_in_netns()` blocks, hence async callers run it in
+// the blocking thread pool of tokio instead of blocking the executor.
+async fn spawn_blocking<T, F>(func: F) -> Result<T, NmstateError>
+where
+    T: Send + 'static,
+    F: FnOnce() -> Result<T, NmstateError> + Send + 'static,
+{
+    tokio::task::spawn_blocking(func).await.map_err(|e| {
+        NmstateError::new(
+            ErrorKind::Bug,
+            format!("Task for network namespace failed: {e}"),
+        )
+    })?
+}
+
+impl NetworkState {
+    /// Retrieve the kernel network state of each specified network namespace
+    /// using a pool of worker threads within current process.
+    ///
+    /// The network namespace could be the PID of process, absolute path to
+    /// network namespace file or name of network namespace created by
+    /// `ip netns add`.
+    /// The flags of this [NetworkState] like
+    /// [NetworkState::set_include_secrets()] are used for every retrieve.
+    /// Require [NetworkState::set_kernel_only()] set to true.
+    /// Failure on one network namespace does not prevent others from being
+    /// retrieved.
+    /// Only available for feature `query_apply`.
+    pub fn retrieve_netns_many<S>(
+        &self,
+        netns_list: &[S],
+    ) -> HashMap<String, Result<NetworkState, NmstateError>>
+    where
+        S: AsRef<str> + Sync,
+    {
+        let results = worker_pool_map(netns_list, |netns| {
+            let mut net_state = self.clone();
+            net_state.retrieve_in_netns(netns.as_ref())?;
+            Ok(net_state)
+        });
+        netns_list
+            .iter()
+            .map(|netns| netns.as_ref().to_string())
+            .zip(results)
+            .collect()
+    }
+
+    pub(crate) fn retrieve_in_netns(
+        &mut self,
+        netns: &str,
+    ) -> Result<(), NmstateError> {
+        if !self.kernel_only {
+            let e = NmstateError::new(
+                ErrorKind::InvalidArgument,
+                format!(
+                    "Retrieving network state of network namespace {netns} \
+                    is only supported in kernel only mode"
+                ),
+            );
+            log::error!("{}", e);
+            return Err(e);
+        }
+        let mut net_state = self.clone();
+        net_state.netns = None;
+        let net_state = run_in_netns(netns, || async move {
+            net_state.retrieve_local_async().await?;
+            Ok(net_state)
+        })?;
+        self.interfaces = net_state.interfaces;
+        self.routes = net_state.routes;
+        self.rules = net_state.rules;
+        self.hostname = None;
+        self.dns = None;
+        self.ovsdb = None;
+        self.netns = Some(netns.to_string());
+        Ok(())
+    }
+
+    pub(crate) async fn retrieve_in_netns_async(
+        &mut self,
+        netns: &str,
+    ) -> Result<(), NmstateError> {
+        let mut net_state = self.clone();
+        let netns = netns.to_string();
+        *self = spawn_blocking(move || {
+            net_state.retrieve_in_netns(&netns)?;
+            Ok(net_state)
+        })
+        .await?;
+        Ok(())
+    }
+
+    pub(crate) async fn apply_in_netns_async(
+        &self,
+        netns: &str,
+    ) -> Result<(), NmstateError> {
+        let net_state = self.clone();
+        let netns = netns.to_string();
+        spawn_blocking(move || net_state.apply_in_netns(&netns)).await
+    }
+
+    pub(crate) fn apply_in_netns(
+        &self,
+        netns: &str,
+    ) -> Result<(), NmstateError> {
+        let reason = if !self.kernel_only {
+            Some("only supported in kernel only mode")
+        } else if self.no_commit {
+            Some("not supported with checkpoint")
+        } else if self.hostname.is_some()
+            || self.dns.is_some()
+            || self.ovsdb.is_some()
+            || !self.ovn.is_none()
+        {
+            Some("not supported for hostname, DNS, OVS and OVN")
+        } else {
+            None
+        };
+        if let Some(reason) = reason {
+            let e = NmstateError::new(
+                ErrorKind::InvalidArgument,
+                format!(
+                    "Applying network state to network namespace {netns} is \
+                    {reason}"
+                ),
+            );
+            log::error!("{}", e);
+            return Err(e);
+        }
+        run_in_netns(netns, || self.apply_without_nm_backend(None))
+    }
+}
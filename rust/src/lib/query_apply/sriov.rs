@@ -111,6 +111,74 @@ impl SrIovConfig {
     }
 }
 
+// VF drivers which do not create network interface, commonly used for DPDK
+const SRIOV_VF_NON_NETDEV_DRIVERS: [&str; 4] =
+    ["vfio-pci", "uio_pci_generic", "igb_uio", "pci-stub"];
+
+// Check sysfs for whether kernel has created all VFs of specified PF along
+// with their network interfaces. Return the reason of the first not ready VF
+// found, or None if all VFs are ready.
+// VF not bound to any driver or bound to driver without network interface
+// is treated as ready.
+pub(crate) fn get_sriov_vf_not_ready_reason(
+    pf_name: &str,
+    total_vfs: u32,
+) -> Option<String> {
+    let dev_path = std::path::Path::new("/sys/class/net")
+        .join(pf_name)
+        .join("device");
+    match std::fs::read_to_string(dev_path.join("sriov_numvfs")) {
+        Ok(content) => {
+            if content.trim().parse::<u32>().ok() != Some(total_vfs) {
+                return Some(format!(
+                    "PF {pf_name} has {} VFs, expecting {total_vfs}",
+                    content.trim()
+                ));
+            }
+        }
+        Err(e) => {
+            return Some(format!(
+                "Failed to read sriov_numvfs of PF {pf_name}: {e}"
+            ));
+        }
+    }
+    for vf_id in 0..total_vfs {
+        let vf_path = dev_path.join(format!("virtfn{vf_id}"));
+        // The /sys/class/net/<pf_name>/device/virtfn<vf_id>/driver is
+        // symbolic link to the folder of bound driver.
+        let driver = match std::fs::read_link(vf_path.join("driver")) {
+            Ok(p) => p,
+            Err(_) => {
+                if vf_path.exists() {
+                    continue;
+                } else {
+                    return Some(format!(
+                        "VF {vf_id} of PF {pf_name} is not created yet"
+                    ));
+                }
+            }
+        };
+        let driver_name = driver
+            .file_name()
+            .and_then(|n| n.to_str())
+            .unwrap_or_default();
+        if SRIOV_VF_NON_NETDEV_DRIVERS.contains(&driver_name) {
+            continue;
+        }
+        // The network interface of VF is listed in
+        // /sys/class/net/<pf_name>/device/virtfn<vf_id>/net/
+        let has_netdev = std::fs::read_dir(vf_path.join("net"))
+            .map(|mut entries| entries.next().is_some())
+            .unwrap_or_default();
+        if !has_netdev {
+            return Some(format!(
+                "VF {vf_id} of PF {pf_name} has no network interface yet"
+            ));
+        }
+    }
+    None
+}
+
 impl Interfaces {
     pub(crate) fn has_sriov_naming(&self) -> bool {
         self.kernel_ifaces
@@ -0,0 +1,208 @@
+// SPDX-License-Identifier: Apache-2.0
+
+// The timings are collected through task local storage, so phases deep in
+// the backends could be recorded without passing a recorder through every
+// function. Recording is no-op when not invoked under
+// `NmstateTimings::collect()`.
+
+use std::cell::RefCell;
+use std::collections::BTreeMap;
+use std::future::Future;
+use std::time::{Duration, Instant};
+
+use serde::{Serialize, Serializer};
+
+use super::net_state::new_tokio_runtime;
+use crate::{NetworkState, NmstateError};
+
+tokio::task_local! {
+    static TIMINGS: RefCell<NmstateTimings>;
+}
+
+/// Accumulated duration of a phase like `retrieve` or `nm-apply`.
+#[derive(Clone, Debug, Serialize, Default, PartialEq, Eq)]
+#[non_exhaustive]
+pub struct NmstatePhaseTiming {
+    pub name: String,
+    /// How many times this phase was entered
+    pub count: u32,
+    /// Sum of all durations of this phase
+    #[serde(rename = "total-ms", serialize_with = "serialize_duration_ms")]
+    pub total: Duration,
+    /// Longest duration of this phase
+    #[serde(rename = "max-ms", serialize_with = "serialize_duration_ms")]
+    pub max: Duration,
+}
+
+/// Per-phase durations and counters like `verify-attempts` collected during
+/// [NetworkState::apply()] or [NetworkState::retrieve()].
+/// Only available for feature `query_apply`.
+///
+/// ```no_run
+/// use nmstate::{NetworkState, NmstateTimings};
+///
+/// let desired = NetworkState::new_from_yaml("interfaces: []").unwrap();
+/// let mut timings = NmstateTimings::new();
+/// let result = desired.apply_with_timings(&mut timings);
+/// println!("{}", serde_json::to_string(&timings).unwrap());
+/// result.unwrap();
+/// ```
+#[derive(Clone, Debug, Serialize, Default, PartialEq, Eq)]
+#[non_exhaustive]
+pub struct NmstateTimings {
+    /// Phases in the order of first entered. Sub-phases are prefixed with
+    /// the name of parent phase, for example `nm-apply.save-profiles`.
+    /// The `retrieve` phase also includes the retrievals done by `verify`.
+    pub phases: Vec<NmstatePhaseTiming>,
+    pub counters: BTreeMap<String, u64>,
+}
+
+impl NmstateTimings {
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// Run the future and accumulate timings of nmstate phases into this.
+    /// Only the phases polled within the same task are recorded.
+    pub async fn collect<F: Future>(&mut self, future: F) -> F::Output {
+        let (output, timings) = TIMINGS
+            .scope(RefCell::new(std::mem::take(self)), async move {
+                let output = future.await;
+                (output, TIMINGS.with(|t| t.take()))
+            })
+            .await;
+        *self = timings;
+        output
+    }
+
+    /// Get the phase timing by name.
+    pub fn phase(&self, name: &str) -> Option<&NmstatePhaseTiming> {
+        self.phases.iter().find(|p| p.name == name)
+    }
+
+    fn add_phase(&mut self, name: &str, elapsed: Duration) {
+        let index = match self.phases.iter().position(|p| p.name == name) {
+            Some(i) => i,
+            None => {
+                self.phases.push(NmstatePhaseTiming {
+                    name: name.to_string(),
+                    ..Default::default()
+                });
+                self.phases.len() - 1
+            }
+        };
+        let phase = &mut self.phases[index];
+        phase.count += 1;
+        phase.total += elapsed;
+        phase.max = phase.max.max(elapsed);
+    }
+
+    fn add_count(&mut self, name: &str, value: u64) {
+        *self.counters.entry(name.to_string()).or_default() += value;
+    }
+}
+
+impl NetworkState {
+    /// Same as [NetworkState::apply()] with timings stored into `timings`
+    /// regardless apply succeeded or not.
+    /// Only available for feature `query_apply`.
+    pub fn apply_with_timings(
+        &self,
+        timings: &mut NmstateTimings,
+    ) -> Result<(), NmstateError> {
+        new_tokio_runtime()?.block_on(timings.collect(self.apply_async()))
+    }
+
+    /// Same as [NetworkState::retrieve()] with timings stored into
+    /// `timings` regardless retrieve succeeded or not.
+    /// Only available for feature `query_apply`.
+    pub fn retrieve_with_timings(
+        &mut self,
+        timings: &mut NmstateTimings,
+    ) -> Result<&mut Self, NmstateError> {
+        new_tokio_runtime()?.block_on(timings.collect(self.retrieve_async()))
+    }
+}
+
+// Record the duration of phase when dropped.
+#[derive(Debug)]
+pub(crate) struct TimingsPhase {
+    name: &'static str,
+    started: Instant,
+}
+
+impl Drop for TimingsPhase {
+    fn drop(&mut self) {
+        let elapsed = self.started.elapsed();
+        TIMINGS
+            .try_with(|t| t.borrow_mut().add_phase(self.name, elapsed))
+            .ok();
+    }
+}
+
+// Please bind the returned guard to a named variable like `_phase`, as `_`
+// drops it immediately.
+pub(crate) fn timings_phase(name: &'static str) -> TimingsPhase {
+    TimingsPhase {
+        name,
+        started: Instant::now(),
+    }
+}
+
+pub(crate) fn timings_count(name: &'static str, value: u64) {
+    TIMINGS
+        .try_with(|t| t.borrow_mut().add_count(name, value))
+        .ok();
+}
+
+fn serialize_duration_ms<S>(
+    duration: &Duration,
+    serializer: S,
+) -> Result<S::Ok, S::Error>
+where
+    S: Serializer,
+{
+    serializer.serialize_f64(duration.as_secs_f64() * 1000.0)
+}
+
+#[cfg(test)]
+mod tests {
+    use std::time::Duration;
+
+    use super::{
+        new_tokio_runtime, timings_count, timings_phase, NmstateTimings,
+    };
+
+    #[test]
+    fn test_timings_collect_phases_and_counters() {
+        let mut timings = NmstateTimings::new();
+        let output =
+            new_tokio_runtime()
+                .unwrap()
+                .block_on(timings.collect(async {
+                    for _ in 0..2 {
+                        let _phase = timings_phase("verify");
+                        timings_count("verify-attempts", 1);
+                        tokio::time::sleep(Duration::from_millis(1)).await;
+                    }
+                    let _phase = timings_phase("merge");
+                    1
+                }));
+
+        assert_eq!(output, 1);
+        let names: Vec<&str> =
+            timings.phases.iter().map(|p| p.name.as_str()).collect();
+        assert_eq!(names, vec!["verify", "merge"]);
+        let verify = timings.phase("verify").unwrap();
+        assert_eq!(verify.count, 2);
+        assert!(verify.total >= Duration::from_millis(2));
+        assert!(verify.max <= verify.total);
+        assert_eq!(timings.counters.get("verify-attempts"), Some(&2));
+    }
+
+    #[test]
+    fn test_timings_no_op_without_collect() {
+        let _phase = timings_phase("merge");
+        timings_count("verify-attempts", 1);
+    }
+}
@@ -7,20 +7,21 @@ impl NetworkState {
         &self,
         current: &Self,
     ) -> Result<Self, NmstateError> {
-        let merged_state = MergedNetworkState::new(
-            self.clone(),
-            current.clone(),
-            false,
-            false,
-        )?;
-        Ok(Self {
-            interfaces: merged_state.interfaces.generate_revert()?,
-            routes: merged_state.routes.generate_revert(),
-            rules: merged_state.rules.generate_revert(),
-            dns: merged_state.dns.generate_revert(),
-            ovsdb: merged_state.ovsdb.generate_revert(),
-            ovn: merged_state.ovn.generate_revert(),
-            hostname: merged_state.hostname.generate_revert(),
+        MergedNetworkState::new(self.clone(), current.clone(), false, false)?
+            .generate_revert()
+    }
+}
+
+impl MergedNetworkState {
+    pub(crate) fn generate_revert(&self) -> Result<NetworkState, NmstateError> {
+        Ok(NetworkState {
+            interfaces: self.interfaces.generate_revert()?,
+            routes: self.routes.generate_revert(),
+            rules: self.rules.generate_revert(),
+            dns: self.dns.generate_revert(),
+            ovsdb: self.ovsdb.generate_revert(),
+            ovn: self.ovn.generate_revert(),
+            hostname: self.hostname.generate_revert(),
             ..Default::default()
         })
     }
@@ -1,6 +1,6 @@
 // SPDX-License-Identifier: Apache-2.0
 
-use crate::BaseInterface;
+use crate::{BaseInterface, Interface};
 
 #[test]
 fn test_base_iface_stringlized_attributes() {
@@ -47,3 +47,21 @@ fn test_base_iface_serialize_copy_mac_from() {
 
     assert_eq!(desired, new);
 }
+
+#[test]
+fn test_iface_serialize_name_and_type_first() {
+    let iface: Interface = serde_yaml::from_str(
+        r#"---
+          description: test
+          profile-name: eth1-profile
+          state: up
+          type: ethernet
+          name: eth1
+        "#,
+    )
+    .unwrap();
+
+    let output = serde_yaml::to_string(&iface).unwrap();
+
+    assert!(output.starts_with("name: eth1\ntype: ethernet\n"));
+}
@@ -0,0 +1,409 @@
+// SPDX-License-Identifier: Apache-2.0
+
+// Benchmarks of the planning engine against synthetic large network states.
+// They are ignored by default, run them in release mode:
+//
+//   cargo test --release --lib -- --ignored --show-output bench_
+//
+// Environment variables:
+//  * NMSTATE_BENCH_SCALES: comma separated scale factors, default 10,100,1000.
+//    Please check `gen_net_state_yaml()` for the generated state.
+//  * NMSTATE_BENCH_ITERATIONS: iterations per scale, default 5.
+//
+// Each result is printed as a single line for tracking between builds:
+//   BENCH <name> scale=<scale> ifaces=<count> min=<us>us median=<us>us
+
+use std::fmt::Write;
+use std::time::{Duration, Instant};
+
+use crate::{CompiledPolicy, MergedNetworkState, NetworkPolicy, NetworkState};
+
+const DEFAULT_SCALES: [usize; 3] = [10, 100, 1000];
+const DEFAULT_ITERATIONS: usize = 5;
+
+const POLICY_CHANGE_GW_IFACE_MTU: &str = r#"
+capture:
+  gw: routes.running.destination=="0.0.0.0/0"
+  base-iface: >-
+    interfaces.name==capture.gw.routes.running.0.next-hop-interface
+desiredState:
+  interfaces:
+  - name: "{{ capture.base-iface.interfaces.0.name }}"
+    type: vlan
+    mtu: 1400
+"#;
+
+// For scale `n`, generate:
+//  * `n` active-backup bonds, each with 2 ethernet ports and a VLAN holding
+//    static IPv4 address, 2 routes and 1 route rule.
+//  * `n / 10 + 1` linux bridges, each with 2 ethernet ports in VLAN trunk
+//    mode.
+//  * `n / 10 + 1` OVS bridges, each with a system port and an internal
+//    interface.
+//  * `n / 10 + 1` SR-IOV PFs, each with 4 VFs.
+// The `mtu` is set to all the ethernet bond ports, so states generated with
+// different `mtu` could be used as desired and current of a change.
+fn gen_net_state_yaml(scale: usize, mtu: u16) -> String {
+    let extra = scale / 10 + 1;
+    let mut ifaces = String::new();
+    let mut routes = String::new();
+    let mut rules = String::new();
+
+    for i in 0..scale {
+        let (a, b) = (i / 256 % 256, i % 256);
+        write!(
+            ifaces,
+            r#"
+- name: bp{i}a
+  type: ethernet
+  state: up
+  mtu: {mtu}
+- name: bp{i}b
+  type: ethernet
+  state: up
+  mtu: {mtu}
+- name: bond{i}
+  type: bond
+  state: up
+  link-aggregation:
+    mode: active-backup
+    port:
+    - bp{i}a
+    - bp{i}b
+- name: bond{i}.10
+  type: vlan
+  state: up
+  vlan:
+    base-iface: bond{i}
+    id: 10
+  ipv4:
+    enabled: true
+    dhcp: false
+    address:
+    - ip: 10.{a}.{b}.1
+      prefix-length: 24
+  ipv6:
+    enabled: false"#
+        )
+        .ok();
+        write!(
+            routes,
+            r#"
+  - destination: 198.18.{a}.{b}/32
+    next-hop-address: 10.{a}.{b}.254
+    next-hop-interface: bond{i}.10
+  - destination: 198.19.{a}.{b}/32
+    next-hop-address: 10.{a}.{b}.254
+    next-hop-interface: bond{i}.10
+    table-id: {table_id}"#,
+            table_id = 1000 + i % 100
+        )
+        .ok();
+        write!(
+            rules,
+            r#"
+  - ip-from: 10.{a}.{b}.0/24
+    route-table: {table_id}
+    priority: {priority}"#,
+            table_id = 1000 + i % 100,
+            priority = 1000 + i
+        )
+        .ok();
+    }
+
+    for i in 0..extra {
+        write!(
+            ifaces,
+            r#"
+- name: brp{i}a
+  type: ethernet
+  state: up
+- name: brp{i}b
+  type: ethernet
+  state: up
+- name: br{i}
+  type: linux-bridge
+  state: up
+  bridge:
+    options:
+      stp:
+        enabled: false
+    port:
+    - name: brp{i}a
+      vlan:
+        mode: trunk
+        trunk-tags:
+        - id-range:
+            min: 100
+            max: 199
+        - id: 300
+    - name: brp{i}b
+      vlan:
+        mode: trunk
+        trunk-tags:
+        - id-range:
+            min: 200
+            max: 299
+- name: ovsp{i}
+  type: ethernet
+  state: up
+- name: ovsbr{i}
+  type: ovs-bridge
+  state: up
+  bridge:
+    port:
+    - name: ovsp{i}
+    - name: ovs{i}
+- name: ovs{i}
+  type: ovs-interface
+  state: up
+- name: pf{i}
+  type: ethernet
+  state: up
+  ethernet:
+    sr-iov:
+      total-vfs: 4
+      vfs:
+      - id: 0
+        trust: true
+      - id: 1
+        trust: true
+      - id: 2
+        spoof-check: false
+      - id: 3
+        spoof-check: false"#
+        )
+        .ok();
+    }
+
+    format!(
+        r#"---
+interfaces:{ifaces}
+routes:
+  config:{routes}
+  running:
+  - destination: 0.0.0.0/0
+    next-hop-address: 10.0.0.254
+    next-hop-interface: bond0.10
+route-rules:
+  config:{rules}
+"#
+    )
+}
+
+fn iface_count(scale: usize) -> usize {
+    scale * 4 + (scale / 10 + 1) * 7
+}
+
+fn gen_net_state(scale: usize, mtu: u16) -> NetworkState {
+    serde_yaml::from_str(&gen_net_state_yaml(scale, mtu)).unwrap()
+}
+
+fn bench_scales() -> Vec<usize> {
+    std::env::var("NMSTATE_BENCH_SCALES")
+        .ok()
+        .map(|s| {
+            s.split(',')
+                .filter_map(|n| n.trim().parse::<usize>().ok())
+                .collect()
+        })
+        .unwrap_or_else(|| DEFAULT_SCALES.to_vec())
+}
+
+fn bench_iterations() -> usize {
+    std::env::var("NMSTATE_BENCH_ITERATIONS")
+        .ok()
+        .and_then(|n| n.parse::<usize>().ok())
+        .filter(|n| *n > 0)
+        .unwrap_or(DEFAULT_ITERATIONS)
+}
+
+// Invoke `setup` before each iteration, only `routine` is timed. The first
+// iteration is used for warm up.
+fn run_bench<T, R>(
+    name: &str,
+    scale: usize,
+    mut setup: impl FnMut() -> T,
+    mut routine: impl FnMut(T) -> R,
+) {
+    let iterations = bench_iterations();
+    let mut durations: Vec<Duration> = Vec::with_capacity(iterations);
+    for i in 0..=iterations {
+        let input = setup();
+        let now = Instant::now();
+        let output = routine(input);
+        let elapsed = now.elapsed();
+        // Do not count the drop of output into the elapsed time
+        drop(output);
+        if i > 0 {
+            durations.push(elapsed);
+        }
+    }
+    durations.sort_unstable();
+    println!(
+        "BENCH {name} scale={scale} ifaces={} min={}us median={}us",
+        iface_count(scale),
+        durations[0].as_micros(),
+        durations[durations.len() / 2].as_micros(),
+    );
+}
+
+#[test]
+fn test_bench_gen_net_state_is_valid() {
+    let current = gen_net_state(2, 1500);
+    let desired = gen_net_state(2, 9000);
+    assert_eq!(current.interfaces.to_vec().len(), iface_count(2));
+
+    let merged =
+        MergedNetworkState::new(current.clone(), current.clone(), false, false)
+            .unwrap();
+    merged.verify(&current).unwrap();
+
+    desired.gen_diff(&current).unwrap();
+    desired.generate_revert(&current).unwrap();
+    desired.gen_conf().unwrap();
+
+    let policy: NetworkPolicy =
+        serde_yaml::from_str(POLICY_CHANGE_GW_IFACE_MTU).unwrap();
+    let state = CompiledPolicy::new(&policy)
+        .unwrap()
+        .execute(&current)
+        .unwrap();
+    assert_eq!(state.interfaces.to_vec()[0].name(), "bond0.10");
+}
+
+#[test]
+#[ignore]
+fn bench_merged_state_new() {
+    for scale in bench_scales() {
+        let current = gen_net_state(scale, 1500);
+        let desired = gen_net_state(scale, 9000);
+        run_bench(
+            "merged_state_new",
+            scale,
+            || (desired.clone(), current.clone()),
+            |(desired, current)| {
+                MergedNetworkState::new(desired, current, false, false).unwrap()
+            },
+        );
+    }
+}
+
+#[test]
+#[ignore]
+fn bench_merged_state_verify() {
+    for scale in bench_scales() {
+        let current = gen_net_state(scale, 1500);
+        let merged = MergedNetworkState::new(
+            current.clone(),
+            current.clone(),
+            false,
+            false,
+        )
+        .unwrap();
+        run_bench(
+            "merged_state_verify",
+            scale,
+            || (),
+            |_| merged.verify(&current).unwrap(),
+        );
+    }
+}
+
+#[test]
+#[ignore]
+fn bench_gen_diff() {
+    for scale in bench_scales() {
+        let current = gen_net_state(scale, 1500);
+        let desired = gen_net_state(scale, 9000);
+        run_bench(
+            "gen_diff",
+            scale,
+            || (),
+            |_| desired.gen_diff(&current).unwrap(),
+        );
+    }
+}
+
+#[test]
+#[ignore]
+fn bench_generate_revert() {
+    for scale in bench_scales() {
+        let current = gen_net_state(scale, 1500);
+        let desired = gen_net_state(scale, 9000);
+        run_bench(
+            "generate_revert",
+            scale,
+            || (),
+            |_| desired.generate_revert(&current).unwrap(),
+        );
+    }
+}
+
+#[test]
+#[ignore]
+fn bench_gen_conf() {
+    for scale in bench_scales() {
+        let desired = gen_net_state(scale, 1500);
+        run_bench("gen_conf", scale, || (), |_| desired.gen_conf().unwrap());
+    }
+}
+
+#[test]
+#[ignore]
+fn bench_network_policy() {
+    let policy: NetworkPolicy =
+        serde_yaml::from_str(POLICY_CHANGE_GW_IFACE_MTU).unwrap();
+    let compiled = CompiledPolicy::new(&policy).unwrap();
+    for scale in bench_scales() {
+        let current = gen_net_state(scale, 1500);
+        run_bench(
+            "network_policy",
+            scale,
+            || (),
+            |_| compiled.execute(&current).unwrap(),
+        );
+    }
+}
+
+#[test]
+#[ignore]
+fn bench_yaml_serde() {
+    for scale in bench_scales() {
+        let yaml_str = gen_net_state_yaml(scale, 1500);
+        let net_state = gen_net_state(scale, 1500);
+        run_bench(
+            "yaml_deserialize",
+            scale,
+            || (),
+            |_| serde_yaml::from_str::<NetworkState>(&yaml_str).unwrap(),
+        );
+        run_bench(
+            "yaml_serialize",
+            scale,
+            || (),
+            |_| serde_yaml::to_string(&net_state).unwrap(),
+        );
+    }
+}
+
+#[test]
+#[ignore]
+fn bench_json_serde() {
+    for scale in bench_scales() {
+        let net_state = gen_net_state(scale, 1500);
+        let json_str = serde_json::to_string(&net_state).unwrap();
+        run_bench(
+            "json_deserialize",
+            scale,
+            || (),
+            |_| NetworkState::new_from_json(&json_str).unwrap(),
+        );
+        run_bench(
+            "json_serialize",
+            scale,
+            || (),
+            |_| serde_json::to_string(&net_state).unwrap(),
+        );
+    }
+}
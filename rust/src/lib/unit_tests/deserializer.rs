@@ -0,0 +1,58 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use crate::{
+    from_json_or_yaml_str, ErrorKind, InterfaceType, NetworkPolicy,
+    NetworkState,
+};
+
+#[test]
+fn test_from_json_or_yaml_str_json() {
+    let state: NetworkState = from_json_or_yaml_str(
+        r#"{"interfaces": [{"name": "dummy0", "type": "dummy"}]}"#,
+    )
+    .unwrap();
+
+    assert!(state
+        .interfaces
+        .get_iface("dummy0", InterfaceType::Dummy)
+        .is_some());
+}
+
+#[test]
+fn test_from_json_or_yaml_str_yaml_flow_mapping() {
+    let state: NetworkState =
+        from_json_or_yaml_str("{interfaces: [{name: dummy0, type: dummy}]}")
+            .unwrap();
+
+    assert!(state
+        .interfaces
+        .get_iface("dummy0", InterfaceType::Dummy)
+        .is_some());
+}
+
+#[test]
+fn test_from_json_or_yaml_str_yaml_flow_mapping_policy() {
+    let policy: NetworkPolicy = from_json_or_yaml_str(
+        "{capture: {}, desired: {interfaces: [{name: dummy0, type: dummy}]}}",
+    )
+    .unwrap();
+    let state = NetworkState::try_from(policy).unwrap();
+
+    assert!(state
+        .interfaces
+        .get_iface("dummy0", InterfaceType::Dummy)
+        .is_some());
+}
+
+#[test]
+fn test_from_json_or_yaml_str_invalid_json_data() {
+    let result = from_json_or_yaml_str::<NetworkState>(
+        r#"{"interfaces": [{"name": "dummy0", "mtu": "abc"}]}"#,
+    );
+
+    assert!(result.is_err());
+    if let Err(e) = result {
+        assert_eq!(e.kind(), ErrorKind::InvalidArgument);
+        assert!(e.msg().starts_with("Invalid JSON string"));
+    }
+}
@@ -355,3 +355,42 @@ fn test_mac_identifer_check_iface_type_also() {
     );
     assert_eq!(des_iface.base_iface().profile_name.as_deref(), Some("wan0"))
 }
+
+#[test]
+fn test_mac_identifer_ignore_mac_case() {
+    let cur_ifaces: Interfaces = serde_yaml::from_str(
+        r"---
+        - name: eth1
+          type: ethernet
+          state: up
+          mac-address: 00:23:45:67:89:1A
+        ",
+    )
+    .unwrap();
+
+    let des_ifaces: Interfaces = serde_yaml::from_str(
+        r"---
+        - name: wan0
+          type: ethernet
+          state: up
+          identifier: mac-address
+          mac-address: 00:23:45:67:89:1a
+        ",
+    )
+    .unwrap();
+
+    let merged_ifaces =
+        MergedInterfaces::new(des_ifaces, cur_ifaces, false, false).unwrap();
+
+    let eth1_iface = merged_ifaces
+        .kernel_ifaces
+        .get("eth1")
+        .unwrap()
+        .for_apply
+        .as_ref()
+        .unwrap();
+    assert_eq!(
+        eth1_iface.base_iface().profile_name.as_deref(),
+        Some("wan0")
+    );
+}
@@ -0,0 +1,171 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use crate::NetworkState;
+
+const STATE1: &str = r"---
+interfaces:
+- name: dummy0
+  type: dummy
+  state: up
+  mtu: 1500
+  ipv4:
+    enabled: true
+    dhcp: true
+    address:
+    - ip: 192.0.2.1
+      prefix-length: 24
+      valid-life-time: 3599sec
+      preferred-life-time: 3599sec
+- name: dummy1
+  type: dummy
+  state: up
+  mtu: 9000
+routes:
+  running:
+  - destination: 198.51.100.0/24
+    next-hop-interface: dummy0
+    metric: 100
+  - destination: 203.0.113.0/24
+    next-hop-interface: dummy1
+    metric: 100
+";
+
+const STATE2: &str = r"---
+interfaces:
+- name: dummy1
+  type: dummy
+  state: up
+  mtu: 9000
+- name: dummy0
+  type: dummy
+  state: up
+  mtu: 1500
+  ipv4:
+    enabled: true
+    dhcp: true
+    address:
+    - ip: 192.0.2.1
+      prefix-length: 24
+      valid-life-time: 3000sec
+      preferred-life-time: 3000sec
+routes:
+  running:
+  - destination: 203.0.113.0/24
+    next-hop-interface: dummy1
+    metric: 100
+  - destination: 198.51.100.0/24
+    next-hop-interface: dummy0
+    metric: 100
+";
+
+#[test]
+fn test_fingerprint_ignore_order_and_life_time() {
+    let state1: NetworkState = serde_yaml::from_str(STATE1).unwrap();
+    let state2: NetworkState = serde_yaml::from_str(STATE2).unwrap();
+
+    let fingerprint = state1.fingerprint(None).unwrap();
+
+    assert_eq!(fingerprint.len(), 64);
+    assert_eq!(fingerprint, state2.fingerprint(None).unwrap());
+}
+
+#[test]
+fn test_fingerprint_detect_change() {
+    let state1: NetworkState = serde_yaml::from_str(STATE1).unwrap();
+    let mut state2 = state1.clone();
+    state2
+        .interfaces
+        .get_iface_mut("dummy1", crate::InterfaceType::Dummy)
+        .unwrap()
+        .base_iface_mut()
+        .mtu = Some(1500);
+
+    assert_ne!(
+        state1.fingerprint(None).unwrap(),
+        state2.fingerprint(None).unwrap()
+    );
+}
+
+#[test]
+fn test_fingerprint_with_desired() {
+    let desired: serde_json::Value = serde_yaml::from_str(
+        r"---
+interfaces:
+- name: dummy0
+  type: dummy
+  mtu: 1500
+",
+    )
+    .unwrap();
+    let state1: NetworkState = serde_yaml::from_str(STATE1).unwrap();
+    let mut state2 = state1.clone();
+    state2
+        .interfaces
+        .get_iface_mut("dummy1", crate::InterfaceType::Dummy)
+        .unwrap()
+        .base_iface_mut()
+        .mtu = Some(1500);
+
+    assert_eq!(
+        state1.fingerprint(Some(&desired)).unwrap(),
+        state2.fingerprint(Some(&desired)).unwrap()
+    );
+
+    state2
+        .interfaces
+        .get_iface_mut("dummy0", crate::InterfaceType::Dummy)
+        .unwrap()
+        .base_iface_mut()
+        .mtu = Some(9000);
+
+    assert_ne!(
+        state1.fingerprint(Some(&desired)).unwrap(),
+        state2.fingerprint(Some(&desired)).unwrap()
+    );
+}
+
+#[test]
+fn test_fingerprint_with_typeless_desired() {
+    let state1: NetworkState = serde_yaml::from_str(STATE1).unwrap();
+    let mut state2 = state1.clone();
+    // Not mentioned in desired, should be ignored
+    state2
+        .interfaces
+        .get_iface_mut("dummy0", crate::InterfaceType::Dummy)
+        .unwrap()
+        .base_iface_mut()
+        .state = crate::InterfaceState::Down;
+
+    for desired_yaml in [
+        r"---
+interfaces:
+- name: dummy0
+  mtu: 1500
+",
+        r"---
+interfaces:
+- name: dummy0
+  type: unknown
+  mtu: 1500
+",
+    ] {
+        let desired: serde_json::Value =
+            serde_yaml::from_str(desired_yaml).unwrap();
+        assert_eq!(
+            state1.fingerprint(Some(&desired)).unwrap(),
+            state2.fingerprint(Some(&desired)).unwrap()
+        );
+
+        let mut state3 = state1.clone();
+        state3
+            .interfaces
+            .get_iface_mut("dummy0", crate::InterfaceType::Dummy)
+            .unwrap()
+            .base_iface_mut()
+            .mtu = Some(9000);
+        assert_ne!(
+            state1.fingerprint(Some(&desired)).unwrap(),
+            state3.fingerprint(Some(&desired)).unwrap()
+        );
+    }
+}
@@ -139,13 +139,52 @@ fn test_ifaces_up_order_nested_5_depth_worst_case() {
     ifaces.push(br0);
     ifaces.push(br4);
 
-    let result =
-        MergedInterfaces::new(ifaces, gen_test_eth_ifaces(), false, false);
+    let merged_ifaces =
+        MergedInterfaces::new(ifaces, gen_test_eth_ifaces(), false, false)
+            .unwrap();
+
+    for (iface_name, priority) in [
+        ("br4", 0),
+        ("br0", 1),
+        ("br1", 2),
+        ("br2", 3),
+        ("br3", 4),
+        ("p1", 5),
+        ("p2", 5),
+    ] {
+        assert_eq!(
+            merged_ifaces.kernel_ifaces[iface_name]
+                .for_apply
+                .as_ref()
+                .unwrap()
+                .base_iface()
+                .up_priority,
+            priority
+        );
+    }
+}
+
+#[test]
+fn test_ifaces_up_order_circular_dependency() {
+    let mut ifaces = Interfaces::new();
+    let mut br0 = new_br_iface("br0");
+    let mut br1 = new_br_iface("br1");
+
+    br0.base_iface_mut().controller = Some("br1".to_string());
+    br0.base_iface_mut().controller_type = Some(InterfaceType::LinuxBridge);
+    br1.base_iface_mut().controller = Some("br0".to_string());
+    br1.base_iface_mut().controller_type = Some(InterfaceType::LinuxBridge);
+
+    ifaces.push(br0);
+    ifaces.push(br1);
+
+    let result = MergedInterfaces::new(ifaces, Interfaces::new(), false, false);
 
     assert!(result.is_err());
 
     if let Err(e) = result {
         assert_eq!(e.kind(), ErrorKind::InvalidArgument);
+        assert!(e.msg().contains("br0, br1"));
     }
 }
 
@@ -3,18 +3,24 @@
 #[cfg(test)]
 mod base;
 #[cfg(test)]
+mod bench;
+#[cfg(test)]
 mod bond;
 #[cfg(test)]
 mod bridge;
 #[cfg(test)]
 mod debug_trait;
 #[cfg(test)]
+mod deserializer;
+#[cfg(test)]
 mod dns;
 #[cfg(test)]
 mod ethernet;
 #[cfg(test)]
 mod ethtool;
 #[cfg(test)]
+mod fingerprint;
+#[cfg(test)]
 mod gen_diff;
 #[cfg(test)]
 mod gen_revert;
@@ -35,10 +41,16 @@ mod mac_vlan;
 #[cfg(test)]
 mod mac_vtap;
 #[cfg(test)]
+mod monitor;
+#[cfg(test)]
 mod mptcp;
 #[cfg(test)]
 mod net_state;
 #[cfg(test)]
+mod netns;
+#[cfg(test)]
+mod nispor;
+#[cfg(test)]
 mod nm;
 #[cfg(test)]
 mod ovn;
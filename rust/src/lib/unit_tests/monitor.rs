@@ -0,0 +1,92 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use crate::{
+    query_apply::monitor::{gen_changes, Notified},
+    NetworkState, NetworkStateChange,
+};
+
+#[test]
+fn test_monitor_gen_changes() {
+    let old: NetworkState = serde_yaml::from_str(
+        r"---
+interfaces:
+- name: dummy0
+  type: dummy
+  state: up
+  mtu: 1500
+- name: dummy1
+  type: dummy
+  state: up
+routes:
+  running:
+  - destination: 198.51.100.0/24
+    next-hop-interface: dummy0
+    metric: 100
+",
+    )
+    .unwrap();
+    let new: NetworkState = serde_yaml::from_str(
+        r"---
+interfaces:
+- name: dummy0
+  type: dummy
+  state: up
+  mtu: 9000
+- name: dummy2
+  type: dummy
+  state: up
+routes:
+  running:
+  - destination: 198.51.100.0/24
+    next-hop-interface: dummy0
+    metric: 200
+",
+    )
+    .unwrap();
+
+    let changes = gen_changes(&old, &new);
+
+    assert_eq!(changes.len(), 5);
+    assert!(matches!(
+        &changes[0],
+        NetworkStateChange::InterfaceChanged(i) if i.name() == "dummy0"
+    ));
+    assert!(matches!(
+        &changes[1],
+        NetworkStateChange::InterfaceAdded(i) if i.name() == "dummy2"
+    ));
+    assert!(matches!(
+        &changes[2],
+        NetworkStateChange::InterfaceRemoved(i) if i.name() == "dummy1"
+    ));
+    assert!(matches!(
+        &changes[3],
+        NetworkStateChange::RouteAdded(r) if r.metric == Some(200)
+    ));
+    assert!(matches!(
+        &changes[4],
+        NetworkStateChange::RouteRemoved(r) if r.metric == Some(100)
+    ));
+    assert!(gen_changes(&new, &new).is_empty());
+}
+
+#[test]
+fn test_monitor_merge_notified() {
+    let mut notified = Notified {
+        kernel: true,
+        ..Default::default()
+    };
+    notified.merge(Notified {
+        nm: true,
+        ..Default::default()
+    });
+
+    assert_eq!(
+        notified,
+        Notified {
+            kernel: true,
+            nm: true,
+            ovsdb: false,
+        }
+    );
+}
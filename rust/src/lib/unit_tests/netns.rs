@@ -0,0 +1,33 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use crate::{query_apply::netns::netns_path, ErrorKind, NetworkState};
+
+#[test]
+fn test_netns_path() {
+    assert_eq!(
+        netns_path("1234").unwrap().to_str(),
+        Some("/proc/1234/ns/net")
+    );
+    assert_eq!(
+        netns_path("/proc/1/ns/net").unwrap().to_str(),
+        Some("/proc/1/ns/net")
+    );
+    assert_eq!(
+        netns_path("blue").unwrap().to_str(),
+        Some("/run/netns/blue")
+    );
+    assert!(netns_path("").is_err());
+    assert!(netns_path("../blue").is_err());
+}
+
+#[test]
+fn test_retrieve_netns_many_require_kernel_only() {
+    let results = NetworkState::new().retrieve_netns_many(&["a", "b"]);
+    assert_eq!(results.len(), 2);
+    for result in results.values() {
+        assert_eq!(
+            result.as_ref().unwrap_err().kind(),
+            ErrorKind::InvalidArgument
+        );
+    }
+}
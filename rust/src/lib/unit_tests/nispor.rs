@@ -0,0 +1,203 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use crate::{nispor::apply::nmstate_iface_to_np_delta, Interface};
+
+fn new_iface(yaml: &str) -> Interface {
+    serde_yaml::from_str(yaml).unwrap()
+}
+
+#[test]
+fn test_np_delta_unchanged_iface() {
+    let iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        mac-address: 00:23:45:67:89:1A
+        ipv4:
+          enabled: true
+          address:
+          - ip: 192.0.2.1
+            prefix-length: 24
+        ",
+    );
+
+    assert!(nmstate_iface_to_np_delta(&iface, Some(&iface))
+        .unwrap()
+        .is_none());
+}
+
+#[test]
+fn test_np_delta_reordered_ip_addresses() {
+    let des_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        ipv4:
+          enabled: true
+          address:
+          - ip: 192.0.2.1
+            prefix-length: 24
+          - ip: 192.0.2.2
+            prefix-length: 24
+        ipv6:
+          enabled: true
+          address:
+          - ip: 2001:db8::1
+            prefix-length: 64
+          - ip: 2001:db8::2
+            prefix-length: 64
+        ",
+    );
+    let cur_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        ipv4:
+          enabled: true
+          address:
+          - ip: 192.0.2.2
+            prefix-length: 24
+          - ip: 192.0.2.1
+            prefix-length: 24
+        ipv6:
+          enabled: true
+          address:
+          - ip: 2001:db8::2
+            prefix-length: 64
+          - ip: 2001:db8::1
+            prefix-length: 64
+        ",
+    );
+
+    assert!(nmstate_iface_to_np_delta(&des_iface, Some(&cur_iface))
+        .unwrap()
+        .is_none());
+}
+
+#[test]
+fn test_np_delta_mac_address_case_insensitive() {
+    let des_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        mac-address: 00:23:45:67:89:1a
+        ",
+    );
+    let cur_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        mac-address: 00:23:45:67:89:1A
+        ",
+    );
+
+    assert!(nmstate_iface_to_np_delta(&des_iface, Some(&cur_iface))
+        .unwrap()
+        .is_none());
+}
+
+#[test]
+fn test_np_delta_changed_ip_addresses() {
+    let des_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        mac-address: 00:23:45:67:89:1A
+        ipv4:
+          enabled: true
+          address:
+          - ip: 192.0.2.3
+            prefix-length: 24
+        ",
+    );
+    let cur_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        mac-address: 00:23:45:67:89:1A
+        ipv4:
+          enabled: true
+          address:
+          - ip: 192.0.2.1
+            prefix-length: 24
+        ",
+    );
+
+    let np_iface = nmstate_iface_to_np_delta(&des_iface, Some(&cur_iface))
+        .unwrap()
+        .unwrap();
+
+    assert!(np_iface.ipv4.is_some());
+    assert_eq!(np_iface.mac_address, None);
+}
+
+#[test]
+fn test_np_delta_detach_from_controller() {
+    let des_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        controller: ''
+        ",
+    );
+    let cur_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        controller: br0
+        ",
+    );
+
+    let np_iface = nmstate_iface_to_np_delta(&des_iface, Some(&cur_iface))
+        .unwrap()
+        .unwrap();
+
+    assert_eq!(np_iface.controller.as_deref(), Some(""));
+}
+
+#[test]
+fn test_np_delta_down_iface_emitted() {
+    let des_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        ",
+    );
+    let cur_iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: down
+        ",
+    );
+
+    let np_iface = nmstate_iface_to_np_delta(&des_iface, Some(&cur_iface))
+        .unwrap()
+        .unwrap();
+
+    assert_eq!(np_iface.name, "eth1");
+    assert!(matches!(np_iface.state, nispor::IfaceState::Up));
+}
+
+#[test]
+fn test_np_delta_new_iface() {
+    let iface = new_iface(
+        r"---
+        name: eth1
+        type: ethernet
+        state: up
+        ",
+    );
+
+    assert!(nmstate_iface_to_np_delta(&iface, None).unwrap().is_some());
+}
@@ -973,3 +973,34 @@ fn test_deny_unknown_field_in_ovs_bond() {
 
     assert!(result.is_err());
 }
+
+#[test]
+fn test_ovs_iface_same_name_as_ovs_bridge_up_priority() {
+    let des_ifaces: Interfaces = serde_yaml::from_str(
+        r"---
+- name: br0
+  type: ovs-interface
+  state: up
+- name: br0
+  type: ovs-bridge
+  state: up
+  bridge:
+    port:
+    - name: br0
+",
+    )
+    .unwrap();
+
+    let merged_ifaces =
+        MergedInterfaces::new(des_ifaces, Interfaces::new(), false, false)
+            .unwrap();
+
+    let ovs_iface = merged_ifaces
+        .get_iface("br0", InterfaceType::OvsInterface)
+        .unwrap()
+        .for_apply
+        .as_ref()
+        .unwrap();
+    // Activated after its controller without self dependency
+    assert_eq!(ovs_iface.base_iface().up_priority, 1);
+}
@@ -5,9 +5,10 @@ use std::collections::HashMap;
 use crate::{
     policy::{
         capture::{NetworkCaptureAction, NetworkCaptureCommand},
+        index::CurrentStateIndex,
         token::NetworkCaptureToken,
     },
-    NetworkState,
+    NetworkCaptureRules, NetworkState,
 };
 
 #[test]
@@ -188,7 +189,9 @@ fn test_policy_capture_retain_only() {
     )
     .unwrap();
 
-    let mut state = cap_con.execute(&current, &HashMap::new()).unwrap();
+    let mut state = cap_con
+        .execute(&mut CurrentStateIndex::new(&current), &HashMap::new())
+        .unwrap();
     let empty_state = NetworkState::new();
 
     assert!(cap_con.key_capture.is_none());
@@ -257,10 +260,107 @@ fn test_policy_capture_route_rule() {
     )
     .unwrap();
 
-    let state = cap_con.execute(&current, &HashMap::new()).unwrap();
+    let state = cap_con
+        .execute(&mut CurrentStateIndex::new(&current), &HashMap::new())
+        .unwrap();
 
     let rules = state.rules.config.as_ref().unwrap();
     assert_eq!(rules.len(), 1);
     assert_eq!(rules[0].ip_from, Some("2001:db8:b::/64".to_string()));
     assert_eq!(rules[0].table_id, Some(500));
 }
+
+#[test]
+fn test_policy_capture_indexed_search() {
+    let current: NetworkState = serde_yaml::from_str(
+        r"---
+        interfaces:
+          - name: eth2
+            type: ethernet
+            state: up
+          - name: eth1
+            type: ethernet
+            state: up
+          - name: br0
+            type: linux-bridge
+            state: up
+        routes:
+          running:
+          - destination: 0.0.0.0/0
+            next-hop-address: 192.0.2.1
+            next-hop-interface: eth1
+            table-id: 254
+          - destination: 198.51.100.0/24
+            next-hop-address: 192.0.2.1
+            next-hop-interface: eth2
+            table-id: 200
+          - destination: 203.0.113.0/24
+            next-hop-address: 192.0.2.1
+            next-hop-interface: eth1
+            table-id: 200
+        ",
+    )
+    .unwrap();
+    let capture: NetworkCaptureRules = serde_yaml::from_str(
+        r#"
+        ethernets: interfaces.type == "ethernet"
+        table-200: routes.running.table-id == 200
+        gw: routes.running.destination == "0.0.0.0/0"
+        gw-iface: interfaces.name == capture.gw.routes.running.0.next-hop-interface
+        gw-iface-routes: routes.running.next-hop-interface == capture.gw-iface.interfaces.0.name
+        gw-iface-table-200: capture.gw-iface-routes | routes.running.table-id == 200
+        "#,
+    )
+    .unwrap();
+
+    let results = capture.execute(&current).unwrap();
+
+    let ethernets = results["ethernets"].interfaces.to_vec();
+    assert_eq!(ethernets.len(), 2);
+    assert_eq!(ethernets[0].name(), "eth1");
+    assert_eq!(ethernets[1].name(), "eth2");
+
+    let routes = results["table-200"].routes.running.as_ref().unwrap();
+    assert_eq!(routes.len(), 2);
+    assert_eq!(routes[0].destination.as_deref(), Some("198.51.100.0/24"));
+    assert_eq!(routes[1].destination.as_deref(), Some("203.0.113.0/24"));
+
+    let ifaces = results["gw-iface"].interfaces.to_vec();
+    assert_eq!(ifaces.len(), 1);
+    assert_eq!(ifaces[0].name(), "eth1");
+
+    let routes = results["gw-iface-routes"].routes.running.as_ref().unwrap();
+    assert_eq!(routes.len(), 2);
+
+    let routes = results["gw-iface-table-200"]
+        .routes
+        .running
+        .as_ref()
+        .unwrap();
+    assert_eq!(routes.len(), 1);
+    assert_eq!(routes[0].destination.as_deref(), Some("203.0.113.0/24"));
+}
+
+#[test]
+fn test_policy_capture_indexed_search_not_found() {
+    let current: NetworkState = serde_yaml::from_str(
+        r"---
+        interfaces:
+          - name: eth1
+            type: ethernet
+            state: up
+        ",
+    )
+    .unwrap();
+    let cap_con =
+        NetworkCaptureCommand::parse(r#"interfaces.name == "eth2""#).unwrap();
+
+    let result =
+        cap_con.execute(&mut CurrentStateIndex::new(&current), &HashMap::new());
+
+    assert!(result.is_err());
+    if let Err(e) = result {
+        assert_eq!(e.kind(), crate::ErrorKind::PolicyError);
+        assert!(e.msg().contains("interface with 'name=eth2' not found"));
+    }
+}
@@ -0,0 +1,106 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use crate::{CompiledPolicy, ErrorKind, NetworkPolicy, NetworkState};
+
+const POLICY_MOVE_GW_ETH_TO_BRIDGE: &str = r#"
+capture:
+  base-iface: >-
+    interfaces.name==capture.gw.routes.running.0.next-hop-interface
+  gw: routes.running.destination=="0.0.0.0/0"
+desiredState:
+  interfaces:
+  - name: br1
+    type: linux-bridge
+    state: up
+    mac-address: "{{ capture.base-iface.interfaces.0.mac-address }}"
+    ipv4:
+      dhcp: true
+      enabled: true
+    bridge:
+        port:
+        - name: "{{ capture.base-iface.interfaces.0.name }}"
+"#;
+
+fn gen_current_state(iface_name: &str, mac: &str) -> NetworkState {
+    serde_yaml::from_str(&format!(
+        r"---
+        interfaces:
+          - name: {iface_name}
+            type: ethernet
+            state: up
+            mac-address: {mac}
+            ipv4:
+              dhcp: true
+              enabled: true
+        routes:
+          running:
+          - destination: 0.0.0.0/0
+            next-hop-address: 192.0.2.1
+            next-hop-interface: {iface_name}
+          config: []
+        "
+    ))
+    .unwrap()
+}
+
+#[test]
+fn test_compiled_policy_match_network_policy() {
+    let policy: NetworkPolicy =
+        serde_yaml::from_str(POLICY_MOVE_GW_ETH_TO_BRIDGE).unwrap();
+    let compiled = CompiledPolicy::new(&policy).unwrap();
+    let current = gen_current_state("eth1", "11:22:33:44:55:66");
+
+    let state = compiled.execute(&current).unwrap();
+
+    let mut policy = policy;
+    policy.current = Some(current);
+    assert_eq!(state, NetworkState::try_from(policy).unwrap());
+    let ifaces = state.interfaces.to_vec();
+    assert_eq!(ifaces.len(), 1);
+    assert_eq!(ifaces[0].name(), "br1");
+    assert_eq!(ifaces[0].ports(), Some(vec!["eth1"]));
+}
+
+#[test]
+fn test_compiled_policy_execute_many() {
+    let policy: NetworkPolicy =
+        serde_yaml::from_str(POLICY_MOVE_GW_ETH_TO_BRIDGE).unwrap();
+    let compiled = CompiledPolicy::new(&policy).unwrap();
+    let mut currents: Vec<NetworkState> = (0..20)
+        .map(|i| gen_current_state(&format!("eth{i}"), "11:22:33:44:55:66"))
+        .collect();
+    // Current state without default gateway
+    currents.push(NetworkState::new());
+
+    let results = compiled.execute_many(&currents);
+
+    assert_eq!(results.len(), 21);
+    for (i, result) in results[..20].iter().enumerate() {
+        let ifaces = result.as_ref().unwrap().interfaces.to_vec();
+        assert_eq!(ifaces[0].ports(), Some(vec![format!("eth{i}").as_str()]));
+    }
+    assert!(results[20].is_err());
+}
+
+#[test]
+fn test_compiled_policy_ref_to_undefined_capture() {
+    let policy: NetworkPolicy = serde_yaml::from_str(
+        r#"
+capture:
+  gw: routes.running.destination=="0.0.0.0/0"
+desiredState:
+  interfaces:
+  - name: "{{ capture.base-iface.interfaces.0.name }}"
+    state: up
+"#,
+    )
+    .unwrap();
+
+    let result = CompiledPolicy::new(&policy);
+
+    assert!(result.is_err());
+    if let Err(e) = result {
+        assert_eq!(e.kind(), ErrorKind::PolicyError);
+        assert_eq!(e.position(), "{{ capture.".len());
+    }
+}
@@ -3,6 +3,8 @@
 #[cfg(test)]
 mod capture;
 #[cfg(test)]
+mod compiled;
+#[cfg(test)]
 mod error;
 #[cfg(test)]
 mod example;
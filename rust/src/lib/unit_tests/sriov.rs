@@ -843,6 +843,77 @@ fn test_get_sriov_vf_count() {
     assert_eq!(merged_ifaces.get_sriov_vf_count(), 32);
 }
 
+#[test]
+fn test_get_sriov_pfs_to_wait() {
+    let desired = serde_yaml::from_str::<Interfaces>(
+        r"---
+        - name: eth1
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 16
+        - name: eth2
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 8
+              drivers-autoprobe: false
+        - name: eth3
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 0
+        - name: eth5
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 4
+              vfs:
+              - id: 0
+                trust: true
+        ",
+    )
+    .unwrap();
+
+    let current = serde_yaml::from_str::<Interfaces>(
+        r"---
+        - name: eth1
+          type: ethernet
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 2
+        - name: eth2
+          type: ethernet
+          state: up
+        - name: eth3
+          type: ethernet
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 4
+        - name: eth4
+          type: ethernet
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 16
+        - name: eth5
+          type: ethernet
+          state: up
+          ethernet:
+            sr-iov:
+              total-vfs: 4
+        ",
+    )
+    .unwrap();
+
+    let merged_ifaces =
+        MergedInterfaces::new(desired, current, false, false).unwrap();
+
+    assert_eq!(merged_ifaces.get_sriov_pfs_to_wait(), vec![("eth1", 16)]);
+}
+
 #[test]
 fn test_sriov_not_allow_802_1ad_vlan_protocol_for_vlan_0_and_qos_0() {
     let mut desired = serde_yaml::from_str::<Interface>(
@@ -0,0 +1,66 @@
+// SPDX-License-Identifier: Apache-2.0
+
+use std::sync::atomic::{AtomicUsize, Ordering};
+
+use crate::{ErrorKind, NmstateError};
+
+/// Run `func` against each item using a pool of worker threads sized to the
+/// available CPUs. The output follows the order of `items`.
+pub(crate) fn worker_pool_map<T, R, F>(
+    items: &[T],
+    func: F,
+) -> Vec<Result<R, NmstateError>>
+where
+    T: Sync,
+    R: Send,
+    F: Fn(&T) -> Result<R, NmstateError> + Sync,
+{
+    let thread_count = std::thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(1)
+        .min(items.len());
+    if thread_count <= 1 {
+        return items.iter().map(&func).collect();
+    }
+
+    let next_index = AtomicUsize::new(0);
+    let done: Vec<(usize, Result<R, NmstateError>)> = std::thread::scope(|s| {
+        let handles: Vec<_> = (0..thread_count)
+            .map(|_| {
+                s.spawn(|| {
+                    let mut ret = Vec::new();
+                    loop {
+                        let i = next_index.fetch_add(1, Ordering::Relaxed);
+                        if let Some(item) = items.get(i) {
+                            ret.push((i, func(item)));
+                        } else {
+                            break;
+                        }
+                    }
+                    ret
+                })
+            })
+            .collect();
+        handles
+            .into_iter()
+            .flat_map(|h| h.join().unwrap_or_default())
+            .collect()
+    });
+
+    let mut results: Vec<Option<Result<R, NmstateError>>> =
+        (0..items.len()).map(|_| None).collect();
+    for (i, result) in done {
+        results[i] = Some(result);
+    }
+    results
+        .into_iter()
+        .map(|r| {
+            r.unwrap_or_else(|| {
+                Err(NmstateError::new(
+                    ErrorKind::Bug,
+                    "Worker thread panicked".to_string(),
+                ))
+            })
+        })
+        .collect()
+}
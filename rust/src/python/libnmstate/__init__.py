@@ -2,26 +2,38 @@
 
 from .clib_wrapper import NmstateError
 from .gen_conf import generate_configurations
+from .gen_conf import generate_configurations_many
 from .gen_diff import generate_differences
 from .netapplier import apply
 from .netapplier import commit
 from .netapplier import rollback
 from .netinfo import show
+from .netinfo import show_fingerprint
+from .netinfo import show_netns_many
 from .netinfo import show_running_config
+from .netinfo import watch
 from .prettystate import PrettyState
+from .nmpolicy import CompiledPolicy
 from .nmpolicy import gen_net_state_from_policy
+from .state_cache import NetworkStateCache
 
 __all__ = [
+    "CompiledPolicy",
+    "NetworkStateCache",
     "NmstateError",
     "PrettyState",
     "apply",
     "commit",
     "gen_net_state_from_policy",
     "generate_configurations",
+    "generate_configurations_many",
     "generate_differences",
     "rollback",
     "show",
+    "show_fingerprint",
+    "show_netns_many",
     "show_running_config",
+    "watch",
 ]
 
 __version__ = "2.2.38"
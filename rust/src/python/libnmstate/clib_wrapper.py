@@ -1,6 +1,15 @@
 # SPDX-License-Identifier: LGPL-2.1-or-later
 
-from ctypes import c_int, c_char_p, c_uint32, POINTER, byref, cdll
+from ctypes import (
+    c_int,
+    c_char_p,
+    c_uint32,
+    c_uint64,
+    c_void_p,
+    POINTER,
+    byref,
+    cdll,
+)
 import json
 import logging
 import yaml
@@ -29,9 +38,31 @@ lib.nmstate_net_state_retrieve.argtypes = (
     POINTER(c_char_p),
 )
 
+lib.nmstate_net_state_retrieve_with_timings.restype = c_int
+lib.nmstate_net_state_retrieve_with_timings.argtypes = (
+    c_uint32,
+    POINTER(c_char_p),
+    POINTER(c_char_p),
+    POINTER(c_char_p),
+    POINTER(c_char_p),
+    POINTER(c_char_p),
+)
+
 lib.nmstate_cstring_free.restype = None
 lib.nmstate_cstring_free.argtypes = (c_char_p,)
 
+lib.nmstate_log_buffered_count.restype = c_uint64
+lib.nmstate_log_buffered_count.argtypes = ()
+
+lib.nmstate_compiled_policy_free.restype = None
+lib.nmstate_compiled_policy_free.argtypes = (c_void_p,)
+
+lib.nmstate_net_state_monitor_free.restype = None
+lib.nmstate_net_state_monitor_free.argtypes = (c_void_p,)
+
+lib.nmstate_net_state_cache_free.restype = None
+lib.nmstate_net_state_cache_free.argtypes = (c_void_p,)
+
 NMSTATE_FLAG_NONE = 0
 NMSTATE_FLAG_KERNEL_ONLY = 1 << 1
 NMSTATE_FLAG_NO_VERIFY = 1 << 2
@@ -40,6 +71,7 @@ NMSTATE_FLAG_INCLUDE_SECRETS = 1 << 4
 NMSTATE_FLAG_NO_COMMIT = 1 << 5
 NMSTATE_FLAG_MEMORY_ONLY = 1 << 6
 NMSTATE_FLAG_RUNNING_CONFIG_ONLY = 1 << 7
+NMSTATE_FLAG_NO_LLDP_NEIGHBORS = 1 << 9
 NMSTATE_PASS = 0
 
 
@@ -48,11 +80,14 @@ def retrieve_net_state_json(
     include_status_data=False,
     include_secrets=False,
     running_config_only=False,
+    include_lldp_neighbors=True,
+    timings=None,
 ):
     c_err_msg = c_char_p()
     c_err_kind = c_char_p()
     c_state = c_char_p()
     c_log = c_char_p()
+    c_timings = c_char_p()
     flags = NMSTATE_FLAG_NONE
     if kernel_only:
         flags |= NMSTATE_FLAG_KERNEL_ONLY
@@ -62,26 +97,128 @@ def retrieve_net_state_json(
         flags |= NMSTATE_FLAG_INCLUDE_SECRETS
     if running_config_only:
         flags |= NMSTATE_FLAG_RUNNING_CONFIG_ONLY
+    if not include_lldp_neighbors:
+        flags |= NMSTATE_FLAG_NO_LLDP_NEIGHBORS
+
+    if timings is None:
+        rc = lib.nmstate_net_state_retrieve(
+            flags,
+            byref(c_state),
+            byref(c_log),
+            byref(c_err_kind),
+            byref(c_err_msg),
+        )
+    else:
+        rc = lib.nmstate_net_state_retrieve_with_timings(
+            flags,
+            byref(c_state),
+            byref(c_timings),
+            byref(c_log),
+            byref(c_err_kind),
+            byref(c_err_msg),
+        )
+    state = c_state.value
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    _store_timings(c_timings.value, timings)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_state)
+    lib.nmstate_cstring_free(c_timings)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise NmstateError(f"{err_kind}: {err_msg}")
+    # pylint: disable=no-member
+    return state.decode("utf-8")
+    # pylint: enable=no-member
+
 
-    rc = lib.nmstate_net_state_retrieve(
+def retrieve_net_state_netns_many_json(
+    netns_list,
+    include_secrets=False,
+    running_config_only=False,
+):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_netns_list = c_char_p(json.dumps(netns_list).encode("utf-8"))
+    c_states = c_char_p()
+    c_log = c_char_p()
+    flags = NMSTATE_FLAG_KERNEL_ONLY
+    if include_secrets:
+        flags |= NMSTATE_FLAG_INCLUDE_SECRETS
+    if running_config_only:
+        flags |= NMSTATE_FLAG_RUNNING_CONFIG_ONLY
+
+    rc = lib.nmstate_net_state_retrieve_netns_many(
         flags,
-        byref(c_state),
+        c_netns_list,
+        byref(c_states),
         byref(c_log),
         byref(c_err_kind),
         byref(c_err_msg),
     )
-    state = c_state.value
+    states = c_states.value
     err_msg = c_err_msg.value
     err_kind = c_err_kind.value
     parse_log(c_log.value)
     lib.nmstate_cstring_free(c_log)
-    lib.nmstate_cstring_free(c_state)
+    lib.nmstate_cstring_free(c_states)
     lib.nmstate_cstring_free(c_err_kind)
     lib.nmstate_cstring_free(c_err_msg)
     if rc != NMSTATE_PASS:
-        raise NmstateError(f"{err_kind}: {err_msg}")
+        raise map_error(err_kind, err_msg)
     # pylint: disable=no-member
-    return state.decode("utf-8")
+    return states.decode("utf-8")
+    # pylint: enable=no-member
+
+
+def retrieve_net_state_fingerprint(
+    desired_state=None,
+    kernel_only=False,
+    include_secrets=False,
+    running_config_only=False,
+    include_lldp_neighbors=True,
+):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_desired_state = (
+        None
+        if desired_state is None
+        else c_char_p(json.dumps(desired_state).encode("utf-8"))
+    )
+    c_fingerprint = c_char_p()
+    c_log = c_char_p()
+    flags = NMSTATE_FLAG_NONE
+    if kernel_only:
+        flags |= NMSTATE_FLAG_KERNEL_ONLY
+    if include_secrets:
+        flags |= NMSTATE_FLAG_INCLUDE_SECRETS
+    if running_config_only:
+        flags |= NMSTATE_FLAG_RUNNING_CONFIG_ONLY
+    if not include_lldp_neighbors:
+        flags |= NMSTATE_FLAG_NO_LLDP_NEIGHBORS
+
+    rc = lib.nmstate_net_state_fingerprint(
+        flags,
+        c_desired_state,
+        byref(c_fingerprint),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    fingerprint = c_fingerprint.value
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_fingerprint)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    # pylint: disable=no-member
+    return fingerprint.decode("utf-8")
     # pylint: enable=no-member
 
 
@@ -92,11 +229,13 @@ def apply_net_state(
     save_to_disk=True,
     commit=True,
     rollback_timeout=60,
+    timings=None,
 ):
     c_err_msg = c_char_p()
     c_err_kind = c_char_p()
     c_state = c_char_p(json.dumps(state).encode("utf-8"))
     c_log = c_char_p()
+    c_timings = c_char_p()
     flags = NMSTATE_FLAG_NONE
     if kernel_only:
         flags |= NMSTATE_FLAG_KERNEL_ONLY
@@ -110,18 +249,31 @@ def apply_net_state(
     if not save_to_disk:
         flags |= NMSTATE_FLAG_MEMORY_ONLY
 
-    rc = lib.nmstate_net_state_apply(
-        flags,
-        c_state,
-        rollback_timeout,
-        byref(c_log),
-        byref(c_err_kind),
-        byref(c_err_msg),
-    )
+    if timings is None:
+        rc = lib.nmstate_net_state_apply(
+            flags,
+            c_state,
+            rollback_timeout,
+            byref(c_log),
+            byref(c_err_kind),
+            byref(c_err_msg),
+        )
+    else:
+        rc = lib.nmstate_net_state_apply_with_timings(
+            flags,
+            c_state,
+            rollback_timeout,
+            byref(c_timings),
+            byref(c_log),
+            byref(c_err_kind),
+            byref(c_err_msg),
+        )
     err_msg = c_err_msg.value
     err_kind = c_err_kind.value
     parse_log(c_log.value)
+    _store_timings(c_timings.value, timings)
     lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_timings)
     lib.nmstate_cstring_free(c_err_kind)
     lib.nmstate_cstring_free(c_err_msg)
     if rc != NMSTATE_PASS:
@@ -201,6 +353,34 @@ def gen_conf(state):
     # pylint: enable=no-member
 
 
+def gen_conf_many(states):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_states = c_char_p(json.dumps(states).encode("utf-8"))
+    c_configs = c_char_p()
+    c_log = c_char_p()
+    rc = lib.nmstate_generate_configurations_many(
+        c_states,
+        byref(c_configs),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    configs = c_configs.value
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_configs)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    # pylint: disable=no-member
+    return configs.decode("utf-8")
+    # pylint: enable=no-member
+
+
 def gen_diff(new_state, old_state):
     c_err_msg = c_char_p()
     c_err_kind = c_char_p()
@@ -281,9 +461,258 @@ def net_state_from_policy(policy, cur_state):
     # pylint: enable=no-member
 
 
+def compiled_policy_new(policy):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_policy = c_char_p(json.dumps(policy).encode("utf-8"))
+    c_compiled_policy = c_void_p()
+    c_log = c_char_p()
+    rc = lib.nmstate_compiled_policy_new(
+        c_policy,
+        byref(c_compiled_policy),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    return c_compiled_policy
+
+
+def compiled_policy_execute(compiled_policy, cur_states):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_cur_states = c_char_p(json.dumps(cur_states).encode("utf-8"))
+    c_states = c_char_p()
+    c_log = c_char_p()
+    rc = lib.nmstate_compiled_policy_execute(
+        compiled_policy,
+        c_cur_states,
+        byref(c_states),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    states = c_states.value
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_states)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    # pylint: disable=no-member
+    return states.decode("utf-8")
+    # pylint: enable=no-member
+
+
+def compiled_policy_free(compiled_policy):
+    lib.nmstate_compiled_policy_free(compiled_policy)
+
+
+def monitor_new(kernel_only=False, include_secrets=False):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_monitor = c_void_p()
+    c_state = c_char_p()
+    c_log = c_char_p()
+    flags = NMSTATE_FLAG_NONE
+    if kernel_only:
+        flags |= NMSTATE_FLAG_KERNEL_ONLY
+    if include_secrets:
+        flags |= NMSTATE_FLAG_INCLUDE_SECRETS
+    rc = lib.nmstate_net_state_monitor_new(
+        flags,
+        byref(c_monitor),
+        byref(c_state),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    state = c_state.value
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_state)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    # pylint: disable=no-member
+    return c_monitor, state.decode("utf-8")
+    # pylint: enable=no-member
+
+
+def monitor_next(monitor, timeout_ms=-1):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_changes = c_char_p()
+    c_log = c_char_p()
+    rc = lib.nmstate_net_state_monitor_next(
+        monitor,
+        c_int(timeout_ms),
+        byref(c_changes),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    changes = c_changes.value
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_changes)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    # pylint: disable=no-member
+    return changes.decode("utf-8")
+    # pylint: enable=no-member
+
+
+def monitor_free(monitor):
+    lib.nmstate_net_state_monitor_free(monitor)
+
+
+def cache_new(max_age):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_cache = c_void_p()
+    c_log = c_char_p()
+    rc = lib.nmstate_net_state_cache_new(
+        c_uint32(int(max_age * 1000)),
+        byref(c_cache),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    return c_cache
+
+
+def cache_retrieve_json(
+    cache,
+    kernel_only=False,
+    include_secrets=False,
+    running_config_only=False,
+    include_lldp_neighbors=True,
+):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_state = c_char_p()
+    c_log = c_char_p()
+    flags = NMSTATE_FLAG_NONE
+    if kernel_only:
+        flags |= NMSTATE_FLAG_KERNEL_ONLY
+    if include_secrets:
+        flags |= NMSTATE_FLAG_INCLUDE_SECRETS
+    if running_config_only:
+        flags |= NMSTATE_FLAG_RUNNING_CONFIG_ONLY
+    if not include_lldp_neighbors:
+        flags |= NMSTATE_FLAG_NO_LLDP_NEIGHBORS
+
+    rc = lib.nmstate_net_state_cache_retrieve(
+        cache,
+        flags,
+        byref(c_state),
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    state = c_state.value
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_state)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+    # pylint: disable=no-member
+    return state.decode("utf-8")
+    # pylint: enable=no-member
+
+
+def cache_apply(
+    cache,
+    state,
+    kernel_only=False,
+    verify_change=True,
+    save_to_disk=True,
+    commit=True,
+    rollback_timeout=60,
+):
+    c_err_msg = c_char_p()
+    c_err_kind = c_char_p()
+    c_state = c_char_p(json.dumps(state).encode("utf-8"))
+    c_log = c_char_p()
+    flags = NMSTATE_FLAG_NONE
+    if kernel_only:
+        flags |= NMSTATE_FLAG_KERNEL_ONLY
+    if not verify_change:
+        flags |= NMSTATE_FLAG_NO_VERIFY
+    if not commit:
+        flags |= NMSTATE_FLAG_NO_COMMIT
+    if not save_to_disk:
+        flags |= NMSTATE_FLAG_MEMORY_ONLY
+
+    rc = lib.nmstate_net_state_cache_apply(
+        cache,
+        flags,
+        c_state,
+        rollback_timeout,
+        byref(c_log),
+        byref(c_err_kind),
+        byref(c_err_msg),
+    )
+    err_msg = c_err_msg.value
+    err_kind = c_err_kind.value
+    parse_log(c_log.value)
+    lib.nmstate_cstring_free(c_log)
+    lib.nmstate_cstring_free(c_err_kind)
+    lib.nmstate_cstring_free(c_err_msg)
+    if rc != NMSTATE_PASS:
+        raise map_error(err_kind, err_msg)
+
+
+def cache_free(cache):
+    lib.nmstate_net_state_cache_free(cache)
+
+
+def log_buffered_count():
+    return lib.nmstate_log_buffered_count()
+
+
+def _store_timings(timings_json, timings):
+    if timings is not None and timings_json:
+        timings.update(json.loads(timings_json.decode("utf-8")))
+
+
 def map_error(err_kind, err_msg):
     err_msg = err_msg.decode("utf-8")
     err_kind = err_kind.decode("utf-8")
+    return map_error_str(err_kind, err_msg)
+
+
+def map_error_str(err_kind, err_msg):
     if err_kind == "VerificationError":
         return NmstateVerificationError(err_msg)
     elif err_kind == "InvalidArgument":
@@ -15,9 +15,84 @@
 # limitations under the License.
 
 import json
+import os
 
 from .clib_wrapper import gen_conf
+from .clib_wrapper import gen_conf_many
+from .clib_wrapper import map_error_str
+from .error import NmstateValueError
 
+# NetworkManager ignores keyfiles readable by others
+CONF_FILE_MODE = 0o600
 
-def generate_configurations(desired_state):
-    return json.loads(gen_conf(desired_state))
+
+def generate_configurations(desired_state, output_dir=None):
+    """
+    Generate backend configurations for the desired state.
+    When output_dir is specified, each configuration is also stored into
+    `<output_dir>/<backend>/<file_name>`. Files holding the same content are
+    not rewritten.
+    """
+    configs = json.loads(gen_conf(desired_state))
+    if output_dir is not None:
+        _write_configs_to_dir(configs, output_dir)
+    return configs
+
+
+def generate_configurations_many(states):
+    """
+    Generate backend configurations for each of the desired states in one
+    call, processed by a pool of worker threads.
+    The `states` could be any iterable of desired states. The returned list
+    follows the order of `states`, each item is the configurations
+    dictionary or the NmstateError instance explaining the failure of that
+    state.
+    """
+    ret = []
+    for entry in json.loads(gen_conf_many(list(states))):
+        if "error" in entry:
+            ret.append(
+                map_error_str(entry["error"]["kind"], entry["error"]["msg"])
+            )
+        else:
+            ret.append(entry["configs"])
+    return ret
+
+
+def _write_configs_to_dir(configs, output_dir):
+    for backend, files in configs.items():
+        _validate_conf_path_name(backend)
+        backend_dir = os.path.join(output_dir, backend)
+        os.makedirs(backend_dir, exist_ok=True)
+        for file_name, content in files:
+            _validate_conf_path_name(file_name)
+            file_path = os.path.join(backend_dir, file_name)
+            if not _is_file_content_equal(file_path, content):
+                fd = os.open(
+                    file_path,
+                    os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                    CONF_FILE_MODE,
+                )
+                with os.fdopen(fd, "w") as f:
+                    f.write(content)
+            # The mode of os.open() only applies to newly created file
+            os.chmod(file_path, CONF_FILE_MODE)
+
+
+def _is_file_content_equal(file_path, content):
+    try:
+        with open(file_path) as fd:
+            return fd.read() == content
+    except OSError:
+        return False
+
+
+def _validate_conf_path_name(name):
+    """
+    Backend and file names are used as single path component, reject
+    anything which could escape the output folder.
+    """
+    if name in ("", ".", "..") or "/" in name:
+        raise NmstateValueError(
+            f"Refusing to store config file with invalid name {name}"
+        )
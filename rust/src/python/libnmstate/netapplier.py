@@ -27,7 +27,13 @@ def apply(
     save_to_disk=True,
     commit=True,
     rollback_timeout=60,
+    timings=None,
 ):
+    """
+    When `timings` is a dictionary, it is updated with the duration of each
+    apply phase as `phases` and counters like `verify-attempts` as
+    `counters`, even when apply failed.
+    """
     return apply_net_state(
         desired_state,
         kernel_only=kernel_only,
@@ -35,6 +41,7 @@ def apply(
         save_to_disk=save_to_disk,
         commit=commit,
         rollback_timeout=rollback_timeout,
+        timings=timings,
     )
 
 
@@ -16,17 +16,34 @@
 
 import json
 
+from .clib_wrapper import map_error_str
+from .clib_wrapper import monitor_free
+from .clib_wrapper import monitor_new
+from .clib_wrapper import monitor_next
+from .clib_wrapper import retrieve_net_state_fingerprint
 from .clib_wrapper import retrieve_net_state_json
+from .clib_wrapper import retrieve_net_state_netns_many_json
 
 
 def show(
-    *, kernel_only=False, include_status_data=False, include_secrets=False
+    *,
+    kernel_only=False,
+    include_status_data=False,
+    include_secrets=False,
+    include_lldp_neighbors=True,
+    timings=None,
 ):
+    """
+    When `timings` is a dictionary, it is updated with the duration of each
+    retrieve phase as `phases` and counters as `counters`.
+    """
     return json.loads(
         retrieve_net_state_json(
             kernel_only=kernel_only,
             include_status_data=include_status_data,
             include_secrets=include_secrets,
+            include_lldp_neighbors=include_lldp_neighbors,
+            timings=timings,
         )
     )
 
@@ -38,3 +55,78 @@ def show_running_config(include_secrets=False):
             running_config_only=True,
         )
     )
+
+
+def show_fingerprint(
+    desired_state=None,
+    *,
+    kernel_only=False,
+    include_secrets=False,
+    include_lldp_neighbors=True,
+):
+    """
+    Return the SHA-256 fingerprint(hex string) of current network state.
+    The fingerprint is not affected by the order of interfaces, routes and
+    route rules. When `desired_state` is defined, only properties mentioned
+    in it are included, hence the fingerprint could be compared with the
+    previous one to detect drift without fetching the full network state.
+    """
+    return retrieve_net_state_fingerprint(
+        desired_state=desired_state,
+        kernel_only=kernel_only,
+        include_secrets=include_secrets,
+        include_lldp_neighbors=include_lldp_neighbors,
+    )
+
+
+def show_netns_many(netns_list, *, include_secrets=False):
+    """
+    Retrieve the kernel network state of each network namespace in
+    `netns_list` concurrently from current process.
+    Each network namespace could be the PID of process, absolute path to
+    network namespace file or name of network namespace created by
+    `ip netns add`. Hostname, DNS and OVS database are not included.
+    Return a dictionary from network namespace to its state or the
+    NmstateError instance explaining the failure of that network namespace.
+    """
+    ret = {}
+    entries = json.loads(
+        retrieve_net_state_netns_many_json(
+            list(netns_list), include_secrets=include_secrets
+        )
+    )
+    for netns, entry in entries.items():
+        if "error" in entry:
+            ret[netns] = map_error_str(
+                entry["error"]["kind"], entry["error"]["msg"]
+            )
+        else:
+            ret[netns] = entry["state"]
+    return ret
+
+
+def watch(*, kernel_only=False, include_secrets=False, timeout=None):
+    """
+    Generator yielding the current network state first, then the list of
+    changes each time network state changed. Each change is a dictionary
+    with single key like `interface-added`, `interface-changed`,
+    `interface-removed`, `route-added`, `route-removed`, `route-rule-added`,
+    `route-rule-removed`, `dns-changed`, `hostname-changed` or
+    `ovs-db-changed` holding the new(or removed) state of that object.
+    When `timeout` in seconds is defined, the generator stops if no change
+    happened within that time.
+    """
+    monitor, state = monitor_new(
+        kernel_only=kernel_only, include_secrets=include_secrets
+    )
+    timeout_ms = -1 if timeout is None else int(timeout * 1000)
+    try:
+        yield json.loads(state)
+        while True:
+            changes = monitor_next(monitor, timeout_ms)
+            if changes:
+                yield json.loads(changes)
+            elif timeout is not None:
+                return
+    finally:
+        monitor_free(monitor)
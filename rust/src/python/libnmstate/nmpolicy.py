@@ -3,8 +3,66 @@
 
 import json
 
+from .clib_wrapper import compiled_policy_execute
+from .clib_wrapper import compiled_policy_free
+from .clib_wrapper import compiled_policy_new
+from .clib_wrapper import map_error_str
 from .clib_wrapper import net_state_from_policy
 
 
 def gen_net_state_from_policy(policy, cur_state):
     return json.loads(net_state_from_policy(policy, cur_state))
+
+
+class CompiledPolicy:
+    """
+    Network policy parsed, sorted and validated once for generating network
+    states against many current states.
+    """
+
+    def __init__(self, policy):
+        self._compiled = compiled_policy_new(policy)
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
+
+    def close(self):
+        compiled = getattr(self, "_compiled", None)
+        if compiled is not None:
+            compiled_policy_free(compiled)
+            self._compiled = None
+
+    def gen_net_state(self, cur_state):
+        ret = self.gen_net_states([cur_state])[0]
+        if isinstance(ret, Exception):
+            raise ret
+        return ret
+
+    def gen_net_states(self, cur_states):
+        """
+        Generate network state for each of current states using a pool of
+        worker threads. The returned list follows the order of `cur_states`,
+        each item is the network state or the NmstateError instance
+        explaining the failure.
+        """
+        if self._compiled is None:
+            raise ValueError("CompiledPolicy is already closed")
+        ret = []
+        for entry in json.loads(
+            compiled_policy_execute(self._compiled, list(cur_states))
+        ):
+            if "error" in entry:
+                ret.append(
+                    map_error_str(
+                        entry["error"]["kind"], entry["error"]["msg"]
+                    )
+                )
+            else:
+                ret.append(entry["state"])
+        return ret
@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import json
+
+from .clib_wrapper import cache_apply
+from .clib_wrapper import cache_free
+from .clib_wrapper import cache_new
+from .clib_wrapper import cache_retrieve_json
+
+
+class NetworkStateCache:
+    """
+    In-process cache of current network state invalidated by kernel,
+    NetworkManager and OVS database change notifications.
+    The `show()` and the pre-apply retrieve of `apply()` are served from
+    cache when nothing changed and the cached state is not older than
+    `max_age` seconds. Not thread safe.
+    """
+
+    def __init__(self, max_age=30):
+        self._cache = cache_new(max_age)
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
+
+    def close(self):
+        cache = getattr(self, "_cache", None)
+        if cache is not None:
+            cache_free(cache)
+            self._cache = None
+
+    def _handle(self):
+        if self._cache is None:
+            raise ValueError("NetworkStateCache is already closed")
+        return self._cache
+
+    def show(
+        self,
+        *,
+        kernel_only=False,
+        include_secrets=False,
+        include_lldp_neighbors=True,
+    ):
+        return json.loads(
+            cache_retrieve_json(
+                self._handle(),
+                kernel_only=kernel_only,
+                include_secrets=include_secrets,
+                include_lldp_neighbors=include_lldp_neighbors,
+            )
+        )
+
+    def show_running_config(self, include_secrets=False):
+        return json.loads(
+            cache_retrieve_json(
+                self._handle(),
+                include_secrets=include_secrets,
+                running_config_only=True,
+            )
+        )
+
+    def apply(
+        self,
+        desired_state,
+        *,
+        kernel_only=False,
+        verify_change=True,
+        save_to_disk=True,
+        commit=True,
+        rollback_timeout=60,
+    ):
+        cache_apply(
+            self._handle(),
+            desired_state,
+            kernel_only=kernel_only,
+            verify_change=verify_change,
+            save_to_disk=save_to_disk,
+            commit=commit,
+            rollback_timeout=rollback_timeout,
+        )
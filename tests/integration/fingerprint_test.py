@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import pytest
+
+import libnmstate
+from libnmstate.schema import Interface
+
+from .testlib.cmdlib import exec_cmd
+
+
+TEST_DUMMY = "dummy-fp0"
+
+
+@pytest.fixture
+def dummy_iface():
+    exec_cmd(f"ip link add {TEST_DUMMY} type dummy".split(), check=True)
+    try:
+        yield TEST_DUMMY
+    finally:
+        exec_cmd(f"ip link del {TEST_DUMMY}".split())
+
+
+def test_fingerprint_detect_drift(dummy_iface):
+    desired_state = {
+        Interface.KEY: [{Interface.NAME: dummy_iface, Interface.MTU: 1500}]
+    }
+    fingerprint = libnmstate.show_fingerprint(
+        desired_state, kernel_only=True
+    )
+
+    assert len(fingerprint) == 64
+    assert fingerprint == libnmstate.show_fingerprint(
+        desired_state, kernel_only=True
+    )
+
+    exec_cmd(f"ip link set {dummy_iface} mtu 1400".split(), check=True)
+
+    assert fingerprint != libnmstate.show_fingerprint(
+        desired_state, kernel_only=True
+    )
@@ -0,0 +1,102 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import json
+
+import pytest
+
+import libnmstate
+from libnmstate.error import NmstateValueError
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceIPv4
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+
+from .testlib import cmdlib
+from .testlib.cmdlib import exec_cmd
+
+
+TEST_NETNS1 = "nmstate-test-ns1"
+TEST_NETNS2 = "nmstate-test-ns2"
+TEST_DUMMY = "dummy-netns0"
+
+
+@pytest.fixture
+def two_netns_with_dummy():
+    for netns in (TEST_NETNS1, TEST_NETNS2):
+        exec_cmd(f"ip netns add {netns}".split(), check=True)
+        exec_cmd(
+            f"ip -n {netns} link add {TEST_DUMMY} type dummy".split(),
+            check=True,
+        )
+    try:
+        yield
+    finally:
+        for netns in (TEST_NETNS1, TEST_NETNS2):
+            exec_cmd(f"ip netns del {netns}".split())
+
+
+def _iface_names(state):
+    return [iface[Interface.NAME] for iface in state[Interface.KEY]]
+
+
+def test_show_netns_many(two_netns_with_dummy):
+    states = libnmstate.show_netns_many([TEST_NETNS1, TEST_NETNS2])
+
+    for netns in (TEST_NETNS1, TEST_NETNS2):
+        assert TEST_DUMMY in _iface_names(states[netns])
+        assert "lo" in _iface_names(states[netns])
+    assert TEST_DUMMY not in _iface_names(libnmstate.show(kernel_only=True))
+
+
+def test_show_netns_many_with_invalid_netns(two_netns_with_dummy):
+    states = libnmstate.show_netns_many([TEST_NETNS1, "not-exist-netns"])
+
+    assert TEST_DUMMY in _iface_names(states[TEST_NETNS1])
+    assert isinstance(states["not-exist-netns"], NmstateValueError)
+
+
+def _get_iface(state, iface_name):
+    for iface in state[Interface.KEY]:
+        if iface[Interface.NAME] == iface_name:
+            return iface
+    return None
+
+
+def test_apply_to_netns(two_netns_with_dummy):
+    desired_state = {
+        Interface.KEY: [
+            {
+                Interface.NAME: TEST_DUMMY,
+                Interface.TYPE: InterfaceType.DUMMY,
+                Interface.STATE: InterfaceState.UP,
+                Interface.MTU: 1400,
+                Interface.IPV4: {
+                    InterfaceIPv4.ENABLED: True,
+                    InterfaceIPv4.ADDRESS: [
+                        {
+                            InterfaceIPv4.ADDRESS_IP: "192.0.2.251",
+                            InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 24,
+                        }
+                    ],
+                },
+            }
+        ]
+    }
+    ret = exec_cmd(
+        f"nmstatectl -q apply --kernel --netns {TEST_NETNS1}".split(),
+        stdin=json.dumps(desired_state).encode("utf-8"),
+    )
+    assert ret[0] == cmdlib.RC_SUCCESS, cmdlib.format_exec_cmd_result(ret)
+
+    states = libnmstate.show_netns_many([TEST_NETNS1, TEST_NETNS2])
+    iface = _get_iface(states[TEST_NETNS1], TEST_DUMMY)
+    assert iface[Interface.MTU] == 1400
+    assert iface[Interface.IPV4][InterfaceIPv4.ADDRESS] == [
+        {
+            InterfaceIPv4.ADDRESS_IP: "192.0.2.251",
+            InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 24,
+        }
+    ]
+    # Other network namespaces are untouched
+    assert _get_iface(states[TEST_NETNS2], TEST_DUMMY)[Interface.MTU] != 1400
+    assert not _get_iface(libnmstate.show(kernel_only=True), TEST_DUMMY)
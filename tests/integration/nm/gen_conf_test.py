@@ -6,6 +6,7 @@ import pytest
 import yaml
 
 import libnmstate
+from libnmstate.error import NmstateValueError
 from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceType
 from libnmstate.schema import OVSBridge
@@ -271,3 +272,77 @@ def test_gen_conf_blackhole_routes():
         desired_routes[1][Route.NEXT_HOP_INTERFACE] = "lo"
         cur_state = libnmstate.show()
         assert_routes(desired_routes, cur_state, nic=None)
+
+
+def test_gen_conf_output_dir(tmp_path):
+    desired_state = load_yaml(
+        """---
+        interfaces:
+          - name: dummy1
+            type: dummy
+            state: up
+          - name: dummy2
+            type: dummy
+            state: up
+        """
+    )
+    confs = libnmstate.generate_configurations(
+        desired_state, output_dir=str(tmp_path)
+    )
+    nm_dir = tmp_path / "NetworkManager"
+    for file_name, content in confs["NetworkManager"]:
+        file_path = nm_dir / file_name
+        assert file_path.read_text() == content
+        assert file_path.stat().st_mode & 0o777 == 0o600
+
+    mtimes = {p.name: p.stat().st_mtime_ns for p in nm_dir.iterdir()}
+    time.sleep(0.01)
+    libnmstate.generate_configurations(desired_state, output_dir=str(tmp_path))
+    assert mtimes == {p.name: p.stat().st_mtime_ns for p in nm_dir.iterdir()}
+
+
+def test_gen_conf_output_dir_fix_mode_of_existing_file(tmp_path):
+    desired_state = load_yaml(
+        """---
+        interfaces:
+          - name: dummy1
+            type: dummy
+            state: up
+        """
+    )
+    confs = libnmstate.generate_configurations(desired_state)
+    nm_dir = tmp_path / "NetworkManager"
+    nm_dir.mkdir()
+    for file_name, content in confs["NetworkManager"]:
+        file_path = nm_dir / file_name
+        file_path.write_text(content)
+        file_path.chmod(0o644)
+
+    libnmstate.generate_configurations(desired_state, output_dir=str(tmp_path))
+
+    for file_name, _ in confs["NetworkManager"]:
+        assert (nm_dir / file_name).stat().st_mode & 0o777 == 0o600
+
+
+def test_gen_conf_many():
+    states = [
+        load_yaml(
+            f"""---
+            interfaces:
+              - name: dummy{i}
+                type: dummy
+                state: up
+            """
+        )
+        for i in range(8)
+    ]
+    states.insert(3, {"interfaces": [{"name": "dummy9", "invalid": 1}]})
+
+    results = libnmstate.generate_configurations_many(iter(states))
+
+    assert len(results) == len(states)
+    assert isinstance(results[3], NmstateValueError)
+    for state, result in zip(states, results):
+        if isinstance(result, Exception):
+            continue
+        assert result == libnmstate.generate_configurations(state)
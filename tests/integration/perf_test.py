@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+End-to-end performance tests of libnmstate against large kernel topologies
+created in throwaway network namespace. NetworkManager is not involved.
+
+Environment variables:
+    * NMSTATE_PERF_SCALES: Comma separated interface counts,
+      default `100,1000,5000`.
+    * NMSTATE_PERF_ITERATIONS: Timed iterations per operation, default 10.
+    * NMSTATE_PERF_RESULT: Path of JSON result file, default
+      `.perf/result.json` next to this file.
+    * NMSTATE_PERF_BUDGET: Path of JSON file holding the scaling budget in
+      seconds, for example `{"show": {"5000": {"p99": 2.0}}}`.
+"""
+
+import json
+import os
+import platform
+import time
+
+import pytest
+
+import libnmstate
+
+from .testlib.perflib import create_perf_topology
+from .testlib.perflib import perf_netns
+from .testlib.perflib import run_perf_in_netns
+from .testlib.perflib import summarize
+
+
+PERF_NETNS = "nmstate-perf"
+DEFAULT_PERF_SCALES = "100,1000,5000"
+PERF_SCALES = [
+    int(scale)
+    for scale in os.environ.get(
+        "NMSTATE_PERF_SCALES", DEFAULT_PERF_SCALES
+    ).split(",")
+]
+PERF_ITERATIONS = int(os.environ.get("NMSTATE_PERF_ITERATIONS", "10"))
+PERF_RESULT_PATH = os.environ.get(
+    "NMSTATE_PERF_RESULT",
+    os.path.join(
+        os.path.dirname(os.path.realpath(__file__)), ".perf", "result.json"
+    ),
+)
+
+
+def _load_budget():
+    budget_path = os.environ.get("NMSTATE_PERF_BUDGET")
+    if not budget_path:
+        return {}
+    with open(budget_path) as fd:
+        return json.load(fd)
+
+
+@pytest.fixture(scope="module")
+def perf_results():
+    results = {
+        "nmstate": libnmstate.__version__,
+        "kernel": platform.release(),
+        "timestamp": int(time.time()),
+        "iterations": PERF_ITERATIONS,
+        "scales": {},
+    }
+    yield results["scales"]
+    os.makedirs(os.path.dirname(PERF_RESULT_PATH), exist_ok=True)
+    with open(PERF_RESULT_PATH, "w") as fd:
+        json.dump(results, fd, indent=2)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "iface_count", PERF_SCALES, ids=[f"ifaces_{s}" for s in PERF_SCALES]
+)
+def test_perf_kernel_only_in_netns(perf_results, iface_count):
+    with perf_netns(PERF_NETNS):
+        create_perf_topology(PERF_NETNS, iface_count)
+        samples = run_perf_in_netns(PERF_NETNS, PERF_ITERATIONS)
+
+    stats = {op: summarize(op_samples) for op, op_samples in samples.items()}
+    perf_results[str(iface_count)] = stats
+
+    failures = []
+    for op, op_budget in _load_budget().items():
+        for metric, limit in op_budget.get(str(iface_count), {}).items():
+            value = stats[op][metric]
+            if value > limit:
+                failures.append(
+                    f"{op} {metric} {value:.3f}s exceeded budget {limit}s"
+                )
+    assert not failures, failures
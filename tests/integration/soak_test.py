@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Soak test of libnmstate for long running consumers: every operation is
+invoked repeatedly from current process, resource usage is sampled after
+each round and the test fails on sustained growth of RSS, malloc heap, file
+descriptors, threads or the buffered logs of libnmstate.
+
+Environment variables:
+    * NMSTATE_SOAK_ROUNDS: Sampled rounds after the warm up round,
+      default 30.
+    * NMSTATE_SOAK_CALLS: Calls of each operation per round, default 10.
+"""
+
+import os
+
+import pytest
+
+import libnmstate
+from libnmstate.error import NmstateError
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import VLAN
+
+from .testlib.soaklib import find_sustained_growth
+from .testlib.soaklib import sample_resources
+
+
+SOAK_ROUNDS = int(os.environ.get("NMSTATE_SOAK_ROUNDS", "30"))
+SOAK_CALLS = int(os.environ.get("NMSTATE_SOAK_CALLS", "10"))
+SOAK_DUMMY = "dummy-soak0"
+
+POLICY_CHANGE_DUMMY_MTU = {
+    "capture": {
+        "dummy": f'interfaces.name=="{SOAK_DUMMY}"',
+    },
+    "desiredState": {
+        "interfaces": [
+            {
+                "name": "{{ capture.dummy.interfaces.0.name }}",
+                "mtu": 1400,
+            }
+        ]
+    },
+}
+
+INVALID_STATE = {
+    Interface.KEY: [
+        {
+            Interface.NAME: "vlan-soak0",
+            Interface.TYPE: InterfaceType.VLAN,
+            VLAN.CONFIG_SUBTREE: {
+                VLAN.ID: 101,
+                VLAN.BASE_IFACE: "not-exist-soak0",
+            },
+        }
+    ]
+}
+
+
+def _dummy_state(mtu):
+    return {
+        Interface.KEY: [
+            {
+                Interface.NAME: SOAK_DUMMY,
+                Interface.TYPE: InterfaceType.DUMMY,
+                Interface.STATE: InterfaceState.UP,
+                Interface.MTU: mtu,
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def soak_dummy():
+    libnmstate.apply(_dummy_state(1500))
+    try:
+        yield SOAK_DUMMY
+    finally:
+        libnmstate.apply(
+            {
+                Interface.KEY: [
+                    {
+                        Interface.NAME: SOAK_DUMMY,
+                        Interface.STATE: InterfaceState.ABSENT,
+                    }
+                ]
+            }
+        )
+
+
+def _apply_invalid_state():
+    with pytest.raises(NmstateError):
+        libnmstate.apply(INVALID_STATE)
+
+
+def _soak_round(state_cache, compiled_policy, cur_state, round_id):
+    for _ in range(SOAK_CALLS):
+        libnmstate.show()
+        libnmstate.show(kernel_only=True)
+        state_cache.show()
+        libnmstate.generate_configurations(_dummy_state(1400))
+        libnmstate.generate_differences(_dummy_state(1400), cur_state)
+        compiled_policy.gen_net_state(cur_state)
+        _apply_invalid_state()
+    # Apply with NetworkManager takes seconds, once per round is enough for
+    # catching leak of D-Bus connections and tokio runtimes.
+    libnmstate.apply(_dummy_state(1400 if round_id % 2 else 1500))
+
+
+@pytest.mark.slow
+def test_soak_libnmstate(soak_dummy):
+    cur_state = libnmstate.show()
+    compiled_policy = libnmstate.CompiledPolicy(POLICY_CHANGE_DUMMY_MTU)
+    samples = []
+    with libnmstate.NetworkStateCache() as state_cache:
+        # The first round is warm up for lazily initialized resources
+        for round_id in range(SOAK_ROUNDS + 1):
+            _soak_round(state_cache, compiled_policy, cur_state, round_id)
+            if round_id > 0:
+                samples.append(sample_resources())
+    compiled_policy.close()
+
+    growths = find_sustained_growth(samples)
+    assert not growths, f"Sustained growth {growths}, samples {samples}"
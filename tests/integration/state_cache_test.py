@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import pytest
+
+import libnmstate
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+
+from .testlib.cmdlib import exec_cmd
+
+
+TEST_DUMMY = "dummy-cache0"
+
+
+@pytest.fixture
+def state_cache():
+    with libnmstate.NetworkStateCache() as cache:
+        yield cache
+    exec_cmd(f"ip link del {TEST_DUMMY}".split())
+
+
+def _iface_names(state):
+    return [iface[Interface.NAME] for iface in state[Interface.KEY]]
+
+
+def test_cache_invalidated_by_kernel_change(state_cache):
+    assert TEST_DUMMY not in _iface_names(state_cache.show(kernel_only=True))
+
+    exec_cmd(f"ip link add {TEST_DUMMY} type dummy".split(), check=True)
+
+    assert TEST_DUMMY in _iface_names(state_cache.show(kernel_only=True))
+
+
+def test_cache_apply_and_show(state_cache):
+    state_cache.show(kernel_only=True)
+    state_cache.apply(
+        {
+            Interface.KEY: [
+                {
+                    Interface.NAME: TEST_DUMMY,
+                    Interface.TYPE: "dummy",
+                    Interface.STATE: InterfaceState.UP,
+                }
+            ]
+        },
+        kernel_only=True,
+    )
+
+    assert TEST_DUMMY in _iface_names(state_cache.show(kernel_only=True))
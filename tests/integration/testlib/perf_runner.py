@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+"""
+Standalone script invoked by `perflib.run_perf_in_netns()` through
+`ip netns exec`, so libnmstate retrieves and applies the kernel network state
+of the throwaway network namespace. It prints the elapsed seconds of each
+operation as JSON to stdout.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import libnmstate
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceType
+
+POLICY_CHANGE_GW_IFACE_MTU = {
+    "capture": {
+        "gw": 'routes.running.destination=="0.0.0.0/0"',
+        "base-iface": "interfaces.name=="
+        "capture.gw.routes.running.0.next-hop-interface",
+    },
+    "desiredState": {
+        "interfaces": [
+            {
+                "name": "{{ capture.base-iface.interfaces.0.name }}",
+                "mtu": 1400,
+            }
+        ]
+    },
+}
+
+
+def _timeit(func, iterations, warmup):
+    samples = []
+    for i in range(warmup + iterations):
+        start = time.perf_counter()
+        func(i)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def _dummy_mtu_state(cur_state, mtu):
+    return {
+        Interface.KEY: [
+            {
+                Interface.NAME: iface[Interface.NAME],
+                Interface.TYPE: InterfaceType.DUMMY,
+                Interface.MTU: mtu,
+            }
+            for iface in cur_state[Interface.KEY]
+            if iface[Interface.TYPE] == InterfaceType.DUMMY
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    args = parser.parse_args()
+
+    cur_state = libnmstate.show(kernel_only=True)
+    desired_states = [
+        _dummy_mtu_state(cur_state, 1400),
+        _dummy_mtu_state(cur_state, 1500),
+    ]
+    compiled_policy = libnmstate.CompiledPolicy(POLICY_CHANGE_GW_IFACE_MTU)
+
+    results = {
+        "show": _timeit(
+            lambda _: libnmstate.show(kernel_only=True),
+            args.iterations,
+            args.warmup,
+        ),
+        "apply": _timeit(
+            lambda i: libnmstate.apply(
+                desired_states[i % 2], kernel_only=True
+            ),
+            args.iterations,
+            args.warmup,
+        ),
+        "generate_configurations": _timeit(
+            lambda _: libnmstate.generate_configurations(cur_state),
+            args.iterations,
+            args.warmup,
+        ),
+        "generate_differences": _timeit(
+            lambda i: libnmstate.generate_differences(
+                desired_states[i % 2], cur_state
+            ),
+            args.iterations,
+            args.warmup,
+        ),
+        "policy": _timeit(
+            lambda _: compiled_policy.gen_net_state(cur_state),
+            args.iterations,
+            args.warmup,
+        ),
+    }
+    compiled_policy.close()
+    json.dump(results, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
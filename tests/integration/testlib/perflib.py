@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import json
+import math
+import os
+import sys
+from contextlib import contextmanager
+
+from .cmdlib import exec_cmd
+
+PERF_RUNNER_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "perf_runner.py"
+)
+
+
+@contextmanager
+def perf_netns(netns):
+    exec_cmd(f"ip netns del {netns}".split())
+    exec_cmd(f"ip netns add {netns}".split(), check=True)
+    try:
+        yield netns
+    finally:
+        exec_cmd(f"ip netns del {netns}".split())
+
+
+def create_perf_topology(netns, iface_count):
+    """
+    Create roughly `iface_count` kernel interfaces in `netns` using single
+    `ip -batch` invocation:
+        * Half of them are dummy interfaces with static IPv4 address and
+          a static route.
+        * A quarter of them are VLANs on top of the dummy interfaces.
+        * A quarter of them are veth pairs attached to linux bridges, each
+          bridge holds up to 40 veth.
+    Default gateway is on `dum0`.
+    """
+    dummy_count = max(iface_count // 2, 1)
+    vlan_count = iface_count // 4
+    veth_count = iface_count // 8
+    cmds = []
+    for i in range(dummy_count):
+        ip_prefix = f"10.{i // 256 % 256}.{i % 256}"
+        cmds.append(f"link add dum{i} type dummy")
+        cmds.append(f"link set dum{i} up")
+        cmds.append(f"addr add {ip_prefix}.1/24 dev dum{i}")
+        cmds.append(
+            f"route add 198.18.{i // 256 % 256}.{i % 256}/32 "
+            f"via {ip_prefix}.254 dev dum{i}"
+        )
+    for i in range(vlan_count):
+        cmds.append(f"link add dum{i}.10 link dum{i} type vlan id 10")
+        cmds.append(f"link set dum{i}.10 up")
+    for i in range(veth_count // 40 + 1):
+        cmds.append(f"link add br{i} type bridge")
+        cmds.append(f"link set br{i} up")
+    for i in range(veth_count):
+        cmds.append(f"link add veth{i} type veth peer name veth{i}p")
+        cmds.append(f"link set veth{i} master br{i // 40}")
+        cmds.append(f"link set veth{i} up")
+        cmds.append(f"link set veth{i}p up")
+    cmds.append("route add default via 10.0.0.254 dev dum0")
+    exec_cmd(
+        ["ip", "-n", netns, "-batch", "-"],
+        stdin="\n".join(cmds).encode("utf-8"),
+        check=True,
+    )
+
+
+def run_perf_in_netns(netns, iterations, warmup=1):
+    """
+    Return dictionary of operation name to the list of elapsed seconds.
+    """
+    _, out, _ = exec_cmd(
+        [
+            "ip",
+            "netns",
+            "exec",
+            netns,
+            sys.executable,
+            PERF_RUNNER_PATH,
+            "--iterations",
+            str(iterations),
+            "--warmup",
+            str(warmup),
+        ],
+        check=True,
+    )
+    return json.loads(out)
+
+
+def summarize(samples):
+    """
+    Return min, max, mean and nearest-rank percentiles of the samples.
+    """
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "min": samples[0],
+        "max": samples[-1],
+        "mean": sum(samples) / len(samples),
+        "p50": _percentile(samples, 50),
+        "p90": _percentile(samples, 90),
+        "p99": _percentile(samples, 99),
+    }
+
+
+def _percentile(sorted_samples, percent):
+    rank = math.ceil(percent / 100 * len(sorted_samples))
+    return sorted_samples[max(rank, 1) - 1]
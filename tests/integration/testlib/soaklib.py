@@ -0,0 +1,115 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import ctypes
+import gc
+import os
+import statistics
+
+from libnmstate.clib_wrapper import log_buffered_count
+
+# Growth below these values between the first and last window of samples
+# is considered as noise.
+DEFAULT_GROWTH_TOLERANCES = {
+    "rss-kib": 16 * 1024,
+    "heap-bytes": 8 * 1024 * 1024,
+    "fds": 0,
+    "threads": 0,
+    "log-buffer": 0,
+}
+
+SOAK_WINDOW_COUNT = 3
+
+
+class _MallInfo2(ctypes.Structure):
+    _fields_ = [
+        (name, ctypes.c_size_t)
+        for name in (
+            "arena",
+            "ordblks",
+            "smblks",
+            "hblks",
+            "hblkhd",
+            "usmblks",
+            "fsmblks",
+            "uordblks",
+            "fordblks",
+            "keepcost",
+        )
+    ]
+
+
+def _load_mallinfo2():
+    mallinfo2 = getattr(ctypes.CDLL(None), "mallinfo2", None)
+    if mallinfo2 is not None:
+        mallinfo2.restype = _MallInfo2
+        mallinfo2.argtypes = ()
+    return mallinfo2
+
+
+_MALLINFO2 = _load_mallinfo2()
+
+
+def heap_in_use():
+    """
+    Return bytes allocated by glibc malloc, which is also the global
+    allocator of the Rust code in libnmstate. Return None when glibc is older
+    than 2.33.
+    """
+    if _MALLINFO2 is None:
+        return None
+    info = _MALLINFO2()
+    return info.uordblks + info.hblkhd
+
+
+def _proc_self_status():
+    status = {}
+    with open("/proc/self/status") as fd:
+        for line in fd:
+            key, _, value = line.partition(":")
+            status[key] = value.strip()
+    return status
+
+
+def sample_resources():
+    """
+    Return dictionary of the resource usage of current process.
+    """
+    gc.collect()
+    status = _proc_self_status()
+    return {
+        "rss-kib": int(status["VmRSS"].split()[0]),
+        "heap-bytes": heap_in_use(),
+        "fds": len(os.listdir("/proc/self/fd")),
+        "threads": int(status["Threads"]),
+        "log-buffer": log_buffered_count(),
+    }
+
+
+def find_sustained_growth(samples, tolerances=None):
+    """
+    Split the samples into windows, return dictionary of resource name to
+    its growth when the median of each window is larger than the previous
+    one and the total growth exceeds the tolerance.
+    """
+    if tolerances is None:
+        tolerances = DEFAULT_GROWTH_TOLERANCES
+    window_size = len(samples) // SOAK_WINDOW_COUNT
+    if window_size == 0:
+        return {}
+    growths = {}
+    for name, tolerance in tolerances.items():
+        if any(sample[name] is None for sample in samples):
+            continue
+        medians = [
+            statistics.median(
+                sample[name]
+                for sample in samples[i * window_size : (i + 1) * window_size]
+            )
+            for i in range(SOAK_WINDOW_COUNT)
+        ]
+        growth = medians[-1] - medians[0]
+        if growth > tolerance and all(
+            cur > pre for pre, cur in zip(medians, medians[1:])
+        ):
+            growths[name] = growth
+    return growths
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import pytest
+import yaml
+
+import libnmstate
+from libnmstate.error import NmstateError
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import VLAN
+
+from .testlib import cmdlib
+from .testlib.cmdlib import exec_cmd
+
+
+TEST_DUMMY = "dummy-tm0"
+
+
+@pytest.fixture
+def dummy_iface():
+    exec_cmd(f"ip link add {TEST_DUMMY} type dummy".split(), check=True)
+    try:
+        yield TEST_DUMMY
+    finally:
+        exec_cmd(f"ip link del {TEST_DUMMY}".split())
+
+
+def _phase_names(timings):
+    return [phase["name"] for phase in timings["phases"]]
+
+
+def test_show_with_timings():
+    timings = {}
+    libnmstate.show(timings=timings)
+
+    assert "retrieve" in _phase_names(timings)
+    assert "retrieve.kernel" in _phase_names(timings)
+    assert "retrieve.nm" in _phase_names(timings)
+    for phase in timings["phases"]:
+        assert phase["count"] >= 1
+        assert phase["max-ms"] <= phase["total-ms"]
+
+
+def test_apply_with_timings(dummy_iface):
+    timings = {}
+    libnmstate.apply(
+        {
+            Interface.KEY: [
+                {
+                    Interface.NAME: dummy_iface,
+                    Interface.TYPE: InterfaceType.DUMMY,
+                    Interface.STATE: InterfaceState.UP,
+                    Interface.MTU: 1400,
+                }
+            ]
+        },
+        timings=timings,
+    )
+
+    phase_names = _phase_names(timings)
+    for name in (
+        "merge",
+        "checkpoint-create",
+        "nm-apply",
+        "nm-apply.save-profiles",
+        "nm-apply.activate-profiles",
+        "verify",
+        "checkpoint-destroy",
+    ):
+        assert name in phase_names
+    assert timings["counters"]["apply-attempts"] >= 1
+    assert timings["counters"]["verify-attempts"] >= 1
+    assert timings["counters"]["nm-profiles-saved"] >= 1
+
+
+def test_timings_stored_on_failure():
+    timings = {}
+    with pytest.raises(NmstateError):
+        libnmstate.apply(
+            {
+                Interface.KEY: [
+                    {
+                        Interface.NAME: "vlan-tm0",
+                        Interface.TYPE: InterfaceType.VLAN,
+                        VLAN.CONFIG_SUBTREE: {
+                            VLAN.ID: 101,
+                            VLAN.BASE_IFACE: "not-exist-tm0",
+                        },
+                    }
+                ]
+            },
+            kernel_only=True,
+            timings=timings,
+        )
+
+    assert "merge" in _phase_names(timings)
+
+
+def test_nmstatectl_show_timings_in_stderr():
+    ret = exec_cmd("nmstatectl -q show -k --timings".split())
+    rc, out, err = ret
+
+    assert rc == cmdlib.RC_SUCCESS, cmdlib.format_exec_cmd_result(ret)
+    assert yaml.safe_load(out)[Interface.KEY]
+    assert "retrieve" in _phase_names(yaml.safe_load(err))
@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: LGPL-2.1-or-later
+
+import pytest
+
+import libnmstate
+from libnmstate.schema import Interface
+
+from .testlib.cmdlib import exec_cmd
+
+
+TEST_DUMMY = "dummy-watch0"
+
+
+@pytest.fixture
+def watcher():
+    watcher = libnmstate.watch(kernel_only=True, timeout=5)
+    try:
+        yield watcher
+    finally:
+        watcher.close()
+        exec_cmd(f"ip link del {TEST_DUMMY}".split())
+
+
+def _wait_change(watcher, change_type, iface_name):
+    for changes in watcher:
+        for change in changes:
+            if change.get(change_type, {}).get(Interface.NAME) == iface_name:
+                return change[change_type]
+    return None
+
+
+def test_watch_interface_added_and_removed(watcher):
+    state = next(watcher)
+    assert TEST_DUMMY not in [
+        iface[Interface.NAME] for iface in state[Interface.KEY]
+    ]
+
+    exec_cmd(f"ip link add {TEST_DUMMY} type dummy".split(), check=True)
+    iface = _wait_change(watcher, "interface-added", TEST_DUMMY)
+    assert iface[Interface.TYPE] == "dummy"
+
+    exec_cmd(f"ip link del {TEST_DUMMY}".split(), check=True)
+    assert _wait_change(watcher, "interface-removed", TEST_DUMMY)